@@ -8,4 +8,9 @@ from .user_roles import router as user_roles_router
 from .schedules import router as schedules_router
 from .events import router as events_router
 from .event_assignments import router as event_assignments_router
-from .user_unavailable_periods import router as user_unavailable_periods_router
\ No newline at end of file
+from .user_unavailable_periods import router as user_unavailable_periods_router
+from .user_unavailable_rules import router as user_unavailable_rules_router
+from .exports import router as exports_router
+from .jobs import router as jobs_router
+from .analytics import router as analytics_router
+from .api_keys import router as api_keys_router
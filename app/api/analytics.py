@@ -0,0 +1,19 @@
+from uuid import UUID
+from datetime import datetime
+from fastapi import APIRouter
+
+from app.db.models import LoadAnalyticsPublic
+from app.utils.dependencies import SessionDep
+from app.services.analytics import get_load_analytics
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+@router.get("/load", response_model=LoadAnalyticsPublic)
+def get_workload_analytics(
+    session: SessionDep,
+    starts_at: datetime | None = None,
+    ends_at: datetime | None = None,
+    team_id: UUID | None = None,
+):
+    """Assignments and requirement-weighted load per user and role (default: the last 12 weeks), to spot over- and under-scheduling"""
+    return get_load_analytics(session, starts_at=starts_at, ends_at=ends_at, team_id=team_id)
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, status, Response
+from sqlmodel import select
+
+from app.db.models import ApiKey, ApiKeyCreate, ApiKeyUpdate, ApiKeyPublic, ApiKeyCreatedPublic
+from app.utils.dependencies import SessionDep, StoredApiKeyDep, require_admin_scope
+from app.services.api_keys import create_api_key, refresh_api_keys
+from app.services.domain import update_object, delete_object
+
+router = APIRouter(prefix="/api_keys", tags=["api_keys"], dependencies=[Depends(require_admin_scope)])
+
+@router.get("", response_model=list[ApiKeyPublic])
+def get_all_api_keys(session: SessionDep):
+    return session.exec(select(ApiKey).order_by(ApiKey.name)).all()
+
+@router.get("/{id}", response_model=ApiKeyPublic)
+def get_single_api_key(api_key: StoredApiKeyDep):
+    return api_key
+
+@router.post("", response_model=ApiKeyCreatedPublic, status_code=status.HTTP_201_CREATED)
+def post_api_key(payload: ApiKeyCreate, session: SessionDep):
+    """Create an API key; the response's `key` is the only time the full key is returned"""
+    return create_api_key(session, payload)
+
+@router.patch("/{id}", response_model=ApiKeyPublic)
+def patch_api_key(payload: ApiKeyUpdate, session: SessionDep, api_key: StoredApiKeyDep):
+    """Rename a key, change its scopes, or deactivate it (`is_active=false`)"""
+    api_key = update_object(session, payload, api_key)
+    refresh_api_keys(session)
+    return api_key
+
+@router.delete("/{id}")
+def delete_api_key(session: SessionDep, api_key: StoredApiKeyDep):
+    delete_object(session, api_key)
+    refresh_api_keys(session)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
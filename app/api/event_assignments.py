@@ -1,18 +1,23 @@
 from fastapi import APIRouter
 
-from app.db.models import EventAssignmentUpdate, EventAssignmentPublic
-from app.utils.dependencies import SessionDep, EventWithFullHierarchyForAssignmentsDep, EventAssignmentDep
+from app.db.models import EventAssignmentUpdate, EventAssignmentPublic, AssignmentCandidatePublic
+from app.utils.dependencies import SessionDep, EventWithFullHierarchyForAssignmentsDep, EventAssignmentDep, EventAssignmentFieldsDep, EventAssignmentForCandidatesDep
 from app.services.domain import get_event_assignments_from_event, update_event_assignment
+from app.services.candidates import get_assignment_candidates
 
 router = APIRouter(tags=["event_assignments"])
 
 # Event Assignments are inserted when a new event is created - no direct route
 # Event Assignments are cascade deleted when the event is deleted - no direct route
 
-@router.get("/events/{event_id}/assignments", response_model=list[EventAssignmentPublic])
-def get_assignments_by_event(event: EventWithFullHierarchyForAssignmentsDep):
-    return get_event_assignments_from_event(event)
+@router.get("/events/{event_id}/assignments", response_model=list[EventAssignmentPublic], response_model_exclude_unset=True)
+def get_assignments_by_event(event: EventWithFullHierarchyForAssignmentsDep, fields: EventAssignmentFieldsDep):
+    return get_event_assignments_from_event(event, fields)
 
-@router.patch("/assignments/{id}", response_model=EventAssignmentPublic)
-def patch_event_assignment(payload: EventAssignmentUpdate, session: SessionDep, event_assignment: EventAssignmentDep):
-    return update_event_assignment(session, payload, event_assignment)
\ No newline at end of file
+@router.get("/assignments/{id}/candidates", response_model=list[AssignmentCandidatePublic])
+def get_candidates_by_assignment(session: SessionDep, event_assignment: EventAssignmentForCandidatesDep):
+    return get_assignment_candidates(session, event_assignment)
+
+@router.patch("/assignments/{id}", response_model=EventAssignmentPublic, response_model_exclude_unset=True)
+def patch_event_assignment(payload: EventAssignmentUpdate, session: SessionDep, event_assignment: EventAssignmentDep, fields: EventAssignmentFieldsDep):
+    return update_event_assignment(session, payload, event_assignment, fields)
\ No newline at end of file
@@ -1,19 +1,26 @@
+from uuid import UUID
 from fastapi import APIRouter, status, Response
 
-from app.db.models import EventCreate, EventUpdate, EventPublic, EventWithAssignmentsPublic
-from app.utils.dependencies import SessionDep, ScheduleForEventsDep, EventDep, EventWithFullHierarchyDep
+from app.db.models import EventCreate, EventUpdate, EventPublic, EventWithAssignmentsPublic, EventCandidatePublic
+from app.utils.dependencies import SessionDep, ScheduleForEventsDep, EventDep, EventWithFullHierarchyDep, EventFieldsDep
 from app.services.builders import build_events_with_assignments_from_schedule, build_events_with_assignments_from_event
-from app.services.domain import update_object, create_event_with_default_assignment_slots, delete_object
+from app.services.domain import create_event_with_default_assignment_slots, update_event, delete_event_object
+from app.services.candidates import get_event_candidates
 
 router = APIRouter(tags=["events"])
 
-@router.get("/schedules/{schedule_id}/events", response_model=list[EventWithAssignmentsPublic])
-def get_events_for_schedule(schedule: ScheduleForEventsDep):
-    return build_events_with_assignments_from_schedule(schedule)
+@router.get("/schedules/{schedule_id}/events", response_model=list[EventWithAssignmentsPublic], response_model_exclude_unset=True)
+def get_events_for_schedule(schedule: ScheduleForEventsDep, fields: EventFieldsDep):
+    return build_events_with_assignments_from_schedule(schedule, fields)
 
-@router.get("/events/{id}", response_model=EventWithAssignmentsPublic)
-def get_single_event(event: EventWithFullHierarchyDep):
-    return build_events_with_assignments_from_event(event)
+@router.get("/events/{id}", response_model=EventWithAssignmentsPublic, response_model_exclude_unset=True)
+def get_single_event(event: EventWithFullHierarchyDep, fields: EventFieldsDep):
+    return build_events_with_assignments_from_event(event, fields)
+
+@router.get("/events/{id}/candidates", response_model=list[EventCandidatePublic])
+def get_candidates_for_event(event: EventDep, role_id: UUID, session: SessionDep):
+    """Active users qualified for the role (assignable proficiency) and available for the event, from an in-memory index of the schedule"""
+    return get_event_candidates(session, event, role_id)
 
 @router.post("/schedules/{schedule_id}/events", response_model=EventWithAssignmentsPublic, status_code=status.HTTP_201_CREATED)
 def post_event(schedule: ScheduleForEventsDep, event: EventCreate, session: SessionDep):
@@ -23,10 +30,10 @@ def post_event(schedule: ScheduleForEventsDep, event: EventCreate, session: Sess
 
 @router.patch("/events/{id}", response_model=EventPublic)
 def patch_event(payload: EventUpdate, session: SessionDep, event: EventDep):
-    updated_event = update_object(session, payload, event)
+    updated_event = update_event(session, payload, event)
     return EventPublic.from_objects(event=updated_event, schedule=updated_event.schedule, event_type=updated_event.event_type, team=updated_event.team)
 
 @router.delete("/events/{id}")
 def delete_event(session: SessionDep, event: EventDep):
-    delete_object(session, event)
+    delete_event_object(session, event)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -0,0 +1,37 @@
+from uuid import UUID
+from datetime import datetime
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.db.models.enums import ExportFormat
+from app.utils.dependencies import SessionDep
+from app.utils.exceptions import CheckConstraintError
+from app.services.queries import stream_event_assignment_export_rows
+from app.services.exports import iter_event_assignments_csv, iter_event_assignments_ndjson
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+@router.get("/assignments", response_class=StreamingResponse)
+def export_event_assignments(
+    session: SessionDep,
+    format: ExportFormat = ExportFormat.csv,
+    starts_at: datetime | None = None,
+    ends_at: datetime | None = None,
+    schedule_id: UUID | None = None,
+):
+    """Stream event assignments (filtered by event start time and/or schedule) as CSV or NDJSON"""
+    if starts_at and ends_at and starts_at >= ends_at:
+        raise CheckConstraintError("Start time must be before end time")
+
+    rows = stream_event_assignment_export_rows(session, starts_at=starts_at, ends_at=ends_at, schedule_id=schedule_id)
+    if format == ExportFormat.csv:
+        return StreamingResponse(
+            iter_event_assignments_csv(rows),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="event_assignments.csv"'},
+        )
+    return StreamingResponse(
+        iter_event_assignments_ndjson(rows),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="event_assignments.ndjson"'},
+    )
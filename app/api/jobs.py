@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from app.db.models import JobPublic
+from app.utils.dependencies import JobDep
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+@router.get("/{id}", response_model=JobPublic)
+def get_single_job(job: JobDep):
+    """Job status, progress (`progress_done` of `progress_total`), and result or error once finished"""
+    return job
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, status, Response
+from fastapi.responses import JSONResponse
 from sqlmodel import select
 
-from app.db.models import Role, RoleCreate, RoleUpdate
+from app.db.models import Role, RoleCreate, RoleUpdate, JobPublic
+from app.db.models.enums import JobKind
 from app.utils.dependencies import SessionDep, RoleDep
 from app.services.domain import create_role_with_user_roles, update_object, delete_object
+from app.services.jobs import enqueue_job
 
 router = APIRouter(prefix="/roles", tags=["roles"])
 
@@ -15,8 +18,12 @@ def get_all_roles(session: SessionDep):
 def get_single_role(role: RoleDep):
     return role
 
-@router.post("", response_model=Role, status_code=status.HTTP_201_CREATED)
-def post_role(payload: RoleCreate, session: SessionDep):
+@router.post("", response_model=Role, status_code=status.HTTP_201_CREATED, responses={status.HTTP_202_ACCEPTED: {"model": JobPublic}})
+def post_role(payload: RoleCreate, session: SessionDep, background: bool = False):
+    """Create a role and a user role for every user (with `background=true`, returns 202 and a job to poll)"""
+    if background:
+        job = enqueue_job(session, JobKind.role_create, payload)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=JobPublic.model_validate(job).model_dump(mode="json"), headers={"Location": f"/jobs/{job.id}"})
     return create_role_with_user_roles(session, payload)
 
 @router.patch("/{id}", response_model=Role)
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, status, Response
+from fastapi import APIRouter, Request, status, Response
+from fastapi.responses import StreamingResponse
 from sqlmodel import select
 
-from app.db.models import Schedule, ScheduleCreate, ScheduleUpdate, ScheduleGridPublic
-from app.utils.dependencies import SessionDep, ScheduleDep, ScheduleWithEventsAndAssignmentsDep
-from app.services.domain import update_object, get_schedule_grid_from_schedule, create_object, delete_object
+from app.db.models import Schedule, ScheduleCreate, ScheduleUpdate, ScheduleGridPublic, ScheduleGridCompactPublic, ScheduleSummaryPublic
+from app.db.models.enums import GridFormat
+from app.utils.dependencies import SessionDep, ScheduleDep
+from app.services.domain import update_object, get_schedule_grid_json, create_object, delete_object
+from app.services.queries import select_schedule_summary_version
+from app.services.coalescing import schedule_grid_flights, get_schedule_grid_generation
+from app.services.broker import stream_schedule_changes
+from app.services.summaries import get_schedule_summary
 
 router = APIRouter(prefix="/schedules", tags=["schedules"])
 
@@ -15,9 +21,32 @@ def get_all_schedules(session: SessionDep):
 def get_single_schedule(schedule: ScheduleDep):
     return schedule
 
-@router.get("/{id}/grid", response_model=ScheduleGridPublic)
-def get_schedule_grid(session: SessionDep, schedule: ScheduleWithEventsAndAssignmentsDep):
-    return get_schedule_grid_from_schedule(session, schedule)
+@router.get("/{id}/grid", response_model=ScheduleGridPublic | ScheduleGridCompactPublic)
+def get_schedule_grid(session: SessionDep, schedule: ScheduleDep, format: GridFormat = GridFormat.full):
+    """
+    Concurrent requests for the same schedule, grid inputs and format share one computation of the grid.
+
+    `format=compact` lists each role, user, team and event type once in `included`, referenced by id.
+    """
+    key = (schedule.id, select_schedule_summary_version(session, schedule.id), get_schedule_grid_generation(), format)
+    body = schedule_grid_flights.do(key, lambda: get_schedule_grid_json(session, schedule.id, format))
+    return Response(content=body, media_type="application/json")
+
+@router.get("/{id}/summary", response_model=ScheduleSummaryPublic)
+def get_schedule_summary_for_schedule(session: SessionDep, schedule: ScheduleDep):
+    """Dashboard stats for a schedule (events, slot coverage, per-role and per-user counts), kept current by every write"""
+    return ScheduleSummaryPublic.from_objects(schedule_summary=get_schedule_summary(session, schedule.id))
+
+@router.get("/{id}/changes", response_class=StreamingResponse)
+def stream_schedule_grid_changes(request: Request, session: SessionDep, schedule: ScheduleDep):
+    """Server-Sent Events stream of changes to the schedule grid (assignments, events and overlapping availability)"""
+    # Release the pooled connection now; the stream can stay open for hours
+    session.close()
+    return StreamingResponse(
+        stream_schedule_changes(request, schedule.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.post("", response_model=Schedule, status_code=status.HTTP_201_CREATED)
 def post_schedule(payload: ScheduleCreate, session: SessionDep):
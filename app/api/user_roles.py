@@ -1,25 +1,26 @@
 from fastapi import APIRouter
 
 from app.db.models import UserRoleUpdate, UserRolePublic
-from app.utils.dependencies import UserWithUserRolesDep, SessionDep, RoleWithUserRolesDep, UserRoleDep
+from app.utils.dependencies import UserWithUserRolesDep, SessionDep, RoleWithUserRolesDep, UserRoleDep, UserRoleFieldsDep
+from app.utils.fieldsets import related
 from app.services.domain import update_user_role
 
 router = APIRouter(tags=["user_roles"])
 
 # User roles are not created or deleted directly through an API endpoint - they are created when a user or role is created (same with delete)
 
-@router.get("/users/{user_id}/roles", response_model=list[UserRolePublic])
-def get_roles_for_user(user: UserWithUserRolesDep):
+@router.get("/users/{user_id}/roles", response_model=list[UserRolePublic], response_model_exclude_unset=True)
+def get_roles_for_user(user: UserWithUserRolesDep, fields: UserRoleFieldsDep):
     return [
         UserRolePublic.from_objects(
-            user_role=ur, user=user, role=ur.role, proficiency_level=ur.proficiency_level
+            user_role=ur, user=user, role=related(ur, "role", fields), proficiency_level=related(ur, "proficiency_level", fields), fields=fields
         ) for ur in user.user_roles
     ]
 
-@router.get("/roles/{role_id}/users", response_model=list[UserRolePublic])
-def get_users_for_role(role: RoleWithUserRolesDep):
+@router.get("/roles/{role_id}/users", response_model=list[UserRolePublic], response_model_exclude_unset=True)
+def get_users_for_role(role: RoleWithUserRolesDep, fields: UserRoleFieldsDep):
     return [
-        UserRolePublic.from_objects(user_role=ur, user=ur.user, role=role, proficiency_level=ur.proficiency_level)
+        UserRolePublic.from_objects(user_role=ur, user=related(ur, "user", fields), role=role, proficiency_level=related(ur, "proficiency_level", fields), fields=fields)
         for ur in role.user_roles
     ]
 
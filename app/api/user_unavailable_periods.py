@@ -1,8 +1,8 @@
-from fastapi import APIRouter, status, Response
+from fastapi import APIRouter, UploadFile, status, Response
 
-from app.db.models import UserUnavailablePeriodCreate, UserUnavailablePeriodUpdate, UserUnavailablePeriodPublic
+from app.db.models import UserUnavailablePeriodCreate, UserUnavailablePeriodUpdate, UserUnavailablePeriodPublic, UserUnavailablePeriodImportPublic
 from app.utils.dependencies import SessionDep, UserWithUserRolesForUnavailablePeriodsDep, UserUnavailablePeriodDep
-from app.services.domain import create_user_unavailable_period, create_user_unavailable_periods_bulk, update_user_unavailable_period, delete_object
+from app.services.domain import create_user_unavailable_period, create_user_unavailable_periods_bulk, import_user_unavailable_periods_csv, update_user_unavailable_period, delete_user_unavailable_period_object
 
 router = APIRouter(tags=["user_unavailable_periods"])
 
@@ -12,13 +12,19 @@ def post_user_unavailable_period(user: UserWithUserRolesForUnavailablePeriodsDep
 
 @router.post("/users/{user_id}/availability/bulk", response_model=list[UserUnavailablePeriodPublic], status_code=status.HTTP_201_CREATED)
 def post_user_unavailable_periods_bulk(user: UserWithUserRolesForUnavailablePeriodsDep, payload: list[UserUnavailablePeriodCreate], session: SessionDep):
+    """Overlapping or touching periods are merged, with each other and with the user's stored periods"""
     return create_user_unavailable_periods_bulk(session, payload, user)
 
+@router.post("/users/{user_id}/availability/import", response_model=UserUnavailablePeriodImportPublic, status_code=status.HTTP_201_CREATED)
+def import_user_unavailable_periods(user: UserWithUserRolesForUnavailablePeriodsDep, file: UploadFile, session: SessionDep):
+    """Import periods from a CSV file (`starts_at,ends_at` header), merged like the bulk create and written with COPY"""
+    return import_user_unavailable_periods_csv(session, file.file, user)
+
 @router.patch("/user_availability/{id}", response_model=UserUnavailablePeriodPublic)
 def patch_user_unavailable_period(payload: UserUnavailablePeriodUpdate, session: SessionDep, user_unavailable_period: UserUnavailablePeriodDep):
     return update_user_unavailable_period(session, payload, user_unavailable_period)
 
 @router.delete("/user_availability/{id}")
 def delete_user_unavailable_period(session: SessionDep, user_unavailable_period: UserUnavailablePeriodDep):
-    delete_object(session, user_unavailable_period)
+    delete_user_unavailable_period_object(session, user_unavailable_period)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
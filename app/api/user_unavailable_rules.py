@@ -0,0 +1,25 @@
+from fastapi import APIRouter, status, Response
+
+from app.db.models import UserUnavailableRuleCreate, UserUnavailableRuleUpdate, UserUnavailableRulePublic
+from app.utils.dependencies import SessionDep, UserForUnavailableRulesDep, UserUnavailableRuleDep
+from app.services.domain import get_user_unavailable_rules, create_user_unavailable_rule, update_user_unavailable_rule, delete_user_unavailable_rule_object
+
+router = APIRouter(tags=["user_unavailable_rules"])
+
+@router.get("/users/{user_id}/availability/rules", response_model=list[UserUnavailableRulePublic])
+def get_user_unavailable_rules_for_user(user: UserForUnavailableRulesDep, session: SessionDep):
+    return get_user_unavailable_rules(session, user)
+
+@router.post("/users/{user_id}/availability/rules", response_model=UserUnavailableRulePublic, status_code=status.HTTP_201_CREATED)
+def post_user_unavailable_rule(user: UserForUnavailableRulesDep, payload: UserUnavailableRuleCreate, session: SessionDep):
+    """Occurrences count as unavailability wherever periods do (e.g. the schedule grid)"""
+    return create_user_unavailable_rule(session, payload, user)
+
+@router.patch("/user_availability_rules/{id}", response_model=UserUnavailableRulePublic)
+def patch_user_unavailable_rule(payload: UserUnavailableRuleUpdate, session: SessionDep, user_unavailable_rule: UserUnavailableRuleDep):
+    return update_user_unavailable_rule(session, payload, user_unavailable_rule)
+
+@router.delete("/user_availability_rules/{id}")
+def delete_user_unavailable_rule(session: SessionDep, user_unavailable_rule: UserUnavailableRuleDep):
+    delete_user_unavailable_rule_object(session, user_unavailable_rule)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
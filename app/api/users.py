@@ -1,9 +1,14 @@
-from fastapi import APIRouter, status, Response
+from fastapi import APIRouter, Request, status, Response
+from fastapi.responses import JSONResponse
 from sqlmodel import select
 
-from app.db.models import User, UserCreate, UserUpdate
+from app.db.models import User, UserCreate, UserUpdate, JobPublic
+from app.db.models.enums import JobKind
 from app.utils.dependencies import SessionDep, UserDep
+from app.utils.helpers import is_not_modified
 from app.services.domain import create_user_with_user_roles, update_object, delete_object
+from app.services.ical import user_calendar_cache
+from app.services.jobs import enqueue_job
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -15,8 +20,27 @@ def get_all_users(session: SessionDep):
 def get_single_user(user: UserDep):
     return user
 
-@router.post("", response_model=User, status_code=status.HTTP_201_CREATED)
-def post_user(payload: UserCreate, session: SessionDep):
+@router.get("/{id}/calendar.ics", response_class=Response, responses={
+    status.HTTP_200_OK: {"content": {"text/calendar": {}}},
+    status.HTTP_304_NOT_MODIFIED: {"description": "Feed unchanged since the ETag the client holds"},
+})
+def get_user_calendar(request: Request, session: SessionDep, user: UserDep):
+    """iCalendar feed of the user's event assignments (supports conditional GET via ETag)"""
+    calendar = user_calendar_cache.get_version(session, user)
+    # No Last-Modified: the latest updated_at of the assignments the user still holds does not move
+    # when one is reassigned or deleted (only the count in the ETag does)
+    headers = {"ETag": calendar.etag, "Cache-Control": "private, max-age=300"}
+    if is_not_modified(request.headers, calendar.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    calendar = user_calendar_cache.get_feed(session, user, calendar)
+    return Response(content=calendar.body, media_type="text/calendar; charset=utf-8", headers=headers)
+
+@router.post("", response_model=User, status_code=status.HTTP_201_CREATED, responses={status.HTTP_202_ACCEPTED: {"model": JobPublic}})
+def post_user(payload: UserCreate, session: SessionDep, background: bool = False):
+    """Create a user and a user role for every role (with `background=true`, returns 202 and a job to poll)"""
+    if background:
+        job = enqueue_job(session, JobKind.user_create, payload)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=JobPublic.model_validate(job).model_dump(mode="json"), headers={"Location": f"/jobs/{job.id}"})
     return create_user_with_user_roles(session, payload)
 
 @router.patch("/{id}", response_model=User)
@@ -1,29 +1,70 @@
+import os
+import asyncio
+import weakref
 import logging
 from fastapi import FastAPI
+from sqlalchemy import Engine
 from sqlmodel import create_engine
 
 from app.settings import settings
+from app.db.replicas import ReplicaRouter
+from app.db.partitions import create_upcoming_event_partitions
 
 logger = logging.getLogger(__name__)
 
+# Engines created in this process; a forked worker must never reuse their pooled connections
+_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+def _dispose_inherited_engines():
+    # close=False drops the child's references to the parent's connections without closing the
+    # sockets the parent is still using (https://docs.sqlalchemy.org/en/20/core/pooling.html#pooling-multiprocessing)
+    for engine in list(_engines):
+        engine.dispose(close=False)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_inherited_engines)
+
 async def connect_db(app: FastAPI):
     """
     Create a database engine and store it in the app state.
     
     This is called during application startup. Raises exceptions (not HTTPException)
     so FastAPI can properly handle startup failures.
+
+    The lifespan runs inside each worker, so with a preloaded multi-worker server the engine is
+    created after the fork; anything created before it is disposed in the child at fork time.
     """
     try:
-        app.state.db_engine = create_engine(settings.database_url)
-        logger.info("Database engine created successfully")
+        app.state.db_engine = create_engine(
+            settings.database_url,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+        )
+        _engines.add(app.state.db_engine)
+        replicas = [
+            create_engine(url, pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow, pool_pre_ping=True)
+            for url in settings.database_replica_urls_list
+        ]
+        _engines.update(replicas)
+        app.state.db_router = ReplicaRouter(app.state.db_engine, replicas, sticky_seconds=settings.replica_sticky_seconds)
+        await app.state.db_router.start()
+        logger.info("Database engine created successfully (pid %s, pool_size %s, %s replicas)", os.getpid(), settings.db_pool_size, len(replicas))
     except Exception as e:
-        logger.error(f"Failed to connect to database: {str(e)}")
+        logger.error("Failed to connect to database: %s", e)
         # Raise the exception directly (not HTTPException) so FastAPI can handle startup failures properly
         raise
+    try:
+        # Ahead of time, in a short transaction of their own: creating partitions locks the events tables
+        await asyncio.to_thread(create_upcoming_event_partitions, app.state.db_engine, settings.event_partition_years_ahead)
+    except Exception:
+        # Not fatal: another worker may hold the lock, and writes to a year without partitions fail clearly
+        logger.exception("Failed to create upcoming event partitions")
 
 async def close_db(app: FastAPI):
     """
-    Close the database engine during application shutdown.
+    Close the database engine (and replica engines) during application shutdown.
     """
+    if getattr(app.state, "db_router", None):
+        await app.state.db_router.stop()
     if hasattr(app.state, 'db_engine') and app.state.db_engine:
         app.state.db_engine.dispose()
\ No newline at end of file
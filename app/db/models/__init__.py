@@ -5,15 +5,23 @@ from .teams import Team, TeamCreate, TeamUpdate
 from .users import User, UserCreate, UserUpdate
 from .team_users import TeamUser, TeamUserCreate, TeamUserUpdate, TeamUserPublic
 from .user_roles import UserRole, UserRoleUpdate, UserRolePublic
-from .schedules import Schedule, ScheduleCreate, ScheduleUpdate, ScheduleGridPublic
-from .events import Event, EventCreate, EventUpdate, EventPublic, EventWithAssignmentsPublic, EventWithAssignmentsAndAvailabilityPublic
-from .event_assignments import EventAssignment, EventAssignmentUpdate, EventAssignmentPublic, EventAssignmentEmbeddedPublic
-from .user_unavailable_periods import UserUnavailablePeriod, UserUnavailablePeriodCreate, UserUnavailablePeriodUpdate, UserUnavailablePeriodPublic, UserUnavailablePeriodEmbeddedPublic
+from .schedules import Schedule, ScheduleCreate, ScheduleUpdate, ScheduleGridPublic, ScheduleGridCompactPublic, ScheduleGridIncludedPublic, GridRolePublic, GridUserPublic, GridTeamPublic, GridEventTypePublic
+from .events import Event, EventCreate, EventUpdate, EventPublic, EventWithAssignmentsPublic, EventWithAssignmentsAndAvailabilityPublic, EventCompactPublic
+from .event_assignments import EventAssignment, EventAssignmentUpdate, EventAssignmentPublic, EventAssignmentEmbeddedPublic, EventAssignmentCompactPublic
+from .user_unavailable_periods import UserUnavailablePeriod, UserUnavailablePeriodCreate, UserUnavailablePeriodUpdate, UserUnavailablePeriodPublic, UserUnavailablePeriodEmbeddedPublic, UserUnavailablePeriodImportPublic
+from .user_unavailable_rules import UserUnavailableRule, UserUnavailableRuleCreate, UserUnavailableRuleUpdate, UserUnavailableRulePublic
+from .jobs import Job, JobPublic
+from .schedule_summaries import ScheduleSummary, ScheduleSummaryPublic
+from .analytics import LoadAnalyticsPublic, UserLoadPublic, RoleLoadPublic
+from .candidates import EventCandidatePublic, AssignmentCandidatePublic
+from .api_keys import ApiKey, ApiKeyCreate, ApiKeyUpdate, ApiKeyPublic, ApiKeyCreatedPublic
 
 # Rebuild models with forward references after all imports are complete
 EventWithAssignmentsPublic.model_rebuild()
 EventWithAssignmentsAndAvailabilityPublic.model_rebuild()
 ScheduleGridPublic.model_rebuild()
+EventCompactPublic.model_rebuild()
+ScheduleGridCompactPublic.model_rebuild()
 
 __all__ = [
     "Role", "RoleCreate", "RoleUpdate",
@@ -24,7 +32,14 @@ __all__ = [
     "TeamUser", "TeamUserCreate", "TeamUserUpdate", "TeamUserPublic",
     "UserRole", "UserRoleUpdate", "UserRolePublic",
     "Schedule", "ScheduleCreate", "ScheduleUpdate", "ScheduleGridPublic",
-    "Event", "EventCreate", "EventUpdate", "EventPublic", "EventWithAssignmentsPublic", "EventWithAssignmentsAndAvailabilityPublic",
-    "EventAssignment", "EventAssignmentUpdate", "EventAssignmentPublic", "EventAssignmentEmbeddedPublic",
-    "UserUnavailablePeriod", "UserUnavailablePeriodCreate", "UserUnavailablePeriodUpdate", "UserUnavailablePeriodPublic", "UserUnavailablePeriodEmbeddedPublic",
+    "ScheduleGridCompactPublic", "ScheduleGridIncludedPublic", "GridRolePublic", "GridUserPublic", "GridTeamPublic", "GridEventTypePublic",
+    "Event", "EventCreate", "EventUpdate", "EventPublic", "EventWithAssignmentsPublic", "EventWithAssignmentsAndAvailabilityPublic", "EventCompactPublic",
+    "EventAssignment", "EventAssignmentUpdate", "EventAssignmentPublic", "EventAssignmentEmbeddedPublic", "EventAssignmentCompactPublic",
+    "UserUnavailablePeriod", "UserUnavailablePeriodCreate", "UserUnavailablePeriodUpdate", "UserUnavailablePeriodPublic", "UserUnavailablePeriodEmbeddedPublic", "UserUnavailablePeriodImportPublic",
+    "UserUnavailableRule", "UserUnavailableRuleCreate", "UserUnavailableRuleUpdate", "UserUnavailableRulePublic",
+    "Job", "JobPublic",
+    "ScheduleSummary", "ScheduleSummaryPublic",
+    "LoadAnalyticsPublic", "UserLoadPublic", "RoleLoadPublic",
+    "EventCandidatePublic", "AssignmentCandidatePublic",
+    "ApiKey", "ApiKeyCreate", "ApiKeyUpdate", "ApiKeyPublic", "ApiKeyCreatedPublic",
 ]
\ No newline at end of file
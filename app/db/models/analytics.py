@@ -0,0 +1,39 @@
+from uuid import UUID
+from sqlmodel import SQLModel
+from datetime import datetime
+
+class RoleLoadPublic(SQLModel):
+    role_id: UUID
+    role_code: str
+    role_name: str
+    assignments_count: int
+    # weighted_load: assignments weighted by requirement level (see LoadAnalyticsPublic.requirement_level_weights)
+    weighted_load: float
+    # role_average_load / role_load_percentile: compared with everyone else who holds (or filled) the role
+    role_average_load: float
+    role_load_percentile: float
+
+class UserLoadPublic(SQLModel):
+    user_id: UUID
+    first_name: str
+    last_name: str
+    assignments_count: int
+    weighted_load: float
+    # load_ratio: weighted_load / team_average_load (1.0 is an even share; None when nobody has any load)
+    load_ratio: float | None
+    # average_4_week_load: weighted_load spread evenly over the range, per 4 weeks
+    average_4_week_load: float
+    # peak_4_week_load: highest load in any 4 consecutive weeks (Monday-based, UTC) starting at peak_4_week_starts_at
+    peak_4_week_load: float
+    peak_4_week_starts_at: datetime | None
+    roles: list[RoleLoadPublic]
+
+class LoadAnalyticsPublic(SQLModel):
+    starts_at: datetime
+    ends_at: datetime
+    team_id: UUID | None
+    weeks: float
+    requirement_level_weights: dict[str, float]
+    team_average_load: float
+    # users: ordered by weighted_load, most scheduled first
+    users: list[UserLoadPublic]
@@ -0,0 +1,49 @@
+from uuid import UUID, uuid4
+from pydantic import ConfigDict
+from sqlmodel import SQLModel, Field, Column, JSON, TIMESTAMP
+from datetime import datetime, timezone
+
+from app.db.models.enums import ApiKeyScope
+
+class ApiKeyBase(SQLModel):
+    name: str = Field(index=True, unique=True)
+    scopes: list[ApiKeyScope] = Field(default_factory=lambda: [ApiKeyScope.read], sa_column=Column(JSON, nullable=False))
+    is_active: bool = Field(default=True)
+
+class ApiKey(ApiKeyBase, table=True):
+    __tablename__ = "api_keys"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    # Keys look like shq_<prefix>_<secret>: the prefix is the lookup id, only the secret's sha256 is stored
+    prefix: str = Field(index=True, unique=True)
+    secret_hash: str
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True))
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True), onupdate=lambda: datetime.now(timezone.utc))
+    )
+
+class ApiKeyCreate(SQLModel):
+    model_config = ConfigDict(extra="forbid")
+    # api_key.prefix and api_key.secret_hash are generated with the key
+    name: str
+    scopes: list[ApiKeyScope] = [ApiKeyScope.read]
+
+class ApiKeyUpdate(SQLModel):
+    model_config = ConfigDict(extra="forbid")
+    # Keys are not rotated in place: create a new key, move the client over, then deactivate the old one
+    name: str | None = None
+    scopes: list[ApiKeyScope] | None = None
+    is_active: bool | None = None
+
+class ApiKeyPublic(ApiKeyBase):
+    id: UUID
+    prefix: str
+    created_at: datetime
+
+class ApiKeyCreatedPublic(ApiKeyPublic):
+    # The full key, returned only once on creation
+    key: str
@@ -0,0 +1,22 @@
+from uuid import UUID
+from sqlmodel import SQLModel
+
+class EventCandidatePublic(SQLModel):
+    user_id: UUID
+    first_name: str
+    last_name: str
+
+class AssignmentCandidatePublic(SQLModel):
+    user_id: UUID
+    first_name: str
+    last_name: str
+    proficiency_level_id: UUID
+    proficiency_level_name: str
+    proficiency_level_rank: int | None
+    # is_team_member: an active member of the event's team (False when the event has no team)
+    is_team_member: bool
+    # recent_load: filled slots within 4 weeks either side of the event, weighted by requirement level
+    recent_load: float
+    # is_unavailable / has_overlapping_assignment: unavailability (periods or rules) or another filled slot overlapping the event
+    is_unavailable: bool
+    has_overlapping_assignment: bool
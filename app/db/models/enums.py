@@ -3,4 +3,36 @@ from enum import Enum
 class RequirementLevel(str, Enum):
     required = "required"
     preferred = "preferred"
-    optional = "optional"
\ No newline at end of file
+    optional = "optional"
+
+class ScheduleChangeType(str, Enum):
+    assignment_updated = "assignment.updated"
+    event_created = "event.created"
+    event_updated = "event.updated"
+    event_deleted = "event.deleted"
+    availability_added = "availability.added"
+    availability_updated = "availability.updated"
+    availability_deleted = "availability.deleted"
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+class GridFormat(str, Enum):
+    full = "full"  # Related names repeated on every event and assignment
+    compact = "compact"  # Events and assignments reference ids, related rows listed once in `included`
+
+class JobKind(str, Enum):
+    role_create = "roles.create"
+    user_create = "users.create"
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+class ApiKeyScope(str, Enum):
+    read = "read"  # GET and HEAD requests
+    write = "write"  # Every other method
+    admin = "admin"  # Managing API keys (/api_keys)
@@ -1,27 +1,30 @@
 from uuid import UUID, uuid4
 from pydantic import ConfigDict
-from typing import TYPE_CHECKING
-from sqlmodel import SQLModel, Field, Relationship, Column, ForeignKey, UniqueConstraint, Enum as SAEnum, TIMESTAMP
+from typing import TYPE_CHECKING, ClassVar
+from sqlmodel import SQLModel, Field, Relationship, Column, ForeignKey, ForeignKeyConstraint, UniqueConstraint, Index, Enum as SAEnum, TIMESTAMP, Uuid, text
 from datetime import datetime, timezone
 
 from app.db.models.enums import RequirementLevel
+from app.utils.fieldsets import Fields, build_public
 
 if TYPE_CHECKING:
-    from app.db.models import Event, Role, User, EventType, Team, ProficiencyLevel
+    from app.db.models import Event, Role, User, EventType, Team, ProficiencyLevel, Schedule
 
 class EventAssignmentBase(SQLModel):
     # is_applicable: bool - whether the role is applicable to the event
     is_applicable: bool = Field(default=True)
     # requirement_level: RequirementLevel - importance to fill the role for the event
     requirement_level: RequirementLevel = Field(default=RequirementLevel.required, sa_column=Column(SAEnum(RequirementLevel, name="requirement_level")))
-    assigned_user_id: UUID | None = Field(default=None, sa_column=Column(ForeignKey("users.id"), index=True, nullable=True))
+    assigned_user_id: UUID | None = Field(default=None, sa_column=Column(ForeignKey("users.id"), nullable=True))
     is_active: bool = Field(default=True)
 
 class EventAssignment(EventAssignmentBase, table=True):
     __tablename__ = "event_assignments"
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    event_id: UUID = Field(sa_column=Column(ForeignKey("events.id", ondelete="CASCADE"), index=True, nullable=False))
+    event_id: UUID = Field(sa_column=Column(Uuid, nullable=False))
+    # event_starts_at: copy of the event's starts_at, the partition key (filled on flush, kept in sync by the foreign key)
+    event_starts_at: datetime | None = Field(default=None, sa_column=Column(TIMESTAMP(timezone=True), nullable=False))
     role_id: UUID = Field(sa_column=Column(ForeignKey("roles.id"), index=True, nullable=False))
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
@@ -38,7 +41,38 @@ class EventAssignment(EventAssignmentBase, table=True):
     assigned_user: "User" = Relationship()
 
     __table_args__ = (
-        UniqueConstraint("event_id", "role_id", name="event_assignment_ukey"),
+        # Composite so it can reference the partitioned events table (whose key includes starts_at);
+        # ON UPDATE CASCADE moves the slots along when an event moves to another year
+        ForeignKeyConstraint(
+            ["event_id", "event_starts_at"], ["events.id", "events.starts_at"],
+            name="event_assignments_event_fkey", ondelete="CASCADE", onupdate="CASCADE",
+        ),
+        # Unique keys on a partitioned table must include the partition key (one starts_at per event)
+        UniqueConstraint("event_id", "role_id", "event_starts_at", name="event_assignment_ukey"),
+        # Slots of a set of events (grid, summaries), covering the slot-count aggregate
+        Index(
+            "ix_event_assignments_event_id_covering", "event_id",
+            postgresql_include=["role_id", "assigned_user_id", "requirement_level", "is_active", "is_applicable"],
+        ),
+        # A user's assignments (calendar feed and its version check)
+        Index(
+            "ix_event_assignments_assigned_user_id_event_id", "assigned_user_id", "event_id",
+            postgresql_include=["role_id", "id", "is_active", "is_applicable", "updated_at"],
+        ),
+        # Filled live slots per event, covering what workload analytics reads (index-only scans)
+        Index(
+            "ix_event_assignments_filled_event_id", "event_id",
+            postgresql_include=["assigned_user_id", "role_id", "requirement_level"],
+            postgresql_where=text("is_active AND is_applicable AND assigned_user_id IS NOT NULL"),
+        ),
+        # A user's filled live slots by time (candidate ranking: recent load and overlapping slots)
+        Index(
+            "ix_event_assignments_filled_assigned_user_id_event_starts_at", "assigned_user_id", "event_starts_at",
+            postgresql_include=["event_id", "requirement_level"],
+            postgresql_where=text("is_active AND is_applicable AND assigned_user_id IS NOT NULL"),
+        ),
+        # Same yearly partitions as events; primary key (id, event_starts_at) in the database
+        {"postgresql_partition_by": "RANGE (event_starts_at)"},
     )
 
 class EventAssignmentUpdate(SQLModel):
@@ -91,50 +125,70 @@ class EventAssignmentPublic(EventAssignmentBase):
     proficiency_level_is_assignable: bool | None
     proficiency_level_is_active: bool | None
     proficiency_level_code: str | None
+
+    # Fields read from each relationship path of the assignment, so sparse fieldsets skip the loads they don't need
+    RELATED_FIELDS: ClassVar[dict[str, frozenset[str]]] = {
+        "event": frozenset({"event_title", "event_starts_at", "event_ends_at", "event_notes", "event_is_active", "event_schedule_id", "event_team_id", "event_type_id"}),
+        "event.schedule": frozenset({"event_schedule_month", "event_schedule_year", "event_schedule_notes", "event_schedule_is_active"}),
+        "event.team": frozenset({"event_team_name", "event_team_code", "event_team_is_active"}),
+        "event.event_type": frozenset({"event_type_name", "event_type_code", "event_type_is_active"}),
+        "role": frozenset({"role_name", "role_description", "role_order", "role_code", "role_is_active"}),
+        "assigned_user": frozenset({"assigned_user_first_name", "assigned_user_last_name", "assigned_user_email", "assigned_user_phone", "assigned_user_is_active"}),
+        "assigned_user.user_roles.proficiency_level": frozenset({
+            "proficiency_level_id", "proficiency_level_name", "proficiency_level_rank", "proficiency_level_is_assignable", "proficiency_level_is_active", "proficiency_level_code",
+        }),
+    }
     
     @classmethod
     def from_objects(
         cls,
         event_assignment: "EventAssignment",
-        event: "Event",
-        role: "Role",
-        event_type: "EventType",
+        event: "Event | None",
+        role: "Role | None",
+        event_type: "EventType | None",
         team: "Team | None" = None,
         assigned_user: "User | None" = None,
         proficiency_level: "ProficiencyLevel | None" = None,
+        schedule: "Schedule | None" = None,
+        fields: Fields = None,
     ):
-        """Create an EventAssignmentPublic from the related objects."""
-        return cls(
+        """
+        Create an EventAssignmentPublic from the related objects.
+
+        With a sparse fieldset only the requested fields are set, and related objects it doesn't read
+        (see RELATED_FIELDS) may be passed as None.
+        """
+        return build_public(cls, dict(
             id=event_assignment.id,
-            event_id=event.id,
-            role_id=role.id,
+            event_id=event_assignment.event_id,
+            role_id=event_assignment.role_id,
             is_applicable=event_assignment.is_applicable,
             requirement_level=event_assignment.requirement_level,
             assigned_user_id=event_assignment.assigned_user_id,
             is_active=event_assignment.is_active,
-            event_title=event.title,
-            event_starts_at=event.starts_at,
-            event_ends_at=event.ends_at,
-            event_notes=event.notes,
-            event_is_active=event.is_active,
-            event_schedule_id=event.schedule_id,
-            event_schedule_month=event.schedule.month,
-            event_schedule_year=event.schedule.year,
-            event_schedule_notes=event.schedule.notes,
-            event_schedule_is_active=event.schedule.is_active,
-            event_team_id=getattr(team, "id", None),
+            event_title=getattr(event, "title", None),
+            event_starts_at=getattr(event, "starts_at", None),
+            event_ends_at=getattr(event, "ends_at", None),
+            event_notes=getattr(event, "notes", None),
+            event_is_active=getattr(event, "is_active", None),
+            event_schedule_id=getattr(event, "schedule_id", None),
+            event_schedule_month=getattr(schedule, "month", None),
+            event_schedule_year=getattr(schedule, "year", None),
+            event_schedule_notes=getattr(schedule, "notes", None),
+            event_schedule_is_active=getattr(schedule, "is_active", None),
+            event_team_id=getattr(event, "team_id", None),
             event_team_name=getattr(team, "name", None),
             event_team_code=getattr(team, "code", None),
             event_team_is_active=getattr(team, "is_active", None),
-            event_type_id=event_type.id,
-            event_type_name=event_type.name,
-            event_type_code=event_type.code,
-            event_type_is_active=event_type.is_active,
-            role_name=role.name,
-            role_description=role.description,
-            role_order=role.order,
-            role_code=role.code,
-            role_is_active=role.is_active,
+            event_type_id=getattr(event, "event_type_id", None),
+            event_type_name=getattr(event_type, "name", None),
+            event_type_code=getattr(event_type, "code", None),
+            event_type_is_active=getattr(event_type, "is_active", None),
+            role_name=getattr(role, "name", None),
+            role_description=getattr(role, "description", None),
+            role_order=getattr(role, "order", None),
+            role_code=getattr(role, "code", None),
+            role_is_active=getattr(role, "is_active", None),
             assigned_user_first_name=getattr(assigned_user, "first_name", None),
             assigned_user_last_name=getattr(assigned_user, "last_name", None),
             assigned_user_email=getattr(assigned_user, "email", None),
@@ -146,7 +200,7 @@ class EventAssignmentPublic(EventAssignmentBase):
             proficiency_level_is_assignable=getattr(proficiency_level, "is_assignable", None),
             proficiency_level_is_active=getattr(proficiency_level, "is_active", None),
             proficiency_level_code=getattr(proficiency_level, "code", None),
-        )
+        ), fields)
 
 class EventAssignmentEmbeddedPublic(EventAssignmentBase):
     id: UUID
@@ -157,25 +211,36 @@ class EventAssignmentEmbeddedPublic(EventAssignmentBase):
     role_code: str
     assigned_user_first_name: str | None
     assigned_user_last_name: str | None
+
+    RELATED_FIELDS: ClassVar[dict[str, frozenset[str]]] = {
+        "role": frozenset({"role_name", "role_order", "role_code"}),
+        "assigned_user": frozenset({"assigned_user_first_name", "assigned_user_last_name"}),
+    }
     
     @classmethod
     def from_objects(
         cls,
         event_assignment: "EventAssignment",
-        role: "Role",
+        role: "Role | None",
         assigned_user: "User | None" = None,
+        fields: Fields = None,
     ):
-        """Create an EventAssignmentEmbeddedPublic from the related objects."""
-        return cls(
+        """Create an EventAssignmentEmbeddedPublic from the related objects (only the requested fields with a sparse fieldset)."""
+        return build_public(cls, dict(
             id=event_assignment.id,
             is_applicable=event_assignment.is_applicable,
             requirement_level=event_assignment.requirement_level,
             assigned_user_id=event_assignment.assigned_user_id,
             is_active=event_assignment.is_active,
-            role_id=role.id,
-            role_name=role.name,
-            role_order=role.order,
-            role_code=role.code,
+            role_id=event_assignment.role_id,
+            role_name=getattr(role, "name", None),
+            role_order=getattr(role, "order", None),
+            role_code=getattr(role, "code", None),
             assigned_user_first_name=getattr(assigned_user, "first_name", None),
             assigned_user_last_name=getattr(assigned_user, "last_name", None),
-        )
\ No newline at end of file
+        ), fields)
+
+class EventAssignmentCompactPublic(EventAssignmentBase):
+    # Compact grid assignment: role and user names are in the grid's `included`
+    id: UUID
+    role_id: UUID
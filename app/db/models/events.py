@@ -1,15 +1,19 @@
 from uuid import UUID, uuid4
 from pydantic import ConfigDict
-from typing import TYPE_CHECKING
-from sqlmodel import SQLModel, Field, Relationship, Column, ForeignKey, CheckConstraint, TIMESTAMP
+from typing import TYPE_CHECKING, ClassVar
+from sqlalchemy import event, inspect
+from sqlmodel import SQLModel, Session, Field, Relationship, Column, ForeignKey, CheckConstraint, Index, TIMESTAMP, text, select
 from datetime import datetime, timezone
 
+from app.db.partitions import check_event_partitions, partition_year, schedule_partition_years
+from app.utils.fieldsets import Fields, build_public
+
 if TYPE_CHECKING:
-    from app.db.models import Schedule, EventType, Team, EventAssignment, EventAssignmentEmbeddedPublic, UserUnavailablePeriodEmbeddedPublic
+    from app.db.models import Schedule, EventType, Team, EventAssignment, EventAssignmentEmbeddedPublic, EventAssignmentCompactPublic, UserUnavailablePeriodEmbeddedPublic
 
 class EventBase(SQLModel):
     title: str | None = Field(default=None)
-    starts_at: datetime = Field(sa_column=Column(TIMESTAMP(timezone=True), index=True))
+    starts_at: datetime = Field(sa_column=Column(TIMESTAMP(timezone=True), index=True, nullable=False))
     ends_at: datetime = Field(sa_column=Column(TIMESTAMP(timezone=True)))
     team_id: UUID | None = Field(default=None, sa_column=Column(ForeignKey("teams.id"), nullable=True))
     event_type_id: UUID = Field(sa_column=Column(ForeignKey("event_types.id"), index=True, nullable=False))
@@ -20,7 +24,7 @@ class Event(EventBase, table=True):
     __tablename__ = "events"
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    schedule_id: UUID = Field(sa_column=Column(ForeignKey("schedules.id", ondelete="CASCADE"), index=True, nullable=False))
+    schedule_id: UUID = Field(sa_column=Column(ForeignKey("schedules.id", ondelete="CASCADE"), nullable=False))
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(TIMESTAMP(timezone=True))
@@ -38,6 +42,13 @@ class Event(EventBase, table=True):
 
     __table_args__ = (
         CheckConstraint("starts_at < ends_at", name="event_check_time_range"),
+        # A schedule's events in time order (grid, summaries, exports by schedule)
+        Index("ix_events_schedule_id_starts_at", "schedule_id", "starts_at"),
+        # Date-range scans over active events that only need the id (analytics joins)
+        Index("ix_events_active_starts_at", "starts_at", postgresql_include=["id"], postgresql_where=text("is_active")),
+        # Yearly range partitions (app.db.partitions). The table's primary key is (id, starts_at), as
+        # partitioned keys must include the partition column; the ORM keeps identifying events by id
+        {"postgresql_partition_by": "RANGE (starts_at)"},
     )
 
 class EventCreate(EventBase):
@@ -71,17 +82,25 @@ class EventPublic(EventBase):
     event_type_name: str
     event_type_code: str
     event_type_is_active: bool
+
+    # Fields read from each relationship of the event, so sparse fieldsets skip the loads they don't need
+    RELATED_FIELDS: ClassVar[dict[str, frozenset[str]]] = {
+        "schedule": frozenset({"schedule_month", "schedule_year", "schedule_notes", "schedule_is_active"}),
+        "team": frozenset({"team_name", "team_code", "team_is_active"}),
+        "event_type": frozenset({"event_type_name", "event_type_code", "event_type_is_active"}),
+    }
     
     @classmethod
     def from_objects(
         cls,
         event: "Event",
-        schedule: "Schedule",
-        event_type: "EventType",
+        schedule: "Schedule | None",
+        event_type: "EventType | None",
         team: "Team | None" = None,
+        fields: Fields = None,
     ):
-        """Create an EventPublic from the related objects."""
-        return cls(
+        """Create an EventPublic from the related objects (only the requested fields with a sparse fieldset)."""
+        return build_public(cls, dict(
             id=event.id,
             schedule_id=event.schedule_id,
             title=event.title,
@@ -91,17 +110,17 @@ class EventPublic(EventBase):
             event_type_id=event.event_type_id,
             notes=event.notes,
             is_active=event.is_active,
-            schedule_month=schedule.month,
-            schedule_year=schedule.year,
-            schedule_notes=schedule.notes,
-            schedule_is_active=schedule.is_active,
+            schedule_month=getattr(schedule, "month", None),
+            schedule_year=getattr(schedule, "year", None),
+            schedule_notes=getattr(schedule, "notes", None),
+            schedule_is_active=getattr(schedule, "is_active", None),
             team_name=getattr(team, "name", None),
             team_code=getattr(team, "code", None),
             team_is_active=getattr(team, "is_active", None),
-            event_type_name=event_type.name,
-            event_type_code=event_type.code,
-            event_type_is_active=event_type.is_active,
-        )
+            event_type_name=getattr(event_type, "name", None),
+            event_type_code=getattr(event_type, "code", None),
+            event_type_is_active=getattr(event_type, "is_active", None),
+        ), fields)
 
 class EventWithAssignmentsPublic(SQLModel):
     event: EventPublic
@@ -110,4 +129,47 @@ class EventWithAssignmentsPublic(SQLModel):
 class EventWithAssignmentsAndAvailabilityPublic(SQLModel):
     event: EventPublic
     event_assignments: list["EventAssignmentEmbeddedPublic"]
-    availability: list["UserUnavailablePeriodEmbeddedPublic"]
\ No newline at end of file
+    availability: list["UserUnavailablePeriodEmbeddedPublic"]
+
+class EventCompactPublic(EventBase):
+    # Compact grid event: team, event type, role and user names are in the grid's `included`
+    id: UUID
+    event_assignments: list["EventAssignmentCompactPublic"]
+    unavailable_user_ids: list[UUID]
+
+# =============================
+# PARTITION MAINTENANCE
+# =============================
+@event.listens_for(Session, "before_flush")
+def _prepare_event_partitions(session: Session, flush_context, instances) -> None:
+    """
+    events and event_assignments are partitioned by the year of the event start (see app.db.partitions):
+    check that new schedules and new or moved events have their year's partitions (created ahead of
+    time, never here: the DDL would lock both tables for the rest of the request), and give new slots
+    their event's starts_at (the event_assignments partition key) when only event_id was set.
+    """
+    from app.db.models.schedules import Schedule
+    from app.db.models.event_assignments import EventAssignment
+
+    events = [obj for obj in session.new if isinstance(obj, Event)]
+    events += [obj for obj in session.dirty if isinstance(obj, Event) and inspect(obj).attrs.starts_at.history.has_changes()]
+    years = {partition_year(obj.starts_at) for obj in events if obj.starts_at is not None}
+    for schedule in (obj for obj in session.new if isinstance(obj, Schedule)):
+        years |= schedule_partition_years(schedule.month, schedule.year)
+    if years:
+        check_event_partitions(session.connection(), years)
+
+    assignments = [obj for obj in session.new if isinstance(obj, EventAssignment) and obj.event_starts_at is None]
+    if not assignments:
+        return
+    starts_at_by_event_id = {obj.id: obj.starts_at for obj in events}
+    for assignment in assignments:
+        loaded_event = inspect(assignment).attrs.event.loaded_value
+        if isinstance(loaded_event, Event):
+            starts_at_by_event_id.setdefault(loaded_event.id, loaded_event.starts_at)
+    missing_event_ids = {assignment.event_id for assignment in assignments} - starts_at_by_event_id.keys()
+    if missing_event_ids:
+        with session.no_autoflush:
+            starts_at_by_event_id.update(session.exec(select(Event.id, Event.starts_at).where(Event.id.in_(missing_event_ids))).all())
+    for assignment in assignments:
+        assignment.event_starts_at = starts_at_by_event_id.get(assignment.event_id)
@@ -0,0 +1,43 @@
+from uuid import UUID, uuid4
+from typing import Any
+from sqlmodel import SQLModel, Field, Column, Index, JSON, Enum as SAEnum, TIMESTAMP
+from datetime import datetime, timezone
+
+from app.db.models.enums import JobKind, JobStatus
+
+class JobBase(SQLModel):
+    kind: JobKind = Field(sa_column=Column(SAEnum(JobKind, name="job_kind", values_callable=lambda kinds: [kind.value for kind in kinds]), nullable=False))
+    status: JobStatus = Field(default=JobStatus.queued, sa_column=Column(SAEnum(JobStatus, name="job_status"), nullable=False))
+    # progress_done / progress_total: units of work reported by the handler (total is None until known)
+    progress_done: int = Field(default=0)
+    progress_total: int | None = Field(default=None)
+    result: dict[str, Any] | None = Field(default=None, sa_column=Column(JSON, nullable=True))
+    error: str | None = Field(default=None)
+
+class Job(JobBase, table=True):
+    __tablename__ = "jobs"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    payload: dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    attempts: int = Field(default=0)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True))
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True), onupdate=lambda: datetime.now(timezone.utc))
+    )
+    started_at: datetime | None = Field(default=None, sa_column=Column(TIMESTAMP(timezone=True), nullable=True))
+    finished_at: datetime | None = Field(default=None, sa_column=Column(TIMESTAMP(timezone=True), nullable=True))
+
+    __table_args__ = (
+        # Workers claim the oldest queued job
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+    )
+
+class JobPublic(JobBase):
+    id: UUID
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
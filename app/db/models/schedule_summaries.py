@@ -0,0 +1,39 @@
+from uuid import UUID
+from typing import Any
+from sqlmodel import SQLModel, Field, Column, ForeignKey, JSON, TIMESTAMP
+from datetime import datetime, timezone
+
+class ScheduleSummaryBase(SQLModel):
+    events_count: int = Field(default=0)
+    # slots: active, applicable assignments on active events
+    slots_count: int = Field(default=0)
+    filled_slots_count: int = Field(default=0)
+    required_slots_count: int = Field(default=0)
+    required_filled_count: int = Field(default=0)
+    # role_coverage: [{"role_id", "slots", "filled"}] ordered by role order
+    role_coverage: list[dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    # user_assignment_counts: [{"user_id", "count"}] ordered by count, highest first
+    user_assignment_counts: list[dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    # version: incremented on every refresh, so clients (and caches) can tell summaries apart cheaply
+    version: int = Field(default=0)
+    refreshed_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True))
+    )
+
+class ScheduleSummary(ScheduleSummaryBase, table=True):
+    __tablename__ = "schedule_summaries"
+
+    schedule_id: UUID = Field(sa_column=Column(ForeignKey("schedules.id", ondelete="CASCADE"), primary_key=True))
+
+class ScheduleSummaryPublic(ScheduleSummaryBase):
+    schedule_id: UUID
+    required_empty_count: int
+
+    @classmethod
+    def from_objects(cls, schedule_summary: "ScheduleSummary"):
+        """Create a ScheduleSummaryPublic from the stored summary row."""
+        return cls(
+            **schedule_summary.model_dump(),
+            required_empty_count=schedule_summary.required_slots_count - schedule_summary.required_filled_count,
+        )
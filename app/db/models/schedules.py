@@ -5,7 +5,7 @@ from sqlmodel import SQLModel, Field, Relationship, CheckConstraint, Column, TIM
 from datetime import datetime, timezone
 
 if TYPE_CHECKING:
-    from app.db.models import Event, EventWithAssignmentsAndAvailabilityPublic
+    from app.db.models import Event, EventWithAssignmentsAndAvailabilityPublic, EventCompactPublic
 
 class ScheduleBase(SQLModel):
     is_active: bool = Field(default=True)
@@ -55,4 +55,37 @@ class ScheduleGridPublic(SQLModel):
         return cls(
             schedule=schedule,
             events=events
-        )
\ No newline at end of file
+        )
+class GridRolePublic(SQLModel):
+    name: str
+    order: int
+    code: str
+
+class GridUserPublic(SQLModel):
+    first_name: str
+    last_name: str
+
+class GridTeamPublic(SQLModel):
+    name: str
+    code: str
+    is_active: bool
+
+class GridEventTypePublic(SQLModel):
+    name: str
+    code: str
+    is_active: bool
+
+class ScheduleGridIncludedPublic(SQLModel):
+    roles: dict[UUID, GridRolePublic]
+    users: dict[UUID, GridUserPublic]
+    teams: dict[UUID, GridTeamPublic]
+    event_types: dict[UUID, GridEventTypePublic]
+
+class ScheduleGridCompactPublic(SQLModel):
+    """
+    The schedule grid with each related row once: events and assignments reference roles, users,
+    teams and event types by id, and `included` holds them keyed by id.
+    """
+    schedule: Schedule
+    events: list["EventCompactPublic"]
+    included: ScheduleGridIncludedPublic
@@ -1,7 +1,7 @@
 from uuid import UUID, uuid4
 from typing import TYPE_CHECKING
 from pydantic import ConfigDict
-from sqlmodel import SQLModel, Field, Relationship, Column, ForeignKey, UniqueConstraint, TIMESTAMP
+from sqlmodel import SQLModel, Field, Relationship, Column, ForeignKey, UniqueConstraint, Index, TIMESTAMP
 from datetime import datetime, timezone
 
 if TYPE_CHECKING:
@@ -14,7 +14,7 @@ class TeamUser(TeamUserBase, table=True):
     __tablename__ = "team_users"
     
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    team_id: UUID = Field(sa_column=Column(ForeignKey("teams.id", ondelete="CASCADE"), index=True, nullable=False))
+    team_id: UUID = Field(sa_column=Column(ForeignKey("teams.id", ondelete="CASCADE"), nullable=False))
     user_id: UUID = Field(sa_column=Column(ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False))
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
@@ -31,6 +31,8 @@ class TeamUser(TeamUserBase, table=True):
 
     __table_args__ = (
         UniqueConstraint("team_id", "user_id", name="team_user_ukey"),
+        # A team's active members (team filters), answered from the index alone
+        Index("ix_team_users_team_id_is_active", "team_id", "is_active", postgresql_include=["user_id"]),
     )
 
 class TeamUserCreate(TeamUserBase):
@@ -1,9 +1,11 @@
 from uuid import UUID, uuid4
 from pydantic import ConfigDict
-from typing import TYPE_CHECKING
-from sqlmodel import SQLModel, Field, Relationship, Column, ForeignKey, UniqueConstraint, TIMESTAMP
+from typing import TYPE_CHECKING, ClassVar
+from sqlmodel import SQLModel, Field, Relationship, Column, ForeignKey, UniqueConstraint, Index, TIMESTAMP
 from datetime import datetime, timezone
 
+from app.utils.fieldsets import Fields, build_public
+
 if TYPE_CHECKING:
     from app.db.models import User, Role, ProficiencyLevel
 
@@ -15,7 +17,7 @@ class UserRole(UserRoleBase, table=True):
     
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: UUID = Field(sa_column=Column(ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False))
-    role_id: UUID = Field(sa_column=Column(ForeignKey("roles.id", ondelete="CASCADE"), index=True, nullable=False))
+    role_id: UUID = Field(sa_column=Column(ForeignKey("roles.id", ondelete="CASCADE"), nullable=False))
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(TIMESTAMP(timezone=True))
@@ -32,6 +34,8 @@ class UserRole(UserRoleBase, table=True):
 
     __table_args__ = (
         UniqueConstraint("user_id", "role_id", name="user_role_ukey"),
+        # A role's holders with their proficiency level (replaces the plain role_id index; candidate ranking reads it index-only)
+        Index("ix_user_roles_role_id_covering", "role_id", postgresql_include=["user_id", "proficiency_level_id"]),
     )
 
 class UserRoleUpdate(SQLModel):
@@ -60,34 +64,42 @@ class UserRolePublic(UserRoleBase):
     proficiency_level_is_assignable: bool
     proficiency_level_is_active: bool
     proficiency_level_code: str
+
+    # Fields read from each relationship of the user role, so sparse fieldsets skip the loads they don't need
+    RELATED_FIELDS: ClassVar[dict[str, frozenset[str]]] = {
+        "user": frozenset({"user_first_name", "user_last_name", "user_email", "user_phone", "user_is_active"}),
+        "role": frozenset({"role_name", "role_description", "role_order", "role_is_active", "role_code"}),
+        "proficiency_level": frozenset({"proficiency_level_name", "proficiency_level_rank", "proficiency_level_is_assignable", "proficiency_level_is_active", "proficiency_level_code"}),
+    }
     
     @classmethod
     def from_objects(
         cls,
         user_role: "UserRole",
-        user: "User",
-        role: "Role",
-        proficiency_level: "ProficiencyLevel",
+        user: "User | None",
+        role: "Role | None",
+        proficiency_level: "ProficiencyLevel | None",
+        fields: Fields = None,
     ):
-        """Create a UserRolePublic from the related objects."""
-        return cls(
+        """Create a UserRolePublic from the related objects (only the requested fields with a sparse fieldset)."""
+        return build_public(cls, dict(
             id=user_role.id,
             user_id=user_role.user_id,
             role_id=user_role.role_id,
             proficiency_level_id=user_role.proficiency_level_id,
-            user_first_name=user.first_name,
-            user_last_name=user.last_name,
-            user_email=user.email,
-            user_phone=user.phone,
-            user_is_active=user.is_active,
-            role_name=role.name,
-            role_description=role.description,
-            role_order=role.order,
-            role_is_active=role.is_active,
-            role_code=role.code,
-            proficiency_level_name=proficiency_level.name,
-            proficiency_level_rank=proficiency_level.rank,
-            proficiency_level_is_assignable=proficiency_level.is_assignable,
-            proficiency_level_is_active=proficiency_level.is_active,
-            proficiency_level_code=proficiency_level.code,
-        )
\ No newline at end of file
+            user_first_name=getattr(user, "first_name", None),
+            user_last_name=getattr(user, "last_name", None),
+            user_email=getattr(user, "email", None),
+            user_phone=getattr(user, "phone", None),
+            user_is_active=getattr(user, "is_active", None),
+            role_name=getattr(role, "name", None),
+            role_description=getattr(role, "description", None),
+            role_order=getattr(role, "order", None),
+            role_is_active=getattr(role, "is_active", None),
+            role_code=getattr(role, "code", None),
+            proficiency_level_name=getattr(proficiency_level, "name", None),
+            proficiency_level_rank=getattr(proficiency_level, "rank", None),
+            proficiency_level_is_assignable=getattr(proficiency_level, "is_assignable", None),
+            proficiency_level_is_active=getattr(proficiency_level, "is_active", None),
+            proficiency_level_code=getattr(proficiency_level, "code", None),
+        ), fields)
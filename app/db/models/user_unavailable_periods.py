@@ -1,7 +1,7 @@
 from uuid import UUID, uuid4
 from pydantic import ConfigDict
 from typing import TYPE_CHECKING
-from sqlmodel import SQLModel, Field, Relationship, Column, ForeignKey, CheckConstraint, TIMESTAMP
+from sqlmodel import SQLModel, Field, Relationship, Column, ForeignKey, CheckConstraint, Index, TIMESTAMP
 from datetime import datetime, timezone
 
 if TYPE_CHECKING:
@@ -15,7 +15,7 @@ class UserUnavailablePeriod(UserUnavailablePeriodBase, table=True):
     __tablename__ = "user_unavailable_periods"
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    user_id: UUID = Field(sa_column=Column(ForeignKey("users.id"), index=True, nullable=False))
+    user_id: UUID = Field(sa_column=Column(ForeignKey("users.id"), nullable=False))
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(TIMESTAMP(timezone=True))
@@ -30,6 +30,10 @@ class UserUnavailablePeriod(UserUnavailablePeriodBase, table=True):
 
     __table_args__ = (
         CheckConstraint("starts_at < ends_at", name="user_unavailable_period_check_time_range"),
+        # A user's periods in time order (overlap checks per user)
+        Index("ix_user_unavailable_periods_user_id_starts_at_ends_at", "user_id", "starts_at", "ends_at"),
+        # Periods overlapping a window: `ends_at > window start` is the selective bound, since most periods are in the past
+        Index("ix_user_unavailable_periods_ends_at_starts_at", "ends_at", "starts_at"),
     )
 
 class UserUnavailablePeriodCreate(UserUnavailablePeriodBase):
@@ -68,6 +72,15 @@ class UserUnavailablePeriodPublic(UserUnavailablePeriodBase):
             user_is_active=user.is_active,
         )
 
+class UserUnavailablePeriodImportPublic(SQLModel):
+    rows_count: int
+    # Periods stored after merging overlapping or touching rows and stored periods
+    created_count: int
+    # Stored periods merged into a created one (deleted)
+    replaced_count: int
+    # Stored periods that already covered some rows (unchanged)
+    covered_count: int
+
 class UserUnavailablePeriodEmbeddedPublic(SQLModel):
     user_id: UUID
     user_first_name: str
@@ -0,0 +1,107 @@
+from uuid import UUID, uuid4
+from pydantic import ConfigDict, field_validator
+from pydantic_core import PydanticCustomError
+from typing import TYPE_CHECKING
+from sqlmodel import SQLModel, Field, Relationship, Column, ForeignKey, CheckConstraint, Index, TIMESTAMP, String
+from datetime import datetime, timezone
+
+from app.services.recurrence import parse_rrule, get_zone
+
+if TYPE_CHECKING:
+    from app.db.models import User
+
+def _validate_rrule(value: str | None) -> str:
+    # A custom error type (not a ValueError) so the 422 response carries only the message
+    if value is None:
+        raise PydanticCustomError("rrule", "rrule cannot be null")
+    try:
+        parse_rrule(value)
+    except ValueError as e:
+        raise PydanticCustomError("rrule", str(e)) from None
+    return value
+
+def _validate_tzid(value: str | None) -> str | None:
+    if value is None:
+        return value
+    try:
+        get_zone(value)
+    except ValueError as e:
+        raise PydanticCustomError("tzid", str(e)) from None
+    return value
+
+class UserUnavailableRuleBase(SQLModel):
+    # rrule: recurrence rule (RRULE subset, see app.services.recurrence), e.g. "FREQ=MONTHLY;BYDAY=2SU"
+    rrule: str
+    # starts_at/ends_at: the first occurrence; every occurrence has its time of day and length in tzid
+    starts_at: datetime = Field(sa_column=Column(TIMESTAMP(timezone=True), nullable=False))
+    ends_at: datetime = Field(sa_column=Column(TIMESTAMP(timezone=True), nullable=False))
+
+class UserUnavailableRule(UserUnavailableRuleBase, table=True):
+    __tablename__ = "user_unavailable_rules"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    user_id: UUID = Field(sa_column=Column(ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False))
+    # tzid: IANA time zone the rule repeats in (e.g. "Europe/Berlin"), so occurrences keep their local time across DST
+    tzid: str = Field(default="UTC", sa_column=Column(String, nullable=False, server_default="UTC"))
+    # until: start of the last possible occurrence (the rule's UNTIL), so month lookups skip ended rules
+    until: datetime | None = Field(default=None, sa_column=Column(TIMESTAMP(timezone=True), nullable=True))
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True))
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True), onupdate=lambda: datetime.now(timezone.utc))
+    )
+
+    # Relationships
+    user: "User" = Relationship()
+
+    __table_args__ = (
+        CheckConstraint("starts_at < ends_at", name="user_unavailable_rule_check_time_range"),
+        # Rules live in a month: started before its end and not ended before its start
+        Index("ix_user_unavailable_rules_starts_at_until", "starts_at", "until"),
+    )
+
+class UserUnavailableRuleCreate(UserUnavailableRuleBase):
+    model_config = ConfigDict(extra="forbid")
+    # user_unavailable_rule.id is auto-generated by the DB
+    # user_id is provided in the URL path
+    # tzid defaults to DEFAULT_TIMEZONE
+    tzid: str | None = None
+
+    @field_validator("rrule")
+    @classmethod
+    def validate_rrule(cls, value: str) -> str:
+        return _validate_rrule(value)
+
+    @field_validator("tzid")
+    @classmethod
+    def validate_tzid(cls, value: str | None) -> str | None:
+        return _validate_tzid(value)
+
+class UserUnavailableRuleUpdate(SQLModel):
+    model_config = ConfigDict(extra="forbid")
+    # user_id is not updatable, delete and recreate if needed
+    rrule: str | None = None
+    starts_at: datetime | None = None
+    ends_at: datetime | None = None
+    tzid: str | None = None
+
+    @field_validator("rrule")
+    @classmethod
+    def validate_rrule(cls, value: str | None) -> str:
+        return _validate_rrule(value)
+
+    @field_validator("tzid")
+    @classmethod
+    def validate_tzid(cls, value: str | None) -> str:
+        if value is None:
+            raise PydanticCustomError("tzid", "tzid cannot be null")
+        return _validate_tzid(value)
+
+class UserUnavailableRulePublic(UserUnavailableRuleBase):
+    id: UUID
+    user_id: UUID
+    tzid: str
+    until: datetime | None
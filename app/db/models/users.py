@@ -1,28 +1,107 @@
-import phonenumbers
+import re
+import threading
 from uuid import UUID, uuid4
+from collections import OrderedDict
 from typing import TYPE_CHECKING
 from pydantic import ConfigDict, EmailStr, field_validator
 from pydantic_core import PydanticCustomError
+from sqlalchemy import event
 from sqlmodel import SQLModel, Field, Relationship, Column, TIMESTAMP
 from datetime import datetime, timezone
 
 if TYPE_CHECKING:
     from app.db.models import UserRole, UserUnavailablePeriod
 
+PHONE_NUMBER_CACHE_SIZE = 4096
+E164_PATTERN = re.compile(r"^\+[1-9]\d{1,14}$")
+
+class PhoneNumberCache:
+    """
+    Bounded LRU of phone normalization results keyed by the raw input.
+
+    Invalid inputs are cached too (as None), so repeated bad values are rejected without parsing.
+    E.164 values loaded from the database were normalized on write and are primed as known-good, so
+    validating rows for responses never reaches phonenumbers.
+    """
+    def __init__(self, max_size: int = PHONE_NUMBER_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[str, str | None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, value: str) -> tuple[bool, str | None]:
+        with self._lock:
+            if value in self._results:
+                self._results.move_to_end(value)
+                self.hits += 1
+                return True, self._results[value]
+            self.misses += 1
+            return False, None
+
+    def put(self, value: str, result: str | None) -> None:
+        with self._lock:
+            self._store(value, result)
+
+    def prime(self, value: str) -> None:
+        """
+        Record a stored E.164 value as its own normalization without counting a lookup. Anything else
+        (rows written before normalization, seeds, raw SQL) is left to be parsed and validated.
+        """
+        if not E164_PATTERN.match(value):
+            return
+        with self._lock:
+            if value not in self._results:
+                self._store(value, value)
+
+    def _store(self, value: str, result: str | None) -> None:
+        self._results[value] = result
+        self._results.move_to_end(value)
+        while len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._results),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = 0
+
+phone_number_cache = PhoneNumberCache()
+
 def normalize_phone_number(value) -> str:
     """Normalize phone number to E164 format."""
     if not isinstance(value, str):
         raise PydanticCustomError("invalid_phone_number", f"Invalid phone number: {value}")
 
-    try:
-        parsed = phonenumbers.parse(value, None) if value.startswith("+") else phonenumbers.parse(value, "US")
+    found, normalized = phone_number_cache.get(value)
+    if not found:
+        normalized = _parse_phone_number(value)
+        phone_number_cache.put(value, normalized)
+    if normalized is None:
+        raise PydanticCustomError("invalid_phone_number", f"Invalid phone number: {value}")
+    return normalized
 
-        if not phonenumbers.is_valid_number(parsed):
-            raise PydanticCustomError("invalid_phone_number", f"Invalid phone number: {value}")
+def _parse_phone_number(value: str) -> str | None:
+    # Imported on first use: phonenumbers loads large metadata tables that would otherwise add to cold start
+    import phonenumbers
 
-        return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+    try:
+        parsed = phonenumbers.parse(value, None) if value.startswith("+") else phonenumbers.parse(value, "US")
     except phonenumbers.NumberParseException:
-        raise PydanticCustomError("invalid_phone_number", f"Invalid phone number: {value}")
+        return None
+    if not phonenumbers.is_valid_number(parsed):
+        return None
+    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
 
 class UserBase(SQLModel):
     first_name: str
@@ -53,6 +132,13 @@ class User(UserBase, table=True):
     user_roles: list["UserRole"] = Relationship(back_populates="user", sa_relationship_kwargs={"cascade": "all, delete-orphan"})
     user_unavailable_periods: list["UserUnavailablePeriod"] = Relationship(back_populates="user")
 
+@event.listens_for(User, "load")
+@event.listens_for(User, "refresh")
+def _prime_stored_phone_number(user: User, *_) -> None:
+    # Stored phones were normalized on write; re-validating loaded rows (e.g. for responses) is a cache hit
+    if user.__dict__.get("phone"):
+        phone_number_cache.prime(user.__dict__["phone"])
+
 class UserCreate(UserBase):
     model_config = ConfigDict(extra="forbid")
     # user.id is auto-generated by the DB
@@ -0,0 +1,127 @@
+import logging
+from typing import Iterable
+from datetime import datetime, timezone
+from sqlalchemy import Connection, Engine, text
+
+from app.utils.exceptions import CheckConstraintError
+
+logger = logging.getLogger(__name__)
+
+# Tables range-partitioned by the year (UTC) of the event start, and their partition key column.
+# event_assignments carries a copy of its event's starts_at (kept in sync by the composite foreign
+# key's ON UPDATE CASCADE) so an event and its slots always live in the same year.
+PARTITIONED_TABLES = {
+    "events": "starts_at",
+    "event_assignments": "event_starts_at",
+}
+
+# Creating partitions locks the parent tables; a creator waits at most this long for the lock
+PARTITION_LOCK_TIMEOUT_SECONDS = 5
+
+# Years whose partitions are known to exist (per process); only filled after the creating
+# transaction commits, so a rollback never leaves a year marked as present
+_known_partition_years: set[int] = set()
+_partitioning_enabled: bool | None = None
+
+def partition_name(table: str, year: int) -> str:
+    return f"{table}_y{year}"
+
+def get_year_bounds(year: int) -> tuple[datetime, datetime]:
+    return datetime(year, 1, 1, tzinfo=timezone.utc), datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+
+def partition_year(value: datetime) -> int:
+    value = value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    return value.year
+
+def schedule_partition_years(month: int, year: int) -> set[int]:
+    # A December schedule's late evening events fall in January (UTC) of the next year
+    return {year, year + 1} if month == 12 else {year}
+
+def create_year_partitions_sql(year: int) -> list[str]:
+    """CREATE TABLE statements for one year's partitions of every partitioned table."""
+    starts_at, ends_at = get_year_bounds(int(year))
+    return [
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, year)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{starts_at.isoformat()}') TO ('{ends_at.isoformat()}')"
+        for table in PARTITIONED_TABLES
+    ]
+
+def ensure_event_partitions(connection: Connection, years: Iterable[int]) -> set[int]:
+    """
+    Create any missing yearly partitions in the connection's current transaction and return the years created.
+
+    CREATE TABLE ... PARTITION OF takes an ACCESS EXCLUSIVE lock on both parent tables until the
+    transaction ends, so this belongs in a short transaction of its own (create_event_partitions),
+    never in a request's. A no-op when the tables are not partitioned (other databases, or before the
+    migration). An advisory lock serializes creators, so concurrent processes cannot race.
+    """
+    if not _is_partitioned(connection):
+        return set()
+    if not set(years) - _read_partition_years(connection):
+        return set()
+    connection.execute(text("SELECT pg_advisory_xact_lock(hashtext('event_partitions'))"))
+    missing = sorted(set(years) - _read_partition_years(connection))
+    for year in missing:
+        for statement in create_year_partitions_sql(year):
+            connection.execute(text(statement))
+    if missing:
+        logger.info("Created event partitions for %s", ", ".join(map(str, missing)))
+    return set(missing)
+
+def create_event_partitions(engine: Engine, years: Iterable[int], lock_timeout_seconds: float = PARTITION_LOCK_TIMEOUT_SECONDS) -> set[int]:
+    """Create any missing yearly partitions in a short transaction of their own; returns the years created."""
+    years = set(years)
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            # Give up rather than queue every events query behind a long-running transaction
+            connection.execute(text(f"SET LOCAL lock_timeout = '{int(lock_timeout_seconds * 1000)}ms'"))
+        created = ensure_event_partitions(connection, years)
+    mark_partitions_created(years)
+    return created
+
+def create_upcoming_event_partitions(engine: Engine, years_ahead: int) -> set[int]:
+    """Partitions for the current year (UTC) through years_ahead years later. Called at startup."""
+    year = datetime.now(timezone.utc).year
+    return create_event_partitions(engine, range(year, year + years_ahead + 1))
+
+def check_event_partitions(connection: Connection, years: Iterable[int]) -> None:
+    """
+    Raise CheckConstraintError when a year has no partitions yet.
+
+    Runs on every flush that writes events, so it never creates them (see ensure_event_partitions);
+    years not known to this process are looked up in the catalog, which takes no table locks.
+    """
+    missing = set(years) - _known_partition_years
+    if not missing or not _is_partitioned(connection):
+        return
+    _known_partition_years.update(_read_partition_years(connection))
+    missing -= _known_partition_years
+    if missing:
+        raise CheckConstraintError(
+            f"Events can't be stored for {', '.join(map(str, sorted(missing)))} yet: partitions are created ahead of time "
+            f"(at startup, EVENT_PARTITION_YEARS_AHEAD years ahead, or with app/db/scripts/partitions.py)"
+        )
+
+def mark_partitions_created(years: Iterable[int]) -> None:
+    _known_partition_years.update(years)
+
+def forget_partitions() -> None:
+    """Drop the per-process cache, e.g. after rolling back a transaction that created partitions."""
+    _known_partition_years.clear()
+
+def _is_partitioned(connection: Connection) -> bool:
+    global _partitioning_enabled
+    if connection.dialect.name != "postgresql":
+        return False
+    if _partitioning_enabled is None:
+        _partitioning_enabled = bool(connection.execute(text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('events')")).scalar())
+    return _partitioning_enabled
+
+def _read_partition_years(connection: Connection) -> set[int]:
+    # Years that have an events partition (event_assignments partitions are created alongside)
+    names = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = to_regclass('events')"
+    )).scalars()
+    prefix = partition_name("events", 0).removesuffix("0")
+    return {int(name.removeprefix(prefix)) for name in names if name.startswith(prefix) and name.removeprefix(prefix).isdigit()}
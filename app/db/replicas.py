@@ -0,0 +1,102 @@
+import math
+import time
+import asyncio
+import logging
+import itertools
+from fastapi import Request, Response
+from sqlalchemy import Engine, text
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Set after a successful write; while it is in the future the client's reads go to the primary.
+# Returned as a header for clients to echo on their next requests, and as a cookie for browsers.
+READ_PRIMARY_HEADER = "x-read-primary-until"
+READ_PRIMARY_COOKIE = "stewardhq_read_primary_until"
+REPLICA_HEALTH_CHECK_SECONDS = 10
+
+class ReplicaRouter:
+    """
+    Chooses the engine for a request: safe methods go round-robin to healthy replicas, everything
+    else to the primary.
+
+    Read-your-writes: after a client writes, its reads are pinned to the primary for a few seconds so
+    it never reads a replica that has not replayed its write yet. The pin is per client (never per
+    API key, which many clients can share): an X-Read-Primary-Until header to echo, which works
+    whichever worker process the next request lands on, and a SameSite=Lax cookie as a fallback for
+    browsers. Both are client-controlled, so a pin never counts for more than sticky_seconds.
+    """
+    def __init__(self, primary: Engine, replicas: list[Engine], sticky_seconds: float = 5.0):
+        self.primary = primary
+        self.replicas = replicas
+        self.sticky_seconds = sticky_seconds
+        self._healthy = list(replicas)
+        self._counter = itertools.count()
+        self._health_task: asyncio.Task | None = None
+
+    def engine_for(self, request: Request) -> Engine:
+        if request.method not in SAFE_METHODS or self.reads_from_primary(request):
+            return self.primary
+        healthy = self._healthy
+        if not healthy:
+            return self.primary
+        return healthy[next(self._counter) % len(healthy)]
+
+    def reads_from_primary(self, request: Request) -> bool:
+        now = time.time()
+        for value in (request.headers.get(READ_PRIMARY_HEADER), request.cookies.get(READ_PRIMARY_COOKIE)):
+            try:
+                # Clamped, so a far-future value can't keep a client on the primary for good
+                if value is not None and min(float(value), now + self.sticky_seconds) > now:
+                    return True
+            except ValueError:
+                pass
+        return False
+
+    def after_response(self, request: Request, response: Response) -> None:
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return
+        until = time.time() + self.sticky_seconds
+        response.headers[READ_PRIMARY_HEADER] = f"{until:.3f}"
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            f"{until:.3f}",
+            max_age=math.ceil(self.sticky_seconds),
+            httponly=True,
+            samesite="lax",
+        )
+
+    def check_health(self) -> None:
+        healthy = []
+        for replica in self.replicas:
+            try:
+                with replica.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                healthy.append(replica)
+            except Exception as e:
+                if replica in self._healthy:
+                    logger.warning("Replica %s is unhealthy, routing its reads elsewhere: %s", replica.url.render_as_string(hide_password=True), e)
+        for replica in healthy:
+            if replica not in self._healthy:
+                logger.info("Replica %s is healthy again", replica.url.render_as_string(hide_password=True))
+        # Swap the whole list so engine_for never sees a half-updated one
+        self._healthy = healthy
+
+    async def start(self, interval: float = REPLICA_HEALTH_CHECK_SECONDS) -> None:
+        if self.replicas:
+            self._health_task = asyncio.create_task(self._run_health_checks(interval))
+
+    async def stop(self) -> None:
+        if self._health_task:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+        for replica in self.replicas:
+            replica.dispose()
+
+    async def _run_health_checks(self, interval: float) -> None:
+        while True:
+            await asyncio.to_thread(self.check_health)
+            await asyncio.sleep(interval)
@@ -0,0 +1,28 @@
+"""
+This script creates the events / event_assignments partitions for a range of years.
+
+The API creates them at startup for the current year through EVENT_PARTITION_YEARS_AHEAD years
+later; use this for years outside that window (e.g. importing past schedules).
+
+Usage: python app/db/scripts/partitions.py FIRST_YEAR [LAST_YEAR]
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlmodel import create_engine
+
+from app.db.partitions import create_event_partitions
+
+engine = create_engine(os.getenv("DATABASE_URL"))
+
+if __name__ == "__main__":
+    first_year = int(sys.argv[1])
+    last_year = int(sys.argv[2]) if len(sys.argv) > 2 else first_year
+    created = create_event_partitions(engine, range(first_year, last_year + 1))
+    print(f"Created partitions for {', '.join(map(str, sorted(created)))}" if created else "All partitions already exist")
@@ -1,20 +1,27 @@
 import logging
 from fastapi import FastAPI, Request, status, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlmodel import text
 from contextlib import asynccontextmanager
 
 from app.settings import settings
 from app.utils.helpers import TAGS_METADATA
-from app.utils.dependencies import verify_api_key, get_db_session, SessionDep
-from app.utils.logging_config import setup_logging
+from app.utils.dependencies import verify_api_key, enforce_rate_limit, SessionDep
+from app.utils.metrics import render_metrics, start_metrics_flush, stop_metrics_flush
+from app.utils.logging_config import setup_logging, RequestLoggingMiddleware
 from app.utils.exception_handlers import register_exception_handlers
 from app.db.database import connect_db, close_db
+from app.utils.warmup import warm_up
+from app.services.broker import start_broker, stop_broker
+from app.services.jobs import start_job_runner, stop_job_runner
+from app.services.rate_limits import start_rate_limiter, stop_rate_limiter
+from app.services.api_keys import start_api_key_index, stop_api_key_index
 from app.api import (
     roles_router, proficiency_levels_router, event_types_router,
     users_router, teams_router, team_users_router, user_roles_router,
-    schedules_router, events_router, event_assignments_router, user_unavailable_periods_router,
+    schedules_router, events_router, event_assignments_router, user_unavailable_periods_router, user_unavailable_rules_router,
+    exports_router, jobs_router, analytics_router, api_keys_router,
 )
 
 # Set up logging configuration
@@ -27,24 +34,37 @@ def log_settings():
     else:
         logger.info("Running in PRODUCTION mode")
 
-    logger.info(f"Settings: {settings.model_dump_json(indent=4)}")
+    logger.info("Settings: %s", settings.model_dump_json(indent=4))
 
 # Define the lifespan event to manage startup and shutdown tasks, such as database connections
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await start_metrics_flush(settings.metrics_dir, settings.metrics_flush_seconds)
     await connect_db(app)
+    await start_api_key_index(app.state.db_engine, settings.api_key_refresh_seconds)
+    await start_broker(settings.redis_url)
+    await start_rate_limiter(settings.redis_url)
+    await start_job_runner(app.state.db_engine, settings.job_workers)
     log_settings()
+    if settings.startup_warmup:
+        await warm_up(app)
     yield
+    await stop_job_runner()
+    await stop_rate_limiter()
+    await stop_broker()
+    await stop_api_key_index()
     await close_db(app)
+    await stop_metrics_flush()
 
-# Create the FastAPI application with the defined lifespan, global dependencies, and metadata
+# Create the FastAPI application with the defined lifespan, global dependencies, and metadata.
+# Routes that touch the database take SessionDep themselves, so /metrics never opens a session.
 app = FastAPI(
     title="StewardHQ API",
     description="API powering StewardHQ's scheduling, availability, and team management platform",
     version="1.0.0",
     openapi_tags=TAGS_METADATA,
     lifespan=lifespan, 
-    dependencies=[Depends(verify_api_key), Depends(get_db_session)],
+    dependencies=[Depends(verify_api_key), Depends(enforce_rate_limit)],
     swagger_ui_parameters={"persistAuthorization": True}
 )
 
@@ -59,8 +79,23 @@ if settings.cors_allowed_origins_list:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Echoed back by clients to keep read-your-writes across worker processes
+        expose_headers=["X-Read-Primary-Until"],
     )
 
+# Request id, access log (route, status, latency, query count) and request fields on every log record
+app.add_middleware(RequestLoggingMiddleware)
+
+# Pin a client's reads to the primary for a short window after it writes (only with read replicas)
+if settings.database_replica_urls_list:
+    @app.middleware("http")
+    async def read_your_writes(request: Request, call_next):
+        response = await call_next(request)
+        router = getattr(request.app.state, "db_router", None)
+        if router:
+            router.after_response(request, response)
+        return response
+
 # Health check endpoint
 @app.get("/health", tags=["health"])
 def health(_: Request, session: SessionDep):
@@ -80,11 +115,17 @@ def health(_: Request, session: SessionDep):
         if result.first() is None:
             return DB_UNAVAILABLE_RESPONSE
     except Exception as e:
-        logger.error(f"Database health check failed: {str(e)}")
+        logger.error("Database health check failed: %s", e)
         return DB_UNAVAILABLE_RESPONSE
     
     return DB_OK_RESPONSE
 
+# Metrics endpoint (Prometheus text format): all workers' counters with METRICS_DIR, else this process's
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+def metrics():
+    """Counters (e.g. rate limiter decisions), summed over the worker processes sharing METRICS_DIR"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # Include routers for different resources
 app.include_router(roles_router)
 app.include_router(proficiency_levels_router)
@@ -96,4 +137,9 @@ app.include_router(user_roles_router)
 app.include_router(schedules_router)
 app.include_router(events_router)
 app.include_router(event_assignments_router)
-app.include_router(user_unavailable_periods_router)
\ No newline at end of file
+app.include_router(user_unavailable_periods_router)
+app.include_router(user_unavailable_rules_router)
+app.include_router(exports_router)
+app.include_router(jobs_router)
+app.include_router(analytics_router)
+app.include_router(api_keys_router)
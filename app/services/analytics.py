@@ -0,0 +1,192 @@
+from uuid import UUID
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import CTE, Integer, Row, and_, case, cast, func, literal
+from sqlmodel import Session, select
+
+from app.db.models import User, Role, UserRole, ProficiencyLevel, TeamUser, Event, EventAssignment, LoadAnalyticsPublic, UserLoadPublic, RoleLoadPublic
+from app.db.models.enums import RequirementLevel
+from app.utils.exceptions import CheckConstraintError
+
+# A required slot counts fully; optional help is real work but weighs less when judging fairness
+REQUIREMENT_LEVEL_WEIGHTS = {
+    RequirementLevel.required: 1.0,
+    RequirementLevel.preferred: 0.5,
+    RequirementLevel.optional: 0.25,
+}
+ROLLING_WINDOW_WEEKS = 4
+DEFAULT_ANALYTICS_WEEKS = 12
+SECONDS_PER_WEEK = 7 * 24 * 60 * 60
+
+def get_load_analytics(
+    session: Session,
+    starts_at: datetime | None = None,
+    ends_at: datetime | None = None,
+    team_id: UUID | None = None,
+) -> LoadAnalyticsPublic:
+    """
+    Workload per user and role over [starts_at, ends_at) (default: the last 12 weeks), weighted by
+    requirement level, with each user's share of the team average and peak rolling 4-week load.
+
+    Counts, averages, percentiles and rolling sums are computed by two aggregate queries with window
+    functions, so the cost follows the number of slots in the range rather than the whole history.
+    Users are everyone active who holds a role or filled one in the range (limited to the team's
+    active members with team_id). Rolling windows look back up to 3 weeks before starts_at, so the
+    first weeks of the range report the load people actually carried.
+    """
+    ends_at = _as_utc(ends_at) if ends_at else datetime.now(timezone.utc)
+    starts_at = _as_utc(starts_at) if starts_at else ends_at - timedelta(weeks=DEFAULT_ANALYTICS_WEEKS)
+    if starts_at >= ends_at:
+        raise CheckConstraintError("Start time must be before end time")
+
+    assigned = _assigned_slots_cte(starts_at - timedelta(weeks=ROLLING_WINDOW_WEEKS), ends_at)
+    role_rows = _select_role_load_rows(session, assigned, starts_at, team_id)
+    peaks = {row.user_id: row for row in _select_peak_rolling_load_rows(session, assigned, starts_at, team_id)}
+
+    rows_by_user: dict[UUID, list[Row]] = defaultdict(list)
+    for row in role_rows:
+        rows_by_user[row.user_id].append(row)
+
+    weeks = (ends_at - starts_at) / timedelta(weeks=1)
+    user_loads = {user_id: sum(float(row.weighted_load) for row in rows) for user_id, rows in rows_by_user.items()}
+    team_average_load = sum(user_loads.values()) / len(user_loads) if user_loads else 0.0
+
+    users = []
+    for user_id, rows in rows_by_user.items():
+        weighted_load, peak = user_loads[user_id], peaks.get(user_id)
+        users.append(UserLoadPublic(
+            user_id=user_id,
+            first_name=rows[0].first_name,
+            last_name=rows[0].last_name,
+            assignments_count=sum(row.assignments_count for row in rows),
+            weighted_load=weighted_load,
+            load_ratio=weighted_load / team_average_load if team_average_load else None,
+            average_4_week_load=weighted_load / weeks * ROLLING_WINDOW_WEEKS,
+            peak_4_week_load=float(peak.rolling_load) if peak else 0.0,
+            peak_4_week_starts_at=peak.week_starts_at.replace(tzinfo=timezone.utc) - timedelta(weeks=ROLLING_WINDOW_WEEKS - 1) if peak else None,
+            roles=[
+                RoleLoadPublic(
+                    role_id=row.role_id,
+                    role_code=row.role_code,
+                    role_name=row.role_name,
+                    assignments_count=row.assignments_count,
+                    weighted_load=float(row.weighted_load),
+                    role_average_load=float(row.role_average_load),
+                    role_load_percentile=float(row.role_load_percentile),
+                )
+                for row in rows
+            ],
+        ))
+    users.sort(key=lambda user: (-user.weighted_load, user.last_name, user.first_name))
+
+    return LoadAnalyticsPublic(
+        starts_at=starts_at,
+        ends_at=ends_at,
+        team_id=team_id,
+        weeks=weeks,
+        requirement_level_weights={level.value: weight for level, weight in REQUIREMENT_LEVEL_WEIGHTS.items()},
+        team_average_load=team_average_load,
+        users=users,
+    )
+
+def _assigned_slots_cte(starts_at: datetime, ends_at: datetime) -> CTE:
+    # One row per filled live slot (active, applicable assignment on an active event), with its
+    # weight and its Monday-based UTC week; the integer week index lets RANGE frames count weeks.
+    # The range is repeated on the assignment's copy of starts_at so both tables prune partitions.
+    week_starts_at = func.date_trunc("week", func.timezone("UTC", Event.starts_at))
+    return (
+        select(
+            EventAssignment.assigned_user_id.label("user_id"),
+            EventAssignment.role_id,
+            Event.starts_at,
+            week_starts_at.label("week_starts_at"),
+            cast(func.floor(func.extract("epoch", week_starts_at) / SECONDS_PER_WEEK), Integer).label("week_index"),
+            case(REQUIREMENT_LEVEL_WEIGHTS, value=EventAssignment.requirement_level, else_=0.0).label("weight"),
+        )
+        .join(EventAssignment.event)
+        .where(Event.starts_at >= starts_at, Event.starts_at < ends_at)
+        .where(EventAssignment.event_starts_at >= starts_at, EventAssignment.event_starts_at < ends_at)
+        .where(Event.is_active, EventAssignment.is_active, EventAssignment.is_applicable)
+        .where(EventAssignment.assigned_user_id.is_not(None))
+        .cte("assigned_slots")
+    )
+
+def _team_user_ids(team_id: UUID):
+    return select(TeamUser.user_id).where(TeamUser.team_id == team_id, TeamUser.is_active)
+
+def _select_role_load_rows(session: Session, assigned: CTE, starts_at: datetime, team_id: UUID | None) -> list[Row]:
+    # One row per (user, role) ordered by user then role order, with the role-wide average and
+    # percentile computed over everyone in the result: users holding the role at an assignable
+    # proficiency level (as for assignment), plus anyone assigned it in the range
+    in_range = assigned.c.starts_at >= starts_at
+    holders = (
+        select(UserRole.user_id, UserRole.role_id)
+        .join(ProficiencyLevel, UserRole.proficiency_level_id == ProficiencyLevel.id)
+        .where(ProficiencyLevel.is_assignable)
+        .union(select(assigned.c.user_id, assigned.c.role_id).where(in_range))
+        .subquery("holders")
+    )
+    loads = (
+        select(
+            holders.c.user_id, holders.c.role_id,
+            func.count(assigned.c.user_id).filter(in_range).label("assignments_count"),
+            func.coalesce(func.sum(assigned.c.weight).filter(in_range), literal(0.0)).label("weighted_load"),
+        )
+        .select_from(holders)
+        .outerjoin(assigned, and_(assigned.c.user_id == holders.c.user_id, assigned.c.role_id == holders.c.role_id))
+        .group_by(holders.c.user_id, holders.c.role_id)
+    )
+    if team_id is not None:
+        loads = loads.where(holders.c.user_id.in_(_team_user_ids(team_id)))
+    loads = loads.subquery("loads")
+
+    return session.exec(
+        select(
+            loads.c.user_id, loads.c.role_id, loads.c.assignments_count, loads.c.weighted_load,
+            User.first_name, User.last_name, Role.code.label("role_code"), Role.name.label("role_name"),
+            func.avg(loads.c.weighted_load).over(partition_by=loads.c.role_id).label("role_average_load"),
+            func.percent_rank().over(partition_by=loads.c.role_id, order_by=loads.c.weighted_load).label("role_load_percentile"),
+        )
+        .join(User, loads.c.user_id == User.id)
+        .join(Role, loads.c.role_id == Role.id)
+        .where(User.is_active)
+        .order_by(loads.c.user_id, Role.order)
+    ).all()
+
+def _select_peak_rolling_load_rows(session: Session, assigned: CTE, starts_at: datetime, team_id: UUID | None) -> list[Row]:
+    # Weekly load per user, summed over a RANGE frame of the current and 3 preceding week indexes
+    # (gaps count as empty weeks), then the heaviest window ending inside the range per user
+    weekly = select(
+        assigned.c.user_id, assigned.c.week_starts_at, assigned.c.week_index,
+        func.sum(assigned.c.weight).label("load"),
+    ).group_by(assigned.c.user_id, assigned.c.week_starts_at, assigned.c.week_index)
+    if team_id is not None:
+        weekly = weekly.where(assigned.c.user_id.in_(_team_user_ids(team_id)))
+    weekly = weekly.subquery("weekly")
+
+    rolling = select(
+        weekly.c.user_id, weekly.c.week_starts_at,
+        func.sum(weekly.c.load).over(
+            partition_by=weekly.c.user_id,
+            order_by=weekly.c.week_index,
+            range_=(-(ROLLING_WINDOW_WEEKS - 1), 0),
+        ).label("rolling_load"),
+    ).subquery("rolling")
+
+    ranked = (
+        select(
+            rolling.c.user_id, rolling.c.week_starts_at, rolling.c.rolling_load,
+            func.row_number().over(
+                partition_by=rolling.c.user_id,
+                order_by=(rolling.c.rolling_load.desc(), rolling.c.week_starts_at),
+            ).label("peak_rank"),
+        )
+        .where(rolling.c.week_starts_at >= func.date_trunc("week", func.timezone("UTC", starts_at)))
+        .subquery("ranked")
+    )
+    return session.exec(
+        select(ranked.c.user_id, ranked.c.week_starts_at, ranked.c.rolling_load).where(ranked.c.peak_rank == 1)
+    ).all()
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
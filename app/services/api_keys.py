@@ -0,0 +1,136 @@
+import hmac
+import asyncio
+import hashlib
+import logging
+import secrets
+from dataclasses import dataclass
+from sqlalchemy import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.settings import settings
+from app.db.models import ApiKey, ApiKeyCreate, ApiKeyCreatedPublic
+from app.db.models.enums import ApiKeyScope
+from app.utils.exceptions import ConflictError
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "shq"
+# Identity of requests authenticated with FAST_API_KEY (the deployment's bootstrap key, all scopes)
+BOOTSTRAP_KEY_ID = "bootstrap"
+
+@dataclass(frozen=True)
+class ApiKeyIdentity:
+    """Who a request is authenticated as: attributed in the access log and used as the rate limit identity."""
+    id: str
+    name: str
+    scopes: frozenset[ApiKeyScope]
+
+    def allows(self, scope: ApiKeyScope) -> bool:
+        return scope in self.scopes or ApiKeyScope.admin in self.scopes
+
+def hash_secret(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+def generate_api_key() -> tuple[str, str, str]:
+    """A new key as (key, prefix, secret hash): the key is shown once, only the prefix and hash are stored."""
+    prefix, secret = secrets.token_hex(4), secrets.token_urlsafe(32)
+    return f"{KEY_PREFIX}_{prefix}_{secret}", prefix, hash_secret(secret)
+
+def parse_api_key(key: str) -> tuple[str, str] | None:
+    parts = key.split("_", 2)
+    if len(parts) != 3 or parts[0] != KEY_PREFIX or not parts[1] or not parts[2]:
+        return None
+    return parts[1], parts[2]
+
+class ApiKeyIndex:
+    """
+    In-memory index of the active API keys by prefix, so authenticating a request is one dict lookup,
+    one sha256 and a constant-time comparison, with no database query.
+
+    load() swaps in a complete new mapping, so requests in other threads always see a consistent index.
+    """
+    def __init__(self, bootstrap_key: str | None = None):
+        self._bootstrap_hash = hash_secret(bootstrap_key) if bootstrap_key else None
+        self._bootstrap = ApiKeyIdentity(BOOTSTRAP_KEY_ID, "FAST_API_KEY", frozenset(ApiKeyScope))
+        self._keys: dict[str, tuple[str, ApiKeyIdentity]] = {}
+
+    def load(self, session: Session) -> None:
+        api_keys = session.exec(select(ApiKey).where(ApiKey.is_active)).all()
+        self._keys = {
+            api_key.prefix: (api_key.secret_hash, ApiKeyIdentity(str(api_key.id), api_key.name, frozenset(ApiKeyScope(scope) for scope in api_key.scopes)))
+            for api_key in api_keys
+        }
+
+    def clear(self) -> None:
+        self._keys = {}
+
+    def authenticate(self, key: str) -> ApiKeyIdentity | None:
+        secret_hash = hash_secret(key)
+        parsed = parse_api_key(key)
+        if parsed:
+            prefix, secret = parsed
+            entry = self._keys.get(prefix)
+            if entry and hmac.compare_digest(entry[0], hash_secret(secret)):
+                return entry[1]
+        if self._bootstrap_hash and hmac.compare_digest(self._bootstrap_hash, secret_hash):
+            return self._bootstrap
+        return None
+
+_index = ApiKeyIndex(settings.fast_api_key)
+_refresh_task: asyncio.Task | None = None
+
+def get_api_key_index() -> ApiKeyIndex:
+    return _index
+
+def refresh_api_keys(session: Session) -> None:
+    """Reload this process's index right after a key changes; other processes pick it up on their next refresh."""
+    _index.load(session)
+
+async def start_api_key_index(engine: Engine, refresh_seconds: float) -> None:
+    """Load the index and keep refreshing it every refresh_seconds. Called from the application lifespan."""
+    global _refresh_task
+
+    def load() -> None:
+        with Session(engine) as session:
+            _index.load(session)
+
+    async def refresh() -> None:
+        while True:
+            await asyncio.sleep(refresh_seconds)
+            try:
+                await asyncio.to_thread(load)
+            except Exception:
+                logger.exception("Failed to refresh API keys; keeping the previous index")
+
+    await asyncio.to_thread(load)
+    _refresh_task = asyncio.create_task(refresh())
+
+async def stop_api_key_index() -> None:
+    global _refresh_task
+    if _refresh_task:
+        _refresh_task.cancel()
+        await asyncio.gather(_refresh_task, return_exceptions=True)
+        _refresh_task = None
+
+# =============================
+# CREATE API KEY
+# =============================
+def create_api_key(session: Session, payload: ApiKeyCreate) -> ApiKeyCreatedPublic:
+    # The random 8-hex prefix can collide with a stored one: that is no conflict of the client's, so
+    # the key is generated again once (a second collision in a row is vanishingly unlikely)
+    for attempt in range(2):
+        key, prefix, secret_hash = generate_api_key()
+        try:
+            api_key = ApiKey.model_validate(payload, update={"prefix": prefix, "secret_hash": secret_hash})
+            session.add(api_key)
+            session.commit()
+            session.refresh(api_key)
+            break
+        except IntegrityError as e:
+            session.rollback()
+            if attempt == 0 and "ix_api_keys_prefix" in str(e):
+                continue
+            raise ConflictError("ApiKey creation violates a constraint") from e
+    refresh_api_keys(session)
+    return ApiKeyCreatedPublic.model_validate(api_key, update={"key": key})
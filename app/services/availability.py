@@ -0,0 +1,169 @@
+import io
+import csv
+from uuid import UUID, uuid4
+from typing import BinaryIO, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pydantic import ValidationError
+from fastapi.exceptions import RequestValidationError
+from sqlmodel import Session, select
+from sqlalchemy import insert, delete
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.db.models import User, UserUnavailablePeriod, UserUnavailablePeriodCreate, UserUnavailableRule
+from app.utils.exceptions import CheckConstraintError
+from app.services.recurrence import rule_expansions
+
+Interval = tuple[datetime, datetime]
+
+PERIOD_COLUMNS = ("id", "user_id", "starts_at", "ends_at", "created_at", "updated_at")
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """Sort intervals and merge the ones that overlap or touch (one ends when the next starts)."""
+    merged: list[Interval] = []
+    for starts_at, ends_at in sorted(intervals):
+        if merged and starts_at <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], ends_at))
+        else:
+            merged.append((starts_at, ends_at))
+    return merged
+
+@dataclass
+class PeriodMerge:
+    """What storing a batch of periods for a user takes, once merged with the user's stored periods."""
+    # Merged periods to insert
+    periods: list[Interval] = field(default_factory=list)
+    # Stored periods absorbed into one of the new periods (deleted)
+    replaced: list[UserUnavailablePeriod] = field(default_factory=list)
+    # Stored periods that already cover some of the input unchanged (kept)
+    covering: list[UserUnavailablePeriod] = field(default_factory=list)
+
+def plan_period_merge(session: Session, user_id: UUID, intervals: Iterable[Interval]) -> PeriodMerge:
+    """
+    Merge a batch of periods with each other and with the user's stored periods they overlap or touch.
+
+    Takes a lock on the user's row (FOR NO KEY UPDATE, so foreign key checks don't wait on it) so
+    concurrent batches for the same user merge one after the other. Stored periods are read as
+    plain (detached) objects: nothing needs reloading after the commit.
+    """
+    intervals = [(_as_utc(starts_at), _as_utc(ends_at)) for starts_at, ends_at in intervals]
+    if any(starts_at >= ends_at for starts_at, ends_at in intervals):
+        raise CheckConstraintError("Start time must be before end time")
+    new_periods = merge_intervals(intervals)
+    merge = PeriodMerge()
+    if not new_periods:
+        return merge
+
+    session.exec(select(User.id).where(User.id == user_id).with_for_update(key_share=True)).one_or_none()
+    stored = [
+        UserUnavailablePeriod(**row._mapping)
+        for row in session.exec(
+            select(*(getattr(UserUnavailablePeriod, column) for column in PERIOD_COLUMNS))
+            .where(UserUnavailablePeriod.user_id == user_id)
+            .where(UserUnavailablePeriod.starts_at <= new_periods[-1][1])
+            .where(UserUnavailablePeriod.ends_at >= new_periods[0][0])
+        ).all()
+    ]
+
+    # Sweep new (None) and stored periods in start order, grouping those that overlap or touch
+    items = sorted(
+        [(starts_at, ends_at, None) for starts_at, ends_at in new_periods]
+        + [(_as_utc(period.starts_at), _as_utc(period.ends_at), period) for period in stored],
+        key=lambda item: (item[0], item[1]),
+    )
+    group: list = []
+    group_ends_at = None
+    for item in items + [None]:
+        if item is not None and group and item[0] <= group_ends_at:
+            group.append(item)
+            group_ends_at = max(group_ends_at, item[1])
+            continue
+        if group and any(member[2] is None for member in group):
+            bounds = (group[0][0], group_ends_at)
+            group_stored = [member for member in group if member[2] is not None]
+            if len(group_stored) == 1 and group_stored[0][:2] == bounds:
+                merge.covering.append(group_stored[0][2])
+            else:
+                merge.periods.append(bounds)
+                merge.replaced.extend(member[2] for member in group_stored)
+        if item is not None:
+            group, group_ends_at = [item], item[1]
+    return merge
+
+def delete_periods(session: Session, periods: list[UserUnavailablePeriod]) -> None:
+    if periods:
+        session.execute(delete(UserUnavailablePeriod).where(UserUnavailablePeriod.id.in_([period.id for period in periods])))
+
+def insert_periods(session: Session, user_id: UUID, intervals: list[Interval]) -> list[UserUnavailablePeriod]:
+    """Insert periods with one multi-row INSERT ... RETURNING, as plain (detached) objects."""
+    if not intervals:
+        return []
+    table = UserUnavailablePeriod.__table__
+    result = session.execute(
+        insert(table).values(_period_rows(user_id, intervals)).returning(*(table.c[column] for column in PERIOD_COLUMNS))
+    )
+    return [UserUnavailablePeriod(**row._mapping) for row in result]
+
+def copy_periods(session: Session, user_id: UUID, intervals: list[Interval]) -> list[UserUnavailablePeriod]:
+    """Insert periods with COPY (PostgreSQL), for large imports."""
+    rows = _period_rows(user_id, intervals)
+    if not rows:
+        return []
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[column].isoformat() if isinstance(row[column], datetime) else row[column] for column in PERIOD_COLUMNS])
+    buffer.seek(0)
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY user_unavailable_periods ({', '.join(PERIOD_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+    return [UserUnavailablePeriod(**row) for row in rows]
+
+def read_periods_csv(file: BinaryIO) -> list[Interval]:
+    """
+    Read periods from an uploaded CSV file with a `starts_at,ends_at` header (ISO 8601 datetimes),
+    row by row. Invalid rows are a 422 naming the line.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        if reader.fieldnames is None or not {"starts_at", "ends_at"} <= set(reader.fieldnames):
+            raise RequestValidationError([{"type": "missing", "loc": ("body", "file"), "msg": "CSV header must include starts_at and ends_at", "input": reader.fieldnames}])
+        intervals = []
+        for row in reader:
+            try:
+                period = UserUnavailablePeriodCreate.model_validate({"starts_at": row["starts_at"], "ends_at": row["ends_at"]})
+            except ValidationError as e:
+                raise RequestValidationError([{**error, "loc": ("body", "file", reader.line_num, *error["loc"])} for error in e.errors(include_url=False)]) from e
+            intervals.append((period.starts_at, period.ends_at))
+        return intervals
+    finally:
+        # Leave the upload's file open for its owner to close
+        text.detach()
+
+def rule_occurrence_periods(rules: Iterable[UserUnavailableRule], window_start: datetime, window_end: datetime) -> list[UserUnavailablePeriod]:
+    """
+    Occurrences of recurring rules overlapping a window, as plain (never persisted) periods with the
+    rule's id and user: callers reading periods get rule occurrences without knowing about rules.
+    Expansions come from the per-(rule, month) cache.
+    """
+    periods = []
+    for rule in rules:
+        for starts_at, ends_at in rule_expansions.window(rule.id, rule.rrule, rule.starts_at, rule.ends_at, window_start, window_end, rule.tzid):
+            period = UserUnavailablePeriod(id=rule.id, user_id=rule.user_id, starts_at=starts_at, ends_at=ends_at)
+            # Set without events, so the period is not cascaded into the user's session
+            set_committed_value(period, "user", rule.user)
+            periods.append(period)
+    return periods
+
+def _period_rows(user_id: UUID, intervals: list[Interval]) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {"id": uuid4(), "user_id": user_id, "starts_at": starts_at, "ends_at": ends_at, "created_at": now, "updated_at": now}
+        for starts_at, ends_at in intervals
+    ]
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import threading
+from uuid import UUID
+from typing import Any, AsyncIterator
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pydantic import Field
+from fastapi import Request
+from sqlmodel import SQLModel
+
+from app.db.models.enums import ScheduleChangeType
+
+logger = logging.getLogger(__name__)
+
+REDIS_CHANNEL_PREFIX = "schedule_changes:"
+SSE_HEARTBEAT_SECONDS = 15
+
+class ScheduleChange(SQLModel):
+    """Compact change event pushed to clients watching a schedule grid."""
+    schedule_id: UUID
+    type: ScheduleChangeType
+    id: UUID
+    data: dict[str, Any] | None = None
+    occurred_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class InMemoryBroker:
+    """
+    In-process pub/sub broker keyed by schedule id.
+
+    Publishing is thread-safe so the sync write paths (which run in FastAPI's threadpool) can
+    hand changes over to subscribers living on the event loop. Each subscriber has a bounded
+    queue; a subscriber that falls behind gets a single `resync` marker instead of a backlog.
+    """
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: dict[UUID, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    @asynccontextmanager
+    async def subscribe(self, schedule_id: UUID) -> AsyncIterator[asyncio.Queue]:
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.max_queue_size))
+        with self._lock:
+            self._subscribers[schedule_id].add(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            with self._lock:
+                self._subscribers[schedule_id].discard(subscriber)
+                if not self._subscribers[schedule_id]:
+                    del self._subscribers[schedule_id]
+
+    def subscriber_count(self, schedule_id: UUID) -> int:
+        with self._lock:
+            return len(self._subscribers.get(schedule_id, ()))
+
+    def publish(self, change: ScheduleChange) -> None:
+        self._deliver(change)
+
+    def _deliver(self, change: ScheduleChange) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(change.schedule_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_enqueue, queue, change)
+            except RuntimeError:
+                # The subscriber's loop is closed; its context manager will clean it up
+                pass
+
+class RedisBroker(InMemoryBroker):
+    """
+    Broker that fans changes out through Redis pub/sub so every process sees every write.
+
+    Changes are published to Redis only; a listener task per process relays them back into the
+    local subscriber queues, so the publishing process receives its own changes exactly once.
+    """
+    def __init__(self, redis_url: str, max_queue_size: int = 100):
+        super().__init__(max_queue_size=max_queue_size)
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError as e:
+            raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed") from e
+        self._publisher = redis.Redis.from_url(redis_url)
+        self._subscriber = redis.asyncio.Redis.from_url(redis_url)
+        self._listener: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        pubsub = self._subscriber.pubsub()
+        await pubsub.psubscribe(f"{REDIS_CHANNEL_PREFIX}*")
+        self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def stop(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        await self._subscriber.aclose()
+        self._publisher.close()
+
+    def publish(self, change: ScheduleChange) -> None:
+        self._publisher.publish(f"{REDIS_CHANNEL_PREFIX}{change.schedule_id}", change.model_dump_json())
+
+    async def _listen(self, pubsub) -> None:
+        async for message in pubsub.listen():
+            if message["type"] != "pmessage":
+                continue
+            try:
+                self._deliver(ScheduleChange.model_validate_json(message["data"]))
+            except Exception:
+                logger.exception("Failed to relay schedule change from Redis")
+
+def _enqueue(queue: asyncio.Queue, change: ScheduleChange) -> None:
+    if queue.full():
+        # Drop the backlog and tell the client to re-download the grid
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+        return
+    queue.put_nowait(change)
+
+_broker: InMemoryBroker = InMemoryBroker()
+
+def get_broker() -> InMemoryBroker:
+    return _broker
+
+async def start_broker(redis_url: str | None = None) -> None:
+    """Select the broker backend and start it. Called from the application lifespan."""
+    global _broker
+    _broker = RedisBroker(redis_url) if redis_url else InMemoryBroker()
+    await _broker.start()
+
+async def stop_broker() -> None:
+    await _broker.stop()
+
+async def stream_schedule_changes(request: Request, schedule_id: UUID) -> AsyncIterator[str]:
+    """Yield Server-Sent Events for a schedule until the client disconnects."""
+    async with _broker.subscribe(schedule_id) as queue:
+        yield "event: ready\ndata: {}\n\n"
+        while not await request.is_disconnected():
+            try:
+                change = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if change is None:
+                yield "event: resync\ndata: {}\n\n"
+                continue
+            yield f"event: {change.type.value}\ndata: {change.model_dump_json()}\n\n"
+
+def publish_schedule_change(schedule_id: UUID, type: ScheduleChangeType, id: UUID, data: dict[str, Any] | None = None) -> None:
+    """Publish a change for a schedule. Failures are logged, never raised, so writes always succeed."""
+    try:
+        _broker.publish(ScheduleChange(schedule_id=schedule_id, type=type, id=id, data=data))
+    except Exception:
+        logger.exception("Failed to publish %s change for schedule %s", type.value, schedule_id)
@@ -1,45 +1,39 @@
 from typing import TYPE_CHECKING
 
 from app.db.models import EventWithAssignmentsPublic, EventPublic, EventAssignmentEmbeddedPublic
+from app.utils.fieldsets import Fields, build_public, includes_nested, nested_fields, related, related_paths
+from app.services.loaders import prime
 
 if TYPE_CHECKING:
     from app.db.models import Schedule, Event
 
-def build_events_with_assignments_from_schedule(schedule: "Schedule") -> list["EventWithAssignmentsPublic"]:
-    events = []
-    for event in schedule.events:
-        events.append(
-            EventWithAssignmentsPublic(
-                event=EventPublic.from_objects(
-                    event=event,
-                    schedule=schedule,
-                    event_type=event.event_type,
-                    team=event.team,
-                ),
-                event_assignments=[
-                    EventAssignmentEmbeddedPublic.from_objects(
-                        event_assignment=ea,
-                        role=ea.role,
-                        assigned_user=ea.assigned_user,
-                    ) for ea in event.event_assignments
-                ],
-            )
-        )
-    return events
+def event_with_assignments_paths(fields: Fields = None) -> list[str]:
+    """Relationship paths (from the event) an EventWithAssignmentsPublic with these fields reads."""
+    paths = related_paths(fields, EventPublic)
+    if includes_nested(fields, "event_assignments"):
+        assignment_fields = nested_fields(fields, "event_assignments")
+        paths += ["event_assignments", *(f"event_assignments.{path}" for path in related_paths(assignment_fields, EventAssignmentEmbeddedPublic))]
+    return paths
 
-def build_events_with_assignments_from_event(event: "Event") -> "EventWithAssignmentsPublic":
-    return EventWithAssignmentsPublic(
-        event=EventPublic.from_objects(
-            event=event,
-            schedule=event.schedule,
-            event_type=event.event_type,
-            team=event.team,
-        ),
-        event_assignments=[
+def build_event_with_assignments(event: "Event", schedule: "Schedule | None", fields: Fields = None) -> "EventWithAssignmentsPublic":
+    # Relationships a sparse fieldset skipped were not primed and are passed as None
+    values = {"event": EventPublic.from_objects(event=event, schedule=schedule, event_type=related(event, "event_type", fields), team=related(event, "team", fields), fields=fields)}
+    if includes_nested(fields, "event_assignments"):
+        assignment_fields = nested_fields(fields, "event_assignments")
+        values["event_assignments"] = [
             EventAssignmentEmbeddedPublic.from_objects(
                 event_assignment=ea,
-                role=ea.role,
-                assigned_user=ea.assigned_user,
+                role=related(ea, "role", assignment_fields),
+                assigned_user=related(ea, "assigned_user", assignment_fields),
+                fields=assignment_fields,
             ) for ea in event.event_assignments
-        ],
-    )
\ No newline at end of file
+        ]
+    return build_public(EventWithAssignmentsPublic, values, None if fields is None else frozenset(values))
+
+def build_events_with_assignments_from_schedule(schedule: "Schedule", fields: Fields = None) -> list["EventWithAssignmentsPublic"]:
+    prime([schedule], "events", *(f"events.{path}" for path in event_with_assignments_paths(fields)))
+    return [build_event_with_assignments(event, schedule, fields) for event in schedule.events]
+
+def build_events_with_assignments_from_event(event: "Event", fields: Fields = None) -> "EventWithAssignmentsPublic":
+    prime([event], *event_with_assignments_paths(fields))
+    return build_event_with_assignments(event, related(event, "schedule", fields), fields)
@@ -0,0 +1,333 @@
+import time
+import threading
+from uuid import UUID
+from typing import Iterable
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from sqlalchemy import event, and_, case, exists, func, or_
+from sqlmodel import Session, select
+
+from app.settings import settings
+from app.db.models import (
+    Role, ProficiencyLevel, User, UserRole, TeamUser, Schedule, Event, EventAssignment, UserUnavailablePeriod, UserUnavailableRule,
+    EventCandidatePublic, AssignmentCandidatePublic,
+)
+from app.services.queries import select_unavailable_users_for_month, select_assignable_user_roles, select_schedule_events_version
+from app.services.analytics import REQUIREMENT_LEVEL_WEIGHTS, ROLLING_WINDOW_WEEKS
+from app.services.recurrence import rule_expansions
+from app.utils.metrics import describe_counter, increment_counter
+
+CANDIDATE_INDEX_SIZE = 64
+PENDING_USERS_KEY = "candidate_index_user_ids"
+PENDING_RESET_KEY = "candidate_index_reset"
+
+CANDIDATE_INDEX_LOOKUPS = "candidate_index_lookups_total"
+describe_counter(CANDIDATE_INDEX_LOOKUPS, "Candidate index lookups, by result (hit, refreshed changed users, or built the schedule's index)")
+
+Interval = tuple[datetime, datetime]
+
+@dataclass
+class UserRows:
+    """What the index holds for a set of users, as read from the database."""
+    # user id -> (first name, last name), active users only
+    names: dict[UUID, tuple[str, str]] = field(default_factory=dict)
+    unavailable: dict[UUID, list[Interval]] = field(default_factory=lambda: defaultdict(list))
+    role_ids: dict[UUID, set[UUID]] = field(default_factory=lambda: defaultdict(set))
+
+@dataclass
+class ScheduleCandidateIndex:
+    """
+    One schedule month as bitsets. Events and users get bit positions; each user has the events they
+    are available for, each event the same bits transposed (the users available for it), and each
+    role the users qualified for it (an assignable proficiency level), so a slot's candidates are
+    one AND. Positions of users who left stay unused until the index is rebuilt.
+    """
+    # select_schedule_events_version when built
+    version: tuple[int, datetime | None]
+    # (month, year) of the schedule
+    month: tuple[int, int]
+    event_times: dict[UUID, Interval]
+    built_at: float = field(default_factory=time.monotonic)
+    event_positions: dict[UUID, int] = field(default_factory=dict)
+    user_ids: list[UUID] = field(default_factory=list)
+    user_positions: dict[UUID, int] = field(default_factory=dict)
+    user_names: dict[UUID, tuple[str, str]] = field(default_factory=dict)
+    available_events: list[int] = field(default_factory=list)
+    available_users: list[int] = field(default_factory=list)
+    qualified_users: dict[UUID, int] = field(default_factory=dict)
+    # Users written to since their bits were read, refreshed on the next lookup
+    stale_user_ids: set[UUID] = field(default_factory=set)
+
+    def __post_init__(self):
+        self.event_positions = {event_id: position for position, event_id in enumerate(self.event_times)}
+        self.available_users = [0] * len(self.event_times)
+
+    def candidates(self, event_id: UUID, role_id: UUID) -> list[UUID]:
+        users = self.available_users[self.event_positions[event_id]] & self.qualified_users.get(role_id, 0)
+        return [self.user_ids[position] for position in _bit_positions(users)]
+
+    def set_users(self, user_ids: Iterable[UUID], rows: UserRows) -> None:
+        """Replace the bits of these users with their rows (users missing from rows are removed)."""
+        for user_id in user_ids:
+            position = self.user_positions.get(user_id)
+            if position is None:
+                if user_id not in rows.names:
+                    continue
+                position = self.user_positions[user_id] = len(self.user_ids)
+                self.user_ids.append(user_id)
+                self.available_events.append(0)
+            user_bit = 1 << position
+
+            events = 0
+            if user_id in rows.names:
+                self.user_names[user_id] = rows.names[user_id]
+                unavailable = rows.unavailable.get(user_id, ())
+                for event_id, (starts_at, ends_at) in self.event_times.items():
+                    if not any(period_starts_at < ends_at and period_ends_at > starts_at for period_starts_at, period_ends_at in unavailable):
+                        events |= 1 << self.event_positions[event_id]
+            else:
+                self.user_names.pop(user_id, None)
+            self.available_events[position] = events
+            for event_position in range(len(self.available_users)):
+                if events >> event_position & 1:
+                    self.available_users[event_position] |= user_bit
+                else:
+                    self.available_users[event_position] &= ~user_bit
+
+            role_ids = rows.role_ids.get(user_id, set()) if user_id in rows.names else set()
+            for role_id in self.qualified_users.keys() | role_ids:
+                if role_id in role_ids:
+                    self.qualified_users[role_id] = self.qualified_users.get(role_id, 0) | user_bit
+                else:
+                    self.qualified_users[role_id] &= ~user_bit
+
+class CandidateIndex:
+    """
+    Bounded LRU of per-schedule candidate indexes.
+
+    A schedule's index is rebuilt when its events version moves (events were written; assignment
+    writes don't change which users are available or qualified), when it is
+    older than max_age_seconds (writes by other processes), or after role or proficiency level
+    writes. Writes to a user's availability, roles or profile in this process only mark that user,
+    whose bits are re-read on the next lookup.
+    """
+    def __init__(self, max_size: int = CANDIDATE_INDEX_SIZE, max_age_seconds: float = settings.candidate_index_max_age_seconds):
+        self.max_size = max_size
+        self.max_age_seconds = max_age_seconds
+        self._indexes: OrderedDict[UUID, ScheduleCandidateIndex] = OrderedDict()
+        # Bumped by every invalidation, so an index built from reads older than a write is not kept as fresh
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def candidates(self, session: Session, event: Event, role_id: UUID) -> list[EventCandidatePublic]:
+        version = select_schedule_events_version(session, event.schedule_id)
+        with self._lock:
+            index = self._indexes.get(event.schedule_id)
+            if index is not None:
+                self._indexes.move_to_end(event.schedule_id)
+                stale_user_ids, index.stale_user_ids = index.stale_user_ids, set()
+
+        if (
+            index is None or index.version != version or event.id not in index.event_positions
+            or time.monotonic() - index.built_at > self.max_age_seconds
+        ):
+            increment_counter(CANDIDATE_INDEX_LOOKUPS, result="built")
+            index = self._build(session, event.schedule_id, version)
+        elif stale_user_ids:
+            increment_counter(CANDIDATE_INDEX_LOOKUPS, result="refreshed")
+            rows = _read_user_rows(session, index, stale_user_ids)
+            with self._lock:
+                index.set_users(stale_user_ids, rows)
+        else:
+            increment_counter(CANDIDATE_INDEX_LOOKUPS, result="hit")
+
+        with self._lock:
+            user_ids = index.candidates(event.id, role_id)
+            names = [index.user_names[user_id] for user_id in user_ids]
+        return sorted(
+            (EventCandidatePublic(user_id=user_id, first_name=first_name, last_name=last_name) for user_id, (first_name, last_name) in zip(user_ids, names)),
+            key=lambda candidate: (candidate.last_name, candidate.first_name),
+        )
+
+    def invalidate_users(self, user_ids: Iterable[UUID]) -> None:
+        user_ids = set(user_ids)
+        with self._lock:
+            self._generation += 1
+            for index in self._indexes.values():
+                index.stale_user_ids |= user_ids
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._indexes.clear()
+
+    def _build(self, session: Session, schedule_id: UUID, version: tuple[int, datetime | None]) -> ScheduleCandidateIndex:
+        with self._lock:
+            generation = self._generation
+        schedule = session.get(Schedule, schedule_id)
+        events = session.exec(select(Event.id, Event.starts_at, Event.ends_at).where(Event.schedule_id == schedule_id).order_by(Event.starts_at)).all()
+        index = ScheduleCandidateIndex(
+            version=version, month=(schedule.month, schedule.year), event_times={event_id: (starts_at, ends_at) for event_id, starts_at, ends_at in events},
+        )
+        rows = _read_user_rows(session, index)
+        index.set_users(rows.names, rows)
+        with self._lock:
+            if generation != self._generation:
+                # Written to while reading: serve this lookup, rebuild on the next one
+                index.built_at = float("-inf")
+            self._indexes[schedule_id] = index
+            self._indexes.move_to_end(schedule_id)
+            while len(self._indexes) > self.max_size:
+                self._indexes.popitem(last=False)
+        return index
+
+candidate_index = CandidateIndex()
+
+def get_event_candidates(session: Session, event: Event, role_id: UUID) -> list[EventCandidatePublic]:
+    """Active users qualified for the role and with no unavailability (periods or rules) overlapping the event."""
+    return candidate_index.candidates(session, event, role_id)
+
+def mark_candidates_changed(session: Session, user_ids: Iterable[UUID]) -> None:
+    """For writes the session's unit of work does not see (bulk INSERT/DELETE, COPY)."""
+    session.info.setdefault(PENDING_USERS_KEY, set()).update(user_ids)
+
+def get_assignment_candidates(session: Session, event_assignment: EventAssignment) -> list[AssignmentCandidatePublic]:
+    """
+    Active users holding the slot's role at an assignable proficiency level, ranked in one query:
+    free users first (no unavailability or other filled slot overlapping the event), then highest
+    proficiency rank, members of the event's team, lightest recent load (filled slots within
+    ROLLING_WINDOW_WEEKS either side of the event, weighted by requirement level) and name.
+    Recurring rules come back with the rows and are expanded here, from the per-(rule, month) cache.
+    """
+    window = timedelta(weeks=ROLLING_WINDOW_WEEKS)
+    # The slot's event, read through the assignment's copy of starts_at so only its partition is scanned
+    slot = (
+        select(EventAssignment.id, EventAssignment.role_id, Event.starts_at, Event.ends_at, Event.team_id)
+        .join(Event, and_(Event.id == EventAssignment.event_id, Event.starts_at == EventAssignment.event_starts_at))
+        .where(EventAssignment.id == event_assignment.id, EventAssignment.event_starts_at == event_assignment.event_starts_at)
+        .cte("slot")
+    )
+    # The user's other filled live slots (ix_event_assignments_filled_assigned_user_id_event_starts_at)
+    other_slots = (
+        EventAssignment.assigned_user_id == UserRole.user_id,
+        EventAssignment.id != slot.c.id,
+        EventAssignment.is_active,
+        EventAssignment.is_applicable,
+        Event.is_active,
+    )
+    recent_load = (
+        select(func.coalesce(func.sum(case(REQUIREMENT_LEVEL_WEIGHTS, value=EventAssignment.requirement_level, else_=0.0)), 0.0))
+        .join(EventAssignment.event)
+        .where(*other_slots)
+        .where(EventAssignment.event_starts_at >= slot.c.starts_at - window, EventAssignment.event_starts_at < slot.c.starts_at + window)
+        .scalar_subquery()
+    )
+    has_overlapping_assignment = exists(
+        select(EventAssignment.id)
+        .join(EventAssignment.event)
+        .where(*other_slots)
+        .where(EventAssignment.event_starts_at < slot.c.ends_at, Event.ends_at > slot.c.starts_at)
+    )
+    has_overlapping_period = exists(
+        select(UserUnavailablePeriod.id)
+        .where(UserUnavailablePeriod.user_id == UserRole.user_id)
+        .where(UserUnavailablePeriod.starts_at < slot.c.ends_at, UserUnavailablePeriod.ends_at > slot.c.starts_at)
+    )
+    # Rules live at the event's time, as [id, rrule, starts_at, ends_at, tzid] (same bounds as month lookups)
+    rules = (
+        select(func.json_agg(func.json_build_array(
+            UserUnavailableRule.id, UserUnavailableRule.rrule, UserUnavailableRule.starts_at, UserUnavailableRule.ends_at, UserUnavailableRule.tzid,
+        )))
+        .where(UserUnavailableRule.user_id == UserRole.user_id, UserUnavailableRule.starts_at < slot.c.ends_at)
+        .where(or_(
+            UserUnavailableRule.until.is_(None),
+            UserUnavailableRule.until + (UserUnavailableRule.ends_at - UserUnavailableRule.starts_at) > slot.c.starts_at,
+        ))
+        .scalar_subquery()
+    )
+    is_team_member = exists(
+        select(TeamUser.id).where(TeamUser.team_id == slot.c.team_id, TeamUser.user_id == UserRole.user_id, TeamUser.is_active)
+    ).label("is_team_member")
+    recent_load = recent_load.label("recent_load")
+    rows = session.exec(
+        select(
+            UserRole.user_id, User.first_name, User.last_name, UserRole.proficiency_level_id,
+            ProficiencyLevel.name.label("proficiency_level_name"), ProficiencyLevel.rank.label("proficiency_level_rank"),
+            is_team_member,
+            recent_load,
+            has_overlapping_period.label("is_unavailable"),
+            has_overlapping_assignment.label("has_overlapping_assignment"),
+            rules.label("rules"),
+            slot.c.starts_at.label("slot_starts_at"), slot.c.ends_at.label("slot_ends_at"),
+        )
+        .select_from(slot)
+        .join(UserRole, UserRole.role_id == slot.c.role_id)
+        .join(User, and_(User.id == UserRole.user_id, User.is_active))
+        .join(ProficiencyLevel, and_(ProficiencyLevel.id == UserRole.proficiency_level_id, ProficiencyLevel.is_assignable))
+        .order_by(ProficiencyLevel.rank.desc().nulls_last(), is_team_member.desc(), recent_load, User.last_name, User.first_name)
+    ).all()
+
+    candidates = []
+    for row in rows:
+        values = dict(row._mapping)
+        rules, slot_starts_at, slot_ends_at = values.pop("rules"), values.pop("slot_starts_at"), values.pop("slot_ends_at")
+        if not values["is_unavailable"] and rules:
+            values["is_unavailable"] = any(
+                rule_expansions.window(UUID(rule_id), rrule, datetime.fromisoformat(starts_at), datetime.fromisoformat(ends_at), slot_starts_at, slot_ends_at, tzid)
+                for rule_id, rrule, starts_at, ends_at, tzid in rules
+            )
+        candidates.append(AssignmentCandidatePublic(**values))
+    # Stable, so busy users keep the query's ranking behind the free ones
+    candidates.sort(key=lambda candidate: candidate.is_unavailable or candidate.has_overlapping_assignment)
+    return candidates
+
+def _read_user_rows(session: Session, index: ScheduleCandidateIndex, user_ids: Iterable[UUID] | None = None) -> UserRows:
+    """Rows of these users (all active users when None) for the index's month."""
+    user_ids = None if user_ids is None else list(user_ids)
+    rows = UserRows()
+    statement = select(User.id, User.first_name, User.last_name).where(User.is_active)
+    if user_ids is not None:
+        statement = statement.where(User.id.in_(user_ids))
+    rows.names = {user_id: (first_name, last_name) for user_id, first_name, last_name in session.exec(statement).all()}
+    month, year = index.month
+    for period in select_unavailable_users_for_month(session, month=month, year=year, user_ids=user_ids):
+        rows.unavailable[period.user_id].append((period.starts_at, period.ends_at))
+    for user_id, role_id in select_assignable_user_roles(session, user_ids):
+        rows.role_ids[user_id].add(role_id)
+    return rows
+
+def _bit_positions(bits: int) -> Iterable[int]:
+    while bits:
+        low_bit = bits & -bits
+        yield low_bit.bit_length() - 1
+        bits ^= low_bit
+
+# =============================
+# SESSION HOOKS
+# =============================
+# Like schedule summaries, the index follows writes by watching flushes; it is only told after the
+# commit, so a rolled back write never changes it.
+@event.listens_for(Session, "after_flush")
+def _collect_candidate_changes(session: Session, _flush_context) -> None:
+    user_ids = session.info.setdefault(PENDING_USERS_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (UserUnavailablePeriod, UserUnavailableRule, UserRole)) and obj.user_id is not None:
+            user_ids.add(UUID(str(obj.user_id)))
+        elif isinstance(obj, User) and obj.id is not None:
+            user_ids.add(UUID(str(obj.id)))
+        elif isinstance(obj, (Role, ProficiencyLevel)):
+            session.info[PENDING_RESET_KEY] = True
+
+@event.listens_for(Session, "after_commit")
+def _apply_candidate_changes(session: Session) -> None:
+    user_ids = session.info.pop(PENDING_USERS_KEY, set())
+    if session.info.pop(PENDING_RESET_KEY, False):
+        candidate_index.clear()
+    elif user_ids:
+        candidate_index.invalidate_users(user_ids)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_candidate_changes(session: Session) -> None:
+    session.info.pop(PENDING_USERS_KEY, None)
+    session.info.pop(PENDING_RESET_KEY, None)
@@ -0,0 +1,89 @@
+import threading
+from typing import Callable, Hashable, TypeVar
+from concurrent.futures import Future
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.db.models import Schedule, User, Role, Team, EventType, UserUnavailablePeriod, UserUnavailableRule
+from app.utils.metrics import describe_counter, increment_counter
+
+T = TypeVar("T")
+
+COALESCED_REQUESTS = "coalesced_requests_total"
+describe_counter(COALESCED_REQUESTS, "Requests served by single-flight coalescing, by flight and role (leader computed, follower shared)")
+
+class SingleFlight:
+    """
+    Single-flight coalescing for sync routes (which run in FastAPI's threadpool).
+
+    The first caller for a key (the leader) runs the computation; callers arriving with the same key
+    while it is in flight (followers) wait for and share its result, or its exception. Nothing is kept
+    once the flight lands, so keys should include a data version: a request arriving after a write
+    gets a fresh computation rather than one started before it.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, compute: Callable[[], T]) -> T:
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._flights[key] = Future()
+        increment_counter(COALESCED_REQUESTS, flight=self.name, role="leader" if is_leader else "follower")
+        if not is_leader:
+            return flight.result()
+
+        try:
+            flight.set_result(compute())
+        except BaseException as e:
+            flight.set_exception(e)
+        finally:
+            with self._lock:
+                del self._flights[key]
+        return flight.result()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+# Keyed by (schedule id, summary version, grid generation, format): the summary version moves with any
+# write to the schedule's events and assignments, the generation with any committed write to the other
+# grid inputs (the schedule row, availability, and the names the grid shows)
+schedule_grid_flights = SingleFlight("schedule_grid")
+
+# =============================
+# GRID GENERATION
+# =============================
+# Process-wide, like the candidate index's generation: a flight only lasts one grid computation, so a
+# write committed by another process meanwhile is only missed by requests joining that flight
+GRID_INPUT_MODELS = (Schedule, User, Role, Team, EventType, UserUnavailablePeriod, UserUnavailableRule)
+PENDING_GRID_INPUTS_KEY = "schedule_grid_inputs_changed"
+_grid_generation = 0
+_grid_generation_lock = threading.Lock()
+
+def get_schedule_grid_generation() -> int:
+    with _grid_generation_lock:
+        return _grid_generation
+
+def mark_schedule_grids_changed(session: Session) -> None:
+    """For writes the session's unit of work does not see (bulk INSERT/DELETE, COPY)."""
+    session.info[PENDING_GRID_INPUTS_KEY] = True
+
+@event.listens_for(Session, "after_flush")
+def _collect_grid_input_changes(session: Session, _flush_context) -> None:
+    if any(isinstance(obj, GRID_INPUT_MODELS) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[PENDING_GRID_INPUTS_KEY] = True
+
+@event.listens_for(Session, "after_commit")
+def _bump_grid_generation(session: Session) -> None:
+    global _grid_generation
+    if session.info.pop(PENDING_GRID_INPUTS_KEY, False):
+        with _grid_generation_lock:
+            _grid_generation += 1
+
+@event.listens_for(Session, "after_rollback")
+def _discard_grid_input_changes(session: Session) -> None:
+    session.info.pop(PENDING_GRID_INPUTS_KEY, None)
@@ -1,8 +1,10 @@
-from typing import Type
+from uuid import UUID
+from datetime import datetime, timezone
+from typing import Type, Callable, BinaryIO
 from sqlmodel import Session, select, SQLModel
-from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import IntegrityError
 
+from app.settings import settings
 from app.db.models import (
     Role, RoleCreate,
     ProficiencyLevel,
@@ -10,15 +12,28 @@ from app.db.models import (
     User, UserCreate,
     TeamUser, TeamUserCreate, TeamUserUpdate, TeamUserPublic,
     UserRole, UserRoleUpdate, UserRolePublic,
-    Schedule, ScheduleGridPublic,
-    Event, EventCreate, EventPublic, EventWithAssignmentsAndAvailabilityPublic,
-    EventAssignment, EventAssignmentUpdate, EventAssignmentPublic, EventAssignmentEmbeddedPublic,
-    UserUnavailablePeriod, UserUnavailablePeriodCreate, UserUnavailablePeriodUpdate, UserUnavailablePeriodPublic, UserUnavailablePeriodEmbeddedPublic
+    Schedule, ScheduleGridPublic, ScheduleGridCompactPublic, ScheduleGridIncludedPublic, GridRolePublic, GridUserPublic, GridTeamPublic, GridEventTypePublic,
+    Event, EventCreate, EventUpdate, EventPublic, EventWithAssignmentsAndAvailabilityPublic, EventCompactPublic,
+    EventAssignment, EventAssignmentUpdate, EventAssignmentPublic, EventAssignmentEmbeddedPublic, EventAssignmentCompactPublic,
+    UserUnavailablePeriod, UserUnavailablePeriodCreate, UserUnavailablePeriodUpdate, UserUnavailablePeriodPublic, UserUnavailablePeriodEmbeddedPublic, UserUnavailablePeriodImportPublic,
+    UserUnavailableRule, UserUnavailableRuleCreate, UserUnavailableRuleUpdate,
 )
 
-from app.utils.helpers import require_non_empty_payload
+from app.db.models.enums import ScheduleChangeType, GridFormat
+from app.utils.helpers import require_non_empty_payload, raise_exception_if_not_found
+from app.utils.fieldsets import Fields, related, related_paths
 from app.utils.exceptions import ConflictError, CheckConstraintError, EmptyPayloadError
-from app.services.queries import select_unavailable_users_for_month
+from app.services.queries import select_schedule_with_events_and_assignments, select_unavailable_users_for_month, select_schedules_overlapping_period, get_month_bounds
+from app.services.broker import publish_schedule_change
+from app.services.loaders import prime
+from app.services.availability import plan_period_merge, delete_periods, insert_periods, copy_periods, read_periods_csv, rule_occurrence_periods
+from app.services.recurrence import parse_rrule
+from app.services.candidates import mark_candidates_changed
+from app.services.coalescing import mark_schedule_grids_changed
+
+USER_ROLE_BATCH_SIZE = 500
+# on_progress(done, total) is called as fan-out work completes
+ProgressCallback = Callable[[int, int], None]
 
 # =============================
 # CREATE OBJECT
@@ -65,21 +80,15 @@ def delete_object(session: Session, object: SQLModel) -> None:
 # =============================
 # CREATE ROLE WITH USER ROLES
 # =============================
-def create_role_with_user_roles(session: Session, payload: RoleCreate) -> Role:
+def create_role_with_user_roles(session: Session, payload: RoleCreate, on_progress: ProgressCallback | None = None) -> Role:
     try:
         role = Role.model_validate(payload)
         session.add(role)
         session.flush()  # Flush to get the ID before creating UserRole records
 
         # Create user_roles for this new role for every user
-        new_user_roles = []
-        users = session.exec(select(User)).all()
-        untrained_proficiency_level = session.exec(select(ProficiencyLevel).where(ProficiencyLevel.code == "untrained")).first()
-        proficiency_level_id = untrained_proficiency_level.id if untrained_proficiency_level else None
-        for user in users:
-            new_user_roles.append(UserRole(user_id=user.id, role_id=role.id, proficiency_level_id=proficiency_level_id))
-
-        session.add_all(new_user_roles)
+        user_ids = session.exec(select(User.id)).all()
+        _add_untrained_user_roles(session, [(user_id, role.id) for user_id in user_ids], on_progress)
         session.commit()
         session.refresh(role)
         return role
@@ -90,21 +99,15 @@ def create_role_with_user_roles(session: Session, payload: RoleCreate) -> Role:
 # =============================
 # CREATE USER WITH USER ROLES
 # =============================
-def create_user_with_user_roles(session: Session, payload: UserCreate) -> User:
+def create_user_with_user_roles(session: Session, payload: UserCreate, on_progress: ProgressCallback | None = None) -> User:
     try:
         user = User.model_validate(payload)
         session.add(user)
         session.flush()  # Flush to get the ID before creating UserRole records
 
         # Create user_roles for this new user for every role
-        new_user_roles = []
-        roles = session.exec(select(Role)).all()
-        untrained_proficiency_level = session.exec(select(ProficiencyLevel).where(ProficiencyLevel.code == "untrained")).first()
-        proficiency_level_id = untrained_proficiency_level.id if untrained_proficiency_level else None
-        for role in roles:
-            new_user_roles.append(UserRole(user_id=user.id, role_id=role.id, proficiency_level_id=proficiency_level_id))
-
-        session.add_all(new_user_roles)
+        role_ids = session.exec(select(Role.id)).all()
+        _add_untrained_user_roles(session, [(user.id, role_id) for role_id in role_ids], on_progress)
         session.commit()
         session.refresh(user)
         return user
@@ -112,6 +115,18 @@ def create_user_with_user_roles(session: Session, payload: UserCreate) -> User:
         session.rollback()
         raise ConflictError("User creation violates a constraint") from e
 
+def _add_untrained_user_roles(session: Session, user_role_ids: list[tuple[UUID, UUID]], on_progress: ProgressCallback | None) -> None:
+    # Fan-out is flushed in batches so background jobs can report progress as it goes
+    untrained_proficiency_level = session.exec(select(ProficiencyLevel).where(ProficiencyLevel.code == "untrained")).first()
+    proficiency_level_id = untrained_proficiency_level.id if untrained_proficiency_level else None
+    total = len(user_role_ids)
+    for start in range(0, total, USER_ROLE_BATCH_SIZE):
+        batch = user_role_ids[start:start + USER_ROLE_BATCH_SIZE]
+        session.add_all(UserRole(user_id=user_id, role_id=role_id, proficiency_level_id=proficiency_level_id) for user_id, role_id in batch)
+        session.flush()
+        if on_progress:
+            on_progress(start + len(batch), total)
+
 # =============================
 # UPDATE USER ROLE
 # =============================
@@ -122,6 +137,7 @@ def update_user_role(session: Session, payload: UserRoleUpdate, user_role: UserR
             setattr(user_role, key, value)
         session.commit()
         session.refresh(user_role)
+        prime([user_role], "user", "role", "proficiency_level")
         return UserRolePublic.from_objects(user_role=user_role, user=user_role.user, role=user_role.role, proficiency_level=user_role.proficiency_level)
     except IntegrityError as e:
         session.rollback()
@@ -151,6 +167,7 @@ def update_team_user(session: Session, payload: TeamUserUpdate, team_user: TeamU
             setattr(team_user, key, value)
         session.commit()
         session.refresh(team_user)
+        prime([team_user], "team", "user")
         return TeamUserPublic.from_objects(team_user=team_user, team=team_user.team, user=team_user.user)
     except IntegrityError as e:
         session.rollback()
@@ -186,6 +203,53 @@ def get_schedule_grid_from_schedule(session: Session, schedule: Schedule) -> Sch
         )
     return ScheduleGridPublic.from_objects(schedule=schedule, events=schedule_grid_events)
 
+def get_compact_schedule_grid_from_schedule(session: Session, schedule: Schedule) -> ScheduleGridCompactPublic:
+    """The grid with events and assignments referencing ids, and each role, user, team and event type once in `included`."""
+    unavailable_users = select_unavailable_users_for_month(session=session, month=schedule.month, year=schedule.year)
+    unavailable_users = [] if unavailable_users is None else unavailable_users
+
+    roles, users, teams, event_types = {}, {}, {}, {}
+    events = []
+    for event in schedule.events:
+        event_types.setdefault(event.event_type_id, event.event_type)
+        if event.team is not None:
+            teams.setdefault(event.team_id, event.team)
+        event_assignments = []
+        for ea in event.event_assignments:
+            roles.setdefault(ea.role_id, ea.role)
+            if ea.assigned_user is not None:
+                users.setdefault(ea.assigned_user_id, ea.assigned_user)
+            event_assignments.append(EventAssignmentCompactPublic(
+                id=ea.id, role_id=ea.role_id, is_applicable=ea.is_applicable, requirement_level=ea.requirement_level,
+                assigned_user_id=ea.assigned_user_id, is_active=ea.is_active,
+            ))
+        unavailable_user_ids = []
+        for ua in unavailable_users:
+            if ua.starts_at < event.ends_at and ua.ends_at > event.starts_at:
+                users.setdefault(ua.user_id, ua.user)
+                unavailable_user_ids.append(ua.user_id)
+        events.append(EventCompactPublic(
+            id=event.id, title=event.title, starts_at=event.starts_at, ends_at=event.ends_at, team_id=event.team_id,
+            event_type_id=event.event_type_id, notes=event.notes, is_active=event.is_active,
+            event_assignments=event_assignments, unavailable_user_ids=unavailable_user_ids,
+        ))
+
+    included = ScheduleGridIncludedPublic(
+        roles={id: GridRolePublic(name=role.name, order=role.order, code=role.code) for id, role in roles.items()},
+        users={id: GridUserPublic(first_name=user.first_name, last_name=user.last_name) for id, user in users.items()},
+        teams={id: GridTeamPublic(name=team.name, code=team.code, is_active=team.is_active) for id, team in teams.items()},
+        event_types={id: GridEventTypePublic(name=et.name, code=et.code, is_active=et.is_active) for id, et in event_types.items()},
+    )
+    return ScheduleGridCompactPublic(schedule=schedule, events=events, included=included)
+
+def get_schedule_grid_json(session: Session, schedule_id: UUID, format: GridFormat = GridFormat.full) -> bytes:
+    """Load and serialize a schedule's grid in one go, so coalesced requests share the bytes."""
+    schedule = select_schedule_with_events_and_assignments(session, schedule_id)
+    raise_exception_if_not_found(schedule, Schedule)
+    if format == GridFormat.compact:
+        return get_compact_schedule_grid_from_schedule(session, schedule).model_dump_json().encode()
+    return get_schedule_grid_from_schedule(session, schedule).model_dump_json().encode()
+
 # =============================
 # CREATE EVENT WITH DEFAULT ASSIGNMENT SLOTS
 # =============================
@@ -198,61 +262,70 @@ def create_event_with_default_assignment_slots(session: Session, payload: EventC
         session.add(new_event)
         session.commit()
         session.refresh(new_event)
-        return new_event
     except IntegrityError as e:
         session.rollback()
         if "event_check_time_range" in str(e):
             raise CheckConstraintError("Start time must be before end time") from e
         raise ConflictError("Event creation violates a constraint") from e
+    publish_schedule_change(schedule.id, ScheduleChangeType.event_created, new_event.id, _event_change_data(new_event))
+    return new_event
+
+# =============================
+# UPDATE EVENT
+# =============================
+def update_event(session: Session, payload: EventUpdate, event: Event) -> Event:
+    updated_event = update_object(session, payload, event)
+    # Callers render EventPublic, which needs these many-to-one rows
+    prime([updated_event], "schedule", "event_type", "team")
+    publish_schedule_change(updated_event.schedule_id, ScheduleChangeType.event_updated, updated_event.id, payload.model_dump(exclude_unset=True))
+    return updated_event
+
+# =============================
+# DELETE EVENT
+# =============================
+def delete_event_object(session: Session, event: Event) -> None:
+    schedule_id, event_id = event.schedule_id, event.id
+    delete_object(session, event)
+    publish_schedule_change(schedule_id, ScheduleChangeType.event_deleted, event_id)
 
 # =============================
 # GET EVENT ASSIGNMENTS FROM EVENT
 # =============================
-def get_event_assignments_from_event(event: Event) -> list[EventAssignmentPublic]:
-    event_assignments_public = []
-    for ea in event.event_assignments:
-        assigned_user = ea.assigned_user
-        proficiency_level = None
-        if assigned_user:
-            proficiency_level = next((ur.proficiency_level for ur in assigned_user.user_roles if ur.role_id == ea.role_id), None)
-        
-        event_assignments_public.append(
-            EventAssignmentPublic.from_objects(
-                event_assignment=ea,
-                event=event,
-                role=ea.role,
-                event_type=event.event_type,
-                team=event.team,
-                assigned_user=assigned_user,
-                proficiency_level=proficiency_level,
-            )
-        )
-    return event_assignments_public
+def get_event_assignments_from_event(event: Event, fields: Fields = None) -> list[EventAssignmentPublic]:
+    return [build_event_assignment_public(ea, event, fields) for ea in event.event_assignments]
+
+def build_event_assignment_public(event_assignment: EventAssignment, event: Event | None, fields: Fields = None) -> EventAssignmentPublic:
+    # With a sparse fieldset, relationships it skipped were not loaded and are passed as None
+    assigned_user = related(event_assignment, "assigned_user", fields)
+    proficiency_level = None
+    if assigned_user and "assigned_user.user_roles.proficiency_level" in related_paths(fields, EventAssignmentPublic):
+        proficiency_level = next((ur.proficiency_level for ur in assigned_user.user_roles if ur.role_id == event_assignment.role_id), None)
+    return EventAssignmentPublic.from_objects(
+        event_assignment=event_assignment,
+        event=event,
+        role=related(event_assignment, "role", fields),
+        event_type=event and related(event, "event_type", fields),
+        team=event and related(event, "team", fields),
+        schedule=event and related(event, "schedule", fields),
+        assigned_user=assigned_user,
+        proficiency_level=proficiency_level,
+        fields=fields,
+    )
 
 # =============================
 # UPDATE EVENT ASSIGNMENT
 # =============================
-def update_event_assignment(session: Session, payload: EventAssignmentUpdate, event_assignment: EventAssignment) -> EventAssignmentPublic:
+def update_event_assignment(session: Session, payload: EventAssignmentUpdate, event_assignment: EventAssignment, fields: Fields = None) -> EventAssignmentPublic:
     try:
         payload_dict = require_non_empty_payload(payload)
         for key, value in payload_dict.items():
             setattr(event_assignment, key, value)
         session.commit()
         session.refresh(event_assignment)
-
-        if event_assignment.assigned_user:
-            proficiency_level = next((ur.proficiency_level for ur in event_assignment.assigned_user.user_roles if ur.role_id == event_assignment.role_id), None)
-        else:
-            proficiency_level = None
-        return EventAssignmentPublic.from_objects(
-            event_assignment=event_assignment,
-            event=event_assignment.event,
-            role=event_assignment.role,
-            event_type=event_assignment.event.event_type,
-            team=event_assignment.event.team,
-            assigned_user=event_assignment.assigned_user,
-            proficiency_level=proficiency_level
-        )
+        # The event is always needed for the change notification
+        prime([event_assignment], "event", *related_paths(fields, EventAssignmentPublic))
+        publish_schedule_change(event_assignment.event.schedule_id, ScheduleChangeType.assignment_updated, event_assignment.id, payload_dict)
+        return build_event_assignment_public(event_assignment, event_assignment.event, fields)
     except IntegrityError as e:
         session.rollback()
         raise ConflictError("Event assignment update violates a constraint") from e
@@ -266,6 +339,7 @@ def create_user_unavailable_period(session: Session, payload: UserUnavailablePer
         session.add(new_user_unavailable_period)
         session.commit()
         session.refresh(new_user_unavailable_period)
+        _publish_availability_changes(session, [new_user_unavailable_period], ScheduleChangeType.availability_added)
         return UserUnavailablePeriodPublic.from_objects(user_unavailable_period=new_user_unavailable_period, user=user)
     except IntegrityError as e:
         session.rollback()
@@ -276,31 +350,53 @@ def create_user_unavailable_period(session: Session, payload: UserUnavailablePer
 # =============================
 # CREATE USER UNAVAILABLE PERIODS IN BULK
 # =============================
-def create_user_unavailable_periods_bulk(session: Session, payload: list[UserUnavailablePeriodCreate], user: User) -> list[UserUnavailablePeriod]:
+def create_user_unavailable_periods_bulk(session: Session, payload: list[UserUnavailablePeriodCreate], user: User) -> list[UserUnavailablePeriodPublic]:
+    """
+    Store a batch of periods merged with each other and with the user's overlapping or touching periods:
+    returns the stored periods covering the batch (new merged ones and stored ones already covering it).
+    """
     if not payload:
         raise EmptyPayloadError("Payload cannot be empty")
-    bulk_periods = [UserUnavailablePeriod(user_id=user.id, starts_at=period.starts_at, ends_at=period.ends_at) for period in payload]
-    period_ids = [period.id for period in bulk_periods]
     try:
-        session.add_all(bulk_periods)
+        merge = plan_period_merge(session, user.id, [(period.starts_at, period.ends_at) for period in payload])
+        delete_periods(session, merge.replaced)
+        created_periods = insert_periods(session, user.id, merge.periods)
+        mark_candidates_changed(session, [user.id])
+        mark_schedule_grids_changed(session)
         session.commit()
-        # re-fetch to refresh the objects
-        refreshed_periods = session.exec(
-            select(UserUnavailablePeriod)
-            .where(UserUnavailablePeriod.id.in_(period_ids))
-            .options(selectinload(UserUnavailablePeriod.user))
-        ).all()
-        # build public models
-        public_periods = [
-            UserUnavailablePeriodPublic.from_objects(user_unavailable_period=period, user=period.user)
-            for period in refreshed_periods
-        ]
-        return public_periods
     except IntegrityError as e:
         session.rollback()
-        if "user_unavailable_period_check_time_range" in str(e):
-            raise CheckConstraintError("Start time must be before end time") from e
         raise ConflictError("User unavailable period creation violates a constraint") from e
+    _publish_availability_changes(session, merge.replaced, ScheduleChangeType.availability_deleted)
+    _publish_availability_changes(session, created_periods, ScheduleChangeType.availability_added)
+    return [
+        UserUnavailablePeriodPublic.from_objects(user_unavailable_period=period, user=user)
+        for period in sorted(created_periods + merge.covering, key=lambda period: period.starts_at)
+    ]
+
+# =============================
+# IMPORT USER UNAVAILABLE PERIODS FROM CSV
+# =============================
+def import_user_unavailable_periods_csv(session: Session, file: BinaryIO, user: User) -> UserUnavailablePeriodImportPublic:
+    """Same merging as the bulk create, for large CSV uploads: the merged periods are written with COPY."""
+    periods = read_periods_csv(file)
+    if not periods:
+        raise EmptyPayloadError("CSV file has no periods")
+    try:
+        merge = plan_period_merge(session, user.id, periods)
+        delete_periods(session, merge.replaced)
+        created_periods = copy_periods(session, user.id, merge.periods)
+        mark_candidates_changed(session, [user.id])
+        mark_schedule_grids_changed(session)
+        session.commit()
+    except IntegrityError as e:
+        session.rollback()
+        raise ConflictError("User unavailable period import violates a constraint") from e
+    _publish_availability_changes(session, merge.replaced, ScheduleChangeType.availability_deleted)
+    _publish_availability_changes(session, created_periods, ScheduleChangeType.availability_added)
+    return UserUnavailablePeriodImportPublic(
+        rows_count=len(periods), created_count=len(created_periods), replaced_count=len(merge.replaced), covered_count=len(merge.covering),
+    )
 
 # =============================
 # UPDATE USER UNAVAILABLE PERIOD
@@ -312,9 +408,114 @@ def update_user_unavailable_period(session: Session, payload: UserUnavailablePer
             setattr(user_unavailable_period, key, value)
         session.commit()
         session.refresh(user_unavailable_period)
+        _publish_availability_changes(session, [user_unavailable_period], ScheduleChangeType.availability_updated)
         return UserUnavailablePeriodPublic.from_objects(user_unavailable_period=user_unavailable_period, user=user_unavailable_period.user)
     except IntegrityError as e:
         session.rollback()
         if "user_unavailable_period_check_time_range" in str(e):
             raise CheckConstraintError("Start time must be before end time") from e
-        raise ConflictError("User unavailable period update violates a constraint") from e
\ No newline at end of file
+        raise ConflictError("User unavailable period update violates a constraint") from e
+
+# =============================
+# DELETE USER UNAVAILABLE PERIOD
+# =============================
+def delete_user_unavailable_period_object(session: Session, user_unavailable_period: UserUnavailablePeriod) -> None:
+    removed_period = UserUnavailablePeriod(
+        id=user_unavailable_period.id,
+        user_id=user_unavailable_period.user_id,
+        starts_at=user_unavailable_period.starts_at,
+        ends_at=user_unavailable_period.ends_at,
+    )
+    delete_object(session, user_unavailable_period)
+    _publish_availability_changes(session, [removed_period], ScheduleChangeType.availability_deleted)
+
+# =============================
+# GET USER UNAVAILABLE RULES
+# =============================
+def get_user_unavailable_rules(session: Session, user: User) -> list[UserUnavailableRule]:
+    return session.exec(
+        select(UserUnavailableRule).where(UserUnavailableRule.user_id == user.id).order_by(UserUnavailableRule.starts_at)
+    ).all()
+
+# =============================
+# CREATE USER UNAVAILABLE RULE
+# =============================
+def create_user_unavailable_rule(session: Session, payload: UserUnavailableRuleCreate, user: User) -> UserUnavailableRule:
+    new_user_unavailable_rule = UserUnavailableRule(
+        user_id=user.id, rrule=payload.rrule, starts_at=payload.starts_at, ends_at=payload.ends_at,
+        tzid=payload.tzid or settings.default_timezone, until=parse_rrule(payload.rrule).until,
+    )
+    try:
+        session.add(new_user_unavailable_rule)
+        session.commit()
+        session.refresh(new_user_unavailable_rule)
+    except IntegrityError as e:
+        session.rollback()
+        if "user_unavailable_rule_check_time_range" in str(e):
+            raise CheckConstraintError("Start time must be before end time") from e
+        raise ConflictError("User unavailable rule creation violates a constraint") from e
+    _publish_availability_changes(session, _scheduled_rule_occurrences(session, new_user_unavailable_rule), ScheduleChangeType.availability_added)
+    return new_user_unavailable_rule
+
+# =============================
+# UPDATE USER UNAVAILABLE RULE
+# =============================
+def update_user_unavailable_rule(session: Session, payload: UserUnavailableRuleUpdate, user_unavailable_rule: UserUnavailableRule) -> UserUnavailableRule:
+    """Schedules are notified of the old occurrences as deleted and of the new ones as added."""
+    payload_dict = require_non_empty_payload(payload)
+    removed_occurrences = _scheduled_rule_occurrences(session, user_unavailable_rule)
+    try:
+        for key, value in payload_dict.items():
+            setattr(user_unavailable_rule, key, value)
+        user_unavailable_rule.until = parse_rrule(user_unavailable_rule.rrule).until
+        session.commit()
+        session.refresh(user_unavailable_rule)
+    except IntegrityError as e:
+        session.rollback()
+        if "user_unavailable_rule_check_time_range" in str(e):
+            raise CheckConstraintError("Start time must be before end time") from e
+        raise ConflictError("User unavailable rule update violates a constraint") from e
+    _publish_availability_changes(session, removed_occurrences, ScheduleChangeType.availability_deleted)
+    _publish_availability_changes(session, _scheduled_rule_occurrences(session, user_unavailable_rule), ScheduleChangeType.availability_added)
+    return user_unavailable_rule
+
+# =============================
+# DELETE USER UNAVAILABLE RULE
+# =============================
+def delete_user_unavailable_rule_object(session: Session, user_unavailable_rule: UserUnavailableRule) -> None:
+    removed_occurrences = _scheduled_rule_occurrences(session, user_unavailable_rule)
+    delete_object(session, user_unavailable_rule)
+    _publish_availability_changes(session, removed_occurrences, ScheduleChangeType.availability_deleted)
+
+# =============================
+# SCHEDULE CHANGE NOTIFICATIONS
+# =============================
+def _event_change_data(event: Event) -> dict:
+    return event.model_dump(include={"title", "starts_at", "ends_at", "team_id", "event_type_id", "notes", "is_active"})
+
+def _scheduled_rule_occurrences(session: Session, rule: UserUnavailableRule) -> list[UserUnavailablePeriod]:
+    """Occurrences of a rule in the months that have a schedule (a rule without UNTIL never ends)."""
+    last_ends_at = rule.until + (rule.ends_at - rule.starts_at) if rule.until else datetime.max.replace(tzinfo=timezone.utc)
+    occurrences = {}
+    for schedule in select_schedules_overlapping_period(session, starts_at=rule.starts_at, ends_at=last_ends_at):
+        month_start, month_end = get_month_bounds(month=schedule.month, year=schedule.year)
+        for occurrence in rule_occurrence_periods([rule], month_start, month_end):
+            # An occurrence running into the next month is found from both
+            occurrences[occurrence.starts_at] = occurrence
+    return list(occurrences.values())
+
+def _publish_availability_changes(session: Session, periods: list[UserUnavailablePeriod], change_type: ScheduleChangeType) -> None:
+    """Notify every schedule whose month overlaps one of the periods."""
+    if not periods:
+        return
+    schedules = select_schedules_overlapping_period(
+        session, starts_at=min(p.starts_at for p in periods), ends_at=max(p.ends_at for p in periods)
+    )
+    for schedule in schedules:
+        month_start, month_end = get_month_bounds(month=schedule.month, year=schedule.year)
+        for period in periods:
+            if period.starts_at < month_end and period.ends_at > month_start:
+                publish_schedule_change(
+                    schedule.id, change_type, period.id,
+                    {"user_id": period.user_id, "starts_at": period.starts_at, "ends_at": period.ends_at},
+                )
\ No newline at end of file
@@ -0,0 +1,62 @@
+import io
+import csv
+import json
+from enum import Enum
+from uuid import UUID
+from typing import Iterable, Iterator
+from datetime import datetime, timezone
+from sqlalchemy import Row
+
+# Same columns as app/db/csv/event_assignments.csv so an export can be fed back into the seeder
+EVENT_ASSIGNMENTS_CSV_HEADER = [
+    "date", "role_code", "user_first_name", "event_type_code",
+    "sound_only", "sound_and_propresenter", "is_applicable", "requirement_level",
+]
+# Rows buffered per chunk handed to the response; keeps socket writes efficient without growing memory
+EXPORT_CHUNK_ROWS = 500
+
+def iter_event_assignments_csv(rows: Iterable[Row]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(EVENT_ASSIGNMENTS_CSV_HEADER)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([
+            # The seeder matches events on their UTC start date
+            row.event_starts_at.astimezone(timezone.utc).date().isoformat(),
+            row.role_code,
+            row.assigned_user_first_name or "",
+            row.event_type_code,
+            # sound_only and sound_and_propresenter are historical columns that are not stored
+            "FALSE",
+            "FALSE",
+            "TRUE" if row.is_applicable else "FALSE",
+            row.requirement_level.value,
+        ])
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield _drain(buffer)
+    yield _drain(buffer)
+
+def iter_event_assignments_ndjson(rows: Iterable[Row]) -> Iterator[str]:
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(row._mapping), default=_json_default))
+        if len(lines) == EXPORT_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+def _drain(buffer: io.StringIO) -> str:
+    chunk = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+    return chunk
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
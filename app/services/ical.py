@@ -0,0 +1,133 @@
+import hashlib
+import threading
+from uuid import UUID
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from sqlalchemy import Row
+from sqlmodel import Session
+
+from app.db.models import User
+from app.services.queries import select_user_calendar_version, select_user_calendar_rows
+
+CALENDAR_PRODID = "-//StewardHQ//Schedule//EN"
+CALENDAR_CACHE_MAX_USERS = 2048
+
+@dataclass
+class UserCalendar:
+    version: tuple[int, datetime | None, datetime | None]
+    etag: str
+    body: bytes = b""
+    # Rendered VEVENT blocks keyed by assignment id, reused across rebuilds while unchanged
+    vevents: dict[UUID, tuple[datetime, str]] = field(default_factory=dict)
+
+class UserCalendarCache:
+    """
+    Per-user iCalendar feeds cached in process (LRU bounded).
+
+    A feed is identified by a cheap version query (assignment count + latest `updated_at`, and the user's own), so
+    conditional GETs never render anything. When the version moves, only the VEVENTs whose
+    assignment, event or role changed are re-rendered.
+    """
+    def __init__(self, max_users: int = CALENDAR_CACHE_MAX_USERS):
+        self.max_users = max_users
+        self._feeds: OrderedDict[UUID, UserCalendar] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_version(self, session: Session, user: User) -> UserCalendar:
+        """Return the cached feed when it is current, otherwise a header-only stub for the new version."""
+        version = select_user_calendar_version(session, user.id)
+        with self._lock:
+            cached = self._feeds.get(user.id)
+            if cached and cached.version == version:
+                self._feeds.move_to_end(user.id)
+                return cached
+        return _calendar_stub(user, version, previous=cached)
+
+    def get_feed(self, session: Session, user: User, calendar: UserCalendar) -> UserCalendar:
+        """Render the feed body for a calendar returned by get_version (no-op when already cached)."""
+        if calendar.body:
+            return calendar
+        previous = calendar.vevents
+        vevents = {}
+        for row in select_user_calendar_rows(session, user.id):
+            cached_vevent = previous.get(row.id)
+            if cached_vevent and cached_vevent[0] == row.updated_at:
+                vevents[row.id] = cached_vevent
+            else:
+                vevents[row.id] = (row.updated_at, _render_vevent(row))
+        calendar.vevents = vevents
+        calendar.body = _render_calendar(user, [vevent for _, vevent in vevents.values()])
+        with self._lock:
+            self._feeds[user.id] = calendar
+            self._feeds.move_to_end(user.id)
+            while len(self._feeds) > self.max_users:
+                self._feeds.popitem(last=False)
+        return calendar
+
+    def clear(self) -> None:
+        with self._lock:
+            self._feeds.clear()
+
+user_calendar_cache = UserCalendarCache()
+
+def _calendar_stub(user: User, version: tuple[int, datetime | None, datetime | None], previous: UserCalendar | None) -> UserCalendar:
+    count, last_updated_at, user_updated_at = version
+    fingerprint = ":".join([str(user.id), str(count), *(value.isoformat() if value else "" for value in (last_updated_at, user_updated_at))])
+    return UserCalendar(
+        version=version,
+        etag=f'"{hashlib.sha1(fingerprint.encode()).hexdigest()}"',
+        vevents=previous.vevents if previous else {},
+    )
+
+def _render_calendar(user: User, vevents: list[str]) -> bytes:
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{CALENDAR_PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        _fold(f"X-WR-CALNAME:{_escape(f'{user.first_name} {user.last_name} - Assignments')}"),
+    ]
+    body = "\r\n".join(lines) + "\r\n" + "".join(vevents) + "END:VCALENDAR\r\n"
+    return body.encode("utf-8")
+
+def _render_vevent(row: Row) -> str:
+    summary = f"{row.role_name} - {row.event_title}" if row.event_title else row.role_name
+    cancelled = not (row.is_active and row.is_applicable and row.event_is_active)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{row.id}@stewardhq",
+        f"DTSTAMP:{_format_datetime(row.updated_at)}",
+        f"LAST-MODIFIED:{_format_datetime(row.updated_at)}",
+        f"DTSTART:{_format_datetime(row.event_starts_at)}",
+        f"DTEND:{_format_datetime(row.event_ends_at)}",
+        _fold(f"SUMMARY:{_escape(summary.strip())}"),
+        f"STATUS:{'CANCELLED' if cancelled else 'CONFIRMED'}",
+    ]
+    if row.event_notes:
+        lines.append(_fold(f"DESCRIPTION:{_escape(row.event_notes)}"))
+    lines.append("END:VEVENT")
+    return "\r\n".join(lines) + "\r\n"
+
+def _format_datetime(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+
+def _fold(line: str) -> str:
+    # RFC 5545: content lines are folded at 75 octets with CRLF + single space
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts, start = [], 0
+    while start < len(encoded):
+        limit = 75 if start == 0 else 74
+        end = min(start + limit, len(encoded))
+        # Never split inside a multi-byte UTF-8 sequence
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode("utf-8"))
+        start = end
+    return "\r\n ".join(parts)
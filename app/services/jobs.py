@@ -0,0 +1,247 @@
+import time
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from uuid import UUID
+from typing import Any, Callable
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import Engine, update
+from sqlmodel import Session, SQLModel, select
+
+from app.settings import settings
+from app.db.models import Job, RoleCreate, UserCreate
+from app.db.models.enums import JobKind, JobStatus
+from app.utils.exceptions import ConflictError, CheckConstraintError
+from app.services.domain import ProgressCallback, create_role_with_user_roles, create_user_with_user_roles
+from app.services.summaries import TRACK_SUMMARIES_KEY
+
+logger = logging.getLogger(__name__)
+
+# Idle workers re-check the queue this often even without a wake-up (jobs enqueued by other processes)
+JOB_POLL_SECONDS = 5
+# Progress writes are throttled so a chatty handler does not turn into a write per item
+JOB_PROGRESS_INTERVAL_SECONDS = 0.5
+# A job requeued this many times (its worker keeps dying) is failed instead
+JOB_MAX_ATTEMPTS = 3
+JOB_ABANDONED_ERROR = "The worker running the job stopped before it finished"
+
+JobHandler = Callable[[Session, dict[str, Any], ProgressCallback], dict[str, Any]]
+
+def _run_role_create(session: Session, payload: dict[str, Any], on_progress: ProgressCallback) -> dict[str, Any]:
+    role = create_role_with_user_roles(session, RoleCreate.model_validate(payload), on_progress)
+    return {"role_id": str(role.id)}
+
+def _run_user_create(session: Session, payload: dict[str, Any], on_progress: ProgressCallback) -> dict[str, Any]:
+    user = create_user_with_user_roles(session, UserCreate.model_validate(payload), on_progress)
+    return {"user_id": str(user.id)}
+
+JOB_HANDLERS: dict[JobKind, JobHandler] = {
+    JobKind.role_create: _run_role_create,
+    JobKind.user_create: _run_user_create,
+}
+
+class JobBackend(ABC):
+    """Durable storage for jobs. Every method runs in a worker thread with its own short session."""
+    @abstractmethod
+    def enqueue(self, session: Session, kind: JobKind, payload: dict[str, Any]) -> Job: ...
+
+    @abstractmethod
+    def claim(self, session: Session) -> Job | None: ...
+
+    @abstractmethod
+    def report_progress(self, session: Session, job_id: UUID, done: int, total: int) -> None: ...
+
+    @abstractmethod
+    def finish(self, session: Session, job_id: UUID, result: dict[str, Any] | None = None, error: str | None = None) -> None: ...
+
+    @abstractmethod
+    def requeue_stale(self, session: Session, updated_before: datetime) -> int:
+        """Requeue running jobs not updated since updated_before (their worker died). Returns how many."""
+
+class PostgresJobBackend(JobBackend):
+    """
+    Job queue on the `jobs` table.
+
+    Workers claim the oldest queued row with `FOR UPDATE SKIP LOCKED`, so any number of workers in
+    any number of processes can poll the same table without handing out a job twice.
+    """
+    def enqueue(self, session: Session, kind: JobKind, payload: dict[str, Any]) -> Job:
+        job = Job(kind=kind, payload=payload)
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+        return job
+
+    def claim(self, session: Session) -> Job | None:
+        job = session.exec(
+            select(Job)
+            .where(Job.status == JobStatus.queued)
+            .order_by(Job.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        if job is None:
+            return None
+        job.status = JobStatus.running
+        job.attempts += 1
+        job.started_at = datetime.now(timezone.utc)
+        session.commit()
+        session.refresh(job)
+        return job
+
+    def report_progress(self, session: Session, job_id: UUID, done: int, total: int) -> None:
+        session.exec(update(Job).where(Job.id == job_id).values(progress_done=done, progress_total=total))
+        session.commit()
+
+    def finish(self, session: Session, job_id: UUID, result: dict[str, Any] | None = None, error: str | None = None) -> None:
+        session.exec(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(
+                status=JobStatus.failed if error else JobStatus.succeeded,
+                result=result,
+                error=error,
+                finished_at=datetime.now(timezone.utc),
+            )
+        )
+        session.commit()
+
+    def requeue_stale(self, session: Session, updated_before: datetime) -> int:
+        # updated_at moves on claim and on every progress write, so it doubles as the heartbeat
+        stale = (Job.status == JobStatus.running, Job.updated_at < updated_before)
+        session.exec(
+            update(Job)
+            .where(*stale, Job.attempts >= JOB_MAX_ATTEMPTS)
+            .values(status=JobStatus.failed, error=JOB_ABANDONED_ERROR, finished_at=datetime.now(timezone.utc))
+        )
+        requeued = session.exec(
+            update(Job)
+            .where(*stale)
+            .values(status=JobStatus.queued, started_at=None, progress_done=0)
+        ).rowcount
+        session.commit()
+        return requeued
+
+class JobRunner:
+    """
+    In-process asyncio job runner.
+
+    A fixed number of worker tasks bounds concurrency; each claims one job at a time and runs its
+    (synchronous) handler in a thread, so the event loop and request latency are unaffected.
+    """
+    def __init__(self, engine: Engine, backend: JobBackend, concurrency: int = 2, poll_seconds: float = JOB_POLL_SECONDS):
+        self.engine = engine
+        self.backend = backend
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._workers: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def notify(self) -> None:
+        """Wake idle workers; safe to call from the threadpool that runs sync routes."""
+        if self._loop and self._wakeup:
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass
+
+    def requeue_stale_jobs(self, stale_seconds: float) -> int:
+        """Requeue the jobs left running by a worker that crashed or was killed (e.g. during a deploy)."""
+        with Session(self.engine) as session:
+            requeued = self.backend.requeue_stale(session, datetime.now(timezone.utc) - timedelta(seconds=stale_seconds))
+        if requeued:
+            logger.warning("Requeued %d job(s) left running by a stopped worker", requeued)
+        return requeued
+
+    def run_next(self) -> bool:
+        """Claim and run one queued job in the calling thread. Returns False when nothing was queued."""
+        with Session(self.engine) as session:
+            job = self.backend.claim(session)
+            if job is None:
+                return False
+            job_id, kind, payload = job.id, job.kind, job.payload
+
+        result, error = None, None
+        try:
+            with Session(self.engine, info={TRACK_SUMMARIES_KEY: True}) as session:
+                result = JOB_HANDLERS[kind](session, payload, self._progress_reporter(job_id))
+        except (ConflictError, CheckConstraintError) as e:
+            error = str(e)
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job_id, kind.value)
+            error = f"{type(e).__name__}: {e}"
+
+        with Session(self.engine) as session:
+            self.backend.finish(session, job_id, result=result, error=error)
+        return True
+
+    async def _work(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                ran = await asyncio.to_thread(self.run_next)
+            except Exception:
+                logger.exception("Job worker failed to claim a job")
+                ran = False
+            if not ran:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    def _progress_reporter(self, job_id: UUID) -> ProgressCallback:
+        last_reported_at = 0.0
+
+        def report(done: int, total: int) -> None:
+            nonlocal last_reported_at
+            now = time.monotonic()
+            if done < total and now - last_reported_at < JOB_PROGRESS_INTERVAL_SECONDS:
+                return
+            last_reported_at = now
+            # Own session: the handler's transaction is still open and its writes are not visible yet
+            with Session(self.engine) as session:
+                self.backend.report_progress(session, job_id, done, total)
+
+        return report
+
+_backend: JobBackend = PostgresJobBackend()
+_runner: JobRunner | None = None
+
+def get_job_runner() -> JobRunner | None:
+    return _runner
+
+async def start_job_runner(engine: Engine, concurrency: int, backend: JobBackend | None = None) -> None:
+    """Start the worker tasks. Called from the application lifespan."""
+    global _runner, _backend
+    _backend = backend or _backend
+    _runner = JobRunner(engine, _backend, concurrency=concurrency)
+    try:
+        await asyncio.to_thread(_runner.requeue_stale_jobs, settings.job_stale_seconds)
+    except Exception:
+        logger.exception("Failed to requeue stale jobs")
+    await _runner.start()
+
+async def stop_job_runner() -> None:
+    global _runner
+    if _runner:
+        await _runner.stop()
+        _runner = None
+
+def enqueue_job(session: Session, kind: JobKind, payload: SQLModel) -> Job:
+    """Persist a job for a validated payload and wake the local workers."""
+    job = _backend.enqueue(session, kind, payload.model_dump(mode="json"))
+    if _runner:
+        _runner.notify()
+    return job
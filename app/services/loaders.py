@@ -0,0 +1,110 @@
+from uuid import UUID
+from typing import Iterable, Type, TypeVar
+from collections import defaultdict
+from sqlmodel import Session, SQLModel, select
+from sqlalchemy import Column, inspect
+from sqlalchemy.orm import RelationshipProperty, object_session
+from sqlalchemy.orm.interfaces import MANYTOONE, ONETOMANY
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+class RequestLoader:
+    """
+    Request-scoped, DataLoader-style batching on top of the session identity map.
+
+    Rows are keyed by (model, id). `load_many` only queries ids that are not already live in the
+    session, and `prime` fills relationships for a whole list of objects with one `IN` query per
+    relationship level instead of one lazy load per object. A single row is just `session.get`.
+
+    The `require_*` dependencies in app.utils.dependencies don't go through it: they load one root
+    row with `selectinload` options, which already issue one `IN` query per relationship level, and
+    nothing is in the identity map yet to skip. The loader pays off where objects arrive in lists
+    or already loaded: the schedule and event builders and the domain functions.
+    """
+    def __init__(self, session: Session):
+        self.session = session
+
+    def load_many(self, model: Type[ModelT], ids: Iterable[UUID | None]) -> dict[UUID, ModelT]:
+        found, missing = {}, []
+        for id in {id for id in ids if id is not None}:
+            obj = self.session.identity_map.get(identity_key(model, id))
+            if obj is not None and not inspect(obj).expired:
+                found[id] = obj
+            else:
+                missing.append(id)
+        if missing:
+            for obj in self.session.exec(select(model).where(model.id.in_(missing))).all():
+                found[obj.id] = obj
+        return found
+
+    def prime(self, objects: Iterable[SQLModel], *paths: str) -> None:
+        """
+        Load relationship paths (e.g. "events.event_assignments.role") for all objects, one batched
+        query per relationship level. Relationships that are already loaded are left untouched.
+        """
+        objects = [obj for obj in objects if obj is not None]
+        for path in paths:
+            level = objects
+            for name in path.split("."):
+                if not level:
+                    break
+                self._prime_relationship(level, name)
+                level = _collect(level, name)
+
+    def _prime_relationship(self, objects: list[SQLModel], name: str) -> None:
+        relationship = inspect(type(objects[0])).relationships[name]
+        pending = [obj for obj in objects if name in inspect(obj).unloaded]
+        if not pending:
+            return
+        local_column, remote_column = _key_pair(relationship)
+        if relationship.direction is MANYTOONE:
+            foreign_key = relationship.parent.get_property_by_column(local_column).key
+            targets = self.load_many(relationship.mapper.class_, (getattr(obj, foreign_key) for obj in pending))
+            for obj in pending:
+                set_committed_value(obj, name, targets.get(getattr(obj, foreign_key)))
+        elif relationship.direction is ONETOMANY:
+            target_model = relationship.mapper.class_
+            key = relationship.parent.get_property_by_column(local_column).key
+            foreign_key = relationship.mapper.get_property_by_column(remote_column).key
+            children = defaultdict(list)
+            statement = select(target_model).where(getattr(target_model, foreign_key).in_([getattr(obj, key) for obj in pending]))
+            for child in self.session.exec(statement).all():
+                children[getattr(child, foreign_key)].append(child)
+            for obj in pending:
+                set_committed_value(obj, name, children[getattr(obj, key)])
+
+def get_loader(session: Session) -> RequestLoader:
+    """Return the loader bound to this session; sessions are per request, so the loader is too."""
+    loader = session.info.get("request_loader")
+    if loader is None:
+        loader = session.info["request_loader"] = RequestLoader(session)
+    return loader
+
+def prime(objects: Iterable[SQLModel], *paths: str) -> None:
+    """Prime relationship paths for ORM objects attached to a session; detached objects are skipped."""
+    objects = [obj for obj in objects if obj is not None]
+    session = object_session(objects[0]) if objects else None
+    if session is not None:
+        get_loader(session).prime(objects, *paths)
+
+def _key_pair(relationship: RelationshipProperty) -> tuple[Column, Column]:
+    # The (local, remote) column pair on the "one" side's single-column primary key. Other pairs of a
+    # composite join (e.g. starts_at next to id for the partitioned events) follow from that key.
+    one_side, index = (relationship.mapper, 1) if relationship.direction is MANYTOONE else (relationship.parent, 0)
+    primary_key = one_side.primary_key
+    pairs = [pair for pair in relationship.local_remote_pairs if len(primary_key) == 1 and pair[index] is primary_key[0]]
+    if len(pairs) != 1:
+        raise ValueError(f"{relationship}: only joins on a single-column primary key can be primed")
+    return pairs[0]
+
+def _collect(objects: list[SQLModel], name: str) -> list[SQLModel]:
+    # Many-to-one targets repeat (e.g. the same role on every event), so dedupe by identity
+    collected = {}
+    for obj in objects:
+        value = getattr(obj, name)
+        for child in value if isinstance(value, list) else [value]:
+            if child is not None:
+                collected[id(child)] = child
+    return list(collected.values())
@@ -1,10 +1,13 @@
 from uuid import UUID
+from typing import Iterable, Iterator
 from datetime import datetime, timezone
 from calendar import monthrange
-from sqlmodel import Session, select
+from sqlmodel import Session, SQLModel, select
+from sqlalchemy import Row, func, or_
 from sqlalchemy.orm import selectinload
 
-from app.db.models import UserRole, User, Schedule, Event, EventAssignment, UserUnavailablePeriod
+from app.db.models import Role, ProficiencyLevel, EventType, Team, UserRole, User, Schedule, Event, EventAssignment, UserUnavailablePeriod, UserUnavailableRule, ScheduleSummary
+from app.services.availability import rule_occurrence_periods
 
 def select_schedule_with_events_and_assignments(session: Session, schedule_id: UUID) -> Schedule | None:
     return session.exec(
@@ -18,41 +21,192 @@ def select_schedule_with_events_and_assignments(session: Session, schedule_id: U
         )
     ).one_or_none()
 
-def select_event_with_full_hierarchy(session: Session, event_id: UUID) -> Event | None:
+EVENT_HIERARCHY_PATHS = (
+    "schedule", "team", "event_type",
+    "event_assignments.role", "event_assignments.assigned_user.user_roles.proficiency_level",
+)
+EVENT_ASSIGNMENT_PATHS = ("event", "role", "assigned_user.user_roles.proficiency_level")
+
+def selectinload_paths(model: type[SQLModel], paths: Iterable[str]) -> list:
+    """selectinload options for relationship paths written as in loaders.prime (e.g. "event_assignments.role")."""
+    options = []
+    for path in paths:
+        option, related = None, model
+        for name in path.split("."):
+            attribute = getattr(related, name)
+            option = selectinload(attribute) if option is None else option.selectinload(attribute)
+            related = attribute.property.mapper.class_
+        options.append(option)
+    return options
+
+def select_event_with_full_hierarchy(session: Session, event_id: UUID, paths: Iterable[str] = EVENT_HIERARCHY_PATHS) -> Event | None:
+    # paths: the parts of the hierarchy to load; sparse fieldsets pass only those their fields read
     return session.exec(
         select(Event)
         .where(Event.id == event_id)
-        .options(
-            selectinload(Event.schedule),
-            selectinload(Event.team),
-            selectinload(Event.event_type),
-            selectinload(Event.event_assignments).selectinload(EventAssignment.role),
-            selectinload(Event.event_assignments).selectinload(EventAssignment.assigned_user).selectinload(User.user_roles).selectinload(UserRole.proficiency_level)
-        )
+        .options(*selectinload_paths(Event, paths))
     ).one_or_none()
 
-def select_full_event_assignment(session: Session, event_assignment_id: UUID) -> EventAssignment | None:
+def select_full_event_assignment(session: Session, event_assignment_id: UUID, paths: Iterable[str] = EVENT_ASSIGNMENT_PATHS) -> EventAssignment | None:
     return session.exec(
         select(EventAssignment)
         .where(EventAssignment.id == event_assignment_id)
-        .options(
-            selectinload(EventAssignment.event),
-            selectinload(EventAssignment.role),
-            selectinload(EventAssignment.assigned_user).selectinload(User.user_roles).selectinload(UserRole.proficiency_level)
-        )
+        .options(*selectinload_paths(EventAssignment, paths))
     ).one_or_none()
 
-def select_unavailable_users_for_month(session: Session, month: int, year: int) -> list[UserUnavailablePeriod]:
+def stream_event_assignment_export_rows(
+    session: Session,
+    starts_at: datetime | None = None,
+    ends_at: datetime | None = None,
+    schedule_id: UUID | None = None,
+    batch_size: int = 500,
+) -> Iterator[Row]:
+    # Flat column rows (no ORM entities) fetched through a server-side cursor, so memory stays
+    # bounded by batch_size regardless of the date range
+    statement = (
+        select(
+            EventAssignment.id, EventAssignment.event_id, EventAssignment.role_id, EventAssignment.assigned_user_id,
+            EventAssignment.is_applicable, EventAssignment.requirement_level, EventAssignment.is_active,
+            Event.schedule_id, Event.title.label("event_title"), Event.starts_at.label("event_starts_at"), Event.ends_at.label("event_ends_at"),
+            EventType.code.label("event_type_code"), Team.code.label("event_team_code"),
+            Role.code.label("role_code"), Role.name.label("role_name"),
+            User.first_name.label("assigned_user_first_name"), User.last_name.label("assigned_user_last_name"),
+        )
+        .join(EventAssignment.event)
+        .join(EventType, Event.event_type_id == EventType.id)
+        .join(Role, EventAssignment.role_id == Role.id)
+        .outerjoin(Team, Event.team_id == Team.id)
+        .outerjoin(User, EventAssignment.assigned_user_id == User.id)
+        .order_by(Event.starts_at, Event.id, Role.order)
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+    # Range bounds go on both partition keys so only the partitions for those years are scanned
+    if starts_at is not None:
+        statement = statement.where(Event.starts_at >= starts_at, EventAssignment.event_starts_at >= starts_at)
+    if ends_at is not None:
+        statement = statement.where(Event.starts_at < ends_at, EventAssignment.event_starts_at < ends_at)
+    if schedule_id is not None:
+        statement = statement.where(Event.schedule_id == schedule_id)
+    yield from session.exec(statement)
+
+def select_schedule_events_version(session: Session, schedule_id: UUID) -> tuple[int, datetime | None]:
+    # Cheap fingerprint of a schedule's events alone (not their assignments): count plus latest change
+    count, last_updated_at = session.exec(
+        select(func.count(Event.id), func.max(Event.updated_at)).where(Event.schedule_id == schedule_id)
+    ).one()
+    return count, last_updated_at
+
+def select_schedule_summary_version(session: Session, schedule_id: UUID) -> int | None:
+    # None until the schedule's summary row is first written
+    return session.exec(select(ScheduleSummary.version).where(ScheduleSummary.schedule_id == schedule_id)).one_or_none()
+
+def select_user_calendar_version(session: Session, user_id: UUID) -> tuple[int, datetime | None, datetime | None]:
+    # Cheap fingerprint of everything that feeds a user's calendar: assignment count plus the latest
+    # change across the assignments, their events and roles, and the user's own (the calendar name)
+    count, last_updated_at, user_updated_at = session.exec(
+        select(
+            func.count(EventAssignment.id),
+            func.max(func.greatest(EventAssignment.updated_at, Event.updated_at, Role.updated_at)),
+            select(User.updated_at).where(User.id == user_id).scalar_subquery(),
+        )
+        .join(EventAssignment.event)
+        .join(Role, EventAssignment.role_id == Role.id)
+        .where(EventAssignment.assigned_user_id == user_id)
+    ).one()
+    return count, last_updated_at, user_updated_at
+
+def select_user_calendar_rows(session: Session, user_id: UUID) -> list[Row]:
+    return session.exec(
+        select(
+            EventAssignment.id, EventAssignment.is_active, EventAssignment.is_applicable,
+            func.greatest(EventAssignment.updated_at, Event.updated_at, Role.updated_at).label("updated_at"),
+            Event.title.label("event_title"), Event.starts_at.label("event_starts_at"), Event.ends_at.label("event_ends_at"),
+            Event.notes.label("event_notes"), Event.is_active.label("event_is_active"),
+            Role.name.label("role_name"),
+        )
+        .join(EventAssignment.event)
+        .join(Role, EventAssignment.role_id == Role.id)
+        .where(EventAssignment.assigned_user_id == user_id)
+        .order_by(Event.starts_at)
+    ).all()
+
+def select_schedule_slot_counts(session: Session, schedule_id: UUID) -> list[Row]:
+    # One row per (role, requirement level, assigned user) over the schedule's live slots: active,
+    # applicable assignments on active events
+    return session.exec(
+        select(
+            EventAssignment.role_id, EventAssignment.requirement_level, EventAssignment.assigned_user_id,
+            func.count().label("slots"),
+        )
+        .join(EventAssignment.event)
+        .join(Role, EventAssignment.role_id == Role.id)
+        .where(Event.schedule_id == schedule_id)
+        .where(Event.is_active, EventAssignment.is_active, EventAssignment.is_applicable)
+        .group_by(EventAssignment.role_id, Role.order, EventAssignment.requirement_level, EventAssignment.assigned_user_id)
+        .order_by(Role.order)
+    ).all()
+
+def select_schedule_events_count(session: Session, schedule_id: UUID) -> int:
+    return session.exec(select(func.count(Event.id)).where(Event.schedule_id == schedule_id)).one()
+
+def get_month_bounds(month: int, year: int) -> tuple[datetime, datetime]:
     # Calculate the start and end of the month in UTC
     month_start = datetime(year, month, 1, tzinfo=timezone.utc)
     _, last_day = monthrange(year, month)
     month_end = datetime(year, month, last_day, 23, 59, 59, tzinfo=timezone.utc)
-    
-    # Find all periods that overlap with the month
+    return month_start, month_end
+
+def select_unavailable_users_for_month(session: Session, month: int, year: int, user_ids: Iterable[UUID] | None = None) -> list[UserUnavailablePeriod]:
+    month_start, month_end = get_month_bounds(month=month, year=year)
+
+    # Find all periods that overlap with the month, and the occurrences of recurring rules that do
     # A period overlaps if: starts_at < month_end AND ends_at > month_start
-    return session.exec(
+    periods_statement = (
         select(UserUnavailablePeriod)
         .where(UserUnavailablePeriod.starts_at < month_end)
         .where(UserUnavailablePeriod.ends_at > month_start)
         .options(selectinload(UserUnavailablePeriod.user))
-    ).all()
\ No newline at end of file
+    )
+    # Recurring rules live in the month (an occurrence starting up to its length before the month can run into it)
+    rules_statement = (
+        select(UserUnavailableRule)
+        .where(UserUnavailableRule.starts_at < month_end)
+        .where(or_(
+            UserUnavailableRule.until.is_(None),
+            UserUnavailableRule.until + (UserUnavailableRule.ends_at - UserUnavailableRule.starts_at) > month_start,
+        ))
+        .options(selectinload(UserUnavailableRule.user))
+    )
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        periods_statement = periods_statement.where(UserUnavailablePeriod.user_id.in_(user_ids))
+        rules_statement = rules_statement.where(UserUnavailableRule.user_id.in_(user_ids))
+    periods = session.exec(periods_statement).all()
+    rules = session.exec(rules_statement).all()
+    return [*periods, *rule_occurrence_periods(rules, month_start, month_end)]
+
+def select_assignable_user_roles(session: Session, user_ids: Iterable[UUID] | None = None) -> list[Row]:
+    # (user_id, role_id) of every user role held at an assignable proficiency level
+    statement = (
+        select(UserRole.user_id, UserRole.role_id)
+        .join(ProficiencyLevel, UserRole.proficiency_level_id == ProficiencyLevel.id)
+        .where(ProficiencyLevel.is_assignable)
+    )
+    if user_ids is not None:
+        statement = statement.where(UserRole.user_id.in_(list(user_ids)))
+    return session.exec(statement).all()
+
+def select_schedules_overlapping_period(session: Session, starts_at: datetime, ends_at: datetime) -> list[Schedule]:
+    # Schedules are month-long, so compare on a (year * 12 + month) index in UTC
+    first_month_index = _month_index(starts_at)
+    last_month_index = _month_index(ends_at)
+    schedule_month_index = Schedule.year * 12 + Schedule.month - 1
+    return session.exec(
+        select(Schedule)
+        .where(schedule_month_index >= first_month_index)
+        .where(schedule_month_index <= last_month_index)
+    ).all()
+
+def _month_index(value: datetime) -> int:
+    value = value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    return value.year * 12 + value.month - 1
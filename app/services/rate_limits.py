@@ -0,0 +1,182 @@
+import math
+import time
+import logging
+import threading
+from dataclasses import dataclass
+
+from app.utils.metrics import describe_counter, increment_counter
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "rate_limit:"
+RATE_LIMIT_DECISIONS = "rate_limit_decisions_total"
+describe_counter(RATE_LIMIT_DECISIONS, "Rate limiter decisions by outcome and limiting bucket")
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A token bucket: up to `capacity` requests in a burst, refilled at `per_second` requests per second."""
+    capacity: float
+    per_second: float
+
+    @classmethod
+    def per_minute(cls, requests: float) -> "RateLimit":
+        return cls(capacity=requests, per_second=requests / 60)
+
+@dataclass(frozen=True)
+class RateLimitBucket:
+    name: str  # Metrics label: which bucket this is ("key", "route")
+    key: str
+    limit: RateLimit
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    retry_after: float = 0.0
+    limited_by: str | None = None
+
+# Requests per minute per API key and route for the expensive reads; every request also draws from
+# the key's overall bucket (RATE_LIMIT_PER_MINUTE)
+ROUTE_RATE_LIMITS = {
+    ("GET", "/schedules/{id}/grid"): RateLimit.per_minute(120),
+    ("GET", "/schedules/{id}/summary"): RateLimit.per_minute(120),
+    ("GET", "/exports/assignments"): RateLimit.per_minute(10),
+    ("GET", "/analytics/load"): RateLimit.per_minute(30),
+}
+
+def refill(tokens: float, updated_at: float, now: float, limit: RateLimit) -> float:
+    return min(limit.capacity, tokens + max(0.0, now - updated_at) * limit.per_second)
+
+def get_request_buckets(identity: str, method: str, route: str, per_key: RateLimit) -> list[RateLimitBucket]:
+    # The {identity} hash tag keeps a client's buckets in one Redis Cluster slot for the script
+    buckets = [RateLimitBucket("key", f"{REDIS_KEY_PREFIX}{{{identity}}}", per_key)]
+    route_limit = ROUTE_RATE_LIMITS.get((method, route))
+    if route_limit:
+        buckets.append(RateLimitBucket("route", f"{REDIS_KEY_PREFIX}{{{identity}}}:{method}:{route}", route_limit))
+    return buckets
+
+def decide(buckets: list[RateLimitBucket], levels: list[float]) -> RateLimitDecision:
+    """All-or-nothing decision over refilled bucket levels; retry_after is the longest wait for a token."""
+    waits = [((1 - tokens) / bucket.limit.per_second, bucket) for bucket, tokens in zip(buckets, levels) if tokens < 1]
+    if not waits:
+        return RateLimitDecision(allowed=True)
+    retry_after, bucket = max(waits, key=lambda wait: wait[0])
+    return RateLimitDecision(allowed=False, retry_after=retry_after, limited_by=bucket.name)
+
+class InMemoryRateLimiter:
+    """
+    Token buckets held in this process; each worker process limits independently.
+
+    A request takes one token from every bucket or from none: when any bucket is empty nothing is
+    consumed and the wait until all of them have a token is returned as retry_after.
+    """
+    def __init__(self):
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def acquire(self, buckets: list[RateLimitBucket]) -> RateLimitDecision:
+        with self._lock:
+            now = time.monotonic()
+            levels = [refill(*self._buckets.get(bucket.key, (bucket.limit.capacity, now)), now, bucket.limit) for bucket in buckets]
+            decision = decide(buckets, levels)
+            for bucket, tokens in zip(buckets, levels):
+                self._buckets[bucket.key] = (tokens - 1 if decision.allowed else tokens, now)
+        return decision
+
+    def reset(self) -> None:
+        self._buckets.clear()
+
+# KEYS: bucket keys; ARGV: capacity and per-second rate of each bucket in turn. Same arithmetic as
+# InMemoryRateLimiter, atomically on the Redis server's clock so every process shares the buckets.
+# Returns {allowed, retry_after, index of the limiting bucket (1-based, 0 if allowed)}.
+TOKEN_BUCKET_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local levels, retry_after, limited_by = {}, 0, 0
+for i, key in ipairs(KEYS) do
+    local capacity, rate = tonumber(ARGV[i * 2 - 1]), tonumber(ARGV[i * 2])
+    local state = redis.call('HMGET', key, 'tokens', 'updated_at')
+    local tokens = tonumber(state[1]) or capacity
+    local updated_at = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+    levels[i] = tokens
+    if tokens < 1 and (1 - tokens) / rate > retry_after then
+        retry_after, limited_by = (1 - tokens) / rate, i
+    end
+end
+for i, key in ipairs(KEYS) do
+    local capacity, rate = tonumber(ARGV[i * 2 - 1]), tonumber(ARGV[i * 2])
+    local tokens = levels[i]
+    if limited_by == 0 then tokens = tokens - 1 end
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'updated_at', tostring(now))
+    redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+end
+return {limited_by == 0 and 1 or 0, tostring(retry_after), limited_by}
+"""
+
+class RedisRateLimiter:
+    """Token buckets in Redis, shared by every process; buckets expire once they would be full again."""
+    def __init__(self, redis_url: str | None = None, client=None):
+        if client is None:
+            try:
+                import redis.asyncio
+            except ImportError as e:
+                raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed") from e
+            client = redis.asyncio.Redis.from_url(redis_url)
+        self._client = client
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        await self._client.aclose()
+
+    async def acquire(self, buckets: list[RateLimitBucket]) -> RateLimitDecision:
+        args = [value for bucket in buckets for value in (bucket.limit.capacity, bucket.limit.per_second)]
+        allowed, retry_after, limited_by = await self._script(keys=[bucket.key for bucket in buckets], args=args)
+        return RateLimitDecision(
+            allowed=bool(int(allowed)),
+            retry_after=float(retry_after),
+            limited_by=buckets[int(limited_by) - 1].name if int(limited_by) else None,
+        )
+
+    def reset(self) -> None:
+        pass
+
+_limiter: InMemoryRateLimiter | RedisRateLimiter = InMemoryRateLimiter()
+
+def get_rate_limiter() -> InMemoryRateLimiter | RedisRateLimiter:
+    return _limiter
+
+async def start_rate_limiter(redis_url: str | None = None) -> None:
+    """Select the limiter backend (Redis when configured, so limits hold across processes). Called from the lifespan."""
+    global _limiter
+    _limiter = RedisRateLimiter(redis_url) if redis_url else InMemoryRateLimiter()
+    await _limiter.start()
+
+async def stop_rate_limiter() -> None:
+    await _limiter.stop()
+
+async def check_rate_limit(identity: str, method: str, route: str, per_key: RateLimit) -> RateLimitDecision:
+    """
+    Take a token for this request from the buckets of API key `identity` (its id, never the key
+    itself) and record the decision in the metrics. Limiter failures (e.g. Redis unreachable) let the request through rather than failing it.
+    """
+    buckets = get_request_buckets(identity, method, route, per_key)
+    try:
+        decision = await _limiter.acquire(buckets)
+    except Exception:
+        logger.exception("Rate limiter unavailable; allowing request")
+        increment_counter(RATE_LIMIT_DECISIONS, decision="error", bucket="none")
+        return RateLimitDecision(allowed=True)
+    increment_counter(RATE_LIMIT_DECISIONS, decision="allowed" if decision.allowed else "limited", bucket=decision.limited_by or "none")
+    return decision
+
+def retry_after_header(retry_after: float) -> str:
+    return str(max(1, math.ceil(retry_after)))
@@ -0,0 +1,214 @@
+import threading
+from uuid import UUID
+from calendar import monthrange
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Hashable
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.utils.metrics import describe_counter, increment_counter
+
+RULE_EXPANSION_CACHE_SIZE = 8192
+
+RULE_EXPANSIONS = "rule_expansions_total"
+describe_counter(RULE_EXPANSIONS, "Recurring unavailability expansions per (rule, month), by result (hit or miss)")
+
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+
+Interval = tuple[datetime, datetime]
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """
+    The supported RRULE (RFC 5545) subset: FREQ (DAILY, WEEKLY or MONTHLY), INTERVAL, BYDAY (with an
+    ordinal such as 2SU or -1FR for MONTHLY), BYMONTHDAY, BYMONTH and UNTIL, e.g. `FREQ=MONTHLY;BYDAY=2SU`
+    (every 2nd Sunday) or `FREQ=WEEKLY;BYDAY=WE;BYMONTH=6,7,8` (Wednesdays in summer).
+    """
+    freq: str
+    interval: int = 1
+    # (ordinal or None, weekday index with Monday = 0)
+    byday: tuple[tuple[int | None, int], ...] = ()
+    bymonthday: tuple[int, ...] = ()
+    bymonth: tuple[int, ...] = ()
+    until: datetime | None = None
+
+@lru_cache(maxsize=1024)
+def parse_rrule(value: str) -> RecurrenceRule:
+    """Parse an RRULE string (with or without the `RRULE:` prefix), raising ValueError for anything outside the subset."""
+    parts = {}
+    for part in value.strip().removeprefix("RRULE:").split(";"):
+        name, separator, part_value = part.partition("=")
+        name = name.strip().upper()
+        if not separator or not part_value or name in parts:
+            raise ValueError(f"Invalid recurrence rule part: {part!r}")
+        parts[name] = part_value.strip().upper()
+
+    unsupported = parts.keys() - {"FREQ", "INTERVAL", "BYDAY", "BYMONTHDAY", "BYMONTH", "UNTIL"}
+    if unsupported:
+        raise ValueError(f"Unsupported recurrence rule parts: {', '.join(sorted(unsupported))}")
+    freq = parts.get("FREQ")
+    if freq not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    interval = _parse_int(parts.get("INTERVAL", "1"), "INTERVAL", 1, 1000)
+    byday = tuple(_parse_byday(day, freq) for day in parts["BYDAY"].split(",")) if "BYDAY" in parts else ()
+    bymonthday = tuple(_parse_int(day, "BYMONTHDAY", -31, 31, nonzero=True) for day in parts["BYMONTHDAY"].split(",")) if "BYMONTHDAY" in parts else ()
+    if bymonthday and freq == "WEEKLY":
+        raise ValueError("BYMONTHDAY is not supported with FREQ=WEEKLY")
+    bymonth = tuple(_parse_int(month, "BYMONTH", 1, 12) for month in parts["BYMONTH"].split(",")) if "BYMONTH" in parts else ()
+    until = _parse_until(parts["UNTIL"]) if "UNTIL" in parts else None
+    return RecurrenceRule(freq=freq, interval=interval, byday=byday, bymonthday=bymonthday, bymonth=bymonth, until=until)
+
+def occurrences_in_month(rrule: str, starts_at: datetime, ends_at: datetime, year: int, month: int, tzid: str = "UTC") -> tuple[Interval, ...]:
+    """
+    Occurrences starting in a (UTC) month of a rule whose first occurrence is starts_at - ends_at.
+
+    Days are matched and the first occurrence's time of day and length are kept in the rule's time
+    zone, so a 09:00 rule stays at 09:00 local time across daylight saving changes; the occurrences
+    come back in UTC.
+    """
+    rule = parse_rrule(rrule)
+    zone = get_zone(tzid)
+    month_start = datetime(year, month, 1, tzinfo=timezone.utc)
+    month_end = datetime(year + 1, 1, 1, tzinfo=timezone.utc) if month == 12 else datetime(year, month + 1, 1, tzinfo=timezone.utc)
+    if _as_utc(starts_at) >= month_end:
+        return ()
+    local_starts_at, local_ends_at = _as_utc(starts_at).astimezone(zone), _as_utc(ends_at).astimezone(zone)
+    first_day, time_of_day = local_starts_at.date(), local_starts_at.time()
+    length = local_ends_at.replace(tzinfo=None) - local_starts_at.replace(tzinfo=None)
+    occurrences = []
+    # UTC offsets are under a day: the local days one either side of the month cover its occurrences
+    day = max(first_day, month_start.date() - timedelta(days=1))
+    while day <= month_end.date():
+        if _matches_month(rule, day, first_day) and _matches(rule, day, first_day, monthrange(day.year, day.month)[1]):
+            local_occurrence_starts_at = datetime.combine(day, time_of_day)
+            occurrence_starts_at = local_occurrence_starts_at.replace(tzinfo=zone).astimezone(timezone.utc)
+            if rule.until is not None and occurrence_starts_at > rule.until:
+                break
+            if month_start <= occurrence_starts_at < month_end:
+                occurrences.append((occurrence_starts_at, (local_occurrence_starts_at + length).replace(tzinfo=zone).astimezone(timezone.utc)))
+        day += timedelta(days=1)
+    return tuple(occurrences)
+
+@lru_cache(maxsize=None)
+def get_zone(tzid: str) -> ZoneInfo:
+    """The IANA time zone (e.g. `Europe/Berlin`), raising ValueError for an unknown one."""
+    try:
+        return ZoneInfo(tzid)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {tzid!r}") from None
+
+class RuleExpansionCache:
+    """
+    Bounded LRU of rule occurrences per (rule, month).
+
+    Keys carry the rule's content (rrule, first occurrence and time zone), so an edited rule misses and
+    its stale months age out; nothing needs invalidating on writes.
+    """
+    def __init__(self, max_size: int = RULE_EXPANSION_CACHE_SIZE):
+        self.max_size = max_size
+        self._occurrences: OrderedDict[Hashable, tuple[Interval, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def month(self, rule_id: UUID, rrule: str, starts_at: datetime, ends_at: datetime, year: int, month: int, tzid: str = "UTC") -> tuple[Interval, ...]:
+        key = (rule_id, rrule, _as_utc(starts_at), _as_utc(ends_at), tzid, year, month)
+        with self._lock:
+            occurrences = self._occurrences.get(key)
+            if occurrences is not None:
+                self._occurrences.move_to_end(key)
+        if occurrences is not None:
+            increment_counter(RULE_EXPANSIONS, result="hit")
+            return occurrences
+        increment_counter(RULE_EXPANSIONS, result="miss")
+        occurrences = occurrences_in_month(rrule, starts_at, ends_at, year, month, tzid)
+        with self._lock:
+            self._occurrences[key] = occurrences
+            self._occurrences.move_to_end(key)
+            while len(self._occurrences) > self.max_size:
+                self._occurrences.popitem(last=False)
+        return occurrences
+
+    def window(self, rule_id: UUID, rrule: str, starts_at: datetime, ends_at: datetime, window_start: datetime, window_end: datetime, tzid: str = "UTC") -> list[Interval]:
+        """Occurrences overlapping a window, from the months they can start in (earlier ones may run into it)."""
+        window_start, window_end = _as_utc(window_start), _as_utc(window_end)
+        # An hour of slack: across a daylight saving change an occurrence can last an hour longer than the first
+        first = (window_start - (_as_utc(ends_at) - _as_utc(starts_at)) - timedelta(hours=1)).date()
+        year, month = first.year, first.month
+        occurrences = []
+        while (year, month) <= (window_end.year, window_end.month):
+            occurrences += [
+                occurrence for occurrence in self.month(rule_id, rrule, starts_at, ends_at, year, month, tzid)
+                if occurrence[0] < window_end and occurrence[1] > window_start
+            ]
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return occurrences
+
+    def clear(self) -> None:
+        with self._lock:
+            self._occurrences.clear()
+
+rule_expansions = RuleExpansionCache()
+
+def _matches_month(rule: RecurrenceRule, day: date, first_day: date) -> bool:
+    if rule.bymonth and day.month not in rule.bymonth:
+        return False
+    month_offset = (day.year * 12 + day.month) - (first_day.year * 12 + first_day.month)
+    return not (rule.freq == "MONTHLY" and month_offset % rule.interval)
+
+def _matches(rule: RecurrenceRule, day: date, first_day: date, days_in_month: int) -> bool:
+    weekday = day.weekday()
+    if rule.freq == "DAILY":
+        if (day - first_day).days % rule.interval:
+            return False
+    elif rule.freq == "WEEKLY":
+        week_offset = ((day - timedelta(days=weekday)) - (first_day - timedelta(days=first_day.weekday()))).days // 7
+        if week_offset % rule.interval:
+            return False
+        return weekday in ({byday_weekday for _, byday_weekday in rule.byday} or {first_day.weekday()})
+    if rule.byday:
+        return any(
+            byday_weekday == weekday and (
+                ordinal is None
+                or (ordinal > 0 and (day.day - 1) // 7 + 1 == ordinal)
+                or (ordinal < 0 and (days_in_month - day.day) // 7 + 1 == -ordinal)
+            )
+            for ordinal, byday_weekday in rule.byday
+        )
+    if rule.bymonthday:
+        return any(day.day == (monthday if monthday > 0 else days_in_month + monthday + 1) for monthday in rule.bymonthday)
+    # MONTHLY without BYDAY or BYMONTHDAY repeats on the first occurrence's day of the month
+    return rule.freq == "DAILY" or day.day == first_day.day
+
+def _parse_byday(value: str, freq: str) -> tuple[int | None, int]:
+    weekday = value[-2:]
+    if weekday not in WEEKDAYS:
+        raise ValueError(f"Invalid BYDAY weekday: {value!r}")
+    if len(value) == 2:
+        return None, WEEKDAYS.index(weekday)
+    if freq != "MONTHLY":
+        raise ValueError("BYDAY ordinals (e.g. 2SU) are only supported with FREQ=MONTHLY")
+    return _parse_int(value[:-2], "BYDAY ordinal", -5, 5, nonzero=True), WEEKDAYS.index(weekday)
+
+def _parse_int(value: str, name: str, minimum: int, maximum: int, nonzero: bool = False) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer") from None
+    if not minimum <= number <= maximum or (nonzero and number == 0):
+        raise ValueError(f"{name} must be between {minimum} and {maximum}")
+    return number
+
+def _parse_until(value: str) -> datetime:
+    for pattern in ("%Y%m%dT%H%M%SZ", "%Y%m%dT%H%M%S", "%Y%m%d"):
+        try:
+            until = datetime.strptime(value, pattern).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+        # A date-only UNTIL includes that whole day
+        return until + timedelta(days=1) - timedelta(microseconds=1) if pattern == "%Y%m%d" else until
+    raise ValueError("UNTIL must be a UTC date (YYYYMMDD) or date-time (YYYYMMDDTHHMMSSZ)")
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
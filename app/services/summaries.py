@@ -0,0 +1,118 @@
+from uuid import UUID
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from app.db.models import Schedule, Event, EventAssignment, ScheduleSummary
+from app.db.models.enums import RequirementLevel
+from app.services.queries import select_schedule_slot_counts, select_schedule_events_count
+
+# Session.info flag: only sessions opened with it keep summaries in step (request and job sessions)
+TRACK_SUMMARIES_KEY = "track_schedule_summaries"
+PENDING_SCHEDULES_KEY = "summary_schedule_ids"
+PENDING_EVENTS_KEY = "summary_event_ids"
+
+def refresh_schedule_summary(session: Session, schedule_id: UUID) -> ScheduleSummary | None:
+    """
+    Recompute one schedule's summary row from two aggregate queries and bump its version.
+
+    Only the touched schedule is recomputed, so the cost is bounded by one month of assignments
+    regardless of how many schedules exist. Returns None if the schedule no longer exists.
+
+    The row is created if missing (ON CONFLICT DO NOTHING) and locked before the aggregates run:
+    concurrent refreshes of one schedule wait for each other, and each one's aggregates see what the
+    previous one committed, so neither the counts nor the version increments are lost.
+    """
+    if session.get(Schedule, schedule_id) is None:
+        return None
+    session.execute(
+        insert(ScheduleSummary)
+        .values(ScheduleSummary(schedule_id=schedule_id).model_dump())
+        .on_conflict_do_nothing(index_elements=[ScheduleSummary.schedule_id])
+    )
+    summary = session.exec(
+        select(ScheduleSummary)
+        .where(ScheduleSummary.schedule_id == schedule_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).one()
+    summary = _compute_schedule_summary(session, schedule_id, summary)
+    summary.version += 1
+    session.add(summary)
+    return summary
+
+def get_schedule_summary(session: Session, schedule_id: UUID) -> ScheduleSummary:
+    """
+    Single-row lookup. A schedule without a stored summary yet (e.g. seeded by a script) gets one
+    computed on the fly (version 0) but not written, so this stays safe on a read replica; the next
+    write to the schedule stores it.
+    """
+    summary = session.get(ScheduleSummary, schedule_id)
+    if summary is None:
+        summary = _compute_schedule_summary(session, schedule_id, ScheduleSummary(schedule_id=schedule_id))
+    return summary
+
+def _compute_schedule_summary(session: Session, schedule_id: UUID, summary: ScheduleSummary) -> ScheduleSummary:
+    slots = filled = required = required_filled = 0
+    role_coverage: dict[UUID, dict[str, int]] = defaultdict(lambda: {"slots": 0, "filled": 0})
+    user_counts: Counter[UUID] = Counter()
+    for row in select_schedule_slot_counts(session, schedule_id):
+        is_filled = row.assigned_user_id is not None
+        is_required = row.requirement_level == RequirementLevel.required
+        slots += row.slots
+        filled += row.slots if is_filled else 0
+        required += row.slots if is_required else 0
+        required_filled += row.slots if is_filled and is_required else 0
+        role_coverage[row.role_id]["slots"] += row.slots
+        role_coverage[row.role_id]["filled"] += row.slots if is_filled else 0
+        if is_filled:
+            user_counts[row.assigned_user_id] += row.slots
+
+    summary.events_count = select_schedule_events_count(session, schedule_id)
+    summary.slots_count = slots
+    summary.filled_slots_count = filled
+    summary.required_slots_count = required
+    summary.required_filled_count = required_filled
+    summary.role_coverage = [{"role_id": str(role_id), **counts} for role_id, counts in role_coverage.items()]
+    summary.user_assignment_counts = [{"user_id": str(user_id), "count": count} for user_id, count in user_counts.most_common()]
+    summary.refreshed_at = datetime.now(timezone.utc)
+    return summary
+
+# =============================
+# SESSION HOOKS
+# =============================
+# Every write path (routes, jobs) goes through a Session opened with TRACK_SUMMARIES_KEY, so the
+# summary is kept in step by watching flushes rather than by calling refresh from each domain
+# function. Refreshes run in before_commit, inside the same transaction as the write that caused
+# them. Other sessions (job bookkeeping, API key loading, warm-up, scripts) are skipped.
+@event.listens_for(Session, "after_flush")
+def _collect_touched_schedules(session: Session, _flush_context) -> None:
+    if not session.info.get(TRACK_SUMMARIES_KEY):
+        return
+    schedule_ids = session.info.setdefault(PENDING_SCHEDULES_KEY, set())
+    event_ids = session.info.setdefault(PENDING_EVENTS_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Event) and obj.schedule_id is not None:
+            schedule_ids.add(UUID(str(obj.schedule_id)))
+        elif isinstance(obj, EventAssignment) and obj.event_id is not None:
+            event_ids.add(UUID(str(obj.event_id)))
+
+@event.listens_for(Session, "before_commit")
+def _refresh_touched_schedules(session: Session) -> None:
+    if not session.info.get(TRACK_SUMMARIES_KEY):
+        return
+    session.flush()
+    schedule_ids = session.info.pop(PENDING_SCHEDULES_KEY, set())
+    event_ids = session.info.pop(PENDING_EVENTS_KEY, set())
+    if event_ids:
+        schedule_ids.update(session.exec(select(Event.schedule_id).where(Event.id.in_(event_ids))).all())
+    # In a fixed order, so two transactions touching the same schedules can't deadlock on the row locks
+    for schedule_id in sorted(schedule_ids):
+        refresh_schedule_summary(session, schedule_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_touched_schedules(session: Session) -> None:
+    session.info.pop(PENDING_SCHEDULES_KEY, None)
+    session.info.pop(PENDING_EVENTS_KEY, None)
@@ -1,5 +1,7 @@
+import os
 from functools import lru_cache
-from pydantic import Field, AliasChoices, computed_field
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from pydantic import Field, AliasChoices, computed_field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -15,6 +17,41 @@ class Settings(BaseSettings):
     )
     env: str = Field(..., validation_alias=AliasChoices("ENV"))
     log_level: str = Field(..., validation_alias=AliasChoices("LOG_LEVEL"))
+    log_format: str = Field(default="json", validation_alias=AliasChoices("LOG_FORMAT"))
+    log_queue_size: int = Field(default=10000, validation_alias=AliasChoices("LOG_QUEUE_SIZE"))
+    log_client_error_sample_rate: float = Field(default=0.1, validation_alias=AliasChoices("LOG_CLIENT_ERROR_SAMPLE_RATE"))
+    redis_url: str | None = Field(default=None, validation_alias=AliasChoices("REDIS_URL"))
+    database_replica_urls: str | None = Field(default=None, validation_alias=AliasChoices("DATABASE_REPLICA_URLS"))
+    replica_sticky_seconds: float = Field(default=5.0, validation_alias=AliasChoices("REPLICA_STICKY_SECONDS"))
+    # Worker processes for the multi-process server (gunicorn.conf.py); pool settings below are per worker
+    web_concurrency: int = Field(default_factory=lambda: os.cpu_count() or 1, validation_alias=AliasChoices("WEB_CONCURRENCY"))
+    db_pool_size: int = Field(default=5, validation_alias=AliasChoices("DB_POOL_SIZE"))
+    db_max_overflow: int = Field(default=10, validation_alias=AliasChoices("DB_MAX_OVERFLOW"))
+    # Candidate indexes follow this process's writes at once and other processes' within this bound
+    candidate_index_max_age_seconds: float = Field(default=30, validation_alias=AliasChoices("CANDIDATE_INDEX_MAX_AGE_SECONDS"))
+    api_key_refresh_seconds: float = Field(default=30, validation_alias=AliasChoices("API_KEY_REFRESH_SECONDS"))
+    rate_limit_enabled: bool = Field(default=True, validation_alias=AliasChoices("RATE_LIMIT_ENABLED"))
+    rate_limit_per_minute: float = Field(default=600, validation_alias=AliasChoices("RATE_LIMIT_PER_MINUTE"))
+    job_workers: int = Field(default=2, validation_alias=AliasChoices("JOB_WORKERS"))
+    job_stale_seconds: float = Field(default=600, validation_alias=AliasChoices("JOB_STALE_SECONDS"))
+    # IANA time zone recurring unavailability rules repeat in when created without a tzid
+    event_partition_years_ahead: int = Field(default=2, ge=0, validation_alias=AliasChoices("EVENT_PARTITION_YEARS_AHEAD"))
+    default_timezone: str = Field(default="UTC", validation_alias=AliasChoices("DEFAULT_TIMEZONE"))
+    # Shared directory the worker processes write their counters to, so any worker's /metrics reports all of them
+    metrics_dir: str | None = Field(default=None, validation_alias=AliasChoices("METRICS_DIR"))
+    metrics_flush_seconds: float = Field(default=5, validation_alias=AliasChoices("METRICS_FLUSH_SECONDS"))
+    startup_warmup: bool = Field(default=True, validation_alias=AliasChoices("STARTUP_WARMUP"))
+    warmup_hot_queries: bool = Field(default=True, validation_alias=AliasChoices("WARMUP_HOT_QUERIES"))
+
+    @field_validator("default_timezone")
+    @classmethod
+    def validate_default_timezone(cls, value: str) -> str:
+        # Fail at startup rather than on the first rule created
+        try:
+            ZoneInfo(value)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown time zone: {value!r}") from None
+        return value
 
     @computed_field
     @property
@@ -23,6 +60,13 @@ class Settings(BaseSettings):
             return []
         return [origin.strip() for origin in self.cors_allowed_origins.split(",") if origin.strip()]
 
+    @computed_field
+    @property
+    def database_replica_urls_list(self) -> list[str]:
+        if self.database_replica_urls is None or not self.database_replica_urls.strip():
+            return []
+        return [url.strip() for url in self.database_replica_urls.split(",") if url.strip()]
+
 @lru_cache()
 def get_settings() -> Settings:
     # Cache ensures settings are only loaded once and can be reused everywhere
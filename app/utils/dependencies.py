@@ -1,30 +1,67 @@
 from uuid import UUID
 from typing import AsyncGenerator, Annotated
-from sqlmodel import Session, select
+from sqlmodel import Session, SQLModel, select
 from sqlalchemy.orm import selectinload
-from fastapi import Request, HTTPException, status, Depends
+from fastapi import Request, HTTPException, Query, status, Depends
 from fastapi.security import APIKeyHeader
 
 from app.settings import settings
-from app.db.models import Role, ProficiencyLevel, EventType, Team, User, Schedule, TeamUser, UserRole, Event, EventAssignment, UserUnavailablePeriod
+from app.db.models import EventPublic, EventAssignmentPublic, EventAssignmentEmbeddedPublic, UserRolePublic, ApiKey, Role, ProficiencyLevel, EventType, Team, User, Schedule, TeamUser, UserRole, Event, EventAssignment, UserUnavailablePeriod, UserUnavailableRule, Job
 from app.utils.helpers import raise_exception_if_not_found
-from app.services.queries import select_schedule_with_events_and_assignments, select_event_with_full_hierarchy, select_full_event_assignment
+from app.utils.fieldsets import Fields, parse_fields, related_paths
+from app.utils.exceptions import RateLimitExceededError
+from app.services.queries import select_event_with_full_hierarchy, select_full_event_assignment, selectinload_paths
+from app.services.builders import event_with_assignments_paths
+from app.db.models.enums import ApiKeyScope
+from app.services.api_keys import ApiKeyIdentity, get_api_key_index
+from app.services.rate_limits import RateLimit, check_rate_limit
+from app.services.summaries import TRACK_SUMMARIES_KEY
+from app.utils.logging_config import get_request_context
 
 api_key_header = APIKeyHeader(name="x-api-key", auto_error=False)
 
-def verify_api_key(api_key: str = Depends(api_key_header)) -> None:
+async def verify_api_key(request: Request, api_key: str = Depends(api_key_header)) -> ApiKeyIdentity:
     """
     Dependency to verify API key from API key header.
     
-    Validates the API key against the configured API key. Raises HTTPException if the key is missing or invalid.
+    Looks the key up in the in-memory API key index (or matches FAST_API_KEY), without a database query.
+    Raises HTTPException if the key is missing or invalid (401), or lacks the scope the request method
+    needs (403): `read` for GET and HEAD, `write` for everything else.
     """
-    if not api_key or api_key != settings.fast_api_key:
+    identity = get_api_key_index().authenticate(api_key) if api_key else None
+    if identity is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="Unauthorized: Invalid or missing API Key"
         )
+    scope = ApiKeyScope.read if request.method in ("GET", "HEAD") else ApiKeyScope.write
+    if not identity.allows(scope):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Forbidden: API key lacks the '{scope.value}' scope")
+    request_context = get_request_context()
+    if request_context is not None:
+        request_context.api_key = identity.name
+    return identity
+
+APIKeyDep = Annotated[ApiKeyIdentity, Depends(verify_api_key)]
+
+def require_admin_scope(identity: APIKeyDep) -> ApiKeyIdentity:
+    if not identity.allows(ApiKeyScope.admin):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden: API key lacks the 'admin' scope")
+    return identity
+
+async def enforce_rate_limit(request: Request, identity: APIKeyDep) -> None:
+    """
+    Dependency to rate limit requests per API key, and per key and route for expensive routes.
 
-APIKeyDep = Annotated[str, Depends(verify_api_key)]
+    Runs after verify_api_key and before a database session is taken, so a client over its limit
+    gets a 429 (with Retry-After) without touching the connection pool.
+    """
+    if not settings.rate_limit_enabled:
+        return
+    route = getattr(request.scope.get("route"), "path", request.url.path)
+    decision = await check_rate_limit(identity.id, request.method, route, RateLimit.per_minute(settings.rate_limit_per_minute))
+    if not decision.allowed:
+        raise RateLimitExceededError(decision.retry_after)
 
 async def get_db_session(request: Request) -> AsyncGenerator[Session, None]:
     """
@@ -32,12 +69,35 @@ async def get_db_session(request: Request) -> AsyncGenerator[Session, None]:
     
     Each request uses its own session from the engine. The session is
     automatically closed when the request completes.
+
+    When read replicas are configured, safe (GET/HEAD) requests get a session on a healthy replica,
+    unless the client wrote recently (read-your-writes); all other requests use the primary.
     """
-    with Session(request.app.state.db_engine) as session:
+    router = getattr(request.app.state, "db_router", None)
+    engine = router.engine_for(request) if router else request.app.state.db_engine
+    with Session(engine, info={TRACK_SUMMARIES_KEY: True}) as session:
         yield session
 
 SessionDep = Annotated[Session, Depends(get_db_session)]
 
+class SparseFields:
+    """
+    Dependency parsing the `fields` query parameter against a response model, for sparse fieldsets.
+
+    Loading dependencies take the same dependency (resolved once per request) to skip the
+    relationships the requested fields don't read.
+    """
+    def __init__(self, model: type[SQLModel], nested: dict[str, type[SQLModel]] | None = None):
+        self.model = model
+        self.nested = nested
+
+    def __call__(self, fields: str | None = Query(default=None, description="Comma-separated fields to return (default: all); `id` is always returned")) -> Fields:
+        return parse_fields(fields, self.model, self.nested)
+
+EventAssignmentFieldsDep = Annotated[Fields, Depends(SparseFields(EventAssignmentPublic))]
+EventFieldsDep = Annotated[Fields, Depends(SparseFields(EventPublic, nested={"event_assignments": EventAssignmentEmbeddedPublic}))]
+UserRoleFieldsDep = Annotated[Fields, Depends(SparseFields(UserRolePublic))]
+
 def require_role(id: UUID, session: SessionDep) -> Role:
     role = session.get(Role, id)
     raise_exception_if_not_found(role, Role)
@@ -45,12 +105,9 @@ def require_role(id: UUID, session: SessionDep) -> Role:
 
 RoleDep = Annotated[Role, Depends(require_role)]
 
-def require_role_with_user_roles(role_id: UUID, session: SessionDep) -> Role:
-    role = session.exec(select(Role).where(Role.id == role_id)
-        .options(
-            selectinload(Role.user_roles).selectinload(UserRole.user),
-            selectinload(Role.user_roles).selectinload(UserRole.proficiency_level)
-        )).one_or_none()
+def require_role_with_user_roles(role_id: UUID, session: SessionDep, fields: UserRoleFieldsDep) -> Role:
+    paths = ["user_roles", *(f"user_roles.{path}" for path in related_paths(fields, UserRolePublic) if path != "role")]
+    role = session.exec(select(Role).where(Role.id == role_id).options(*selectinload_paths(Role, paths))).one_or_none()
     raise_exception_if_not_found(role, Role)
     return role
 
@@ -98,12 +155,9 @@ def require_user(id: UUID, session: SessionDep) -> User:
 
 UserDep = Annotated[User, Depends(require_user)]
 
-def require_user_with_user_roles(user_id: UUID, session: SessionDep) -> User:
-    user = session.exec(select(User).where(User.id == user_id)
-        .options(
-            selectinload(User.user_roles).selectinload(UserRole.role),
-            selectinload(User.user_roles).selectinload(UserRole.proficiency_level)
-        )).one_or_none()
+def require_user_with_user_roles(user_id: UUID, session: SessionDep, fields: UserRoleFieldsDep) -> User:
+    paths = ["user_roles", *(f"user_roles.{path}" for path in related_paths(fields, UserRolePublic) if path != "user")]
+    user = session.exec(select(User).where(User.id == user_id).options(*selectinload_paths(User, paths))).one_or_none()
     raise_exception_if_not_found(user, User)
     return user
 
@@ -120,6 +174,13 @@ def require_user_with_user_roles_for_unavailable_periods(user_id: UUID, session:
 
 UserWithUserRolesForUnavailablePeriodsDep = Annotated[User, Depends(require_user_with_user_roles_for_unavailable_periods)]
 
+def require_user_for_unavailable_rules(user_id: UUID, session: SessionDep) -> User:
+    user = session.get(User, user_id)
+    raise_exception_if_not_found(user, User)
+    return user
+
+UserForUnavailableRulesDep = Annotated[User, Depends(require_user_for_unavailable_rules)]
+
 def require_schedule(id: UUID, session: SessionDep) -> Schedule:
     schedule = session.get(Schedule, id)
     raise_exception_if_not_found(schedule, Schedule)
@@ -134,13 +195,6 @@ def require_schedule_for_events(schedule_id: UUID, session: SessionDep) -> Sched
 
 ScheduleForEventsDep = Annotated[Schedule, Depends(require_schedule_for_events)]
 
-def require_schedule_with_events_and_assignments(id: UUID, session: SessionDep) -> Schedule:
-    schedule = select_schedule_with_events_and_assignments(session, id)
-    raise_exception_if_not_found(schedule, Schedule)
-    return schedule
-
-ScheduleWithEventsAndAssignmentsDep = Annotated[Schedule, Depends(require_schedule_with_events_and_assignments)]
-
 def require_team_user(team_id: UUID, user_id: UUID, session: SessionDep) -> TeamUser:
     team_user = session.exec(select(TeamUser).where(TeamUser.team_id == team_id).where(TeamUser.user_id == user_id)).one_or_none()
     raise_exception_if_not_found(team_user, TeamUser)
@@ -162,30 +216,65 @@ def require_event(id: UUID, session: SessionDep) -> Event:
 
 EventDep = Annotated[Event, Depends(require_event)]
 
-def require_event_with_full_hierarchy(id: UUID, session: SessionDep) -> Event:
-    event = select_event_with_full_hierarchy(session, id)
+def require_event_with_full_hierarchy(id: UUID, session: SessionDep, fields: EventFieldsDep) -> Event:
+    event = select_event_with_full_hierarchy(session, id, event_with_assignments_paths(fields))
     raise_exception_if_not_found(event, Event)
     return event
 
 EventWithFullHierarchyDep = Annotated[Event, Depends(require_event_with_full_hierarchy)]
 
-def require_event_with_full_hierarchy_for_assignments(event_id: UUID, session: SessionDep) -> Event:
-    event = select_event_with_full_hierarchy(session, event_id)
+def require_event_with_full_hierarchy_for_assignments(event_id: UUID, session: SessionDep, fields: EventAssignmentFieldsDep) -> Event:
+    # The event is the assignments' parent here: their event paths load from the root, the rest under event_assignments
+    paths = ["event_assignments"]
+    for path in related_paths(fields, EventAssignmentPublic):
+        if path.startswith("event."):
+            paths.append(path.removeprefix("event."))
+        elif path != "event":
+            paths.append(f"event_assignments.{path}")
+    event = select_event_with_full_hierarchy(session, event_id, paths)
     raise_exception_if_not_found(event, Event)
     return event
 
 EventWithFullHierarchyForAssignmentsDep = Annotated[Event, Depends(require_event_with_full_hierarchy_for_assignments)]
 
-def require_full_event_assignment(id: UUID, session: SessionDep) -> EventAssignment:
-    event_assignment = select_full_event_assignment(session, id)
+def require_full_event_assignment(id: UUID, session: SessionDep, fields: EventAssignmentFieldsDep) -> EventAssignment:
+    event_assignment = select_full_event_assignment(session, id, related_paths(fields, EventAssignmentPublic))
     raise_exception_if_not_found(event_assignment, EventAssignment)
     return event_assignment
 
 EventAssignmentDep = Annotated[EventAssignment, Depends(require_full_event_assignment)]
 
+def require_event_assignment_for_candidates(id: UUID, session: SessionDep) -> EventAssignment:
+    event_assignment = session.get(EventAssignment, id)
+    raise_exception_if_not_found(event_assignment, EventAssignment)
+    return event_assignment
+
+EventAssignmentForCandidatesDep = Annotated[EventAssignment, Depends(require_event_assignment_for_candidates)]
+
 def require_user_unavailable_period(id: UUID, session: SessionDep) -> UserUnavailablePeriod:
     user_unavailable_period = session.get(UserUnavailablePeriod, id)
     raise_exception_if_not_found(user_unavailable_period, UserUnavailablePeriod)
     return user_unavailable_period
 
-UserUnavailablePeriodDep = Annotated[UserUnavailablePeriod, Depends(require_user_unavailable_period)]
\ No newline at end of file
+UserUnavailablePeriodDep = Annotated[UserUnavailablePeriod, Depends(require_user_unavailable_period)]
+
+def require_user_unavailable_rule(id: UUID, session: SessionDep) -> UserUnavailableRule:
+    user_unavailable_rule = session.get(UserUnavailableRule, id)
+    raise_exception_if_not_found(user_unavailable_rule, UserUnavailableRule)
+    return user_unavailable_rule
+
+UserUnavailableRuleDep = Annotated[UserUnavailableRule, Depends(require_user_unavailable_rule)]
+
+def require_job(id: UUID, session: SessionDep) -> Job:
+    job = session.get(Job, id)
+    raise_exception_if_not_found(job, Job)
+    return job
+
+JobDep = Annotated[Job, Depends(require_job)]
+
+def require_stored_api_key(id: UUID, session: SessionDep) -> ApiKey:
+    api_key = session.get(ApiKey, id)
+    raise_exception_if_not_found(api_key, ApiKey)
+    return api_key
+
+StoredApiKeyDep = Annotated[ApiKey, Depends(require_stored_api_key)]
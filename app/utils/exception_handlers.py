@@ -5,7 +5,9 @@ import logging
 import traceback
 
 from app.settings import settings
-from app.utils.exceptions import ConflictError, CheckConstraintError, EmptyPayloadError, NotFoundError
+from app.utils.exceptions import ConflictError, CheckConstraintError, EmptyPayloadError, NotFoundError, InvalidFieldsError, RateLimitExceededError
+from app.services.rate_limits import retry_after_header
+from app.utils.logging_config import CLIENT_ERROR
 
 logger = logging.getLogger(__name__)
 
@@ -15,14 +17,15 @@ def register_exception_handlers(app: FastAPI):
     
     This function sets up handlers for various exception types to ensure
     consistent error responses and proper logging without exposing internal
-    implementation details to clients.
+    implementation details to clients. Client errors (4xx) are logged with
+    CLIENT_ERROR so bursts of them are sampled rather than logged one by one.
     """
     @app.exception_handler(ConflictError)
     def conflict_error_handler(_: Request, exc: ConflictError):
         """
         Handle ConflictError raised by the application.
         """
-        logger.error(f"ConflictError: {str(exc)}")
+        logger.error("ConflictError: %s", exc, extra=CLIENT_ERROR)
         return JSONResponse(
             status_code=status.HTTP_409_CONFLICT,
             content={"detail": str(exc)},
@@ -33,7 +36,7 @@ def register_exception_handlers(app: FastAPI):
         """
         Handle CheckConstraintError raised by the application.
         """
-        logger.error(f"CheckConstraintError: {str(exc)}")
+        logger.error("CheckConstraintError: %s", exc, extra=CLIENT_ERROR)
         return JSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
             content={"detail": str(exc)},
@@ -44,7 +47,18 @@ def register_exception_handlers(app: FastAPI):
         """
         Handle EmptyPayloadError raised by the application.
         """
-        logger.error(f"EmptyPayloadError: {str(exc)}")
+        logger.error("EmptyPayloadError: %s", exc, extra=CLIENT_ERROR)
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": str(exc)},
+        )
+
+    @app.exception_handler(InvalidFieldsError)
+    def invalid_fields_error_handler(_: Request, exc: InvalidFieldsError):
+        """
+        Handle InvalidFieldsError raised for a `fields` parameter naming unknown fields.
+        """
+        logger.error("InvalidFieldsError: %s", exc, extra=CLIENT_ERROR)
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"detail": str(exc)},
@@ -55,12 +69,26 @@ def register_exception_handlers(app: FastAPI):
         """
         Handle NotFoundError raised by the application.
         """
-        logger.error(f"NotFoundError: {str(exc)}")
+        logger.error("NotFoundError: %s", exc, extra=CLIENT_ERROR)
         return JSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
             content={"detail": str(exc)},
         )
     
+    @app.exception_handler(RateLimitExceededError)
+    def rate_limit_exceeded_error_handler(_: Request, exc: RateLimitExceededError):
+        """
+        Handle RateLimitExceededError raised by the rate limit dependency.
+
+        Retry-After tells the client how many whole seconds until its bucket has a token again.
+        """
+        logger.warning("RateLimitExceededError: %s", exc, extra=CLIENT_ERROR)
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": str(exc)},
+            headers={"Retry-After": retry_after_header(exc.retry_after)},
+        )
+
     @app.exception_handler(HTTPException)
     def http_exception_handler(_: Request, exc: HTTPException):
         """
@@ -69,7 +97,7 @@ def register_exception_handlers(app: FastAPI):
         These are intentional exceptions (e.g., 404, 401) that should be
         returned to the client as-is.
         """
-        logger.error(f"HTTPException: {exc.detail}")
+        logger.error("HTTPException: %s", exc.detail, extra={"client_error": exc.status_code < 500})
         return JSONResponse(
             status_code=exc.status_code,
             content={"detail": exc.detail},
@@ -82,7 +110,7 @@ def register_exception_handlers(app: FastAPI):
         
         Returns validation errors to help clients fix their request format.
         """
-        logger.error(f"RequestValidationError: {exc.errors()}")
+        logger.error("RequestValidationError: %s", exc.errors(), extra=CLIENT_ERROR)
         return JSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
             content={"detail": exc.errors(), "body": exc.body},
@@ -96,7 +124,7 @@ def register_exception_handlers(app: FastAPI):
         Logs the full exception with stack trace internally but returns a
         generic error message to clients to avoid exposing implementation details.
         """
-        logger.exception(f"Unhandled Exception: {str(exc)}")
+        logger.exception("Unhandled Exception: %s", exc)
 
         if settings.env != "production":
             return JSONResponse(
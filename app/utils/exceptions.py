@@ -8,4 +8,12 @@ class EmptyPayloadError(Exception):
     pass
 
 class NotFoundError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class InvalidFieldsError(Exception):
+    pass
+
+class RateLimitExceededError(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"Too many requests: retry in {retry_after:.1f} seconds")
+        self.retry_after = retry_after
@@ -0,0 +1,59 @@
+from typing import Any, TypeVar
+from sqlalchemy import inspect
+from sqlmodel import SQLModel
+
+from app.utils.exceptions import InvalidFieldsError
+
+M = TypeVar("M", bound=SQLModel)
+
+# Fields requested with ?fields= (None: every field)
+Fields = frozenset[str] | None
+
+def parse_fields(fields: str | None, model: type[SQLModel], nested: dict[str, type[SQLModel]] | None = None) -> Fields:
+    """
+    Parse a comma-separated `fields` parameter against a response model. `id` is always returned.
+
+    A nested list field (e.g. `event_assignments`) is requested whole by its name or narrowed with
+    `name.field` entries; nested fields not mentioned are left out of the response.
+    """
+    if fields is None:
+        return None
+    requested = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    allowed = set(model.model_fields)
+    for name, nested_model in (nested or {}).items():
+        allowed |= {name, *(f"{name}.{field}" for field in nested_model.model_fields)}
+    unknown = requested - allowed
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested | {"id"}
+
+def nested_fields(fields: Fields, name: str) -> Fields:
+    """Fields of nested list `name`: all of them when requested whole, else the `name.field` entries."""
+    if fields is None or name in fields:
+        return None
+    return frozenset(field.removeprefix(f"{name}.") for field in fields if field.startswith(f"{name}.")) | {"id"}
+
+def includes_nested(fields: Fields, name: str) -> bool:
+    return fields is None or any(field == name or field.startswith(f"{name}.") for field in fields)
+
+def related_paths(fields: Fields, model: type[SQLModel]) -> list[str]:
+    """
+    Relationship paths (as in loaders.prime) a response needs loaded: model.RELATED_FIELDS maps each
+    path to the fields read from it, so a sparse fieldset skips the relationships it does not read.
+    """
+    return [path for path, names in model.RELATED_FIELDS.items() if fields is None or not fields.isdisjoint(names)]
+
+def related(obj: SQLModel, relationship: str, fields: Fields) -> Any:
+    """The related object; with a sparse fieldset, None unless already loaded (skipped relationships are never lazy loaded)."""
+    if fields is not None and relationship in inspect(obj).unloaded:
+        return None
+    return getattr(obj, relationship)
+
+def build_public(model: type[M], values: dict[str, Any], fields: Fields) -> M:
+    """
+    A validated model with every field or, for a sparse fieldset, an unvalidated one with only the
+    requested fields set: routes serialize with response_model_exclude_unset, so only those are returned.
+    """
+    if fields is None:
+        return model(**values)
+    return model.model_construct(_fields_set=set(fields) & values.keys(), **{name: values[name] for name in fields if name in values})
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import Type, Mapping
 from sqlmodel import SQLModel
 
 from app.utils.exceptions import EmptyPayloadError, NotFoundError
@@ -53,6 +53,26 @@ TAGS_METADATA = [
         "name": "user_unavailable_periods",
         "description": "User unavailable periods are the time periods that a user is unavailable",
     },
+    {
+        "name": "user_unavailable_rules",
+        "description": "User unavailable rules are recurring unavailability (an RRULE subset, e.g. every 2nd Sunday), expanded per month",
+    },
+    {
+        "name": "exports",
+        "description": "Exports stream large result sets (e.g. a year of assignments) as CSV or NDJSON",
+    },
+    {
+        "name": "jobs",
+        "description": "Jobs track heavy operations accepted with `?background=true` (status, progress and result)",
+    },
+    {
+        "name": "analytics",
+        "description": "Analytics aggregate assignment history (e.g. workload fairness per user and role)",
+    },
+    {
+        "name": "api_keys",
+        "description": "API keys identify client apps (hashed, with `read`/`write`/`admin` scopes); managing them needs the `admin` scope",
+    },
 ]
 
 # Whitelist of valid table names to prevent SQL injection
@@ -60,6 +80,7 @@ VALID_TABLES = {
     "roles", "proficiency_levels", "event_types",
     "teams", "users", "team_users", "user_roles",
     "schedules", "events", "event_assignments", "user_unavailable_periods",
+    "user_unavailable_rules", "jobs", "schedule_summaries", "api_keys",
 }
 
 def require_non_empty_payload(payload: SQLModel) -> None:
@@ -70,4 +91,12 @@ def require_non_empty_payload(payload: SQLModel) -> None:
 
 def raise_exception_if_not_found(obj: SQLModel | None, model: Type[SQLModel]) -> None:
     if not obj:
-        raise NotFoundError(f"{model.__name__} not found")
\ No newline at end of file
+        raise NotFoundError(f"{model.__name__} not found")
+
+def is_not_modified(headers: Mapping[str, str], etag: str) -> bool:
+    """Evaluate a conditional GET's If-None-Match header against the current ETag."""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
\ No newline at end of file
@@ -1,19 +1,244 @@
-import logging
+import os
 import sys
+import json
+import time
+import queue
+import atexit
+import random
+import logging
+from uuid import uuid4
+from dataclasses import dataclass, field
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.settings import settings
 
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+REQUEST_ID_HEADER = "x-request-id"
+# Pass as extra= on logs of client errors (4xx): they are sampled at LOG_CLIENT_ERROR_SAMPLE_RATE
+CLIENT_ERROR = {"client_error": True}
+# Request fields copied onto every record logged while handling a request
+REQUEST_FIELDS = ("request_id", "method", "route", "api_key")
+
+access_logger = logging.getLogger("app.access")
+
+@dataclass
+class RequestContext:
+    request_id: str
+    method: str
+    path: str
+    scope: Scope
+    started_at: float = field(default_factory=time.perf_counter)
+    # Mutated in place (from threadpool threads too), so the middleware sees the final count
+    query_count: int = 0
+    # Name of the authenticated API key, set by verify_api_key
+    api_key: str | None = None
+
+    @property
+    def route(self) -> str:
+        # The matched route template (/schedules/{id}/grid) once routing has run, else the raw path
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.path
+
+_request_context: ContextVar[RequestContext | None] = ContextVar("request_context", default=None)
+
+def get_request_context() -> RequestContext | None:
+    return _request_context.get()
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_request_query(conn, cursor, statement, parameters, context, executemany):
+    request_context = _request_context.get()
+    if request_context is not None:
+        request_context.query_count += 1
+
+# =============================
+# FILTERS AND FORMATTERS
+# =============================
+class RequestContextFilter(logging.Filter):
+    """Copy the current request's id, method, route and API key name onto the record (in the logging thread, before queueing)."""
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_context = _request_context.get()
+        if request_context is not None:
+            for name in REQUEST_FIELDS:
+                if not hasattr(record, name):
+                    setattr(record, name, getattr(request_context, name))
+        return True
+
+class ClientErrorSampler(logging.Filter):
+    """Keep a random sample_rate share of client error records (extra=CLIENT_ERROR), counting the rest."""
+    def __init__(self, sample_rate: float):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "client_error", False) or self.sample_rate >= 1:
+            return True
+        if random.random() < self.sample_rate:
+            record.sample_rate = self.sample_rate
+            return True
+        self.sampled_out += 1
+        return False
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, request fields and any extra fields."""
+    EXTRA_FIELDS = (*REQUEST_FIELDS, "status_code", "latency_ms", "query_count", "sample_rate")
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in self.EXTRA_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                payload[name] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, default=str)
+
+# =============================
+# QUEUE PIPELINE
+# =============================
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hand records to the listener thread without ever blocking the caller: when the bounded queue is
+    full the record is dropped and counted, and the count is reported once the queue has room again.
+    """
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._reported_dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message (and traceback) here: args may be mutated once the caller moves on.
+        # Unlike the base class, the JSON formatter downstream still sees the plain message.
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # Called with the handler lock held, so the counters need no extra locking
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.dropped > self._reported_dropped:
+            dropped = self.dropped - self._reported_dropped
+            try:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+                    "msg": f"Dropped {dropped} log records: logging queue full",
+                }))
+                self._reported_dropped = self.dropped
+            except queue.Full:
+                pass
+
+_queue_handler: BoundedQueueHandler | None = None
+_listener: QueueListener | None = None
+
 def setup_logging():
     """
     Configure logging for the application.
-    
-    Sets up basic logging configuration with INFO level, formatted output
-    to stdout including timestamp, logger name, log level, and message.
+
+    Loggers only enqueue records (QueueHandler), so a slow stdout never stalls a request; a
+    QueueListener thread formats them (JSON lines, or the text format with LOG_FORMAT=text) and
+    writes them out. The queue holds LOG_QUEUE_SIZE records, beyond which records are dropped and
+    counted. Client error logs are sampled at LOG_CLIENT_ERROR_SAMPLE_RATE.
     """
-    logging.basicConfig(
-        level=settings.log_level.upper(),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
\ No newline at end of file
+    global _queue_handler, _listener
+    if _queue_handler is not None:
+        return
+
+    output_handler = logging.StreamHandler(sys.stdout)
+    output_handler.setFormatter(JsonFormatter() if settings.log_format == "json" else logging.Formatter(TEXT_FORMAT))
+
+    _queue_handler = BoundedQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+    _queue_handler.addFilter(ClientErrorSampler(settings.log_client_error_sample_rate))
+    _queue_handler.addFilter(RequestContextFilter())
+    root_logger = logging.getLogger()
+    root_logger.setLevel(settings.log_level.upper())
+    root_logger.addHandler(_queue_handler)
+
+    _listener = QueueListener(_queue_handler.queue, output_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+def stop_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def get_dropped_log_records() -> int:
+    return _queue_handler.dropped if _queue_handler else 0
+
+def _restart_listener_after_fork():
+    # The listener thread does not survive a fork (gunicorn preload_app); give the child a fresh
+    # queue, since the parent's may have been mid-operation, and its own listener thread
+    global _listener
+    if _queue_handler is None or _listener is None:
+        return
+    _queue_handler.queue = queue.Queue(maxsize=settings.log_queue_size)
+    _listener = QueueListener(_queue_handler.queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener_after_fork)
+
+# =============================
+# REQUEST LOGGING
+# =============================
+class RequestLoggingMiddleware:
+    """
+    Bind a RequestContext (id from X-Request-ID or generated, echoed in the response) for the
+    duration of each HTTP request and write one access record with status, route, latency and the
+    number of database queries. Access records of 4xx responses are sampled like other client errors.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(REQUEST_ID_HEADER.encode(), b"").decode("latin-1")[:128] or uuid4().hex
+        request_context = RequestContext(request_id=request_id, method=scope["method"], path=scope["path"], scope=scope)
+        token = _request_context.set(request_context)
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (REQUEST_ID_HEADER.encode(), request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            latency_ms = round((time.perf_counter() - request_context.started_at) * 1000, 2)
+            access_logger.info(
+                "%s %s %s %.2fms", request_context.method, request_context.route, status_code, latency_ms,
+                extra={
+                    "status_code": status_code, "latency_ms": latency_ms, "query_count": request_context.query_count,
+                    "client_error": 400 <= status_code < 500,
+                },
+            )
+            _request_context.reset(token)
@@ -0,0 +1,120 @@
+import os
+import json
+import asyncio
+import logging
+import threading
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# In-process counters, rendered in the Prometheus text format by GET /metrics. Under a multi-process
+# server a scrape reaches one arbitrary worker, so with METRICS_DIR set every worker also writes its
+# counters to a file there (every METRICS_FLUSH_SECONDS) and /metrics adds up all the files. Files of
+# exited workers are kept, so totals never go backwards; the directory is cleared when the server
+# starts (gunicorn.conf.py). Without METRICS_DIR, /metrics reports the process that answered.
+_counters: Counter[tuple[str, tuple[tuple[str, str], ...]]] = Counter()
+_descriptions: dict[str, str] = {}
+_lock = threading.Lock()
+_metrics_dir: str | None = None
+_flush_task: asyncio.Task | None = None
+
+COUNTERS_FILE_PREFIX = "counters_"
+
+def describe_counter(name: str, description: str) -> None:
+    _descriptions[name] = description
+
+def increment_counter(name: str, amount: int = 1, **labels: str) -> None:
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] += amount
+
+def get_counter(name: str, **labels: str) -> int:
+    with _lock:
+        return _counters[(name, tuple(sorted(labels.items())))]
+
+def render_metrics() -> str:
+    counters = sorted(_collect_counters().items())
+    lines, described = [], set()
+    for (name, labels), value in counters:
+        if name not in described:
+            described.add(name)
+            if name in _descriptions:
+                lines.append(f"# HELP {name} {_descriptions[name]}")
+            lines.append(f"# TYPE {name} counter")
+        label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+        lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+# =============================
+# MULTI-PROCESS
+# =============================
+def flush_counters() -> None:
+    """Write this process's counters to METRICS_DIR (atomically, so readers never see a partial file)."""
+    if _metrics_dir is None:
+        return
+    with _lock:
+        rows = [[name, [list(label) for label in labels], value] for (name, labels), value in _counters.items()]
+    path = _counters_path(_metrics_dir, os.getpid())
+    with open(f"{path}.tmp", "w") as file:
+        json.dump(rows, file)
+    os.replace(f"{path}.tmp", path)
+
+def clear_metrics_dir(directory: str) -> None:
+    """Remove the counter files of a previous server run. Called once, before the workers start."""
+    os.makedirs(directory, exist_ok=True)
+    for entry in os.scandir(directory):
+        if entry.name.startswith(COUNTERS_FILE_PREFIX):
+            os.remove(entry.path)
+
+async def start_metrics_flush(directory: str | None, flush_seconds: float) -> None:
+    """Share this process's counters through `directory` (if set). Called from the application lifespan."""
+    global _metrics_dir, _flush_task
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    _metrics_dir = directory
+
+    async def flush() -> None:
+        while True:
+            await asyncio.sleep(flush_seconds)
+            try:
+                await asyncio.to_thread(flush_counters)
+            except Exception:
+                logger.exception("Failed to write metrics to %s", directory)
+
+    _flush_task = asyncio.create_task(flush())
+
+async def stop_metrics_flush() -> None:
+    global _metrics_dir, _flush_task
+    if _flush_task:
+        _flush_task.cancel()
+        await asyncio.gather(_flush_task, return_exceptions=True)
+        _flush_task = None
+    try:
+        # Last write, so the counts of a worker that is shutting down are not lost
+        await asyncio.to_thread(flush_counters)
+    except Exception:
+        logger.exception("Failed to write metrics to %s", _metrics_dir)
+    _metrics_dir = None
+
+def _counters_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"{COUNTERS_FILE_PREFIX}{pid}.json")
+
+def _collect_counters() -> Counter[tuple[str, tuple[tuple[str, str], ...]]]:
+    # This process's live counts plus every other process's last written ones
+    with _lock:
+        counters = Counter(_counters)
+    if _metrics_dir is None:
+        return counters
+    own_path = _counters_path(_metrics_dir, os.getpid())
+    for entry in os.scandir(_metrics_dir):
+        if not entry.name.startswith(COUNTERS_FILE_PREFIX) or not entry.name.endswith(".json") or entry.path == own_path:
+            continue
+        try:
+            with open(entry.path) as file:
+                rows = json.load(file)
+        except (OSError, ValueError):
+            continue
+        for name, labels, value in rows:
+            counters[(name, tuple(tuple(label) for label in labels))] += value
+    return counters
@@ -0,0 +1,77 @@
+import time
+import logging
+import inspect
+from uuid import uuid4
+from typing import Callable
+from contextlib import ExitStack
+from fastapi import FastAPI
+from sqlmodel import Session, SQLModel, text
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.pool import QueuePool
+
+from app.settings import settings
+from app.db import models
+from app.services.queries import (
+    select_schedule_with_events_and_assignments, select_event_with_full_hierarchy,
+    select_full_event_assignment, select_user_calendar_version, select_user_calendar_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+async def warm_up(app: FastAPI):
+    """
+    Pay the lazy first-use costs during startup instead of on the first request.
+
+    Each step is timed and logged. A failing step is logged and skipped: warm-up only moves work
+    earlier, so it must never stop the application from starting (e.g. when the database is down).
+    """
+    started_at = time.perf_counter()
+    _run_step("configure mappers", configure_mappers)
+    _run_step("build openapi schema and routes", app.openapi)
+    _run_step("check response models", _check_response_models)
+    engine = getattr(app.state, "db_engine", None)
+    if engine is not None:
+        _run_step("open pool connections", lambda: _open_pool_connections(engine))
+        if settings.warmup_hot_queries:
+            _run_step("compile hot queries", lambda: _compile_hot_queries(engine))
+    logger.info("Warm-up finished in %.1f ms", (time.perf_counter() - started_at) * 1000)
+
+def _run_step(name: str, step: Callable[[], object]):
+    started_at = time.perf_counter()
+    try:
+        step()
+    except Exception:
+        logger.warning("Warm-up step '%s' failed", name, exc_info=True)
+        return
+    logger.info("Warm-up step '%s' took %.1f ms", name, (time.perf_counter() - started_at) * 1000)
+
+def _check_response_models():
+    # Pydantic builds a model's validator and serializer when the class is defined, and FastAPI each
+    # route's TypeAdapter when routes are built, so there is nothing left to warm. A model whose
+    # forward references did not resolve would only be completed mid-request: complete it here, or fail.
+    incomplete = [
+        model for model in vars(models).values()
+        if inspect.isclass(model) and issubclass(model, SQLModel) and not model.__pydantic_complete__
+    ]
+    for model in incomplete:
+        model.model_rebuild(raise_errors=True)
+    if incomplete:
+        logger.warning("Completed response models at startup: %s", ", ".join(model.__name__ for model in incomplete))
+
+def _open_pool_connections(engine):
+    # Check out pool_size connections at once so the pool really opens that many, then return them all
+    size = engine.pool.size() if isinstance(engine.pool, QueuePool) else 1
+    with ExitStack() as stack:
+        for _ in range(size):
+            connection = stack.enter_context(engine.connect())
+            connection.execute(text("SELECT 1"))
+
+def _compile_hot_queries(engine):
+    # Lookups with a random id match no rows but populate SQLAlchemy's compiled statement cache
+    missing_id = uuid4()
+    with Session(engine) as session:
+        select_schedule_with_events_and_assignments(session, missing_id)
+        select_event_with_full_hierarchy(session, missing_id)
+        select_full_event_assignment(session, missing_id)
+        select_user_calendar_version(session, missing_id)
+        select_user_calendar_rows(session, missing_id)
@@ -0,0 +1,104 @@
+"""
+Cold-start profile for the API process.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters and reports the slowest
+modules by cumulative import time, plus the time from interpreter start to the first 200 response
+(served in process, without the lifespan, so no database is needed).
+
+Usage:
+    uv run python benchmarks/import_time.py
+    uv run python benchmarks/import_time.py --runs 5 --top 30 --json
+    uv run python benchmarks/import_time.py --max-import-ms 900   # exit 1 on regression
+
+Environment variables from `.env` (or the shell) must be set, because importing the app loads settings.
+"""
+import re
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)$")
+# Modules that must stay out of the import graph of app.main; they are imported on first use
+LAZY_MODULES = ["phonenumbers", "redis"]
+
+FIRST_RESPONSE_SCRIPT = """
+import time
+started_at = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.main import app
+response = TestClient(app).get("/openapi.json")
+assert response.status_code == 200, response.status_code
+print(round((time.perf_counter() - started_at) * 1000, 1))
+"""
+
+def profile_imports(module: str) -> tuple[int, dict[str, tuple[int, int]], set[str]]:
+    """Return (total µs, {module: (self µs, cumulative µs)}, top-level packages imported) for one cold import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    modules, total = {}, 0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, name = int(match.group(1)), int(match.group(2)), match.group(4)
+        modules[name] = (self_us, cumulative_us)
+        if name == module:
+            total = cumulative_us
+    return total, modules, {name.split(".")[0] for name in modules}
+
+def time_first_response() -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_RESPONSE_SCRIPT],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=3, help="cold runs per measurement; the median is reported")
+    parser.add_argument("--top", type=int, default=20, help="number of slowest modules to list")
+    parser.add_argument("--json", action="store_true", help="print a machine-readable report")
+    parser.add_argument("--max-import-ms", type=float, default=None, help="fail when the median import time exceeds this")
+    args = parser.parse_args()
+
+    profiles = [profile_imports(args.module) for _ in range(args.runs)]
+    import_ms = statistics.median(total for total, _, _ in profiles) / 1000
+    first_response_ms = statistics.median(time_first_response() for _ in range(args.runs))
+    _, modules, packages = profiles[-1]
+    slowest = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+    eager_lazy_modules = [name for name in LAZY_MODULES if name in packages]
+
+    if args.json:
+        print(json.dumps({
+            "module": args.module,
+            "runs": args.runs,
+            "import_ms": round(import_ms, 1),
+            "first_response_ms": round(first_response_ms, 1),
+            "eager_lazy_modules": eager_lazy_modules,
+            "slowest": [{"module": name, "self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000} for name, (self_us, cumulative_us) in slowest],
+        }, indent=2))
+    else:
+        print(f"import {args.module}: {import_ms:.1f} ms (median of {args.runs})")
+        print(f"cold start to first 200: {first_response_ms:.1f} ms (median of {args.runs})")
+        print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+        for name, (self_us, cumulative_us) in slowest:
+            print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+        if eager_lazy_modules:
+            print(f"\nWARNING: lazily loaded modules imported eagerly: {', '.join(eager_lazy_modules)}")
+
+    if eager_lazy_modules:
+        return 1
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        print(f"import time {import_ms:.1f} ms exceeds --max-import-ms {args.max_import_ms}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Throughput scaling of the multi-process server with worker count.
+
+For each worker count, starts the server (gunicorn.conf.py, or `uvicorn --workers` with
+--server uvicorn), waits for /health, drives a GET endpoint with concurrent keep-alive clients for a
+fixed duration, and reports requests/second and latency percentiles. The default path is the schedule
+grid, whose Pydantic serialization is CPU bound and is what extra workers are meant to scale.
+
+Usage (against a seeded database from .env):
+    uv run python benchmarks/worker_scaling.py --schedule-id <uuid> --workers 1,2,4
+    uv run python benchmarks/worker_scaling.py --path /roles --workers 1,2 --duration 5 --json
+"""
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+def start_server(server: str, workers: int, port: int) -> subprocess.Popen:
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "BIND": f"127.0.0.1:{port}", "LOG_LEVEL": os.getenv("LOG_LEVEL", "warning")}
+    if server == "gunicorn":
+        command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"]
+    else:
+        command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    return subprocess.Popen(command, cwd=REPO_ROOT, env=env, start_new_session=True)
+
+def stop_server(process: subprocess.Popen) -> None:
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+
+async def wait_until_ready(base_url: str, api_key: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url, headers={"x-api-key": api_key}) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"Server at {base_url} did not become healthy within {timeout}s")
+
+async def drive(base_url: str, api_key: str, path: str, concurrency: int, duration: float) -> dict:
+    latencies, errors = [], 0
+    deadline = time.monotonic() + duration
+
+    async def client_loop(client: httpx.AsyncClient):
+        nonlocal errors
+        while time.monotonic() < deadline:
+            started_at = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started_at)
+            if response.status_code != 200:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers={"x-api-key": api_key}, limits=limits, timeout=30) as client:
+        started_at = time.monotonic()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.monotonic() - started_at
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1) if latencies else None,
+    }
+
+async def run(args) -> list[dict]:
+    api_key = os.environ["FAST_API_KEY"]
+    path = args.path or f"/schedules/{args.schedule_id}/grid"
+    results = []
+    for workers in args.workers:
+        process = start_server(args.server, workers, args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            await wait_until_ready(base_url, api_key)
+            await drive(base_url, api_key, path, args.concurrency, min(2.0, args.duration))  # warm every worker
+            result = await drive(base_url, api_key, path, args.concurrency, args.duration)
+        finally:
+            stop_server(process)
+        results.append({"workers": workers, **result})
+    baseline = results[0]["requests_per_second"] or 1
+    for result in results:
+        result["speedup"] = round(result["requests_per_second"] / baseline, 2)
+    return results
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schedule-id", help="schedule whose grid is requested (default path)")
+    parser.add_argument("--path", help="GET path to drive instead of the schedule grid")
+    parser.add_argument("--workers", type=lambda value: [int(count) for count in value.split(",")], default=[1, 2, os.cpu_count() or 1])
+    parser.add_argument("--server", choices=["gunicorn", "uvicorn"], default="gunicorn")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent keep-alive clients")
+    parser.add_argument("--duration", type=float, default=10, help="seconds measured per worker count")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--json", action="store_true", help="print a machine-readable report")
+    args = parser.parse_args()
+    if not args.path and not args.schedule_id:
+        parser.error("--schedule-id or --path is required")
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps({"server": args.server, "cpus": os.cpu_count(), "results": results}, indent=2))
+    else:
+        print(f"{args.server}, {os.cpu_count()} CPUs, {args.concurrency} clients, {args.duration:.0f}s per run")
+        print(f"{'workers':>8} {'req/s':>9} {'speedup':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for result in results:
+            print(f"{result['workers']:>8} {result['requests_per_second']:>9} {result['speedup']:>7}x {result['p50_ms']:>8} {result['p99_ms']:>8} {result['errors']:>7}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
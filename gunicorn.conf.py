@@ -0,0 +1,36 @@
+# Multi-process serving: `uv run gunicorn` (requires the `gunicorn` and `uvicorn-worker` packages)
+#
+# The app is imported once in the master (preload_app) and forked into WEB_CONCURRENCY uvicorn
+# workers, so each worker serializes responses on its own core. The lifespan (engine, broker, job
+# workers, warm-up) runs inside every worker after the fork; see app/db/database.py for how
+# engines inherited across a fork are disposed.
+import os
+import logging
+
+from app.settings import settings
+from app.utils.metrics import clear_metrics_dir
+
+logger = logging.getLogger("gunicorn.error")
+
+wsgi_app = "app.main:app"
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = settings.web_concurrency
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+def on_starting(server):
+    # Workers share their /metrics counters through METRICS_DIR; start from zero on every server start
+    if settings.metrics_dir:
+        clear_metrics_dir(settings.metrics_dir)
+    else:
+        logger.warning("METRICS_DIR is not set: /metrics reports only the worker that answers the scrape")
+
+def when_ready(server):
+    max_connections = workers * (settings.db_pool_size + settings.db_max_overflow)
+    logger.info(
+        "Serving with %s workers; up to %s database connections (DB_POOL_SIZE=%s + DB_MAX_OVERFLOW=%s per worker)",
+        workers, max_connections, settings.db_pool_size, settings.db_max_overflow,
+    )
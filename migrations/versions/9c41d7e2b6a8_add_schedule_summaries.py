@@ -0,0 +1,43 @@
+"""add schedule summaries
+
+Revision ID: 9c41d7e2b6a8
+Revises: 5b2e8f0a9d13
+Create Date: 2026-10-19 14:02:17.518930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41d7e2b6a8'
+down_revision: Union[str, Sequence[str], None] = '5b2e8f0a9d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows are written by the application on the next write to each schedule (and computed on the
+    # fly until then), so no backfill is needed here
+    op.create_table('schedule_summaries',
+    sa.Column('events_count', sa.Integer(), nullable=False),
+    sa.Column('slots_count', sa.Integer(), nullable=False),
+    sa.Column('filled_slots_count', sa.Integer(), nullable=False),
+    sa.Column('required_slots_count', sa.Integer(), nullable=False),
+    sa.Column('required_filled_count', sa.Integer(), nullable=False),
+    sa.Column('role_coverage', sa.JSON(), nullable=False),
+    sa.Column('user_assignment_counts', sa.JSON(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('schedule_id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['schedule_id'], ['schedules.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('schedule_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('schedule_summaries')
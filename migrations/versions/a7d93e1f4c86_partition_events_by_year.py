@@ -0,0 +1,172 @@
+"""partition events and event_assignments by year
+
+Revision ID: a7d93e1f4c86
+Revises: f4b81d6c2a57
+Create Date: 2026-10-19 18:12:55.108264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d93e1f4c86'
+down_revision: Union[str, Sequence[str], None] = 'f4b81d6c2a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EVENT_COLUMNS = 'title, starts_at, ends_at, team_id, event_type_id, notes, is_active, id, schedule_id, created_at, updated_at'
+EVENT_ASSIGNMENT_COLUMNS = 'is_applicable, requirement_level, assigned_user_id, is_active, id, event_id, role_id, created_at, updated_at'
+requirement_level = postgresql.ENUM('required', 'preferred', 'optional', name='requirement_level', create_type=False)
+
+
+def _event_columns() -> list[sa.Column]:
+    return [
+        sa.Column('title', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('starts_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('ends_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('team_id', sa.Uuid(), nullable=True),
+        sa.Column('event_type_id', sa.Uuid(), nullable=False),
+        sa.Column('notes', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('schedule_id', sa.Uuid(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.CheckConstraint('starts_at < ends_at', name='event_check_time_range'),
+        sa.ForeignKeyConstraint(['event_type_id'], ['event_types.id'], ),
+        sa.ForeignKeyConstraint(['schedule_id'], ['schedules.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    ]
+
+
+def _event_assignment_columns() -> list[sa.Column]:
+    return [
+        sa.Column('is_applicable', sa.Boolean(), nullable=False),
+        sa.Column('requirement_level', requirement_level, nullable=True),
+        sa.Column('assigned_user_id', sa.Uuid(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('event_id', sa.Uuid(), nullable=False),
+        sa.Column('role_id', sa.Uuid(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['assigned_user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['role_id'], ['roles.id'], ),
+    ]
+
+
+def _create_event_indexes() -> None:
+    op.create_index('ix_events_event_type_id', 'events', ['event_type_id'], unique=False)
+    op.create_index('ix_events_starts_at', 'events', ['starts_at'], unique=False)
+    op.create_index('ix_events_schedule_id_starts_at', 'events', ['schedule_id', 'starts_at'], unique=False)
+    op.create_index('ix_events_active_starts_at', 'events', ['starts_at'], unique=False,
+        postgresql_include=['id'], postgresql_where=sa.text('is_active'))
+
+
+def _create_event_assignment_indexes() -> None:
+    op.create_index('ix_event_assignments_role_id', 'event_assignments', ['role_id'], unique=False)
+    op.create_index('ix_event_assignments_event_id_covering', 'event_assignments', ['event_id'], unique=False,
+        postgresql_include=['role_id', 'assigned_user_id', 'requirement_level', 'is_active', 'is_applicable'])
+    op.create_index('ix_event_assignments_assigned_user_id_event_id', 'event_assignments', ['assigned_user_id', 'event_id'], unique=False,
+        postgresql_include=['role_id', 'id', 'is_active', 'is_applicable', 'updated_at'])
+    op.create_index('ix_event_assignments_filled_event_id', 'event_assignments', ['event_id'], unique=False,
+        postgresql_include=['assigned_user_id', 'role_id', 'requirement_level'],
+        postgresql_where=sa.text('is_active AND is_applicable AND assigned_user_id IS NOT NULL'))
+
+
+# Partitions for every year with events or schedules (plus the January after a December schedule),
+# this year and next; later years are created by the application when first needed
+# (app.db.partitions, which names them the same way)
+CREATE_YEAR_PARTITIONS = """
+DO $$
+DECLARE
+    partition_year int;
+BEGIN
+    FOR partition_year IN
+        SELECT extract(year FROM starts_at AT TIME ZONE 'UTC')::int FROM events_unpartitioned
+        UNION SELECT year FROM schedules
+        UNION SELECT year + 1 FROM schedules WHERE month = 12
+        UNION SELECT extract(year FROM now() AT TIME ZONE 'UTC')::int + offset_years FROM generate_series(0, 1) AS offset_years
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF events FOR VALUES FROM (%L) TO (%L)',
+            'events_y' || partition_year, make_timestamptz(partition_year, 1, 1, 0, 0, 0, 'UTC'), make_timestamptz(partition_year + 1, 1, 1, 0, 0, 0, 'UTC')
+        );
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF event_assignments FOR VALUES FROM (%L) TO (%L)',
+            'event_assignments_y' || partition_year, make_timestamptz(partition_year, 1, 1, 0, 0, 0, 'UTC'), make_timestamptz(partition_year + 1, 1, 1, 0, 0, 0, 'UTC')
+        );
+    END LOOP;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rebuild both tables: a regular table cannot be converted to a partitioned one in place. The
+    # copies hold the rows while the originals (and their constraint and index names) are dropped.
+    op.execute('CREATE TABLE events_unpartitioned AS TABLE events')
+    op.execute('CREATE TABLE event_assignments_unpartitioned AS TABLE event_assignments')
+    op.drop_table('event_assignments')
+    op.drop_table('events')
+
+    # Primary and unique keys of a partitioned table must include the partition key
+    op.create_table('events',
+        *_event_columns(),
+        sa.PrimaryKeyConstraint('id', 'starts_at', name='events_pkey'),
+        postgresql_partition_by='RANGE (starts_at)',
+    )
+    op.create_table('event_assignments',
+        *_event_assignment_columns(),
+        sa.Column('event_starts_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['event_id', 'event_starts_at'], ['events.id', 'events.starts_at'],
+            name='event_assignments_event_fkey', ondelete='CASCADE', onupdate='CASCADE'),
+        sa.PrimaryKeyConstraint('id', 'event_starts_at', name='event_assignments_pkey'),
+        sa.UniqueConstraint('event_id', 'role_id', 'event_starts_at', name='event_assignment_ukey'),
+        postgresql_partition_by='RANGE (event_starts_at)',
+    )
+    op.execute(CREATE_YEAR_PARTITIONS)
+    _create_event_indexes()
+    _create_event_assignment_indexes()
+
+    op.execute(f'INSERT INTO events ({EVENT_COLUMNS}) SELECT {EVENT_COLUMNS} FROM events_unpartitioned')
+    op.execute(
+        f'INSERT INTO event_assignments ({EVENT_ASSIGNMENT_COLUMNS}, event_starts_at) '
+        f'SELECT {", ".join(f"ea.{column}" for column in EVENT_ASSIGNMENT_COLUMNS.split(", "))}, e.starts_at '
+        'FROM event_assignments_unpartitioned AS ea JOIN events_unpartitioned AS e ON e.id = ea.event_id'
+    )
+    op.drop_table('event_assignments_unpartitioned')
+    op.drop_table('events_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('CREATE TABLE events_partitioned AS TABLE events')
+    op.execute('CREATE TABLE event_assignments_partitioned AS TABLE event_assignments')
+    # Dropping the partitioned parents drops every partition with them
+    op.drop_table('event_assignments')
+    op.drop_table('events')
+
+    op.create_table('events',
+        *_event_columns(),
+        sa.PrimaryKeyConstraint('id', name='events_pkey'),
+    )
+    op.create_table('event_assignments',
+        *_event_assignment_columns(),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], name='event_assignments_event_id_fkey', ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id', name='event_assignments_pkey'),
+        sa.UniqueConstraint('event_id', 'role_id', name='event_assignment_ukey'),
+    )
+    _create_event_indexes()
+    _create_event_assignment_indexes()
+
+    op.execute(f'INSERT INTO events ({EVENT_COLUMNS}) SELECT {EVENT_COLUMNS} FROM events_partitioned')
+    op.execute(f'INSERT INTO event_assignments ({EVENT_ASSIGNMENT_COLUMNS}) SELECT {EVENT_ASSIGNMENT_COLUMNS} FROM event_assignments_partitioned')
+    op.drop_table('event_assignments_partitioned')
+    op.drop_table('events_partitioned')
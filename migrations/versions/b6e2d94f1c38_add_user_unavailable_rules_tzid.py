@@ -0,0 +1,29 @@
+"""add user unavailable rules tzid
+
+Revision ID: b6e2d94f1c38
+Revises: d8b5e3f07a61
+Create Date: 2026-10-19 21:14:38.205716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2d94f1c38'
+down_revision: Union[str, Sequence[str], None] = 'd8b5e3f07a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rules were expanded in UTC: they keep doing so
+    op.add_column('user_unavailable_rules', sa.Column('tzid', sa.String(), server_default='UTC', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user_unavailable_rules', 'tzid')
@@ -0,0 +1,45 @@
+"""add user unavailable rules table
+
+Revision ID: c3f9a2d17e45
+Revises: b8e24c7f9a31
+Create Date: 2026-10-19 17:41:12.204813
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f9a2d17e45'
+down_revision: Union[str, Sequence[str], None] = 'b8e24c7f9a31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_unavailable_rules',
+    sa.Column('rrule', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('starts_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('ends_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('until', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.CheckConstraint('starts_at < ends_at', name='user_unavailable_rule_check_time_range'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_user_unavailable_rules_user_id'), 'user_unavailable_rules', ['user_id'], unique=False)
+    op.create_index('ix_user_unavailable_rules_starts_at_until', 'user_unavailable_rules', ['starts_at', 'until'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_unavailable_rules_starts_at_until', table_name='user_unavailable_rules')
+    op.drop_index(op.f('ix_user_unavailable_rules_user_id'), table_name='user_unavailable_rules')
+    op.drop_table('user_unavailable_rules')
@@ -0,0 +1,42 @@
+"""add assignment candidate indexes
+
+Revision ID: d8b5e3f07a61
+Revises: c3f9a2d17e45
+Create Date: 2026-10-19 18:52:07.631904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8b5e3f07a61'
+down_revision: Union[str, Sequence[str], None] = 'c3f9a2d17e45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A partitioned table's index can't be built CONCURRENTLY: this one is built in the migration
+    # transaction (on every yearly partition)
+    op.create_index('ix_event_assignments_filled_assigned_user_id_event_starts_at', 'event_assignments',
+        ['assigned_user_id', 'event_starts_at'], unique=False,
+        postgresql_include=['event_id', 'requirement_level'],
+        postgresql_where=sa.text('is_active AND is_applicable AND assigned_user_id IS NOT NULL'),
+        if_not_exists=True)
+    # Built CONCURRENTLY (outside the migration transaction) so user roles stay writable
+    with op.get_context().autocommit_block():
+        op.create_index('ix_user_roles_role_id_covering', 'user_roles', ['role_id'], unique=False,
+            postgresql_include=['user_id', 'proficiency_level_id'], postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_user_roles_role_id', table_name='user_roles', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_user_roles_role_id', 'user_roles', ['role_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_user_roles_role_id_covering', table_name='user_roles', postgresql_concurrently=True, if_exists=True)
+    op.drop_index('ix_event_assignments_filled_assigned_user_id_event_starts_at', table_name='event_assignments', if_exists=True)
@@ -0,0 +1,37 @@
+"""add workload analytics indexes
+
+Revision ID: e3a7c5f19b20
+Revises: 9c41d7e2b6a8
+Create Date: 2026-10-19 15:26:41.204377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a7c5f19b20'
+down_revision: Union[str, Sequence[str], None] = '9c41d7e2b6a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built CONCURRENTLY (outside the migration transaction) so years of assignments stay writable
+    with op.get_context().autocommit_block():
+        op.create_index('ix_events_active_starts_at', 'events', ['starts_at'], unique=False,
+            postgresql_include=['id'], postgresql_where=sa.text('is_active'), postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_event_assignments_filled_event_id', 'event_assignments', ['event_id'], unique=False,
+            postgresql_include=['assigned_user_id', 'role_id', 'requirement_level'],
+            postgresql_where=sa.text('is_active AND is_applicable AND assigned_user_id IS NOT NULL'),
+            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_event_assignments_filled_event_id', table_name='event_assignments', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_events_active_starts_at', table_name='events', postgresql_concurrently=True, if_exists=True)
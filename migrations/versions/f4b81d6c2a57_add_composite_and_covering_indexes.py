@@ -0,0 +1,64 @@
+"""add composite and covering indexes
+
+Revision ID: f4b81d6c2a57
+Revises: e3a7c5f19b20
+Create Date: 2026-10-19 16:48:09.731652
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b81d6c2a57'
+down_revision: Union[str, Sequence[str], None] = 'e3a7c5f19b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Single-column FK indexes that are a leading prefix of a new composite index (kept working for
+# FK checks and cascades by the composite), as (index name, table, columns)
+SUPERSEDED_INDEXES = [
+    ('ix_events_schedule_id', 'events', ['schedule_id']),
+    ('ix_event_assignments_event_id', 'event_assignments', ['event_id']),
+    ('ix_event_assignments_assigned_user_id', 'event_assignments', ['assigned_user_id']),
+    ('ix_team_users_team_id', 'team_users', ['team_id']),
+    ('ix_user_unavailable_periods_user_id', 'user_unavailable_periods', ['user_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built CONCURRENTLY (outside the migration transaction) so the tables stay writable; the new
+    # indexes exist before the ones they supersede are dropped
+    with op.get_context().autocommit_block():
+        op.create_index('ix_events_schedule_id_starts_at', 'events', ['schedule_id', 'starts_at'], unique=False,
+            postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_event_assignments_event_id_covering', 'event_assignments', ['event_id'], unique=False,
+            postgresql_include=['role_id', 'assigned_user_id', 'requirement_level', 'is_active', 'is_applicable'],
+            postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_event_assignments_assigned_user_id_event_id', 'event_assignments', ['assigned_user_id', 'event_id'], unique=False,
+            postgresql_include=['role_id', 'id', 'is_active', 'is_applicable', 'updated_at'],
+            postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_team_users_team_id_is_active', 'team_users', ['team_id', 'is_active'], unique=False,
+            postgresql_include=['user_id'], postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_user_unavailable_periods_user_id_starts_at_ends_at', 'user_unavailable_periods', ['user_id', 'starts_at', 'ends_at'], unique=False,
+            postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_user_unavailable_periods_ends_at_starts_at', 'user_unavailable_periods', ['ends_at', 'starts_at'], unique=False,
+            postgresql_concurrently=True, if_not_exists=True)
+        for index_name, table_name, _ in SUPERSEDED_INDEXES:
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns in SUPERSEDED_INDEXES:
+            op.create_index(index_name, table_name, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_user_unavailable_periods_ends_at_starts_at', table_name='user_unavailable_periods', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_user_unavailable_periods_user_id_starts_at_ends_at', table_name='user_unavailable_periods', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_team_users_team_id_is_active', table_name='team_users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_event_assignments_assigned_user_id_event_id', table_name='event_assignments', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_event_assignments_event_id_covering', table_name='event_assignments', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_events_schedule_id_starts_at', table_name='events', postgresql_concurrently=True, if_exists=True)
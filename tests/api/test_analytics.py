@@ -0,0 +1,99 @@
+import pytest
+from fastapi import status
+
+from app.db.models import UserRole
+from app.db.models.enums import RequirementLevel
+from tests.utils.constants import USER_ID_1, USER_ID_2, USER_ID_3, PROFICIENCY_LEVEL_ID_3, ROLE_ID_1, ROLE_ID_2, TEAM_ID_2, DATETIME_2025_05_01, DATETIME_2025_05_02, DATETIME_2025_05_04
+
+pytestmark = pytest.mark.asyncio
+
+# =============================
+# FIXTURES
+# =============================
+@pytest.fixture
+def seed_for_analytics_tests(
+    seed_users, seed_roles, seed_proficiency_levels, seed_user_roles, seed_teams, seed_team_users,
+    seed_schedules, seed_event_types, seed_events, seed_event_assignments,
+    test_users_data, test_roles_data, test_proficiency_levels_data, test_user_roles_data, test_teams_data, test_team_users_data,
+    test_schedules_data, test_event_types_data, test_events_data, test_event_assignments_data,
+):
+    # Alice: required propresenter + preferred sound on May 1; Bob: optional propresenter on May 2
+    test_event_assignments_data[1].assigned_user_id = USER_ID_1
+    test_event_assignments_data[1].requirement_level = RequirementLevel.preferred
+    test_event_assignments_data[2].assigned_user_id = USER_ID_2
+    test_event_assignments_data[2].requirement_level = RequirementLevel.optional
+    seed_users(test_users_data)
+    seed_roles(test_roles_data[:2])
+    seed_proficiency_levels(test_proficiency_levels_data)
+    seed_user_roles(test_user_roles_data)
+    seed_teams(test_teams_data[:2])
+    seed_team_users(test_team_users_data)
+    seed_schedules([test_schedules_data[1]])
+    seed_event_types([test_event_types_data[0]])
+    seed_events(test_events_data)
+    seed_event_assignments(test_event_assignments_data)
+
+# =============================
+# GET WORKLOAD ANALYTICS
+# =============================
+@pytest.mark.parametrize("params", [
+    {"starts_at": DATETIME_2025_05_02.isoformat(), "ends_at": DATETIME_2025_05_01.isoformat()}, # starts_at after ends_at
+    {"starts_at": "invalid-datetime"}, # invalid datetime
+    {"team_id": "invalid-uuid"}, # invalid team_id
+])
+async def test_get_workload_analytics_error_cases(async_client, params):
+    response = await async_client.get("/analytics/load", params=params)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+async def test_get_workload_analytics_success(async_client, seed_for_analytics_tests):
+    response = await async_client.get("/analytics/load", params={"starts_at": DATETIME_2025_05_01.isoformat(), "ends_at": DATETIME_2025_05_04.isoformat()})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["weeks"] == pytest.approx(3 / 7)
+    assert data["requirement_level_weights"] == {"required": 1.0, "preferred": 0.5, "optional": 0.25}
+    assert data["team_average_load"] == pytest.approx(0.875)
+    # Most scheduled first; Carol holds no role and filled none, so she is not listed
+    assert [user["user_id"] for user in data["users"]] == [USER_ID_1, USER_ID_2]
+
+    alice, bob = data["users"]
+    assert alice["assignments_count"] == 2
+    assert alice["weighted_load"] == pytest.approx(1.5)
+    assert alice["load_ratio"] == pytest.approx(1.5 / 0.875)
+    assert alice["peak_4_week_load"] == pytest.approx(1.5)
+    # The peak window is the 4 weeks ending with the week of Monday 2025-04-28
+    assert alice["peak_4_week_starts_at"].startswith("2025-04-07")
+    assert [(role["role_id"], role["assignments_count"], role["weighted_load"]) for role in alice["roles"]] == [(ROLE_ID_1, 1, 1.0), (ROLE_ID_2, 1, 0.5)]
+    assert alice["roles"][0]["role_average_load"] == pytest.approx(0.625)
+    assert alice["roles"][0]["role_load_percentile"] == 1.0
+
+    assert bob["weighted_load"] == pytest.approx(0.25)
+    assert bob["roles"][0]["role_load_percentile"] == 0.0
+
+async def test_get_workload_analytics_team_filter(async_client, seed_for_analytics_tests):
+    response = await async_client.get("/analytics/load", params={
+        "starts_at": DATETIME_2025_05_01.isoformat(), "ends_at": DATETIME_2025_05_04.isoformat(), "team_id": TEAM_ID_2,
+    })
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["team_id"] == TEAM_ID_2
+    assert [user["user_id"] for user in data["users"]] == [USER_ID_1]
+    assert data["users"][0]["load_ratio"] == pytest.approx(1.0)
+
+async def test_get_workload_analytics_range_without_assignments(async_client, seed_for_analytics_tests):
+    response = await async_client.get("/analytics/load", params={"starts_at": DATETIME_2025_05_04.isoformat(), "ends_at": "2025-06-01T00:00:00Z"})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    # Role holders are still listed with zero load, so under-scheduled people show up
+    assert {user["user_id"] for user in data["users"]} == {USER_ID_1, USER_ID_2}
+    assert all(user["weighted_load"] == 0 and user["load_ratio"] is None for user in data["users"])
+
+async def test_get_workload_analytics_skips_holders_at_non_assignable_levels(async_client, get_test_db_session, seed_for_analytics_tests, test_proficiency_levels_data):
+    # Carol holds propresenter, but at a level she can't be assigned at
+    untrained = get_test_db_session.merge(test_proficiency_levels_data[2])
+    untrained.is_assignable = False
+    get_test_db_session.add(UserRole(user_id=USER_ID_3, role_id=ROLE_ID_1, proficiency_level_id=PROFICIENCY_LEVEL_ID_3))
+    get_test_db_session.commit()
+
+    response = await async_client.get("/analytics/load", params={"starts_at": DATETIME_2025_05_04.isoformat(), "ends_at": "2025-06-01T00:00:00Z"})
+    assert response.status_code == status.HTTP_200_OK
+    assert {user["user_id"] for user in response.json()["users"]} == {USER_ID_1, USER_ID_2}
@@ -0,0 +1,80 @@
+import pytest
+from fastapi import status
+
+from app.services import api_keys
+from tests.utils.helpers import assert_keys_match
+
+pytestmark = pytest.mark.asyncio
+
+API_KEYS_RESPONSE_KEYS = {"id", "name", "scopes", "is_active", "prefix"}
+
+# =============================
+# HELPERS
+# =============================
+async def create_key(async_client, name: str, scopes: list[str]) -> dict:
+    response = await async_client.post("/api_keys", json={"name": name, "scopes": scopes})
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()
+
+# =============================
+# CREATE AND AUTHENTICATE
+# =============================
+async def test_created_key_is_returned_once_and_authenticates(async_client):
+    created = await create_key(async_client, "mobile", ["read"])
+    assert_keys_match(created, API_KEYS_RESPONSE_KEYS | {"key"})
+    assert created["key"].startswith(f"shq_{created['prefix']}_")
+
+    response = await async_client.get("/roles", headers={"x-api-key": created["key"]})
+    assert response.status_code == status.HTTP_200_OK
+
+    # Test: the full key (and its hash) is never returned again
+    response = await async_client.get(f"/api_keys/{created['id']}")
+    assert response.status_code == status.HTTP_200_OK
+    assert_keys_match(response.json(), API_KEYS_RESPONSE_KEYS)
+
+async def test_scopes_are_enforced_per_method(async_client):
+    reader = await create_key(async_client, "reader", ["read"])
+    writer = await create_key(async_client, "writer", ["read", "write"])
+
+    response = await async_client.post("/roles", json={"name": "New Role", "order": 4, "code": "new_role"}, headers={"x-api-key": reader["key"]})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert "write" in response.json()["detail"]
+    response = await async_client.post("/roles", json={"name": "New Role", "order": 4, "code": "new_role"}, headers={"x-api-key": writer["key"]})
+    assert response.status_code == status.HTTP_201_CREATED
+
+    # Test: managing keys needs the admin scope
+    response = await async_client.get("/api_keys", headers={"x-api-key": writer["key"]})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+async def test_duplicate_key_name_conflicts(async_client):
+    await create_key(async_client, "mobile", ["read"])
+    response = await async_client.post("/api_keys", json={"name": "mobile", "scopes": ["read"]})
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+async def test_prefix_collision_is_retried_with_a_new_key(async_client, monkeypatch):
+    existing = await create_key(async_client, "mobile", ["read"])
+    generated_keys = iter([(f"shq_{existing['prefix']}_secret", existing["prefix"], "hash"), api_keys.generate_api_key()])
+    monkeypatch.setattr(api_keys, "generate_api_key", lambda: next(generated_keys))
+
+    created = await create_key(async_client, "kiosk", ["read"])
+    assert created["prefix"] != existing["prefix"]
+
+# =============================
+# REVOKE
+# =============================
+async def test_deactivated_and_deleted_keys_stop_authenticating(async_client):
+    deactivated = await create_key(async_client, "old", ["read"])
+    deleted = await create_key(async_client, "older", ["read"])
+
+    response = await async_client.patch(f"/api_keys/{deactivated['id']}", json={"is_active": False})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["is_active"] is False
+    response = await async_client.delete(f"/api_keys/{deleted['id']}")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    for key in (deactivated["key"], deleted["key"]):
+        response = await async_client.get("/roles", headers={"x-api-key": key})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = await async_client.get("/api_keys")
+    assert [api_key["name"] for api_key in response.json()] == ["old"]
@@ -1,8 +1,12 @@
+import asyncio
 import pytest
+from uuid import UUID
 from fastapi import status
 
+from app.db.models.enums import ScheduleChangeType
+from app.services.broker import get_broker
 from tests.utils.helpers import assert_empty_list_200, assert_list_response
-from tests.utils.constants import BAD_ID_0000, EVENT_ID_1, ROLE_ID_1, ROLE_ID_2, USER_ID_1, USER_ID_2, EVENT_ASSIGNMENT_ID_1, EVENT_ASSIGNMENT_ID_2, SCHEDULE_ID_2
+from tests.utils.constants import BAD_ID_0000, EVENT_ID_1, ROLE_ID_1, ROLE_ID_2, USER_ID_1, USER_ID_2, EVENT_ASSIGNMENT_ID_1, EVENT_ASSIGNMENT_ID_2, EVENT_ASSIGNMENT_ID_3, SCHEDULE_ID_2, PROFICIENCY_LEVEL_ID_2
 
 pytestmark = pytest.mark.asyncio
 
@@ -94,4 +98,89 @@ async def test_update_event_assignment_success(async_client, seed_for_event_assi
     for field, value in payload.items():
         assert response_json[field] == value
     for field, value in unchanged_fields.items():
-        assert response_json[field] == value
\ No newline at end of file
+        assert response_json[field] == value
+
+async def test_update_event_assignment_publishes_schedule_change(async_client, seed_for_event_assignments_tests):
+    async with get_broker().subscribe(UUID(SCHEDULE_ID_2)) as queue:
+        response = await async_client.patch(f"/assignments/{EVENT_ASSIGNMENT_ID_1}", json={"assigned_user_id": USER_ID_2})
+        assert response.status_code == status.HTTP_200_OK
+        change = await asyncio.wait_for(queue.get(), timeout=1)
+    assert change.type == ScheduleChangeType.assignment_updated
+    assert str(change.schedule_id) == SCHEDULE_ID_2
+    assert str(change.id) == EVENT_ASSIGNMENT_ID_1
+    assert change.data == {"assigned_user_id": UUID(USER_ID_2)}
+
+# =============================
+# GET CANDIDATES FOR EVENT ASSIGNMENT
+# =============================
+@pytest.fixture
+def seed_for_assignment_candidates_tests(seed_for_event_assignments_tests, seed_user_roles, seed_events, seed_event_assignments, test_user_roles_data, test_events_data, test_event_assignments_data):
+    # Adds Bob's ROLE_ID_1, EVENT_ID_2 (May 2 - May 3, right after EVENT_ID_1) and its ROLE_ID_1 slot
+    seed_user_roles([test_user_roles_data[2]])
+    seed_events([test_events_data[1]])
+    seed_event_assignments([test_event_assignments_data[2]])
+
+@pytest.mark.parametrize("assignment_id, expected_status", [
+    (BAD_ID_0000, status.HTTP_404_NOT_FOUND), # assignment not found
+    ("invalid-uuid-format", status.HTTP_422_UNPROCESSABLE_CONTENT), # invalid UUID format
+])
+async def test_get_assignment_candidates_error_cases(async_client, seed_for_assignment_candidates_tests, assignment_id, expected_status):
+    response = await async_client.get(f"/assignments/{assignment_id}/candidates")
+    assert response.status_code == expected_status
+
+async def test_get_assignment_candidates_success(async_client, seed_for_assignment_candidates_tests):
+    # Both are novices for ROLE_ID_1; Alice's slot on EVENT_ID_1 (touching, not overlapping) is recent load
+    response = await async_client.get(f"/assignments/{EVENT_ASSIGNMENT_ID_3}/candidates")
+    assert_list_response(response, expected_length=2)
+    response_json = response.json()
+    assert [candidate["user_id"] for candidate in response_json] == [USER_ID_2, USER_ID_1]
+    assert response_json[1]["recent_load"] == 1.0
+    assert response_json[1]["has_overlapping_assignment"] is False
+    assert response_json[0]["recent_load"] == 0.0
+    assert response_json[0]["is_team_member"] is False
+
+    # Test: another filled slot on the same event is load and an overlapping assignment
+    response = await async_client.get(f"/assignments/{EVENT_ASSIGNMENT_ID_2}/candidates")
+    assert response.json() == [{
+        "user_id": USER_ID_1, "first_name": "Alice", "last_name": "Smith",
+        "proficiency_level_id": PROFICIENCY_LEVEL_ID_2, "proficiency_level_name": "Proficient", "proficiency_level_rank": 4,
+        "is_team_member": False, "recent_load": 1.0, "is_unavailable": False, "has_overlapping_assignment": True,
+    }]
+
+    # Test: the slot being filled is neither
+    response = await async_client.get(f"/assignments/{EVENT_ASSIGNMENT_ID_1}/candidates")
+    assert [(candidate["user_id"], candidate["recent_load"], candidate["has_overlapping_assignment"]) for candidate in response.json()] == [
+        (USER_ID_2, 0.0, False), (USER_ID_1, 0.0, False), # by last name
+    ]
+
+@pytest.mark.parametrize("path, payload", [
+    ("availability", {"starts_at": "2025-05-02T10:00:00+00:00", "ends_at": "2025-05-02T12:00:00+00:00"}), # unavailable period
+    ("availability/rules", {"rrule": "FREQ=WEEKLY", "starts_at": "2025-04-25T10:00:00+00:00", "ends_at": "2025-04-25T12:00:00+00:00"}), # rule with an occurrence on May 2
+])
+async def test_get_assignment_candidates_unavailable_last(async_client, seed_for_assignment_candidates_tests, path, payload):
+    response = await async_client.post(f"/users/{USER_ID_2}/{path}", json=payload)
+    assert response.status_code == status.HTTP_201_CREATED
+    response = await async_client.get(f"/assignments/{EVENT_ASSIGNMENT_ID_3}/candidates")
+    assert [(candidate["user_id"], candidate["is_unavailable"]) for candidate in response.json()] == [(USER_ID_1, False), (USER_ID_2, True)]
+
+# =============================
+# SPARSE FIELDSETS
+# =============================
+async def test_get_event_assignments_sparse_fields(async_client, seed_for_event_assignments_tests):
+    response = await async_client.get(f"/events/{EVENT_ID_1}/assignments", params={"fields": "role_id,role_name,proficiency_level_rank"})
+    assert_list_response(response, expected_length=2)
+    event_assignments_dict = {ea["role_id"]: ea for ea in response.json()}
+    assert all(set(ea) == {"id", "role_id", "role_name", "proficiency_level_rank"} for ea in event_assignments_dict.values())
+    assert event_assignments_dict[ROLE_ID_1]["role_name"] == "ProPresenter"
+    assert event_assignments_dict[ROLE_ID_1]["proficiency_level_rank"] == 3
+    assert event_assignments_dict[ROLE_ID_2]["proficiency_level_rank"] is None
+
+async def test_get_event_assignments_unknown_fields(async_client, seed_for_event_assignments_tests):
+    response = await async_client.get(f"/events/{EVENT_ID_1}/assignments", params={"fields": "role_name,bogus"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "Unknown fields: bogus"
+
+async def test_update_event_assignment_sparse_fields(async_client, seed_for_event_assignments_tests):
+    response = await async_client.patch(f"/assignments/{EVENT_ASSIGNMENT_ID_1}", params={"fields": "is_active,event_type_code"}, json={"is_active": False})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"id": EVENT_ASSIGNMENT_ID_1, "is_active": False, "event_type_code": "service"}
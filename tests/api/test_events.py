@@ -1,13 +1,19 @@
+import asyncio
 import pytest
 import json
+from uuid import UUID
 from fastapi import status
 from sqlmodel import select, func
 
 from app.db.models import EventAssignment
+from app.db.models.enums import ScheduleChangeType
+from app.services.broker import get_broker
+from app.services.candidates import CANDIDATE_INDEX_LOOKUPS
+from app.utils.metrics import get_counter
 from tests.utils.helpers import  assert_empty_list_200, assert_list_response, assert_single_item_response, parse_to_utc, conditional_seed, assert_keys_match
 from tests.utils.constants import (
     BAD_ID_0000, SCHEDULE_ID_1, SCHEDULE_ID_2, EVENT_TYPE_ID_1, EVENT_TYPE_ID_2,
-    EVENT_ID_1, EVENT_ID_2, EVENT_ID_3, TEAM_ID_1, USER_ID_1, ROLE_ID_1, ROLE_ID_2, EVENT_ASSIGNMENT_ID_1, EVENT_ASSIGNMENT_ID_2,
+    EVENT_ID_1, EVENT_ID_2, EVENT_ID_3, TEAM_ID_1, USER_ID_1, USER_ID_2, ROLE_ID_1, ROLE_ID_2, EVENT_ASSIGNMENT_ID_1, EVENT_ASSIGNMENT_ID_2,
     DATETIME_2025_05_01, DATETIME_2025_05_02, DATETIME_2025_05_03, DATETIME_2025_05_04
 )
 
@@ -134,6 +140,74 @@ async def test_get_single_event_success(async_client, seed_for_events_tests):
         ]
     }, additional_keys_to_exclude=["starts_at", "ends_at"])
 
+# =============================
+# GET EVENT CANDIDATES
+# =============================
+@pytest.fixture
+def seed_for_candidates_tests(seed_proficiency_levels, seed_user_roles, seed_user_unavailable_periods, seed_users, seed_roles, seed_schedules, seed_event_types, seed_events, test_proficiency_levels_data, test_user_roles_data, test_user_unavailable_periods_data, test_users_data, test_roles_data, test_schedules_data, test_event_types_data, test_events_data):
+    seed_users(test_users_data[:2])
+    seed_roles(test_roles_data[:2])
+    seed_proficiency_levels(test_proficiency_levels_data)
+    seed_user_roles(test_user_roles_data)
+    seed_schedules([test_schedules_data[1]])
+    seed_event_types([test_event_types_data[0]])
+    seed_events(test_events_data)
+    # Alice and Bob are unavailable May 1 - May 2 (EVENT_ID_1)
+    seed_user_unavailable_periods(test_user_unavailable_periods_data[1:])
+
+@pytest.mark.parametrize("event_id, params, expected_status", [
+    (BAD_ID_0000, {"role_id": ROLE_ID_1}, status.HTTP_404_NOT_FOUND), # event not found
+    (EVENT_ID_2, {}, status.HTTP_422_UNPROCESSABLE_CONTENT), # missing role_id
+    (EVENT_ID_2, {"role_id": "invalid-uuid-format"}, status.HTTP_422_UNPROCESSABLE_CONTENT), # invalid role_id
+])
+async def test_get_event_candidates_error_cases(async_client, seed_for_candidates_tests, event_id, params, expected_status):
+    response = await async_client.get(f"/events/{event_id}/candidates", params=params)
+    assert response.status_code == expected_status
+
+async def test_get_event_candidates_success(async_client, seed_for_candidates_tests):
+    # Both hold ROLE_ID_1 at an assignable level, only Alice holds ROLE_ID_2
+    response = await async_client.get(f"/events/{EVENT_ID_2}/candidates", params={"role_id": ROLE_ID_1})
+    assert response.status_code == status.HTTP_200_OK
+    assert [candidate["user_id"] for candidate in response.json()] == [USER_ID_2, USER_ID_1] # by last name
+    assert response.json()[1] == {"user_id": USER_ID_1, "first_name": "Alice", "last_name": "Smith"}
+    response = await async_client.get(f"/events/{EVENT_ID_2}/candidates", params={"role_id": ROLE_ID_2})
+    assert [candidate["user_id"] for candidate in response.json()] == [USER_ID_1]
+
+    # Test: unavailable users are left out
+    assert_empty_list_200(await async_client.get(f"/events/{EVENT_ID_1}/candidates", params={"role_id": ROLE_ID_1}))
+
+async def test_get_event_candidates_follow_writes(async_client, seed_for_candidates_tests):
+    response = await async_client.get(f"/events/{EVENT_ID_2}/candidates", params={"role_id": ROLE_ID_1})
+    assert len(response.json()) == 2
+
+    # Test: a new unavailable period drops the user from the index built before it
+    response = await async_client.post(f"/users/{USER_ID_2}/availability", json={"starts_at": "2025-05-02T10:00:00+00:00", "ends_at": "2025-05-02T12:00:00+00:00"})
+    assert response.status_code == status.HTTP_201_CREATED
+    response = await async_client.get(f"/events/{EVENT_ID_2}/candidates", params={"role_id": ROLE_ID_1})
+    assert [candidate["user_id"] for candidate in response.json()] == [USER_ID_1]
+
+    # Test: so does deactivating the user
+    response = await async_client.patch(f"/users/{USER_ID_1}", json={"is_active": False})
+    assert response.status_code == status.HTTP_200_OK
+    assert_empty_list_200(await async_client.get(f"/events/{EVENT_ID_2}/candidates", params={"role_id": ROLE_ID_1}))
+
+async def test_get_event_candidates_index_is_kept_across_assignment_writes(async_client, get_test_db_session, seed_for_candidates_tests):
+    await async_client.get(f"/events/{EVENT_ID_2}/candidates", params={"role_id": ROLE_ID_1})
+    built = get_counter(CANDIDATE_INDEX_LOOKUPS, result="built")
+
+    # Test: filling a slot moves the summary version but not the schedule's events
+    get_test_db_session.add(EventAssignment(event_id=EVENT_ID_2, role_id=ROLE_ID_1, assigned_user_id=USER_ID_1))
+    get_test_db_session.commit()
+    response = await async_client.get(f"/events/{EVENT_ID_2}/candidates", params={"role_id": ROLE_ID_1})
+    assert len(response.json()) == 2
+    assert get_counter(CANDIDATE_INDEX_LOOKUPS, result="built") == built
+
+    # Test: moving an event rebuilds it
+    response = await async_client.patch(f"/events/{EVENT_ID_2}", json={"ends_at": "2025-05-02T23:00:00+00:00"})
+    assert response.status_code == status.HTTP_200_OK
+    await async_client.get(f"/events/{EVENT_ID_2}/candidates", params={"role_id": ROLE_ID_1})
+    assert get_counter(CANDIDATE_INDEX_LOOKUPS, result="built") == built + 1
+
 # =============================
 # INSERT EVENT FOR SCHEDULE
 # =============================
@@ -245,6 +319,18 @@ async def test_delete_event_success(async_client, seed_events, seed_event_types,
     verify_response = await async_client.get(f"/events/{EVENT_ID_1}")
     assert verify_response.status_code == status.HTTP_404_NOT_FOUND
 
+async def test_delete_event_publishes_schedule_change(async_client, seed_events, seed_event_types, seed_schedules, test_events_data, test_event_types_data, test_schedules_data):
+    seed_event_types([test_event_types_data[0]])
+    seed_schedules([test_schedules_data[1]])
+    seed_events([test_events_data[0]])
+    async with get_broker().subscribe(UUID(SCHEDULE_ID_2)) as queue:
+        response = await async_client.delete(f"/events/{EVENT_ID_1}")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        change = await asyncio.wait_for(queue.get(), timeout=1)
+    assert change.type == ScheduleChangeType.event_deleted
+    assert str(change.id) == EVENT_ID_1
+    assert change.data is None
+
 # =============================
 # DELETE EVENT CASCADE
 # =============================
@@ -285,4 +371,33 @@ async def test_delete_event_cascade_event_assignments(
 
     # Verify all child records are cascade deleted
     count_after = get_test_db_session.exec(select(func.count()).select_from(EventAssignment).where(EventAssignment.id.in_(event_assignment_ids))).one()
-    assert count_after == 0
\ No newline at end of file
+    assert count_after == 0
+# =============================
+# SPARSE FIELDSETS
+# =============================
+async def test_get_all_events_for_schedule_sparse_fields(async_client, seed_for_events_tests):
+    response = await async_client.get(f"/schedules/{SCHEDULE_ID_2}/events", params={"fields": "team_id,team_code"})
+    assert_list_response(response, expected_length=3)
+    response_dict = {e["event"]["id"]: e for e in response.json()}
+    # event_assignments is not requested, so it is left out
+    assert all(set(e) == {"event"} for e in response_dict.values())
+    assert set(response_dict[EVENT_ID_3]["event"]) == {"id", "team_id", "team_code"}
+    assert response_dict[EVENT_ID_3]["event"]["team_id"] == TEAM_ID_1
+
+async def test_get_single_event_sparse_fields(async_client, seed_for_events_tests):
+    response = await async_client.get(f"/events/{EVENT_ID_1}", params={"fields": "event_type_name,event_assignments.role_name,event_assignments.assigned_user_first_name"})
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    assert response_json["event"] == {"id": EVENT_ID_1, "event_type_name": "Service"}
+    assert {ea["id"]: ea for ea in response_json["event_assignments"]} == {
+        EVENT_ASSIGNMENT_ID_1: {"id": EVENT_ASSIGNMENT_ID_1, "role_name": "ProPresenter", "assigned_user_first_name": "Alice"},
+        EVENT_ASSIGNMENT_ID_2: {"id": EVENT_ASSIGNMENT_ID_2, "role_name": "Sound", "assigned_user_first_name": None},
+    }
+
+@pytest.mark.parametrize("fields", [
+    "bogus", # unknown field
+    "event_assignments.event_title", # not a field of the embedded assignments
+])
+async def test_get_single_event_unknown_fields(async_client, seed_for_events_tests, fields):
+    response = await async_client.get(f"/events/{EVENT_ID_1}", params={"fields": fields})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
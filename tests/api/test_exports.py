@@ -0,0 +1,63 @@
+import csv
+import json
+import pytest
+from fastapi import status
+
+from app.services.exports import EVENT_ASSIGNMENTS_CSV_HEADER
+from tests.utils.constants import SCHEDULE_ID_2, EVENT_ID_1, EVENT_ASSIGNMENT_ID_1, DATETIME_2025_05_01, DATETIME_2025_05_02, DATETIME_2025_05_03
+
+pytestmark = pytest.mark.asyncio
+
+# =============================
+# FIXTURES
+# =============================
+@pytest.fixture
+def seed_for_exports_tests(seed_users, seed_roles, seed_schedules, seed_event_types, seed_events, seed_event_assignments, test_users_data, test_roles_data, test_schedules_data, test_event_types_data, test_events_data, test_event_assignments_data):
+    seed_users([test_users_data[0]])
+    seed_roles(test_roles_data[:2])
+    seed_schedules([test_schedules_data[1]])
+    seed_event_types([test_event_types_data[0]])
+    seed_events(test_events_data)
+    seed_event_assignments(test_event_assignments_data)
+
+# =============================
+# EXPORT EVENT ASSIGNMENTS
+# =============================
+@pytest.mark.parametrize("params, expected_status", [
+    ({"format": "xml"}, status.HTTP_422_UNPROCESSABLE_CONTENT), # unsupported format
+    ({"starts_at": "invalid-datetime"}, status.HTTP_422_UNPROCESSABLE_CONTENT), # invalid datetime
+    ({"starts_at": DATETIME_2025_05_02.isoformat(), "ends_at": DATETIME_2025_05_01.isoformat()}, status.HTTP_422_UNPROCESSABLE_CONTENT), # starts_at after ends_at
+])
+async def test_export_event_assignments_error_cases(async_client, params, expected_status):
+    response = await async_client.get("/exports/assignments", params=params)
+    assert response.status_code == expected_status
+
+async def test_export_event_assignments_csv_success(async_client, seed_for_exports_tests):
+    response = await async_client.get("/exports/assignments", params={"schedule_id": SCHEDULE_ID_2})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(response.text.splitlines()))
+    assert rows[0] == EVENT_ASSIGNMENTS_CSV_HEADER
+    assert len(rows) == 4
+    # Ordered by event start, then role order
+    assert rows[1] == ["2025-05-01", "propresenter", "Alice", "service", "FALSE", "FALSE", "TRUE", "required"]
+    assert rows[2] == ["2025-05-01", "sound", "", "service", "FALSE", "FALSE", "TRUE", "required"]
+
+async def test_export_event_assignments_ndjson_date_range(async_client, seed_for_exports_tests):
+    response = await async_client.get("/exports/assignments", params={
+        "format": "ndjson", "starts_at": DATETIME_2025_05_01.isoformat(), "ends_at": DATETIME_2025_05_02.isoformat(),
+    })
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 2
+    assert {line["event_id"] for line in lines} == {EVENT_ID_1}
+    assignment = next(line for line in lines if line["id"] == EVENT_ASSIGNMENT_ID_1)
+    assert assignment["role_code"] == "propresenter"
+    assert assignment["assigned_user_first_name"] == "Alice"
+    assert assignment["requirement_level"] == "required"
+
+async def test_export_event_assignments_empty_range(async_client, seed_for_exports_tests):
+    response = await async_client.get("/exports/assignments", params={"starts_at": DATETIME_2025_05_03.isoformat(), "format": "ndjson"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.text == ""
@@ -0,0 +1,101 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import status
+from sqlmodel import select
+
+from app.db.models import Job, UserRole
+from app.db.models.enums import JobKind, JobStatus
+from app.services.jobs import JobRunner, PostgresJobBackend, JOB_MAX_ATTEMPTS, JOB_ABANDONED_ERROR
+from tests.utils.helpers import assert_keys_match
+from tests.utils.constants import BAD_ID_0000, PROFICIENCY_LEVEL_ID_3, ROLE_ID_1
+
+pytestmark = pytest.mark.asyncio
+
+JOBS_RESPONSE_KEYS = {"id", "kind", "status", "progress_done", "progress_total", "result", "error", "started_at", "finished_at"}
+
+# =============================
+# BACKGROUND CREATE
+# =============================
+@pytest.mark.real_commits # the job runner reads the queued job from its own connection
+async def test_post_role_in_background_runs_fan_out_as_job(async_client, get_test_db_session, test_db_engine, seed_users, seed_proficiency_levels, test_users_data, test_proficiency_levels_data):
+    seed_proficiency_levels([test_proficiency_levels_data[2]]) # Untrained proficiency level
+    seed_users(test_users_data[:2])
+    response = await async_client.post("/roles?background=true", json={"name": "New Role", "order": 4, "code": "new_role"})
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = response.json()
+    assert_keys_match(job, JOBS_RESPONSE_KEYS)
+    assert (job["kind"], job["status"]) == ("roles.create", "queued")
+    assert response.headers["location"] == f"/jobs/{job['id']}"
+
+    # Test: nothing is created until a worker runs the job
+    assert get_test_db_session.exec(select(UserRole)).all() == []
+    assert JobRunner(test_db_engine, PostgresJobBackend()).run_next() is True
+
+    response = await async_client.get(f"/jobs/{job['id']}")
+    assert response.status_code == status.HTTP_200_OK
+    job = response.json()
+    assert job["status"] == "succeeded"
+    assert (job["progress_done"], job["progress_total"]) == (2, 2)
+    assert job["started_at"] is not None and job["finished_at"] is not None
+    user_roles = get_test_db_session.exec(select(UserRole).where(UserRole.role_id == job["result"]["role_id"])).all()
+    assert len(user_roles) == 2
+    assert {str(ur.proficiency_level_id) for ur in user_roles} == {PROFICIENCY_LEVEL_ID_3}
+
+@pytest.mark.real_commits
+async def test_background_job_records_constraint_failures(async_client, test_db_engine, seed_roles, test_roles_data):
+    seed_roles([test_roles_data[0]])
+    response = await async_client.post("/roles?background=true", json={"name": "Duplicate", "order": 4, "code": test_roles_data[0].code})
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    runner = JobRunner(test_db_engine, PostgresJobBackend())
+    assert runner.run_next() is True
+    # Test: the queue is empty once the job has been claimed
+    assert runner.run_next() is False
+
+    job = (await async_client.get(f"/jobs/{response.json()['id']}")).json()
+    assert job["status"] == "failed"
+    assert job["error"] == "Role creation violates a constraint"
+    assert job["result"] is None
+
+@pytest.mark.real_commits
+async def test_post_user_in_background(async_client, test_db_engine, seed_roles, test_roles_data):
+    seed_roles(test_roles_data[:2])
+    response = await async_client.post("/users?background=true", json={"first_name": "New", "last_name": "User", "phone": "+12345554444"})
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert JobRunner(test_db_engine, PostgresJobBackend()).run_next() is True
+
+    job = (await async_client.get(f"/jobs/{response.json()['id']}")).json()
+    assert (job["kind"], job["status"], job["progress_total"]) == ("users.create", "succeeded", 2)
+    user_roles = (await async_client.get(f"/roles/{ROLE_ID_1}/users")).json()
+    assert [ur["user_id"] for ur in user_roles] == [job["result"]["user_id"]]
+
+@pytest.mark.real_commits
+async def test_stale_running_jobs_are_requeued(async_client, get_test_db_session, test_db_engine, seed_roles, test_roles_data):
+    seed_roles(test_roles_data[:2])
+    an_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+    payload = {"first_name": "New", "last_name": "User", "phone": "+12345554444"}
+    # Left running by a killed worker, a running job with a recent heartbeat, and one that kept killing its worker
+    stale = Job(kind=JobKind.user_create, payload=payload, status=JobStatus.running, attempts=1, started_at=an_hour_ago, updated_at=an_hour_ago)
+    live = Job(kind=JobKind.user_create, payload=payload, status=JobStatus.running, attempts=1, started_at=an_hour_ago)
+    poisoned = Job(kind=JobKind.user_create, payload=payload, status=JobStatus.running, attempts=JOB_MAX_ATTEMPTS, started_at=an_hour_ago, updated_at=an_hour_ago)
+    get_test_db_session.add_all([stale, live, poisoned])
+    get_test_db_session.commit()
+    ids = [str(job.id) for job in (stale, live, poisoned)]
+
+    runner = JobRunner(test_db_engine, PostgresJobBackend())
+    assert runner.requeue_stale_jobs(stale_seconds=600) == 1
+    jobs = [(await async_client.get(f"/jobs/{job_id}")).json() for job_id in ids]
+    assert [job["status"] for job in jobs] == ["queued", "running", "failed"]
+    assert jobs[2]["error"] == JOB_ABANDONED_ERROR
+
+    # Test: the requeued job runs again
+    assert runner.run_next() is True
+    assert runner.run_next() is False
+    job = (await async_client.get(f"/jobs/{ids[0]}")).json()
+    assert job["status"] == "succeeded"
+
+# =============================
+# GET JOB
+# =============================
+async def test_get_job_not_found(async_client):
+    response = await async_client.get(f"/jobs/{BAD_ID_0000}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
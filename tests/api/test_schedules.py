@@ -1,10 +1,12 @@
 import pytest
+from datetime import datetime, timezone
 from fastapi import status
 from sqlmodel import select, func
 
-from app.db.models import Event, EventAssignment
+from app.db.models import Event, EventAssignment, ScheduleSummary, User, UserUnavailablePeriod
+from app.services.coalescing import get_schedule_grid_generation
 from tests.utils.helpers import  assert_empty_list_200, assert_list_response, assert_single_item_response, conditional_seed, assert_keys_match
-from tests.utils.constants import BAD_ID_0000, SCHEDULE_ID_1, SCHEDULE_ID_2, ROLE_ID_1, ROLE_ID_2, USER_ID_1, USER_ID_2, EVENT_ID_1, EVENT_ID_2, EVENT_ID_3, EVENT_TYPE_ID_1, TEAM_ID_1
+from tests.utils.constants import BAD_ID_0000, SCHEDULE_ID_1, SCHEDULE_ID_2, ROLE_ID_1, ROLE_ID_2, USER_ID_1, USER_ID_2, EVENT_ID_1, EVENT_ID_2, EVENT_ID_3, EVENT_TYPE_ID_1, TEAM_ID_1, EVENT_ASSIGNMENT_ID_2, EVENT_ASSIGNMENT_ID_3
 
 pytestmark = pytest.mark.asyncio
 
@@ -107,6 +109,114 @@ async def test_get_schedule_grid_success(async_client, seed_for_schedules_tests)
     assert availability_dict[USER_ID_2]["user_first_name"] == "Bob"
     assert availability_dict[USER_ID_2]["user_last_name"] == "Jones"
 
+async def test_get_schedule_grid_includes_recurring_unavailability(async_client, seed_for_schedules_tests):
+    # Saturdays from 10:00 to 11:00: in May 2025 only EVENT_ID_3 (May 3 - May 4) overlaps one
+    response = await async_client.post(f"/users/{USER_ID_1}/availability/rules", json={
+        "rrule": "FREQ=WEEKLY;BYDAY=SA", "starts_at": "2025-01-04T10:00:00+00:00", "ends_at": "2025-01-04T11:00:00+00:00",
+    })
+    assert response.status_code == status.HTTP_201_CREATED
+    response = await async_client.get(f"/schedules/{SCHEDULE_ID_2}/grid")
+    events_dict = {e["event"]["id"]: e for e in response.json()["events"]}
+    assert [a["user_id"] for a in events_dict[EVENT_ID_3]["availability"]] == [USER_ID_1]
+    assert events_dict[EVENT_ID_2]["availability"] == []
+
+async def test_get_schedule_grid_compact(async_client, seed_for_schedules_tests):
+    response = await async_client.get(f"/schedules/{SCHEDULE_ID_2}/grid", params={"format": "compact"})
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    assert response_json["schedule"]["id"] == SCHEDULE_ID_2
+    events_dict = {e["id"]: e for e in response_json["events"]}
+    assert len(events_dict) == 3
+    assert events_dict[EVENT_ID_3]["team_id"] == TEAM_ID_1
+    event_assignments_dict = {ea["role_id"]: ea for ea in events_dict[EVENT_ID_1]["event_assignments"]}
+    assert_keys_match(event_assignments_dict[ROLE_ID_1], {"id", "role_id", "is_applicable", "requirement_level", "assigned_user_id", "is_active"})
+    assert event_assignments_dict[ROLE_ID_1]["assigned_user_id"] == USER_ID_1
+    assert set(events_dict[EVENT_ID_1]["unavailable_user_ids"]) == {USER_ID_1, USER_ID_2}
+
+    # Related rows are listed once, keyed by id
+    included = response_json["included"]
+    assert included["roles"][ROLE_ID_1] == {"name": "ProPresenter", "order": 10, "code": "propresenter"}
+    assert set(included["roles"]) == {ROLE_ID_1, ROLE_ID_2}
+    assert included["users"][USER_ID_1] == {"first_name": "Alice", "last_name": "Smith"}
+    assert included["users"][USER_ID_2] == {"first_name": "Bob", "last_name": "Jones"}
+    assert set(included["teams"]) == {TEAM_ID_1}
+    assert included["event_types"][EVENT_TYPE_ID_1]["code"] == "service"
+
+async def test_get_schedule_grid_invalid_format(async_client, seed_for_schedules_tests):
+    response = await async_client.get(f"/schedules/{SCHEDULE_ID_2}/grid", params={"format": "bogus"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+async def test_schedule_grid_flight_key_follows_availability_and_name_writes(get_test_db_session, seed_for_schedules_tests):
+    generation = get_schedule_grid_generation()
+
+    get_test_db_session.add(UserUnavailablePeriod(user_id=USER_ID_2, starts_at=datetime(2025, 5, 10, tzinfo=timezone.utc), ends_at=datetime(2025, 5, 11, tzinfo=timezone.utc)))
+    get_test_db_session.commit()
+    assert get_schedule_grid_generation() > generation
+    generation = get_schedule_grid_generation()
+
+    get_test_db_session.get(User, USER_ID_1).first_name = "Alicia"
+    get_test_db_session.commit()
+    assert get_schedule_grid_generation() > generation
+    generation = get_schedule_grid_generation()
+
+    # Test: a rolled back write leaves the generation alone
+    get_test_db_session.get(User, USER_ID_1).first_name = "Alice"
+    get_test_db_session.flush()
+    get_test_db_session.rollback()
+    assert get_schedule_grid_generation() == generation
+
+# =============================
+# GET SCHEDULE SUMMARY
+# =============================
+async def test_get_schedule_summary_not_found(async_client):
+    response = await async_client.get(f"/schedules/{BAD_ID_0000}/summary")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+async def test_get_schedule_summary_without_events(async_client, seed_schedules, test_schedules_data):
+    seed_schedules([test_schedules_data[0]])
+    response = await async_client.get(f"/schedules/{SCHEDULE_ID_1}/summary")
+    assert response.status_code == status.HTTP_200_OK
+    summary = response.json()
+    assert (summary["events_count"], summary["slots_count"], summary["required_empty_count"]) == (0, 0, 0)
+    assert summary["role_coverage"] == []
+    assert summary["user_assignment_counts"] == []
+
+async def test_get_schedule_summary_success(async_client, seed_for_schedules_tests):
+    response = await async_client.get(f"/schedules/{SCHEDULE_ID_2}/summary")
+    assert response.status_code == status.HTTP_200_OK
+    summary = response.json()
+    assert summary["schedule_id"] == SCHEDULE_ID_2
+    assert summary["events_count"] == 3
+    assert (summary["slots_count"], summary["filled_slots_count"]) == (3, 1)
+    assert (summary["required_slots_count"], summary["required_filled_count"], summary["required_empty_count"]) == (3, 1, 2)
+    assert summary["role_coverage"] == [{"role_id": ROLE_ID_1, "slots": 2, "filled": 1}, {"role_id": ROLE_ID_2, "slots": 1, "filled": 0}]
+    assert summary["user_assignment_counts"] == [{"user_id": USER_ID_1, "count": 1}]
+
+async def test_schedule_summary_follows_assignment_and_event_writes(async_client, seed_for_schedules_tests):
+    version = (await async_client.get(f"/schedules/{SCHEDULE_ID_2}/summary")).json()["version"]
+
+    await async_client.patch(f"/assignments/{EVENT_ASSIGNMENT_ID_2}", json={"assigned_user_id": USER_ID_2})
+    summary = (await async_client.get(f"/schedules/{SCHEDULE_ID_2}/summary")).json()
+    assert summary["version"] == version + 1
+    assert summary["filled_slots_count"] == 2
+    assert {c["user_id"]: c["count"] for c in summary["user_assignment_counts"]} == {USER_ID_1: 1, USER_ID_2: 1}
+
+    # Test: not-applicable slots no longer count
+    await async_client.patch(f"/assignments/{EVENT_ASSIGNMENT_ID_3}", json={"is_applicable": False})
+    summary = (await async_client.get(f"/schedules/{SCHEDULE_ID_2}/summary")).json()
+    assert (summary["slots_count"], summary["required_empty_count"]) == (2, 0)
+
+    await async_client.delete(f"/events/{EVENT_ID_1}")
+    summary = (await async_client.get(f"/schedules/{SCHEDULE_ID_2}/summary")).json()
+    assert (summary["events_count"], summary["slots_count"], summary["user_assignment_counts"]) == (2, 0, [])
+
+async def test_schedule_summary_is_only_refreshed_by_tracked_sessions(get_test_db_session, seed_for_schedules_tests):
+    # The fixtures seed through a plain session: no summary row is stored
+    event = get_test_db_session.get(Event, EVENT_ID_1)
+    event.notes = "moved"
+    get_test_db_session.commit()
+    assert get_test_db_session.get(ScheduleSummary, SCHEDULE_ID_2) is None
+
 # =============================
 # INSERT SCHEDULE
 # =============================
@@ -112,4 +112,24 @@ async def test_update_user_role_success(async_client, seed_proficiency_levels, s
     for field, value in payload.items():
         assert response_json[field] == value
     for field, value in unchanged_fields.items():
-        assert response_json[field] == value
\ No newline at end of file
+        assert response_json[field] == value
+# =============================
+# SPARSE FIELDSETS
+# =============================
+async def test_get_roles_for_user_sparse_fields(async_client, seed_for_user_roles_tests):
+    response = await async_client.get(f"/users/{USER_ID_1}/roles", params={"fields": "role_id,role_name"})
+    assert_list_response(response, expected_length=2)
+    assert all(set(ur) == {"id", "role_id", "role_name"} for ur in response.json())
+    assert {ur["role_name"] for ur in response.json()} == {"ProPresenter", "Sound"}
+
+async def test_get_users_for_role_sparse_fields(async_client, seed_for_user_roles_tests):
+    response = await async_client.get(f"/roles/{ROLE_ID_1}/users", params={"fields": "user_id,user_email,proficiency_level_rank"})
+    assert_list_response(response, expected_length=2)
+    response_dict = {ur["user_id"]: ur for ur in response.json()}
+    assert set(response_dict[USER_ID_1]) == {"id", "user_id", "user_email", "proficiency_level_rank"}
+    assert response_dict[USER_ID_1]["user_email"] == "alice@example.com"
+    assert response_dict[USER_ID_1]["proficiency_level_rank"] == 3
+
+async def test_get_users_for_role_unknown_fields(async_client, seed_for_user_roles_tests):
+    response = await async_client.get(f"/roles/{ROLE_ID_1}/users", params={"fields": "event_title"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,9 +1,10 @@
 import pytest
 from fastapi import status
+from sqlmodel import select, func
 
 from app.db.models import UserUnavailablePeriod
 from tests.utils.helpers import assert_single_item_response, assert_list_response, parse_to_utc
-from tests.utils.constants import BAD_ID_0000, DATETIME_2025_01_01, DATETIME_2025_01_02, DATETIME_2025_04_01, DATETIME_2025_05_01, DATETIME_2025_05_02, DATETIME_2025_05_03, USER_ID_1, USER_UNAVAILABLE_PERIOD_ID_1, USER_UNAVAILABLE_PERIOD_ID_2
+from tests.utils.constants import BAD_ID_0000, DATETIME_2024_02_29, DATETIME_2025_01_01, DATETIME_2025_01_02, DATETIME_2025_03_01, DATETIME_2025_04_01, DATETIME_2025_05_01, DATETIME_2025_05_02, DATETIME_2025_05_03, DATETIME_2025_05_04, USER_ID_1, USER_UNAVAILABLE_PERIOD_ID_1, USER_UNAVAILABLE_PERIOD_ID_2
 
 pytestmark = pytest.mark.asyncio
 
@@ -85,6 +86,55 @@ async def test_insert_user_unavailable_periods_bulk_success(async_client, seed_u
     assert periods_by_start[DATETIME_2025_05_01]["user_email"] == "alice@example.com"
     assert parse_to_utc(periods_by_start[DATETIME_2025_05_01]["ends_at"]) == DATETIME_2025_05_02
 
+async def test_insert_user_unavailable_periods_bulk_merges_overlaps(async_client, get_test_db_session, seed_users, seed_user_unavailable_periods, test_users_data, test_user_unavailable_periods_data):
+    seed_users([test_users_data[0]])
+    # Stored: Feb 29 2024 - Mar 1 2025 and May 1 - May 2 2025
+    seed_user_unavailable_periods(test_user_unavailable_periods_data[:2])
+    response = await async_client.post(f"/users/{USER_ID_1}/availability/bulk", json=[
+        {"starts_at": DATETIME_2025_01_01.isoformat(), "ends_at": DATETIME_2025_01_02.isoformat()}, # inside the first stored period
+        {"starts_at": DATETIME_2025_04_01.isoformat(), "ends_at": DATETIME_2025_05_01.isoformat()}, # touches the second stored period
+        {"starts_at": DATETIME_2025_05_03.isoformat(), "ends_at": DATETIME_2025_05_04.isoformat()}, # overlaps the next one
+        {"starts_at": DATETIME_2025_05_03.isoformat(), "ends_at": DATETIME_2025_05_04.isoformat()},
+    ])
+    assert_list_response(response, expected_length=3, status_code=status.HTTP_201_CREATED)
+    periods = [(parse_to_utc(item["starts_at"]), parse_to_utc(item["ends_at"])) for item in response.json()]
+    assert periods == [(DATETIME_2024_02_29, DATETIME_2025_03_01), (DATETIME_2025_04_01, DATETIME_2025_05_02), (DATETIME_2025_05_03, DATETIME_2025_05_04)]
+    assert response.json()[0]["id"] == USER_UNAVAILABLE_PERIOD_ID_1
+
+    # The touching stored period was merged into a new one
+    get_test_db_session.expire_all()
+    assert get_test_db_session.get(UserUnavailablePeriod, USER_UNAVAILABLE_PERIOD_ID_2) is None
+    stored = get_test_db_session.exec(select(func.count()).select_from(UserUnavailablePeriod).where(UserUnavailablePeriod.user_id == USER_ID_1)).one()
+    assert stored == 3
+
+# =============================
+# IMPORT USER UNAVAILABLE PERIODS FROM CSV
+# =============================
+async def test_import_user_unavailable_periods_csv(async_client, seed_users, seed_user_unavailable_periods, test_users_data, test_user_unavailable_periods_data):
+    seed_users([test_users_data[0]])
+    seed_user_unavailable_periods([test_user_unavailable_periods_data[1]])
+    csv_file = "\n".join([
+        "starts_at,ends_at",
+        f"{DATETIME_2025_01_01.isoformat()},{DATETIME_2025_01_02.isoformat()}",
+        f"{DATETIME_2025_04_01.isoformat()},{DATETIME_2025_05_01.isoformat()}",
+        f"{DATETIME_2025_05_02.isoformat()},{DATETIME_2025_05_03.isoformat()}",
+    ])
+    response = await async_client.post(f"/users/{USER_ID_1}/availability/import", files={"file": ("periods.csv", csv_file, "text/csv")})
+    assert response.status_code == status.HTTP_201_CREATED
+    # The last two rows touch the stored May 1 - May 2 period and merge with it into one
+    assert response.json() == {"rows_count": 3, "created_count": 2, "replaced_count": 1, "covered_count": 0}
+
+@pytest.mark.parametrize("csv_file, expected_status", [
+    ("starts_at,ends_at\n", status.HTTP_400_BAD_REQUEST), # no rows
+    ("start,end\n2025-01-01T00:00:00Z,2025-01-02T00:00:00Z", status.HTTP_422_UNPROCESSABLE_CONTENT), # missing columns
+    ("starts_at,ends_at\ninvalid-datetime,2025-01-02T00:00:00Z", status.HTTP_422_UNPROCESSABLE_CONTENT), # invalid datetime
+    ("starts_at,ends_at\n2025-01-02T00:00:00Z,2025-01-01T00:00:00Z", status.HTTP_422_UNPROCESSABLE_CONTENT), # violates check constraint
+])
+async def test_import_user_unavailable_periods_csv_error_cases(async_client, seed_users, test_users_data, csv_file, expected_status):
+    seed_users([test_users_data[0]])
+    response = await async_client.post(f"/users/{USER_ID_1}/availability/import", files={"file": ("periods.csv", csv_file, "text/csv")})
+    assert response.status_code == expected_status
+
 # =============================
 # UPDATE USER UNAVAILABLE PERIOD
 # =============================
@@ -0,0 +1,103 @@
+import pytest
+from fastapi import status
+
+from app.db.models import UserUnavailableRule
+from tests.utils.helpers import assert_empty_list_200, assert_list_response, parse_to_utc
+from tests.utils.constants import BAD_ID_0000, DATETIME_2025_01_01, USER_ID_1
+
+pytestmark = pytest.mark.asyncio
+
+STARTS_AT = DATETIME_2025_01_01.replace(hour=9).isoformat()
+ENDS_AT = DATETIME_2025_01_01.replace(hour=12).isoformat()
+VALID_PAYLOAD = {"rrule": "FREQ=MONTHLY;BYDAY=2SU", "starts_at": STARTS_AT, "ends_at": ENDS_AT}
+
+# =============================
+# INSERT USER UNAVAILABLE RULE
+# =============================
+@pytest.mark.parametrize("user_id, payload, expected_status", [
+    (BAD_ID_0000, VALID_PAYLOAD, status.HTTP_404_NOT_FOUND), # user not found
+    (USER_ID_1, {}, status.HTTP_422_UNPROCESSABLE_CONTENT), # empty payload
+    (USER_ID_1, {"starts_at": STARTS_AT, "ends_at": ENDS_AT}, status.HTTP_422_UNPROCESSABLE_CONTENT), # missing required fields (rrule)
+    (USER_ID_1, {**VALID_PAYLOAD, "rrule": "FREQ=YEARLY"}, status.HTTP_422_UNPROCESSABLE_CONTENT), # unsupported rule
+    (USER_ID_1, {**VALID_PAYLOAD, "starts_at": ENDS_AT, "ends_at": STARTS_AT}, status.HTTP_422_UNPROCESSABLE_CONTENT), # violates check constraint
+    (USER_ID_1, {**VALID_PAYLOAD, "until": ENDS_AT}, status.HTTP_422_UNPROCESSABLE_CONTENT), # until is derived from the rule
+    (USER_ID_1, {**VALID_PAYLOAD, "tzid": "Mars/Olympus_Mons"}, status.HTTP_422_UNPROCESSABLE_CONTENT), # unknown time zone
+])
+async def test_insert_user_unavailable_rule_error_cases(async_client, seed_users, test_users_data, user_id, payload, expected_status):
+    seed_users([test_users_data[0]])
+    response = await async_client.post(f"/users/{user_id}/availability/rules", json=payload)
+    assert response.status_code == expected_status
+
+async def test_insert_user_unavailable_rule_success(async_client, seed_users, test_users_data):
+    seed_users([test_users_data[0]])
+    response = await async_client.post(f"/users/{USER_ID_1}/availability/rules", json={**VALID_PAYLOAD, "rrule": "FREQ=MONTHLY;BYDAY=2SU;UNTIL=20250630"})
+    assert response.status_code == status.HTTP_201_CREATED
+    response_json = response.json()
+    assert response_json["user_id"] == USER_ID_1
+    assert response_json["rrule"] == "FREQ=MONTHLY;BYDAY=2SU;UNTIL=20250630"
+    assert parse_to_utc(response_json["starts_at"]) == DATETIME_2025_01_01.replace(hour=9)
+    assert parse_to_utc(response_json["until"]).date().isoformat() == "2025-06-30"
+    # Without a tzid the rule repeats in DEFAULT_TIMEZONE
+    assert response_json["tzid"] == "UTC"
+
+async def test_insert_user_unavailable_rule_with_time_zone(async_client, seed_users, test_users_data):
+    seed_users([test_users_data[0]])
+    response = await async_client.post(f"/users/{USER_ID_1}/availability/rules", json={**VALID_PAYLOAD, "tzid": "Europe/Berlin"})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["tzid"] == "Europe/Berlin"
+
+# =============================
+# GET USER UNAVAILABLE RULES
+# =============================
+async def test_get_user_unavailable_rules(async_client, seed_users, test_users_data):
+    seed_users([test_users_data[0]])
+    assert_empty_list_200(await async_client.get(f"/users/{USER_ID_1}/availability/rules"))
+    await async_client.post(f"/users/{USER_ID_1}/availability/rules", json=VALID_PAYLOAD)
+    response = await async_client.get(f"/users/{USER_ID_1}/availability/rules")
+    assert_list_response(response, expected_length=1)
+    assert response.json()[0]["until"] is None
+
+# =============================
+# UPDATE USER UNAVAILABLE RULE
+# =============================
+@pytest.mark.parametrize("payload, expected_status", [
+    ({}, status.HTTP_400_BAD_REQUEST), # empty payload
+    ({"rrule": "FREQ=WEEKLY;BYDAY=2SU"}, status.HTTP_422_UNPROCESSABLE_CONTENT), # unsupported rule
+    ({"rrule": None}, status.HTTP_422_UNPROCESSABLE_CONTENT), # rrule is required
+    ({"tzid": None}, status.HTTP_422_UNPROCESSABLE_CONTENT), # tzid is required
+    ({"tzid": "Nowhere"}, status.HTTP_422_UNPROCESSABLE_CONTENT), # unknown time zone
+    ({"starts_at": "2025-01-01T13:00:00+00:00"}, status.HTTP_422_UNPROCESSABLE_CONTENT), # violates check constraint
+    ({"user_id": BAD_ID_0000}, status.HTTP_422_UNPROCESSABLE_CONTENT), # non-updatable field
+])
+async def test_update_user_unavailable_rule_error_cases(async_client, seed_users, test_users_data, payload, expected_status):
+    seed_users([test_users_data[0]])
+    rule_id = (await async_client.post(f"/users/{USER_ID_1}/availability/rules", json=VALID_PAYLOAD)).json()["id"]
+    response = await async_client.patch(f"/user_availability_rules/{rule_id}", json=payload)
+    assert response.status_code == expected_status
+
+async def test_update_user_unavailable_rule_rederives_until(async_client, seed_users, test_users_data):
+    seed_users([test_users_data[0]])
+    rule_id = (await async_client.post(f"/users/{USER_ID_1}/availability/rules", json=VALID_PAYLOAD)).json()["id"]
+    response = await async_client.patch(f"/user_availability_rules/{rule_id}", json={"rrule": "FREQ=MONTHLY;BYDAY=2SU;UNTIL=20250301T000000Z"})
+    assert response.status_code == status.HTTP_200_OK
+    assert parse_to_utc(response.json()["until"]).isoformat() == "2025-03-01T00:00:00+00:00"
+    response = await async_client.patch(f"/user_availability_rules/{rule_id}", json={"rrule": "FREQ=MONTHLY;BYDAY=2SU"})
+    assert response.json()["until"] is None
+
+# =============================
+# DELETE USER UNAVAILABLE RULE
+# =============================
+@pytest.mark.parametrize("id, expected_status", [
+    ("invalid-uuid-format", status.HTTP_422_UNPROCESSABLE_CONTENT), # invalid UUID format
+    (BAD_ID_0000, status.HTTP_404_NOT_FOUND), # user unavailable rule not found
+])
+async def test_delete_user_unavailable_rule_error_cases(async_client, id, expected_status):
+    response = await async_client.delete(f"/user_availability_rules/{id}")
+    assert response.status_code == expected_status
+
+async def test_delete_user_unavailable_rule_success(async_client, get_test_db_session, seed_users, test_users_data):
+    seed_users([test_users_data[0]])
+    rule_id = (await async_client.post(f"/users/{USER_ID_1}/availability/rules", json=VALID_PAYLOAD)).json()["id"]
+    response = await async_client.delete(f"/user_availability_rules/{rule_id}")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert get_test_db_session.get(UserUnavailableRule, rule_id) is None
@@ -3,8 +3,9 @@ from fastapi import status
 from sqlmodel import select, func
 
 from app.db.models import TeamUser, UserRole
+from app.services.ical import user_calendar_cache
 from tests.utils.helpers import  assert_empty_list_200, assert_list_response, assert_single_item_response, conditional_seed, assert_keys_match
-from tests.utils.constants import BAD_ID_0000, ROLE_ID_1, ROLE_ID_2, USER_ID_1, USER_ID_2, USER_ID_3, PROFICIENCY_LEVEL_ID_3
+from tests.utils.constants import BAD_ID_0000, ROLE_ID_1, ROLE_ID_2, USER_ID_1, USER_ID_2, USER_ID_3, PROFICIENCY_LEVEL_ID_3, EVENT_ASSIGNMENT_ID_1
 
 pytestmark = pytest.mark.asyncio
 
@@ -54,6 +55,84 @@ async def test_get_single_user_success(async_client, seed_users, test_users_data
         "is_active": True
     })
 
+# =============================
+# GET USER CALENDAR
+# =============================
+@pytest.fixture
+def seed_for_calendar_tests(seed_users, seed_roles, seed_schedules, seed_event_types, seed_events, seed_event_assignments, test_users_data, test_roles_data, test_schedules_data, test_event_types_data, test_events_data, test_event_assignments_data):
+    user_calendar_cache.clear()
+    seed_users(test_users_data[:2])
+    seed_roles(test_roles_data[:2])
+    seed_schedules([test_schedules_data[1]])
+    seed_event_types([test_event_types_data[0]])
+    seed_events(test_events_data[:2])
+    seed_event_assignments(test_event_assignments_data)
+
+@pytest.mark.parametrize("id, expected_status", [
+    (BAD_ID_0000, status.HTTP_404_NOT_FOUND), # User not present
+    ("invalid-uuid-format", status.HTTP_422_UNPROCESSABLE_CONTENT), # Invalid UUID format
+])
+async def test_get_user_calendar_error_cases(async_client, id, expected_status):
+    response = await async_client.get(f"/users/{id}/calendar.ics")
+    assert response.status_code == expected_status
+
+async def test_get_user_calendar_success(async_client, seed_for_calendar_tests):
+    response = await async_client.get(f"/users/{USER_ID_1}/calendar.ics")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/calendar")
+    assert response.headers["etag"]
+    body = response.text
+    assert body.startswith("BEGIN:VCALENDAR\r\n")
+    assert body.endswith("END:VCALENDAR\r\n")
+    assert body.count("BEGIN:VEVENT") == 1
+    assert f"UID:{EVENT_ASSIGNMENT_ID_1}@stewardhq" in body
+    assert "SUMMARY:ProPresenter" in body
+    assert "DTSTART:20250501T000000Z" in body
+
+async def test_get_user_calendar_no_assignments(async_client, seed_for_calendar_tests):
+    response = await async_client.get(f"/users/{USER_ID_2}/calendar.ics")
+    assert response.status_code == status.HTTP_200_OK
+    assert "BEGIN:VEVENT" not in response.text
+
+async def test_get_user_calendar_conditional_get(async_client, seed_for_calendar_tests):
+    response = await async_client.get(f"/users/{USER_ID_1}/calendar.ics")
+    etag = response.headers["etag"]
+
+    # Test: a matching ETag returns 304 without a body
+    not_modified = await async_client.get(f"/users/{USER_ID_1}/calendar.ics", headers={"If-None-Match": etag})
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified.content == b""
+
+    # Test: no Last-Modified, and If-Modified-Since alone never returns 304
+    assert "last-modified" not in response.headers
+    modified = await async_client.get(f"/users/{USER_ID_1}/calendar.ics", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert modified.status_code == status.HTTP_200_OK
+
+    # Test: unassigning the user moves the ETag (the count in it drops)
+    await async_client.patch(f"/assignments/{EVENT_ASSIGNMENT_ID_1}", json={"assigned_user_id": USER_ID_2})
+    modified = await async_client.get(f"/users/{USER_ID_1}/calendar.ics", headers={"If-None-Match": etag})
+    assert modified.status_code == status.HTTP_200_OK
+    assert "BEGIN:VEVENT" not in modified.text
+    await async_client.patch(f"/assignments/{EVENT_ASSIGNMENT_ID_1}", json={"assigned_user_id": USER_ID_1})
+    etag = (await async_client.get(f"/users/{USER_ID_1}/calendar.ics")).headers["etag"]
+
+    # Test: an assignment change moves the ETag and the feed is rebuilt
+    await async_client.patch(f"/assignments/{EVENT_ASSIGNMENT_ID_1}", json={"is_active": False})
+    modified = await async_client.get(f"/users/{USER_ID_1}/calendar.ics", headers={"If-None-Match": etag})
+    assert modified.status_code == status.HTTP_200_OK
+    assert modified.headers["etag"] != etag
+    assert "STATUS:CANCELLED" in modified.text
+
+async def test_get_user_calendar_etag_follows_user_rename(async_client, seed_for_calendar_tests):
+    etag = (await async_client.get(f"/users/{USER_ID_1}/calendar.ics")).headers["etag"]
+
+    # Test: the calendar name (X-WR-CALNAME) comes from the user, so renaming them moves the ETag
+    await async_client.patch(f"/users/{USER_ID_1}", json={"first_name": "Renamed"})
+    modified = await async_client.get(f"/users/{USER_ID_1}/calendar.ics", headers={"If-None-Match": etag})
+    assert modified.status_code == status.HTTP_200_OK
+    assert modified.headers["etag"] != etag
+    assert "X-WR-CALNAME:Renamed " in modified.text
+
 # =============================
 # INSERT USER
 # =============================
@@ -2,6 +2,7 @@ pytest_plugins = ("pytest_asyncio","tests.fixtures.data_fixtures","tests.fixture
 
 # Shared configurations and fixtures for tests
 from contextlib import asynccontextmanager
+import os
 import asyncio
 import pytest
 import pytest_asyncio
@@ -9,15 +10,25 @@ import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
 from fastapi import Request
 
+from sqlalchemy import URL, Connection, Engine, make_url, pool
 from sqlmodel import create_engine, Session, text
 from alembic.config import Config
 from alembic import command
 
 from app.main import app
+from app.db.partitions import create_event_partitions, forget_partitions
+from app.services.rate_limits import get_rate_limiter
+from app.services.api_keys import get_api_key_index
+from app.services.candidates import candidate_index
+from app.services.summaries import TRACK_SUMMARIES_KEY
 from app.utils.dependencies import get_db_session
+from app.utils.helpers import VALID_TABLES
 from app.settings import settings
 
 TEST_SCHEMA = "test_schema"
+TEMPLATE_LOCK = "test_database_template"
+# Years the tests write events in; the app creates partitions ahead of time at startup, which the tests skip
+TEST_PARTITION_YEARS = range(2020, 2033)
 
 # =============================
 # LIFESPAN OVERRIDE
@@ -33,6 +44,20 @@ def disable_app_lifespan():
     """Disable the app's lifespan for testing"""
     app.router.lifespan_context = _noop_lifespan
 
+# Every test starts with full rate limit buckets (the lifespan is disabled, so the in-memory limiter is used)
+# and an API key index holding only FAST_API_KEY (keys created by a test are rolled back with it)
+@pytest.fixture(autouse=True)
+def reset_rate_limiter_and_api_keys():
+    get_rate_limiter().reset()
+    yield
+    get_api_key_index().clear()
+
+# Test data is rolled back or truncated behind the candidate index's back, so every test starts without one
+@pytest.fixture(autouse=True)
+def reset_candidate_index():
+    yield
+    candidate_index.clear()
+
 # =============================
 # ASYNC CLIENT FIXTURES
 # =============================
@@ -44,11 +69,75 @@ def event_loop():
     yield loop
     loop.close()
 
+# =============================
+# DATABASE FIXTURES
+# =============================
+def truncate_test_tables(engine: Engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE TABLE {', '.join(VALID_TABLES)} RESTART IDENTITY CASCADE"))
+
+def migrate_test_database(url: URL) -> None:
+    """
+    Migrate the test database and empty its tables:
+    1. Ensure test_schema exists
+    2. Run alembic upgrade head against the test DB URL (a no-op when already at head)
+    3. Create the events partitions of TEST_PARTITION_YEARS
+    4. Truncate anything a previous interrupted run committed
+    """
+    engine = create_engine(url, poolclass=pool.NullPool, connect_args={"options": f"-csearch_path={TEST_SCHEMA}"})
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {TEST_SCHEMA};"))
+
+    # Run alembic migrations to build schema in test_schema
+    alembic_config = Config("alembic.ini")
+    alembic_config.set_main_option("sqlalchemy.url", url.render_as_string(hide_password=False))
+    alembic_config.set_main_option("search_path", TEST_SCHEMA)
+    command.upgrade(alembic_config, "head")
+
+    create_event_partitions(engine, TEST_PARTITION_YEARS)
+    truncate_test_tables(engine)
+    engine.dispose()
+
 @pytest.fixture(scope="session")
-def test_db_engine():
+def test_db_url():
+    """
+    URL of this process's test database.
+
+    A serial run migrates LOCAL_TEST_DB_URL and uses it directly. Under pytest-xdist that database is
+    the template: it is migrated once, by the first worker, and each worker gets its own copy through
+    CREATE DATABASE ... TEMPLATE (a file-level copy, far faster than replaying the migrations). An
+    advisory lock, taken from the maintenance database, serializes the workers, since Postgres only
+    copies a template nobody is connected to.
+    """
+    template_url = make_url(settings.local_test_db_url)
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker is None:
+        migrate_test_database(template_url)
+        yield template_url
+        return
+
+    worker_url = template_url.set(database=f"{template_url.database}_{worker}")
+    maintenance_engine = create_engine(template_url.set(database="postgres"), poolclass=pool.NullPool, isolation_level="AUTOCOMMIT")
+    with maintenance_engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(hashtext(:lock))"), {"lock": TEMPLATE_LOCK})
+        try:
+            migrate_test_database(template_url)
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{worker_url.database}" WITH (FORCE)'))
+            conn.execute(text(f'CREATE DATABASE "{worker_url.database}" TEMPLATE "{template_url.database}"'))
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(hashtext(:lock))"), {"lock": TEMPLATE_LOCK})
+    try:
+        yield worker_url
+    finally:
+        with maintenance_engine.connect() as conn:
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{worker_url.database}" WITH (FORCE)'))
+        maintenance_engine.dispose()
+
+@pytest.fixture(scope="session")
+def test_db_engine(test_db_url):
     """Sync engine for testing"""
     engine = create_engine(
-        settings.local_test_db_url,
+        test_db_url,
         pool_pre_ping=True,
         connect_args={"options": f"-csearch_path={TEST_SCHEMA}"}
     )
@@ -57,37 +146,47 @@ def test_db_engine():
     finally:
         engine.dispose()
 
-@pytest.fixture(scope="session", autouse=True)
-def apply_migrations(test_db_engine):
+@pytest.fixture(scope="function")
+def test_db_bind(test_db_engine, request) -> Connection | Engine:
     """
-    Apply migrations to the test database:
-    1. Ensure test_schema exists
-    2. Run alembic upgrade head against the test DB URL
+    What test sessions (and the app's sessions, through async_client) bind to.
+
+    By default a connection whose transaction spans the test and is rolled back afterwards: sessions
+    join it with SAVEPOINTs, so their commits are visible to each other but never reach the database,
+    and no cleanup is needed. Tests marked `real_commits` (their data must be visible to other
+    connections, e.g. a job runner or VACUUM) get the engine and have the tables truncated around them.
     """
-    with test_db_engine.begin() as conn:
-        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {TEST_SCHEMA};"))
+    if request.node.get_closest_marker("real_commits"):
+        truncate_test_tables(test_db_engine)
+        yield test_db_engine
+        truncate_test_tables(test_db_engine)
+        return
 
-    # Run alembic migrations to build schema in test_schema
-    alembic_config = Config("alembic.ini")
-    alembic_config.set_main_option("sqlalchemy.url", settings.local_test_db_url)
-    alembic_config.set_main_option("search_path", TEST_SCHEMA)
-    command.upgrade(alembic_config, "head")
+    connection = test_db_engine.connect()
+    transaction = connection.begin()
+    try:
+        yield connection
+    finally:
+        transaction.rollback()
+        connection.close()
+        # Partitions created (or seen) during the test were rolled back with it
+        forget_partitions()
 
 @pytest.fixture(scope="function")
-def get_test_db_session(test_db_engine):
+def get_test_db_session(test_db_bind):
     """
     Provide a database session for the test database.
     """
-    with Session(test_db_engine) as session:
+    with Session(test_db_bind, join_transaction_mode="create_savepoint") as session:
         yield session
 
 @pytest_asyncio.fixture(scope="function")
-async def async_client(test_db_engine, request):
+async def async_client(test_db_engine, test_db_bind, request):
     """
     Create an async HTTP client for testing with database connection override.
     
     Sets up the app state with the test database engine and overrides the
-    get_db_session dependency to use the test engine.
+    get_db_session dependency to use the test's connection (see test_db_bind).
     
     Headers can be customized by using pytest.mark.parametrize with indirect=True.
     Default includes API key. Custom headers override defaults.
@@ -112,9 +211,9 @@ async def async_client(test_db_engine, request):
     # Set app state with test engine (needed for health endpoint and get_db_session)
     app.state.db_engine = test_db_engine
     
-    # Override the get_db_session dependency to use test engine
+    # Override the get_db_session dependency to join the test's transaction
     def get_test_session(_: Request):
-        with Session(test_db_engine) as session:
+        with Session(test_db_bind, join_transaction_mode="create_savepoint", info={TRACK_SUMMARIES_KEY: True}) as session:
             yield session
 
     app.dependency_overrides[get_db_session] = get_test_session
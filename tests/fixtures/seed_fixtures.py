@@ -1,26 +1,7 @@
 import pytest
-import pytest_asyncio
-from sqlmodel import text
 
-from app.utils.helpers import VALID_TABLES
 from app.db.models import Role, ProficiencyLevel, EventType, Team, User, TeamUser, UserRole, Schedule, Event, EventAssignment, UserUnavailablePeriod
 
-@pytest_asyncio.fixture(autouse=True, scope="function")
-async def truncate_tables(test_db_engine):
-    """
-    Truncate tables before each test to keep state isolated without recreating schema.
-    Assumes search_path=test_schema so unqualified table names resolve correctly.
-    """
-    truncate_sql = f"""
-    TRUNCATE TABLE
-        {', '.join(VALID_TABLES)}
-    RESTART IDENTITY CASCADE;
-    """
-
-    with test_db_engine.begin() as conn:
-        conn.execute(text(truncate_sql))
-    yield
-
 # =============================
 # SEED HELPER FIXTURES
 # =============================
@@ -2,6 +2,9 @@ import pytest
 from fastapi import status
 
 from app.settings import settings
+from app.db.models import ApiKey
+from app.db.models.enums import ApiKeyScope
+from app.services.api_keys import ApiKeyIndex, BOOTSTRAP_KEY_ID, generate_api_key
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
@@ -24,4 +27,54 @@ async def test_health_endpoint_auth_scenarios(async_client, expected_status, exp
     if expected_response:
         assert response.json() == expected_response
     else:
-        assert "Unauthorized" in response.json()["detail"]
\ No newline at end of file
+        assert "Unauthorized" in response.json()["detail"]
+
+# =============================
+# API KEY INDEX
+# =============================
+class _Keys:
+    """Minimal session stand-in: ApiKeyIndex.load only runs one select over the active keys."""
+    def __init__(self, api_keys):
+        self.api_keys = api_keys
+
+    def exec(self, _statement):
+        return self
+
+    def all(self):
+        return self.api_keys
+
+def _stored_key(name: str, scopes: list[ApiKeyScope]) -> tuple[str, ApiKey]:
+    key, prefix, secret_hash = generate_api_key()
+    return key, ApiKey(name=name, scopes=scopes, prefix=prefix, secret_hash=secret_hash)
+
+def test_api_key_index_authenticates_by_prefix_and_secret():
+    key, api_key = _stored_key("mobile", [ApiKeyScope.read])
+    index = ApiKeyIndex()
+    index.load(_Keys([api_key]))
+
+    identity = index.authenticate(key)
+    assert (identity.id, identity.name) == (str(api_key.id), "mobile")
+    assert identity.allows(ApiKeyScope.read) and not identity.allows(ApiKeyScope.write)
+
+    # Test: a known prefix with the wrong secret, an unknown prefix and malformed keys are rejected
+    prefix = key.split("_")[1]
+    assert index.authenticate(f"shq_{prefix}_wrong") is None
+    assert index.authenticate(key.replace(prefix, "00000000")) is None
+    assert index.authenticate("shq__") is None
+    assert index.authenticate(key[:-1]) is None
+
+def test_api_key_index_matches_bootstrap_key_with_all_scopes():
+    index = ApiKeyIndex(bootstrap_key="bootstrap-secret")
+    identity = index.authenticate("bootstrap-secret")
+    assert identity.id == BOOTSTRAP_KEY_ID
+    assert all(identity.allows(scope) for scope in ApiKeyScope)
+    assert index.authenticate("bootstrap-secre") is None
+
+def test_api_key_index_reload_drops_deactivated_keys():
+    key, api_key = _stored_key("web", [ApiKeyScope.admin])
+    index = ApiKeyIndex()
+    index.load(_Keys([api_key]))
+    assert index.authenticate(key).allows(ApiKeyScope.write)
+
+    index.load(_Keys([]))
+    assert index.authenticate(key) is None
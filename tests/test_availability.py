@@ -0,0 +1,14 @@
+from datetime import datetime, timezone
+
+from app.services.availability import merge_intervals
+
+def at(day: int, hour: int = 0) -> datetime:
+    return datetime(2025, 5, day, hour, tzinfo=timezone.utc)
+
+def test_merge_intervals_merges_overlapping_and_touching():
+    assert merge_intervals([]) == []
+    assert merge_intervals([(at(3), at(4)), (at(1), at(2)), (at(2), at(3))]) == [(at(1), at(4))]
+    assert merge_intervals([(at(1), at(5)), (at(2), at(3)), (at(2, 12), at(6))]) == [(at(1), at(6))]
+
+def test_merge_intervals_keeps_gaps():
+    assert merge_intervals([(at(5), at(6)), (at(1), at(2)), (at(2, 1), at(3))]) == [(at(1), at(2)), (at(2, 1), at(3)), (at(5), at(6))]
@@ -0,0 +1,44 @@
+import asyncio
+from uuid import UUID
+
+from app.db.models.enums import ScheduleChangeType
+from app.services.broker import InMemoryBroker, ScheduleChange
+from tests.utils.constants import SCHEDULE_ID_1, SCHEDULE_ID_2, EVENT_ID_1, EVENT_ID_2, EVENT_ID_3
+
+def _change(schedule_id: str, event_id: str) -> ScheduleChange:
+    return ScheduleChange(schedule_id=UUID(schedule_id), type=ScheduleChangeType.event_updated, id=UUID(event_id), data={"notes": "Updated"})
+
+# =============================
+# TESTS
+# =============================
+async def test_in_memory_broker_delivers_only_to_schedule_subscribers():
+    broker = InMemoryBroker()
+    async with broker.subscribe(UUID(SCHEDULE_ID_1)) as queue_1, broker.subscribe(UUID(SCHEDULE_ID_2)) as queue_2:
+        assert broker.subscriber_count(UUID(SCHEDULE_ID_1)) == 1
+        broker.publish(_change(SCHEDULE_ID_1, EVENT_ID_1))
+        change = await asyncio.wait_for(queue_1.get(), timeout=1)
+        assert str(change.id) == EVENT_ID_1
+        assert change.data == {"notes": "Updated"}
+        assert queue_2.empty()
+
+    # Test: subscriptions are removed when the context exits
+    assert broker.subscriber_count(UUID(SCHEDULE_ID_1)) == 0
+    assert broker.subscriber_count(UUID(SCHEDULE_ID_2)) == 0
+
+async def test_in_memory_broker_publish_from_worker_thread():
+    broker = InMemoryBroker()
+    async with broker.subscribe(UUID(SCHEDULE_ID_1)) as queue:
+        # Sync routes publish from the threadpool, not the event loop
+        await asyncio.to_thread(broker.publish, _change(SCHEDULE_ID_1, EVENT_ID_2))
+        change = await asyncio.wait_for(queue.get(), timeout=1)
+        assert str(change.id) == EVENT_ID_2
+
+async def test_in_memory_broker_slow_subscriber_gets_resync_marker():
+    broker = InMemoryBroker(max_queue_size=2)
+    async with broker.subscribe(UUID(SCHEDULE_ID_1)) as queue:
+        for event_id in (EVENT_ID_1, EVENT_ID_2, EVENT_ID_3):
+            broker.publish(_change(SCHEDULE_ID_1, event_id))
+        await asyncio.sleep(0)
+        # Test: the backlog is replaced by a single resync marker (None)
+        assert queue.qsize() == 1
+        assert await queue.get() is None
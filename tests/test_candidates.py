@@ -0,0 +1,45 @@
+from uuid import uuid4
+from datetime import datetime, timezone
+
+from app.services.candidates import ScheduleCandidateIndex, UserRows
+
+def at(day: int, hour: int = 0) -> datetime:
+    return datetime(2025, 5, day, hour, tzinfo=timezone.utc)
+
+EVENT_1, EVENT_2 = uuid4(), uuid4()
+ROLE_1, ROLE_2 = uuid4(), uuid4()
+ALICE, BOB = uuid4(), uuid4()
+
+def build_index() -> ScheduleCandidateIndex:
+    index = ScheduleCandidateIndex(version=(2, None), month=(5, 2025), event_times={EVENT_1: (at(1), at(2)), EVENT_2: (at(2), at(3))})
+    rows = UserRows(names={ALICE: ("Alice", "Smith"), BOB: ("Bob", "Jones")})
+    rows.unavailable[ALICE].append((at(1, 12), at(1, 14)))
+    rows.role_ids[ALICE] |= {ROLE_1, ROLE_2}
+    rows.role_ids[BOB].add(ROLE_1)
+    index.set_users(rows.names, rows)
+    return index
+
+def test_candidates_are_available_and_qualified():
+    index = build_index()
+    assert index.candidates(EVENT_1, ROLE_1) == [BOB]
+    assert sorted(index.candidates(EVENT_2, ROLE_1)) == sorted([ALICE, BOB])
+    assert index.candidates(EVENT_2, ROLE_2) == [ALICE]
+    assert index.candidates(EVENT_2, uuid4()) == []
+    # Each user's availability over events, and its transpose per event
+    assert index.available_events[index.user_positions[ALICE]] == 0b10
+    assert index.available_users[index.event_positions[EVENT_1]] == 1 << index.user_positions[BOB]
+
+def test_set_users_replaces_only_those_users():
+    index = build_index()
+    rows = UserRows(names={BOB: ("Bob", "Jones")})
+    rows.unavailable[BOB].append((at(2, 18), at(3, 1)))
+    rows.role_ids[BOB].add(ROLE_2)
+    index.set_users([BOB], rows)
+    assert index.candidates(EVENT_1, ROLE_1) == []
+    assert index.candidates(EVENT_1, ROLE_2) == [BOB]
+    assert index.candidates(EVENT_2, ROLE_1) == [ALICE]
+
+    # Test: users missing from the rows (deleted or deactivated) are removed
+    index.set_users([ALICE], UserRows())
+    assert index.candidates(EVENT_2, ROLE_2) == []
+    assert ALICE not in index.user_names
@@ -0,0 +1,72 @@
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.coalescing import SingleFlight, COALESCED_REQUESTS
+from app.utils.metrics import get_counter
+
+# =============================
+# HELPERS
+# =============================
+def run_concurrently(flight: SingleFlight, key, compute, callers: int) -> list:
+    """Start `callers` threads on the same key and let the leader finish once all of them joined the flight."""
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        futures = [pool.submit(flight.do, key, compute) for _ in range(callers)]
+        return [future.result(timeout=5) for future in futures]
+
+# =============================
+# TESTS
+# =============================
+def test_concurrent_callers_share_one_computation():
+    flight = SingleFlight("test_shared")
+    calls = 0
+    followers_joined = threading.Event()
+
+    def compute() -> bytes:
+        nonlocal calls
+        calls += 1
+        # Hold the flight until the other callers are waiting on it
+        followers_joined.wait(timeout=5)
+        return b'{"events": []}'
+
+    def watch() -> None:
+        while get_counter(COALESCED_REQUESTS, flight="test_shared", role="follower") < 4:
+            threading.Event().wait(0.001)
+        followers_joined.set()
+
+    threading.Thread(target=watch).start()
+    results = run_concurrently(flight, ("schedule", 1), compute, callers=5)
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert flight.in_flight() == 0
+
+    # Test: once landed, the next call computes again
+    followers_joined.set()
+    flight.do(("schedule", 1), compute)
+    assert calls == 2
+
+def test_different_keys_do_not_share():
+    flight = SingleFlight("test_keys")
+    assert flight.do(("schedule", 1), lambda: b"v1") == b"v1"
+    assert flight.do(("schedule", 2), lambda: b"v2") == b"v2"
+
+def test_followers_get_the_leaders_exception():
+    flight = SingleFlight("test_errors")
+    followers_joined = threading.Event()
+
+    def compute():
+        followers_joined.wait(timeout=5)
+        raise LookupError("Schedule not found")
+
+    def watch() -> None:
+        while get_counter(COALESCED_REQUESTS, flight="test_errors", role="follower") < 2:
+            threading.Event().wait(0.001)
+        followers_joined.set()
+
+    threading.Thread(target=watch).start()
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.do, "key", compute) for _ in range(3)]
+        for future in futures:
+            with pytest.raises(LookupError):
+                future.result(timeout=5)
+    assert flight.in_flight() == 0
@@ -0,0 +1,34 @@
+import os
+from sqlmodel import create_engine
+
+from app.db.database import _engines
+from app.settings import settings
+
+# =============================
+# TESTS
+# =============================
+def test_forked_worker_opens_its_own_connections():
+    engine = create_engine(settings.local_test_db_url, pool_size=1)
+    _engines.add(engine)
+    with engine.connect() as connection:
+        parent_backend_pid = connection.exec_driver_sql("SELECT pg_backend_pid()").scalar()
+
+    # The parent's connection is now pooled; a forked worker must not pick it up
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            with engine.connect() as connection:
+                os.write(write_fd, str(connection.exec_driver_sql("SELECT pg_backend_pid()").scalar()).encode())
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+    child_backend_pid = int(os.read(read_fd, 64))
+    os.close(read_fd)
+
+    assert child_backend_pid != parent_backend_pid
+    # Test: the parent's pooled connection is still usable after the child exits
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT pg_backend_pid()").scalar() == parent_backend_pid
+    engine.dispose()
@@ -0,0 +1,47 @@
+import pytest
+
+from app.db.models import EventPublic, EventAssignmentPublic, EventAssignmentEmbeddedPublic
+from app.services.builders import build_events_with_assignments_from_event, event_with_assignments_paths
+from app.utils.exceptions import InvalidFieldsError
+from app.utils.fieldsets import parse_fields, nested_fields, includes_nested, related_paths
+
+def test_parse_fields():
+    assert parse_fields(None, EventAssignmentPublic) is None
+    assert parse_fields("role_name, event_title,", EventAssignmentPublic) == {"id", "role_name", "event_title"}
+    with pytest.raises(InvalidFieldsError, match="Unknown fields: bogus"):
+        parse_fields("role_name,bogus", EventAssignmentPublic)
+
+    # Test: nested list fields are accepted whole or by field, only where declared
+    nested = {"event_assignments": EventAssignmentEmbeddedPublic}
+    assert parse_fields("title,event_assignments.role_name", EventPublic, nested) == {"id", "title", "event_assignments.role_name"}
+    with pytest.raises(InvalidFieldsError):
+        parse_fields("event_assignments.event_title", EventPublic, nested)
+    with pytest.raises(InvalidFieldsError):
+        parse_fields("event_assignments", EventPublic)
+
+def test_nested_fields():
+    fields = frozenset({"id", "title", "event_assignments.role_name"})
+    assert includes_nested(fields, "event_assignments")
+    assert nested_fields(fields, "event_assignments") == {"id", "role_name"}
+    assert nested_fields(frozenset({"id", "event_assignments"}), "event_assignments") is None
+    assert not includes_nested(frozenset({"id", "title"}), "event_assignments")
+
+def test_related_paths_skip_unread_relationships():
+    assert related_paths(None, EventAssignmentPublic) == list(EventAssignmentPublic.RELATED_FIELDS)
+    assert related_paths(frozenset({"id", "role_name", "is_active"}), EventAssignmentPublic) == ["role"]
+    assert related_paths(frozenset({"id", "event_id", "assigned_user_id"}), EventAssignmentPublic) == []
+    assert event_with_assignments_paths(frozenset({"id", "title"})) == []
+    assert event_with_assignments_paths(frozenset({"id", "team_name", "event_assignments.assigned_user_first_name"})) == [
+        "team", "event_assignments", "event_assignments.assigned_user",
+    ]
+
+def test_build_sparse_event_with_assignments(sample_event_with_assignments):
+    fields = frozenset({"id", "title", "event_type_name", "event_assignments.role_name"})
+    result = build_events_with_assignments_from_event(sample_event_with_assignments, fields)
+    assert result.event.model_fields_set == {"id", "title", "event_type_name"}
+    assert result.event.event_type_name == "Service"
+    assert all(ea.model_fields_set == {"id", "role_name"} for ea in result.event_assignments)
+
+    # Test: without the nested list in the fieldset it is left out
+    result = build_events_with_assignments_from_event(sample_event_with_assignments, frozenset({"id", "title"}))
+    assert result.model_fields_set == {"event"}
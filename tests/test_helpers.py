@@ -1,6 +1,6 @@
 import pytest
 
-from app.utils.helpers import raise_exception_if_not_found, require_non_empty_payload
+from app.utils.helpers import raise_exception_if_not_found, require_non_empty_payload, is_not_modified
 from app.db.models import ProficiencyLevel, Role, RoleUpdate
 from tests.utils.constants import PROFICIENCY_LEVEL_ID_1
 from app.utils.exceptions import EmptyPayloadError, NotFoundError
@@ -46,4 +46,18 @@ def test_require_non_empty_payload():
     # Test: returns dict with single field set
     payload = RoleUpdate(is_active=False)
     result = require_non_empty_payload(payload)
-    assert result == {"is_active": False}
\ No newline at end of file
+    assert result == {"is_active": False}
+
+def test_is_not_modified():
+    # Test: no conditional headers
+    assert is_not_modified({}, '"abc"') is False
+
+    # Test: If-None-Match matches (including weak and list forms)
+    assert is_not_modified({"if-none-match": '"abc"'}, '"abc"') is True
+    assert is_not_modified({"if-none-match": 'W/"abc"'}, '"abc"') is True
+    assert is_not_modified({"if-none-match": '"xyz", "abc"'}, '"abc"') is True
+    assert is_not_modified({"if-none-match": "*"}, '"abc"') is True
+    assert is_not_modified({"if-none-match": '"xyz"'}, '"abc"') is False
+
+    # Test: If-Modified-Since is ignored
+    assert is_not_modified({"if-modified-since": "Fri, 01 Jan 2100 00:00:00 GMT"}, '"abc"') is False
@@ -0,0 +1,18 @@
+import sys
+import subprocess
+
+# =============================
+# TESTS
+# =============================
+def test_heavy_optional_modules_are_not_imported_at_startup():
+    # Run in a fresh interpreter: this test process has already imported everything
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, app.main; print(sorted({'phonenumbers', 'redis'} & sys.modules.keys()))"],
+        capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip() == "[]"
+
+def test_phone_numbers_are_normalized_after_lazy_import():
+    from app.db.models import UserCreate
+    user = UserCreate(first_name="Test", last_name="User", phone="(615) 555-0100")
+    assert user.phone == "+16155550100"
@@ -0,0 +1,80 @@
+import pytest
+from uuid import UUID
+from datetime import datetime, timedelta, timezone
+from sqlmodel import select
+
+from app.db.models import EventAssignment
+
+from app.services.analytics import get_load_analytics
+from app.services.candidates import get_assignment_candidates
+from app.services.queries import (
+    select_schedule_with_events_and_assignments, select_schedule_slot_counts, select_user_calendar_version,
+    select_user_calendar_rows, select_unavailable_users_for_month,
+)
+from tests.utils.large_dataset import generate_large_dataset, large_dataset_id, large_dataset_schedule_number
+from tests.utils.query_plans import explain_plans, indexes_used, sequential_scans, partition_parents
+
+# generate_large_dataset commits and VACUUMs from another connection, so these tests need real commits
+pytestmark = [pytest.mark.asyncio, pytest.mark.real_commits]
+
+LARGE_TABLES = {"events", "event_assignments", "user_unavailable_periods"}
+# events partitions hold a year (~300 rows) each, so schedule-scoped queries, which cannot prune by
+# year, may read the other years' events partitions sequentially; their slots must still use indexes
+SCHEDULE_SCOPED_LARGE_TABLES = LARGE_TABLES - {"events"}
+
+# =============================
+# FIXTURES
+# =============================
+@pytest.fixture
+def seed_large_dataset(get_test_db_session):
+    generate_large_dataset(get_test_db_session)
+
+@pytest.fixture
+def parents(get_test_db_session, seed_large_dataset):
+    return partition_parents(get_test_db_session)
+
+@pytest.fixture
+def last_schedule_id():
+    return UUID(large_dataset_id("schedule", large_dataset_schedule_number(2025, 11)))
+
+# =============================
+# INDEX USAGE
+# =============================
+async def test_schedule_slot_counts_use_schedule_and_covering_indexes(get_test_db_session, parents, last_schedule_id):
+    plans = explain_plans(get_test_db_session, lambda session: select_schedule_slot_counts(session, last_schedule_id))
+    assert "ix_events_schedule_id_starts_at" in indexes_used(plans, parents)
+    assert "ix_event_assignments_event_id_covering" in indexes_used(plans, parents)
+    assert not sequential_scans(plans, parents) & SCHEDULE_SCOPED_LARGE_TABLES
+
+async def test_schedule_grid_loads_use_indexes(get_test_db_session, parents, last_schedule_id):
+    plans = explain_plans(get_test_db_session, lambda session: select_schedule_with_events_and_assignments(session, last_schedule_id))
+    assert "ix_events_schedule_id_starts_at" in indexes_used(plans, parents)
+    assert not sequential_scans(plans, parents) & SCHEDULE_SCOPED_LARGE_TABLES
+
+async def test_user_calendar_uses_assigned_user_index(get_test_db_session, parents):
+    user_id = UUID(large_dataset_id("user", 42))
+    plans = explain_plans(get_test_db_session, lambda session: (select_user_calendar_version(session, user_id), select_user_calendar_rows(session, user_id)))
+    assert "ix_event_assignments_assigned_user_id_event_id" in indexes_used(plans, parents)
+    assert not sequential_scans(plans, parents) & LARGE_TABLES
+
+async def test_unavailable_users_for_month_uses_ends_at_index(get_test_db_session, seed_large_dataset):
+    plans = explain_plans(get_test_db_session, lambda session: select_unavailable_users_for_month(session, month=11, year=2025))
+    assert "ix_user_unavailable_periods_ends_at_starts_at" in indexes_used(plans)
+    assert "user_unavailable_periods" not in sequential_scans(plans)
+
+async def test_workload_analytics_uses_range_and_filled_slot_indexes(get_test_db_session, parents):
+    ends_at = datetime(2025, 12, 1, tzinfo=timezone.utc)
+    plans = explain_plans(get_test_db_session, lambda session: get_load_analytics(session, starts_at=ends_at - timedelta(weeks=4), ends_at=ends_at))
+    used = indexes_used(plans, parents)
+    assert used & {"ix_events_active_starts_at", "ix_events_starts_at"}
+    assert used & {"ix_event_assignments_filled_event_id", "ix_event_assignments_event_id_covering"}
+    assert not sequential_scans(plans, parents) & {"events", "event_assignments"}
+
+async def test_assignment_candidates_use_filled_slot_by_user_index(get_test_db_session, parents):
+    event_assignment = get_test_db_session.exec(
+        select(EventAssignment)
+        .where(EventAssignment.event_id == UUID(large_dataset_id("event", 3001)), EventAssignment.role_id == UUID(large_dataset_id("role", 1)))
+    ).one()
+    plans = explain_plans(get_test_db_session, lambda session: get_assignment_candidates(session, event_assignment))
+    assert "ix_event_assignments_filled_assigned_user_id_event_starts_at" in indexes_used(plans, parents)
+    assert not sequential_scans(plans, parents) & LARGE_TABLES
@@ -0,0 +1,86 @@
+import pytest
+from uuid import UUID
+from contextlib import contextmanager
+from types import SimpleNamespace
+from sqlalchemy import event, inspect
+from sqlalchemy.orm.interfaces import ONETOMANY
+
+from app.db.models import Schedule, Event, EventAssignment, Role
+from app.services.loaders import get_loader, prime, _key_pair
+from tests.utils.constants import SCHEDULE_ID_2, EVENT_ID_1, EVENT_ID_2, EVENT_ID_3, ROLE_ID_1, ROLE_ID_2
+
+# =============================
+# FIXTURES
+# =============================
+@pytest.fixture
+def seed_for_loaders_tests(seed_users, seed_roles, seed_teams, seed_schedules, seed_event_types, seed_events, seed_event_assignments, test_users_data, test_roles_data, test_teams_data, test_schedules_data, test_event_types_data, test_events_data, test_event_assignments_data):
+    seed_users([test_users_data[0]])
+    seed_roles(test_roles_data[:2])
+    seed_teams([test_teams_data[0]])
+    seed_schedules([test_schedules_data[1]])
+    seed_event_types([test_event_types_data[0]])
+    seed_events(test_events_data)
+    seed_event_assignments(test_event_assignments_data)
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+# =============================
+# TESTS
+# =============================
+def test_load_many_uses_identity_map(test_db_engine, get_test_db_session, seed_for_loaders_tests):
+    get_test_db_session.expire_all()
+    loader = get_loader(get_test_db_session)
+    assert get_loader(get_test_db_session) is loader
+
+    with count_queries(test_db_engine) as statements:
+        roles = loader.load_many(Role, [UUID(ROLE_ID_1), UUID(ROLE_ID_2), None])
+        assert set(roles) == {UUID(ROLE_ID_1), UUID(ROLE_ID_2)}
+        # Test: a second lookup of live rows is served from the identity map
+        assert loader.load_many(Role, [UUID(ROLE_ID_1)])[UUID(ROLE_ID_1)] is roles[UUID(ROLE_ID_1)]
+    assert len(statements) == 1
+
+def test_prime_batches_relationship_levels(test_db_engine, get_test_db_session, seed_for_loaders_tests):
+    get_test_db_session.expire_all()
+    schedule = get_test_db_session.get(Schedule, UUID(SCHEDULE_ID_2))
+
+    with count_queries(test_db_engine) as statements:
+        prime([schedule], "events.event_type", "events.team", "events.event_assignments.role", "events.event_assignments.assigned_user")
+        # Test: everything is loaded, walking the graph issues no further queries
+        events = {str(e.id): e for e in schedule.events}
+        assert set(events) == {EVENT_ID_1, EVENT_ID_2, EVENT_ID_3}
+        assert events[EVENT_ID_1].event_type.code == "service"
+        assert events[EVENT_ID_1].team is None
+        assert events[EVENT_ID_3].team.code == "team_1"
+        assert {ea.role.code for ea in events[EVENT_ID_1].event_assignments} == {"propresenter", "sound"}
+        assert {ea.assigned_user.first_name for ea in events[EVENT_ID_1].event_assignments if ea.assigned_user} == {"Alice"}
+    # One query per relationship level, independent of the number of events and assignments
+    assert len(statements) == 6
+
+def test_prime_skips_detached_objects(test_events_data):
+    # Test: in-memory objects without a session are left untouched
+    prime(test_events_data, "event_assignments")
+    prime([], "event_assignments")
+    assert isinstance(test_events_data[0], Event)
+
+def test_key_pair_uses_primary_key_of_composite_joins():
+    # Test: events join their slots on (id, starts_at); children are matched on the primary key
+    local_column, remote_column = _key_pair(inspect(Event).relationships["event_assignments"])
+    assert (local_column.name, remote_column.name) == ("id", "event_id")
+    local_column, remote_column = _key_pair(inspect(EventAssignment).relationships["event"])
+    assert (local_column.name, remote_column.name) == ("event_id", "id")
+
+    # Test: a join that is not on the one side's primary key is refused
+    parent = inspect(Event)
+    starts_at_only = [pair for pair in parent.relationships["event_assignments"].local_remote_pairs if pair[0].name == "starts_at"]
+    relationship = SimpleNamespace(direction=ONETOMANY, parent=parent, mapper=inspect(EventAssignment), local_remote_pairs=starts_at_only)
+    with pytest.raises(ValueError):
+        _key_pair(relationship)
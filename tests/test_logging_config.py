@@ -0,0 +1,97 @@
+import sys
+import json
+import queue
+import logging
+import pytest
+
+from app.utils.logging_config import BoundedQueueHandler, ClientErrorSampler, JsonFormatter, CLIENT_ERROR
+
+pytestmark = pytest.mark.asyncio
+
+# =============================
+# HELPERS
+# =============================
+def make_record(msg: str, *args, level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.makeLogRecord({"name": "tests", "levelno": level, "levelname": logging.getLevelName(level), "msg": msg, "args": args})
+    record.__dict__.update(extra)
+    return record
+
+def drain(log_queue: queue.Queue) -> list[logging.LogRecord]:
+    records = []
+    while not log_queue.empty():
+        records.append(log_queue.get_nowait())
+    return records
+
+# =============================
+# QUEUE HANDLER
+# =============================
+async def test_full_queue_drops_records_and_reports_them_later():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2))
+    for n in range(5):
+        handler.handle(make_record("record %s", n))
+    assert handler.dropped == 3
+    assert [record.getMessage() for record in drain(handler.queue)] == ["record 0", "record 1"]
+
+    # Test: once there is room, the next record is followed by a report of what was dropped
+    handler.handle(make_record("record 5"))
+    messages = [record.getMessage() for record in drain(handler.queue)]
+    assert messages == ["record 5", "Dropped 3 log records: logging queue full"]
+    handler.handle(make_record("record 6"))
+    assert [record.getMessage() for record in drain(handler.queue)] == ["record 6"]
+
+async def test_queued_records_carry_the_formatted_message_and_traceback():
+    handler = BoundedQueueHandler(queue.Queue())
+    values = ["before"]
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = make_record("values: %s", values, level=logging.ERROR)
+        record.exc_info = sys.exc_info()
+    handler.handle(record)
+    values.append("after")
+
+    queued = handler.queue.get_nowait()
+    assert queued.getMessage() == "values: ['before']"
+    assert queued.exc_info is None and "ValueError: boom" in queued.exc_text
+
+# =============================
+# SAMPLING AND FORMAT
+# =============================
+async def test_client_error_sampler_only_samples_client_errors():
+    sampler = ClientErrorSampler(sample_rate=0)
+    assert sampler.filter(make_record("NotFoundError: missing", **CLIENT_ERROR)) is False
+    assert sampler.filter(make_record("Database unavailable", level=logging.ERROR)) is True
+    assert sampler.sampled_out == 1
+
+    assert ClientErrorSampler(sample_rate=1).filter(make_record("NotFoundError: missing", **CLIENT_ERROR)) is True
+
+async def test_json_formatter_includes_request_fields():
+    record = make_record("GET %s 200", "/roles", request_id="abc123", route="/roles", method="GET", status_code=200, latency_ms=1.5, query_count=2)
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["message"] == "GET /roles 200"
+    assert (payload["level"], payload["logger"]) == ("INFO", "tests")
+    assert {key: payload[key] for key in ("request_id", "route", "method", "status_code", "latency_ms", "query_count")} == {
+        "request_id": "abc123", "route": "/roles", "method": "GET", "status_code": 200, "latency_ms": 1.5, "query_count": 2,
+    }
+
+# =============================
+# REQUEST LOGGING
+# =============================
+async def test_requests_get_an_id_and_an_access_record(async_client, caplog):
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        response = await async_client.get("/roles", headers={"x-request-id": "req-1"})
+        generated = await async_client.get("/roles")
+
+    assert response.headers["x-request-id"] == "req-1"
+    assert len(generated.headers["x-request-id"]) == 32
+    access = [record for record in caplog.records if record.name == "app.access"]
+    assert [record.getMessage().split()[:3] for record in access] == [["GET", "/roles", "200"], ["GET", "/roles", "200"]]
+    assert all(record.query_count >= 1 and record.latency_ms >= 0 and record.status_code == 200 for record in access)
+
+async def test_access_record_of_client_error_uses_route_template(async_client, caplog):
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        response = await async_client.get("/roles/00000000-0000-0000-0000-000000000000")
+    assert response.status_code == 404
+    access = [record for record in caplog.records if record.name == "app.access"]
+    assert access[0].getMessage().startswith("GET /roles/{id} 404")
+    assert access[0].client_error is True
@@ -0,0 +1,40 @@
+import os
+import json
+
+from app.main import app
+from app.utils.dependencies import get_db_session
+from app.utils.metrics import describe_counter, increment_counter, render_metrics, flush_counters, clear_metrics_dir, start_metrics_flush, stop_metrics_flush
+
+TEST_COUNTER = "test_metrics_requests_total"
+describe_counter(TEST_COUNTER, "Counter for the metrics tests")
+
+# =============================
+# TESTS
+# =============================
+async def test_metrics_are_summed_over_the_processes_sharing_the_directory(tmp_path):
+    other_worker = tmp_path / "counters_1.json"
+    other_worker.write_text(json.dumps([[TEST_COUNTER, [["route", "/a"]], 5]]))
+    await start_metrics_flush(str(tmp_path), flush_seconds=3600)
+    try:
+        increment_counter(TEST_COUNTER, 2, route="/a")
+        increment_counter(TEST_COUNTER, route="/b")
+        metrics = render_metrics()
+        assert f'{TEST_COUNTER}{{route="/a"}} 7' in metrics
+        assert f'{TEST_COUNTER}{{route="/b"}} 1' in metrics
+
+        # Test: this process's file holds only its own counts, and is not counted twice
+        flush_counters()
+        own_rows = json.loads((tmp_path / f"counters_{os.getpid()}.json").read_text())
+        assert [TEST_COUNTER, [["route", "/a"]], 2] in own_rows
+        assert f'{TEST_COUNTER}{{route="/a"}} 7' in render_metrics()
+    finally:
+        await stop_metrics_flush()
+
+    # Test: a new server run starts from this process's counts only
+    clear_metrics_dir(str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+    assert f'{TEST_COUNTER}{{route="/a"}} 2' in render_metrics()
+
+def test_metrics_route_does_not_open_a_database_session():
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/metrics")
+    assert get_db_session not in {dependency.call for dependency in route.dependant.dependencies}
@@ -0,0 +1,108 @@
+import pytest
+from fastapi import status
+from datetime import datetime, timezone
+from sqlmodel import text
+
+from app.db.partitions import create_event_partitions, create_upcoming_event_partitions, ensure_event_partitions, partition_name
+from app.services.queries import stream_event_assignment_export_rows
+from tests.utils.query_plans import explain_plans, scanned_relations
+from tests.utils.constants import EVENT_ID_1
+
+pytestmark = pytest.mark.asyncio
+
+# =============================
+# HELPERS
+# =============================
+def partition_exists(session, name: str) -> bool:
+    return session.exec(text("SELECT to_regclass(:name) IS NOT NULL").bindparams(name=name)).one()[0]
+
+def partitions_holding(session, table: str) -> set[str]:
+    return set(session.exec(text(f"SELECT DISTINCT tableoid::regclass::text FROM {table}")).scalars())
+
+# =============================
+# FIXTURES
+# =============================
+@pytest.fixture
+def seed_partitioned_events(seed_roles, seed_users, seed_schedules, seed_event_types, seed_events, seed_event_assignments, test_roles_data, test_users_data, test_schedules_data, test_event_types_data, test_events_data, test_event_assignments_data):
+    seed_roles(test_roles_data[:2])
+    seed_users(test_users_data[:2])
+    seed_schedules([test_schedules_data[1]])
+    seed_event_types([test_event_types_data[0]])
+    seed_events(test_events_data)
+    seed_event_assignments(test_event_assignments_data)
+
+# =============================
+# PARTITION CREATION
+# =============================
+async def test_new_december_schedule_needs_partitions_for_its_year_and_next(async_client, get_test_db_session):
+    ensure_event_partitions(get_test_db_session.connection(), {2040})
+    get_test_db_session.commit()
+
+    # Test: the flush guard refuses the schedule instead of creating the missing 2041 partitions
+    response = await async_client.post("/schedules", json={"month": 12, "year": 2040})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert "2041" in response.json()["detail"]
+    assert not partition_exists(get_test_db_session, "events_y2041")
+
+    ensure_event_partitions(get_test_db_session.connection(), {2041})
+    get_test_db_session.commit()
+    response = await async_client.post("/schedules", json={"month": 12, "year": 2040})
+    assert response.status_code == status.HTTP_201_CREATED
+
+async def test_events_in_a_year_without_partitions_are_refused(async_client, get_test_db_session, seed_partitioned_events):
+    response = await async_client.patch(f"/events/{EVENT_ID_1}", json={"starts_at": "2045-05-01T00:00:00Z", "ends_at": "2045-05-02T00:00:00Z"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert not partition_exists(get_test_db_session, "events_y2045")
+
+@pytest.mark.real_commits
+async def test_partitions_are_created_ahead_of_time_in_their_own_transaction(test_db_bind, get_test_db_session):
+    try:
+        assert create_event_partitions(test_db_bind, {2045, 2046}) == {2045, 2046}
+        for name in ("events_y2045", "event_assignments_y2045", "events_y2046", "event_assignments_y2046"):
+            assert partition_exists(get_test_db_session, name)
+        # Test: existing partitions are left alone
+        assert create_event_partitions(test_db_bind, {2045, 2046}) == set()
+    finally:
+        with test_db_bind.begin() as connection:
+            for year in (2045, 2046):
+                for table in ("event_assignments", "events"):
+                    connection.execute(text(f"DROP TABLE IF EXISTS {partition_name(table, year)}"))
+
+    # Test: startup covers the current year through EVENT_PARTITION_YEARS_AHEAD years later
+    create_upcoming_event_partitions(test_db_bind, 2)
+    year = datetime.now(timezone.utc).year
+    for offset in range(3):
+        assert partition_exists(get_test_db_session, partition_name("events", year + offset))
+
+async def test_events_and_slots_are_stored_in_their_event_year_partition(get_test_db_session, seed_partitioned_events):
+    assert partitions_holding(get_test_db_session, "events") == {"events_y2025"}
+    assert partitions_holding(get_test_db_session, "event_assignments") == {"event_assignments_y2025"}
+    mismatched = get_test_db_session.exec(text(
+        "SELECT count(*) FROM event_assignments JOIN events ON events.id = event_assignments.event_id "
+        "WHERE event_assignments.event_starts_at <> events.starts_at"
+    )).one()[0]
+    assert mismatched == 0
+
+async def test_moving_an_event_to_another_year_moves_its_slots(async_client, get_test_db_session, seed_partitioned_events):
+    response = await async_client.patch(f"/events/{EVENT_ID_1}", json={"starts_at": "2026-05-01T00:00:00Z", "ends_at": "2026-05-02T00:00:00Z"})
+    assert response.status_code == status.HTTP_200_OK
+    slots = get_test_db_session.exec(text(
+        "SELECT tableoid::regclass::text, event_starts_at FROM event_assignments WHERE event_id = :event_id"
+    ).bindparams(event_id=EVENT_ID_1)).all()
+    assert len(slots) == 2
+    assert {partition for partition, _ in slots} == {"event_assignments_y2026"}
+    assert {starts_at for _, starts_at in slots} == {datetime(2026, 5, 1, tzinfo=timezone.utc)}
+
+# =============================
+# PARTITION PRUNING
+# =============================
+async def test_date_range_export_reads_only_that_year_partitions(get_test_db_session, seed_partitioned_events):
+    # Other years' partitions exist but must not be read
+    ensure_event_partitions(get_test_db_session.connection(), {2024, 2026})
+    get_test_db_session.commit()
+    plans = explain_plans(get_test_db_session, lambda session: list(stream_event_assignment_export_rows(
+        session, starts_at=datetime(2025, 5, 1, tzinfo=timezone.utc), ends_at=datetime(2025, 6, 1, tzinfo=timezone.utc),
+    )))
+    scanned = scanned_relations(plans)
+    assert {"events_y2025", "event_assignments_y2025"} <= scanned
+    assert not {relation for relation in scanned if relation.startswith(("events_y", "event_assignments_y"))} - {"events_y2025", "event_assignments_y2025"}
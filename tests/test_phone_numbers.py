@@ -0,0 +1,49 @@
+import pytest
+from pydantic import ValidationError
+
+from app.db.models import UserUpdate
+from app.db.models.users import PhoneNumberCache, normalize_phone_number, phone_number_cache
+
+# =============================
+# TESTS
+# =============================
+def test_normalization_results_are_memoized_including_invalid_inputs():
+    phone_number_cache.clear()
+    for _ in range(3):
+        assert UserUpdate(phone="(615) 555-0100").phone == "+16155550100"
+        with pytest.raises(ValidationError):
+            UserUpdate(phone="555-9999")
+
+    stats = phone_number_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (4, 2, 2)
+    assert stats["hit_rate"] == pytest.approx(4 / 6)
+
+def test_primed_stored_numbers_skip_parsing():
+    phone_number_cache.clear()
+    phone_number_cache.prime("+12345551111")
+    assert phone_number_cache.stats()["misses"] == 0
+
+    assert normalize_phone_number("+12345551111") == "+12345551111"
+    assert phone_number_cache.stats()["hits"] == 1
+    assert phone_number_cache.stats()["misses"] == 0
+
+def test_only_e164_stored_numbers_are_primed():
+    phone_number_cache.clear()
+    # Test: values stored without normalization are not taken as valid
+    for value in ["555-9999", "(615) 555-0100", "+0123", "+1234567890123456"]:
+        phone_number_cache.prime(value)
+    assert phone_number_cache.stats()["size"] == 0
+    with pytest.raises(ValidationError):
+        UserUpdate(phone="555-9999")
+    assert UserUpdate(phone="(615) 555-0100").phone == "+16155550100"
+
+def test_phone_number_cache_evicts_least_recently_used():
+    cache = PhoneNumberCache(max_size=2)
+    cache.put("a", "+1")
+    cache.put("b", None)
+    assert cache.get("a") == (True, "+1")
+    cache.put("c", "+3")
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, "+1")
+    assert cache.stats()["size"] == 2
@@ -0,0 +1,115 @@
+import time
+import pytest
+
+from app.services import rate_limits
+from app.services.rate_limits import (
+    InMemoryRateLimiter, RedisRateLimiter, RateLimit, RateLimitBucket, RATE_LIMIT_DECISIONS,
+    decide, get_request_buckets, refill, retry_after_header,
+)
+from app.settings import settings
+from app.utils.metrics import get_counter
+
+pytestmark = pytest.mark.asyncio
+
+# =============================
+# HELPERS
+# =============================
+class LocalRedis:
+    """Stand-in for a Redis server running TOKEN_BUCKET_SCRIPT: one store shared by every limiter using it."""
+    def __init__(self):
+        self.store: dict[str, tuple[float, float]] = {}
+        self.closed = False
+
+    def register_script(self, script: str):
+        async def run(keys: list[str], args: list[float]):
+            now = time.monotonic()
+            buckets = [RateLimitBucket(key, key, RateLimit(args[i * 2], args[i * 2 + 1])) for i, key in enumerate(keys)]
+            levels = [refill(*self.store.get(bucket.key, (bucket.limit.capacity, now)), now, bucket.limit) for bucket in buckets]
+            decision = decide(buckets, levels)
+            for bucket, tokens in zip(buckets, levels):
+                self.store[bucket.key] = (tokens - 1 if decision.allowed else tokens, now)
+            limited_by = keys.index(decision.limited_by) + 1 if decision.limited_by else 0
+            return [int(decision.allowed), str(decision.retry_after), limited_by]
+        return run
+
+    async def aclose(self):
+        self.closed = True
+
+# =============================
+# TOKEN BUCKETS
+# =============================
+async def test_in_memory_limiter_allows_burst_then_limits():
+    limiter = InMemoryRateLimiter()
+    buckets = get_request_buckets("client", "GET", "/roles", RateLimit.per_minute(3))
+    assert [(await limiter.acquire(buckets)).allowed for _ in range(4)] == [True, True, True, False]
+
+    decision = await limiter.acquire(buckets)
+    assert decision.limited_by == "key"
+    assert 0 < decision.retry_after <= 20
+    assert retry_after_header(decision.retry_after) == str(int(decision.retry_after) + 1)
+
+async def test_route_bucket_limits_expensive_route_without_draining_key_bucket():
+    limiter = InMemoryRateLimiter()
+    export = get_request_buckets("client", "GET", "/exports/assignments", RateLimit.per_minute(600))
+    roles = get_request_buckets("client", "GET", "/roles", RateLimit.per_minute(600))
+    assert len(export) == 2 and len(roles) == 1
+
+    for _ in range(10):
+        assert (await limiter.acquire(export)).allowed
+    decision = await limiter.acquire(export)
+    assert (decision.allowed, decision.limited_by) == (False, "route")
+
+    # Test: a limited request takes no token, and other routes of the same key are unaffected
+    assert (await limiter.acquire(roles)).allowed
+
+async def test_clients_have_separate_buckets():
+    limiter = InMemoryRateLimiter()
+    noisy = get_request_buckets("noisy", "GET", "/roles", RateLimit.per_minute(1))
+    quiet = get_request_buckets("quiet", "GET", "/roles", RateLimit.per_minute(1))
+    assert (await limiter.acquire(noisy)).allowed
+    assert not (await limiter.acquire(noisy)).allowed
+    assert (await limiter.acquire(quiet)).allowed
+
+async def test_redis_limiters_share_buckets():
+    server = LocalRedis()
+    first, second = RedisRateLimiter(client=server), RedisRateLimiter(client=server)
+    buckets = get_request_buckets("client", "GET", "/analytics/load", RateLimit.per_minute(600))
+    for n in range(30):
+        assert (await (first if n % 2 else second).acquire(buckets)).allowed
+    decision = await first.acquire(buckets)
+    assert (decision.allowed, decision.limited_by) == (False, "route")
+    assert decision.retry_after > 0
+
+    await first.stop()
+    assert server.closed
+
+async def test_limiter_failure_allows_request(monkeypatch):
+    class BrokenLimiter:
+        async def acquire(self, buckets):
+            raise ConnectionError("Redis unavailable")
+
+    monkeypatch.setattr(rate_limits, "_limiter", BrokenLimiter())
+    errors = get_counter(RATE_LIMIT_DECISIONS, decision="error", bucket="none")
+    decision = await rate_limits.check_rate_limit("key", "GET", "/roles", RateLimit.per_minute(1))
+    assert decision.allowed
+    assert get_counter(RATE_LIMIT_DECISIONS, decision="error", bucket="none") == errors + 1
+
+# =============================
+# API
+# =============================
+async def test_requests_over_the_limit_get_429_with_retry_after(async_client, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_per_minute", 2)
+    limited = get_counter(RATE_LIMIT_DECISIONS, decision="limited", bucket="key")
+
+    statuses = [(await async_client.get("/roles")).status_code for _ in range(2)]
+    response = await async_client.get("/roles")
+    assert statuses == [200, 200]
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert get_counter(RATE_LIMIT_DECISIONS, decision="limited", bucket="key") == limited + 1
+
+    # Test: the limiter decisions are exposed on /metrics
+    monkeypatch.setattr(settings, "rate_limit_enabled", False)
+    metrics = await async_client.get("/metrics")
+    assert metrics.status_code == 200
+    assert f'{RATE_LIMIT_DECISIONS}{{bucket="key",decision="limited"}} {limited + 1}' in metrics.text
@@ -0,0 +1,90 @@
+from uuid import uuid4
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.recurrence import RuleExpansionCache, parse_rrule, occurrences_in_month
+from app.utils.metrics import render_metrics
+
+FIRST_STARTS_AT = datetime(2025, 1, 1, 9, tzinfo=timezone.utc)
+FIRST_ENDS_AT = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+
+def days(rrule: str, year: int, month: int) -> list[int]:
+    return [starts_at.day for starts_at, _ in occurrences_in_month(rrule, FIRST_STARTS_AT, FIRST_ENDS_AT, year, month)]
+
+@pytest.mark.parametrize("rrule", [
+    "FREQ=YEARLY", # unsupported frequency
+    "FREQ=WEEKLY;COUNT=3", # unsupported part
+    "FREQ=WEEKLY;BYDAY=2SU", # ordinals are MONTHLY only
+    "FREQ=MONTHLY;BYDAY=XX", # invalid weekday
+    "FREQ=DAILY;INTERVAL=0", # out of range
+    "FREQ=DAILY;FREQ=WEEKLY", # repeated part
+    "FREQ=DAILY;UNTIL=tomorrow", # invalid UNTIL
+])
+def test_parse_rrule_rejects_unsupported_rules(rrule):
+    with pytest.raises(ValueError):
+        parse_rrule(rrule)
+
+def test_parse_rrule():
+    rule = parse_rrule("RRULE:FREQ=MONTHLY;BYDAY=2SU,-1FR;UNTIL=20250630")
+    assert rule.freq == "MONTHLY"
+    assert rule.byday == ((2, 6), (-1, 4))
+    # A date-only UNTIL includes that whole day
+    assert rule.until == datetime(2025, 6, 30, 23, 59, 59, 999999, tzinfo=timezone.utc)
+
+def test_occurrences_in_month():
+    # Every 2nd Sunday, keeping the first occurrence's time of day and length
+    occurrences = occurrences_in_month("FREQ=MONTHLY;BYDAY=2SU", FIRST_STARTS_AT, FIRST_ENDS_AT, 2025, 5)
+    assert occurrences == ((datetime(2025, 5, 11, 9, tzinfo=timezone.utc), datetime(2025, 5, 11, 12, tzinfo=timezone.utc)),)
+    assert days("FREQ=MONTHLY;BYDAY=-1FR", 2025, 5) == [30]
+    assert days("FREQ=MONTHLY;BYMONTHDAY=1,-1", 2025, 2) == [1, 28]
+    # Wednesdays in summer
+    assert days("FREQ=WEEKLY;BYDAY=WE;BYMONTH=6,7,8", 2025, 5) == []
+    assert days("FREQ=WEEKLY;BYDAY=WE;BYMONTH=6,7,8", 2025, 6) == [4, 11, 18, 25]
+    # Every other week, counted from the first occurrence's week
+    assert days("FREQ=WEEKLY;INTERVAL=2", 2025, 1) == [1, 15, 29]
+    assert days("FREQ=DAILY;UNTIL=20250103", 2025, 1) == [1, 2, 3]
+    # Nothing before the first occurrence
+    assert days("FREQ=DAILY", 2024, 12) == []
+
+def test_occurrences_keep_their_local_time_across_daylight_saving_changes():
+    # 09:00-12:00 in Berlin every Sunday: 08:00 UTC in winter (CET), 07:00 UTC in summer (CEST)
+    starts_at, ends_at = datetime(2025, 3, 23, 8, tzinfo=timezone.utc), datetime(2025, 3, 23, 11, tzinfo=timezone.utc)
+    occurrences = occurrences_in_month("FREQ=WEEKLY", starts_at, ends_at, 2025, 3, "Europe/Berlin")
+    assert occurrences == (
+        (datetime(2025, 3, 23, 8, tzinfo=timezone.utc), datetime(2025, 3, 23, 11, tzinfo=timezone.utc)),
+        (datetime(2025, 3, 30, 7, tzinfo=timezone.utc), datetime(2025, 3, 30, 10, tzinfo=timezone.utc)),
+    )
+    # Test: without a time zone, the UTC time of day is kept
+    assert occurrences_in_month("FREQ=WEEKLY", starts_at, ends_at, 2025, 3)[1][0] == datetime(2025, 3, 30, 8, tzinfo=timezone.utc)
+
+def test_occurrences_are_bucketed_by_utc_month_and_matched_on_local_days():
+    # Every 1st of the month at 01:00 in Berlin starts the evening before in UTC
+    starts_at, ends_at = datetime(2025, 1, 1, 0, tzinfo=timezone.utc), datetime(2025, 1, 1, 1, tzinfo=timezone.utc)
+    assert occurrences_in_month("FREQ=MONTHLY;BYMONTHDAY=1", starts_at, ends_at, 2025, 5, "Europe/Berlin") == (
+        (datetime(2025, 5, 31, 23, tzinfo=timezone.utc), datetime(2025, 6, 1, 0, tzinfo=timezone.utc)),
+    )
+
+def test_unknown_time_zones_are_rejected():
+    with pytest.raises(ValueError):
+        occurrences_in_month("FREQ=DAILY", FIRST_STARTS_AT, FIRST_ENDS_AT, 2025, 1, "Mars/Olympus_Mons")
+
+def test_rule_expansion_cache_hits_per_rule_and_month():
+    cache = RuleExpansionCache(max_size=2)
+    rule_id = uuid4()
+    may = cache.month(rule_id, "FREQ=MONTHLY;BYDAY=2SU", FIRST_STARTS_AT, FIRST_ENDS_AT, 2025, 5)
+    assert cache.month(rule_id, "FREQ=MONTHLY;BYDAY=2SU", FIRST_STARTS_AT, FIRST_ENDS_AT, 2025, 5) is may
+    assert 'rule_expansions_total{result="hit"}' in render_metrics()
+
+    # An edited rule misses instead of reading the old expansion
+    assert cache.month(rule_id, "FREQ=MONTHLY;BYDAY=3SU", FIRST_STARTS_AT, FIRST_ENDS_AT, 2025, 5) != may
+
+def test_rule_expansion_cache_window_includes_occurrences_running_into_it():
+    cache = RuleExpansionCache()
+    starts_at = datetime(2025, 1, 31, 22, tzinfo=timezone.utc)
+    ends_at = datetime(2025, 2, 1, 2, tzinfo=timezone.utc)
+    window = cache.window(uuid4(), "FREQ=MONTHLY;BYMONTHDAY=-1", starts_at, ends_at, datetime(2025, 3, 1, tzinfo=timezone.utc), datetime(2025, 3, 31, 23, 59, 59, tzinfo=timezone.utc))
+    assert window == [
+        (datetime(2025, 2, 28, 22, tzinfo=timezone.utc), datetime(2025, 3, 1, 2, tzinfo=timezone.utc)),
+        (datetime(2025, 3, 31, 22, tzinfo=timezone.utc), datetime(2025, 4, 1, 2, tzinfo=timezone.utc)),
+    ]
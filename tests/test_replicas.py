@@ -0,0 +1,91 @@
+import time
+from fastapi import Request, Response
+from sqlmodel import create_engine
+
+from app.db.replicas import ReplicaRouter, READ_PRIMARY_COOKIE, READ_PRIMARY_HEADER
+
+def _request(method: str = "GET", cookies: dict[str, str] | None = None, headers: dict[str, str] | None = None) -> Request:
+    cookie_header = "; ".join(f"{name}={value}" for name, value in (cookies or {}).items())
+    raw_headers = [(name.encode(), value.encode()) for name, value in (headers or {}).items()]
+    if cookie_header:
+        raw_headers.append((b"cookie", cookie_header.encode()))
+    return Request({"type": "http", "method": method, "path": "/", "headers": raw_headers})
+
+def _router(replica_count: int = 2) -> ReplicaRouter:
+    primary = create_engine("sqlite://")
+    replicas = [create_engine("sqlite://") for _ in range(replica_count)]
+    return ReplicaRouter(primary, replicas, sticky_seconds=5)
+
+# =============================
+# TESTS
+# =============================
+def test_reads_round_robin_over_replicas_and_writes_use_primary():
+    router = _router()
+    assert [router.engine_for(_request()) for _ in range(4)] == router.replicas * 2
+    for method in ["POST", "PATCH", "DELETE"]:
+        assert router.engine_for(_request(method)) is router.primary
+
+def test_reads_use_primary_without_replicas():
+    router = _router(replica_count=0)
+    assert router.engine_for(_request()) is router.primary
+
+def test_unhealthy_replicas_are_skipped():
+    router = _router()
+    router.replicas[0] = create_engine("postgresql+psycopg2://nobody@127.0.0.1:1/missing")
+    router.check_health()
+    assert {router.engine_for(_request()) for _ in range(4)} == {router.replicas[1]}
+
+    router.replicas[1] = create_engine("postgresql+psycopg2://nobody@127.0.0.1:1/missing")
+    router.check_health()
+    # Test: with no healthy replica, reads fall back to the primary
+    assert router.engine_for(_request()) is router.primary
+
+def test_reads_stick_to_primary_after_a_write():
+    router = _router()
+    response = Response()
+    router.after_response(_request("POST"), response)
+    cookie = response.headers["set-cookie"]
+    assert cookie.startswith(f"{READ_PRIMARY_COOKIE}=")
+    assert "Max-Age=5" in cookie
+
+    until = cookie.split(";")[0].split("=")[1]
+    assert router.engine_for(_request(cookies={READ_PRIMARY_COOKIE: until})) is router.primary
+    # Test: an expired window goes back to the replicas
+    assert router.engine_for(_request(cookies={READ_PRIMARY_COOKIE: str(time.time() - 1)})) in router.replicas
+
+def test_only_the_client_that_wrote_is_pinned():
+    # Two clients sharing one API key: only the writer echoes the pin back
+    router = _router()
+    response = Response()
+    router.after_response(_request("POST", headers={"x-api-key": "shared"}), response)
+    writer = _request(headers={"x-api-key": "shared", READ_PRIMARY_HEADER: response.headers[READ_PRIMARY_HEADER]})
+    other = _request(headers={"x-api-key": "shared"})
+    assert router.engine_for(writer) is router.primary
+    assert router.engine_for(other) in router.replicas
+
+def test_far_future_pins_are_clamped():
+    router = _router()
+    far_future = str(time.time() + 3600)
+    assert router.reads_from_primary(_request(headers={READ_PRIMARY_HEADER: far_future}))
+    # Test: a far-future value counts for at most sticky_seconds, so it is over once they have passed
+    router.sticky_seconds = 0
+    assert not router.reads_from_primary(_request(headers={READ_PRIMARY_HEADER: far_future}))
+    assert not router.reads_from_primary(_request(cookies={READ_PRIMARY_COOKIE: far_future}))
+
+def test_reads_stick_to_primary_with_the_echoed_header():
+    router = _router()
+    response = Response()
+    router.after_response(_request("POST"), response)
+    until = response.headers[READ_PRIMARY_HEADER]
+    assert float(until) > time.time()
+
+    assert router.engine_for(_request(headers={READ_PRIMARY_HEADER: until})) is router.primary
+    assert router.engine_for(_request(headers={READ_PRIMARY_HEADER: "not-a-time"})) in router.replicas
+
+def test_failed_writes_and_reads_do_not_set_stickiness():
+    router = _router()
+    for method, status_code in [("POST", 409), ("GET", 200)]:
+        response = Response(status_code=status_code)
+        router.after_response(_request(method), response)
+        assert "set-cookie" not in response.headers
+        assert READ_PRIMARY_HEADER not in response.headers
@@ -0,0 +1,33 @@
+import logging
+import pytest
+from fastapi import FastAPI
+from sqlmodel import create_engine
+
+from app.utils.warmup import warm_up
+
+pytestmark = pytest.mark.asyncio
+
+# =============================
+# TESTS
+# =============================
+async def test_warm_up_runs_and_times_every_step(test_db_engine, caplog):
+    app = FastAPI()
+    app.state.db_engine = test_db_engine
+    with caplog.at_level(logging.INFO, logger="app.utils.warmup"):
+        await warm_up(app)
+
+    messages = [record.getMessage() for record in caplog.records]
+    for step in ["configure mappers", "build openapi schema and routes", "check response models", "open pool connections", "compile hot queries"]:
+        assert any(f"'{step}' took" in message for message in messages)
+    assert any(message.startswith("Warm-up finished") for message in messages)
+
+async def test_warm_up_does_not_fail_startup_when_database_is_unreachable(test_db_engine, caplog):
+    app = FastAPI()
+    app.state.db_engine = create_engine(test_db_engine.url.set(host="127.0.0.1", port=1))
+    with caplog.at_level(logging.INFO, logger="app.utils.warmup"):
+        await warm_up(app)
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert "Warm-up step 'open pool connections' failed" in messages
+    assert any("'configure mappers' took" in message for message in messages)
+    app.state.db_engine.dispose()
@@ -0,0 +1,122 @@
+import uuid
+import hashlib
+from sqlmodel import Session, text
+
+from app.db.partitions import ensure_event_partitions
+
+# Shape of the generated history: a multi-site year is ~300 events and ~3,600 slots, so the defaults
+# give the planner tables large enough that a missing index shows up as a sequential scan
+LARGE_DATASET_YEARS = 10
+LARGE_DATASET_FIRST_YEAR = 2016
+LARGE_DATASET_EVENTS_PER_WEEK = 6
+LARGE_DATASET_ROLES = 12
+LARGE_DATASET_USERS = 2000
+LARGE_DATASET_TEAMS = 20
+
+# Ids are derived from md5(<kind> || n) so rows can reference each other without lookups, and
+# tests can address e.g. the 5th user as large_dataset_id("user", 5)
+LARGE_DATASET_STATEMENTS = [
+    """
+    INSERT INTO proficiency_levels (id, name, code, rank, is_active, is_assignable, created_at, updated_at)
+    VALUES (md5('proficiency_level1')::uuid, 'Proficient', 'proficient', 4, true, true, now(), now())
+    """,
+    """
+    INSERT INTO event_types (id, name, code, is_active, created_at, updated_at)
+    VALUES (md5('event_type1')::uuid, 'Service', 'service', true, now(), now())
+    """,
+    """
+    INSERT INTO roles (id, name, code, "order", is_active, created_at, updated_at)
+    SELECT md5('role' || n)::uuid, 'Role ' || n, 'role_' || n, n, true, now(), now()
+    FROM generate_series(1, :roles) AS n
+    """,
+    """
+    INSERT INTO teams (id, name, code, is_active, created_at, updated_at)
+    SELECT md5('team' || n)::uuid, 'Team ' || n, 'team_' || n, true, now(), now()
+    FROM generate_series(1, :teams) AS n
+    """,
+    """
+    INSERT INTO users (id, first_name, last_name, phone, is_active, created_at, updated_at)
+    SELECT md5('user' || n)::uuid, 'User', lpad(n::text, 5, '0'), '+1555' || lpad(n::text, 7, '0'), true, now(), now()
+    FROM generate_series(1, :users) AS n
+    """,
+    """
+    INSERT INTO team_users (id, team_id, user_id, is_active, created_at, updated_at)
+    SELECT gen_random_uuid(), md5('team' || (n % :teams + 1))::uuid, md5('user' || n)::uuid, n % 10 <> 0, now(), now()
+    FROM generate_series(1, :users) AS n
+    """,
+    """
+    INSERT INTO user_roles (id, user_id, role_id, proficiency_level_id, created_at, updated_at)
+    SELECT gen_random_uuid(), md5('user' || n)::uuid, md5('role' || ((n + k) % :roles + 1))::uuid, md5('proficiency_level1')::uuid, now(), now()
+    FROM generate_series(1, :users) AS n, generate_series(0, 2) AS k
+    """,
+    """
+    INSERT INTO schedules (id, month, year, is_active, created_at, updated_at)
+    SELECT md5('schedule' || m)::uuid, m % 12 + 1, :first_year + m / 12, true, now(), now()
+    FROM generate_series(0, :years * 12 - 1) AS m
+    """,
+    """
+    INSERT INTO events (id, schedule_id, event_type_id, team_id, starts_at, ends_at, is_active, created_at, updated_at)
+    SELECT
+        md5('event' || e)::uuid,
+        md5('schedule' || ((extract(year FROM starts_at AT TIME ZONE 'UTC')::int - :first_year) * 12 + extract(month FROM starts_at AT TIME ZONE 'UTC')::int - 1))::uuid,
+        md5('event_type1')::uuid,
+        md5('team' || (e % :teams + 1))::uuid,
+        starts_at, starts_at + interval '2 hours', e % 50 <> 0, now(), now()
+    FROM (
+        SELECT e, make_timestamptz(:first_year, 1, 1, 10, 0, 0, 'UTC') + (e / :events_per_week) * interval '7 days' + (e % :events_per_week) * interval '1 day' AS starts_at
+        FROM generate_series(0, :years * 52 * :events_per_week - 1) AS e
+    ) AS generated
+    WHERE starts_at < make_timestamptz(:first_year + :years, 1, 1, 0, 0, 0, 'UTC')
+    """,
+    """
+    INSERT INTO event_assignments (id, event_id, event_starts_at, role_id, assigned_user_id, requirement_level, is_applicable, is_active, created_at, updated_at)
+    SELECT
+        gen_random_uuid(), events.id, events.starts_at, md5('role' || r)::uuid,
+        CASE WHEN (e + r) % 5 <> 0 THEN md5('user' || ((e * 7 + r * 13) % :users + 1))::uuid END,
+        (ARRAY['required', 'preferred', 'optional'])[r % 3 + 1]::requirement_level,
+        r % 7 <> 0, true, now(), now()
+    FROM generate_series(0, :years * 52 * :events_per_week - 1) AS e
+    JOIN events ON events.id = md5('event' || e)::uuid
+    CROSS JOIN generate_series(1, :roles) AS r
+    """,
+    """
+    INSERT INTO user_unavailable_periods (id, user_id, starts_at, ends_at, created_at, updated_at)
+    SELECT gen_random_uuid(), md5('user' || n)::uuid, starts_at, starts_at + interval '3 days', now(), now()
+    FROM generate_series(1, :users) AS n, generate_series(0, :years * 12 - 1, 3) AS m,
+        LATERAL (SELECT make_timestamptz(:first_year, 1, 1, 0, 0, 0, 'UTC') + m * interval '1 month' + (n % 28) * interval '1 day' AS starts_at) AS period
+    """,
+]
+
+def large_dataset_id(kind: str, n: int) -> str:
+    """Id of the n-th generated row of a kind ("user", "role", "team", "event", "schedule")."""
+    return str(uuid.UUID(hashlib.md5(f"{kind}{n}".encode()).hexdigest()))
+
+def large_dataset_schedule_number(year: int, month: int) -> int:
+    """n for large_dataset_id("schedule", n) of a generated month."""
+    return (year - LARGE_DATASET_FIRST_YEAR) * 12 + month - 1
+
+def generate_large_dataset(
+    session: Session,
+    years: int = LARGE_DATASET_YEARS,
+    events_per_week: int = LARGE_DATASET_EVENTS_PER_WEEK,
+    roles: int = LARGE_DATASET_ROLES,
+    users: int = LARGE_DATASET_USERS,
+    teams: int = LARGE_DATASET_TEAMS,
+) -> None:
+    """
+    Generate years of schedule history with set-based INSERT ... SELECT generate_series statements
+    (seconds, not minutes), then VACUUM ANALYZE so the planner sees the real table sizes.
+    """
+    params = {
+        "years": years, "first_year": LARGE_DATASET_FIRST_YEAR, "events_per_week": events_per_week,
+        "roles": roles, "users": users, "teams": teams,
+    }
+    connection = session.connection()
+    ensure_event_partitions(connection, range(LARGE_DATASET_FIRST_YEAR, LARGE_DATASET_FIRST_YEAR + years))
+    for statement in LARGE_DATASET_STATEMENTS:
+        connection.execute(text(statement), {key: value for key, value in params.items() if f":{key}" in statement})
+    session.commit()
+    # VACUUM (outside a transaction) also sets the visibility map, without which the planner never
+    # costs an index-only scan as cheap, just as autovacuum would have done in production
+    with session.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as autocommit_connection:
+        autocommit_connection.execute(text("VACUUM ANALYZE"))
@@ -0,0 +1,47 @@
+from typing import Any, Callable
+from sqlalchemy import event
+from sqlmodel import Session, text
+
+def explain_plans(session: Session, run_queries: Callable[[Session], Any]) -> list[dict]:
+    """Run the queries, capturing the SQL they send, then EXPLAIN each one with the same parameters."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        run_queries(session)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    connection = session.connection()
+    return [connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()[0]["Plan"] for statement, parameters in statements]
+
+def plan_nodes(plan: dict) -> list[dict]:
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+def partition_parents(session: Session) -> dict[str, str]:
+    """Partition (table or index) name -> name of the partitioned table or index it belongs to."""
+    return dict(session.exec(text(
+        "SELECT child.relname, parent.relname FROM pg_inherits "
+        "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+        "JOIN pg_class AS parent ON parent.oid = pg_inherits.inhparent"
+    )).all())
+
+def scanned_relations(plans: list[dict]) -> set[str]:
+    return {node["Relation Name"] for plan in plans for node in plan_nodes(plan) if "Relation Name" in node}
+
+def indexes_used(plans: list[dict], parents: dict[str, str] | None = None) -> set[str]:
+    """Index names in the plans; with parents, partition indexes are reported as their parent index."""
+    parents = parents or {}
+    return {parents.get(node["Index Name"], node["Index Name"]) for plan in plans for node in plan_nodes(plan) if "Index Name" in node}
+
+def sequential_scans(plans: list[dict], parents: dict[str, str] | None = None) -> set[str]:
+    """Tables read by a sequential scan; with parents, partitions are reported as their parent table."""
+    parents = parents or {}
+    return {parents.get(node["Relation Name"], node["Relation Name"]) for plan in plans for node in plan_nodes(plan) if node["Node Type"] == "Seq Scan"}